@@ -0,0 +1,105 @@
+// Host microbenchmark: per-device gain fused into SyncEngine's pull vs a second pass over the
+// pulled buffer (the pre-fusion way of applying gainDb).
+//
+//   cmake -S native -B native/build-release -DCMAKE_BUILD_TYPE=Release
+//   cmake --build native/build-release --target bench_device_gain
+//   ./native/build-release/bench_device_gain [devices] [seconds]
+
+#include "multiconnect/sync_engine.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <iostream>
+#include <string>
+#include <vector>
+
+namespace {
+
+constexpr int32_t kSampleRateHz = 48000;
+constexpr std::size_t kBlockSamples = 480;  // 10 ms at 48 kHz.
+
+enum class GainMode { kUnity, kFused, kTwoPass };
+
+float deviceGainDb(int device) { return -1.5F * static_cast<float>(device + 1); }
+
+// Same arithmetic as the engine's fused path (vectorizable), so only the extra pass differs.
+void applyGainPass(int16_t* samples, std::size_t count, float gain) {
+    for (std::size_t i = 0; i < count; ++i) {
+        float value = static_cast<float>(samples[i]) * gain;
+        value += std::copysign(0.5F, value);
+        samples[i] = static_cast<int16_t>(std::min(std::max(value, -32768.0F), 32767.0F));
+    }
+}
+
+double runSession(int devices, int seconds, GainMode mode, int64_t* checksum) {
+    multiconnect::SyncEngineConfig config;
+    config.masterCapacitySamples = kSampleRateHz;
+    multiconnect::SyncEngine engine(config);
+
+    std::vector<multiconnect::DeviceHandle> handles;
+    std::vector<float> linearGains;
+    for (int d = 0; d < devices; ++d) {
+        const auto handle = engine.registerDevice("speaker-" + std::to_string(d));
+        if (mode == GainMode::kFused) {
+            engine.setDeviceGainDb(handle, deviceGainDb(d));
+        }
+        handles.push_back(handle);
+        linearGains.push_back(std::pow(10.0F, deviceGainDb(d) / 20.0F));
+    }
+
+    std::vector<int16_t> block(kBlockSamples);
+    std::vector<int16_t> output(kBlockSamples);
+    const std::size_t blocks = static_cast<std::size_t>(seconds) * kSampleRateHz / kBlockSamples;
+
+    int64_t sum = 0;
+    const auto start = std::chrono::steady_clock::now();
+    for (std::size_t b = 0; b < blocks; ++b) {
+        for (std::size_t i = 0; i < kBlockSamples; ++i) {
+            block[i] = static_cast<int16_t>(((b * kBlockSamples + i) * 37) & 0x3FFF);
+        }
+        engine.pushPcm16(block.data(), block.size());
+
+        for (std::size_t d = 0; d < handles.size(); ++d) {
+            engine.pullForDevice(handles[d], output.data(), output.size());
+            if (mode == GainMode::kTwoPass) {
+                applyGainPass(output.data(), output.size(), linearGains[d]);
+            }
+            sum += output[(b + d) % kBlockSamples];
+        }
+    }
+    const auto elapsed = std::chrono::steady_clock::now() - start;
+
+    *checksum = sum;
+    return std::chrono::duration<double>(elapsed).count();
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    const int devices = argc > 1 ? std::max(std::atoi(argv[1]), 1) : 8;
+    const int sessionSeconds = argc > 2 ? std::max(std::atoi(argv[2]), 1) : 300;
+
+    int64_t unityChecksum = 0;
+    int64_t fusedChecksum = 0;
+    int64_t twoPassChecksum = 0;
+    const double unitySeconds = runSession(devices, sessionSeconds, GainMode::kUnity, &unityChecksum);
+    const double fusedSeconds = runSession(devices, sessionSeconds, GainMode::kFused, &fusedChecksum);
+    const double twoPassSeconds = runSession(devices, sessionSeconds, GainMode::kTwoPass, &twoPassChecksum);
+
+    std::cout << "BENCH config devices=" << devices << " sessionSeconds=" << sessionSeconds
+              << " blockSamples=" << kBlockSamples << '\n';
+    std::cout << "BENCH gain=unity seconds=" << unitySeconds << '\n';
+    std::cout << "BENCH gain=fused seconds=" << fusedSeconds << '\n';
+    std::cout << "BENCH gain=two-pass seconds=" << twoPassSeconds << '\n';
+    std::cout << "BENCH speedup fused-vs-two-pass=" << twoPassSeconds / fusedSeconds << "x\n";
+
+    // The fused ramp starts at unity, so only the first few blocks may differ slightly.
+    if (std::llabs(fusedChecksum - twoPassChecksum) > static_cast<int64_t>(devices) * 32768) {
+        std::cerr << "ERROR fused gain output diverged from the two-pass reference\n";
+        return 1;
+    }
+    return 0;
+}
@@ -0,0 +1,95 @@
+// Host microbenchmark: CPU cost of the fractional-resampling drift corrector per device.
+//
+// Every device is pulled through the resampler (non-zero ppm plus an outstanding slew) in 10 ms
+// blocks at 48 kHz. Exits non-zero if the cost per device exceeds the budget, expressed as the
+// fraction of one core a single device may use.
+//
+//   cmake -S native -B native/build-release -DCMAKE_BUILD_TYPE=Release
+//   cmake --build native/build-release --target bench_drift_corrector
+//   ./native/build-release/bench_drift_corrector [devices] [seconds] [budgetPercentPerDevice]
+
+#include "multiconnect/sync_engine.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <iostream>
+#include <string>
+#include <vector>
+
+namespace {
+
+constexpr int32_t kSampleRateHz = 48000;
+constexpr std::size_t kBlockSamples = 480;  // 10 ms at 48 kHz.
+
+double runSession(int devices, int seconds, bool correct, int64_t* checksum) {
+    multiconnect::SyncEngineConfig config;
+    config.masterCapacitySamples = kSampleRateHz;
+    multiconnect::SyncEngine engine(config);
+
+    std::vector<multiconnect::DeviceHandle> handles;
+    for (int d = 0; d < devices; ++d) {
+        const auto handle = engine.registerDevice("speaker-" + std::to_string(d));
+        if (correct) {
+            // Spread of clock errors seen on the hardware matrix (roughly 35-95 ppm).
+            engine.setDeviceRateCorrectionPpm(handle, 35.0F + 7.5F * static_cast<float>(d));
+        }
+        handles.push_back(handle);
+    }
+
+    std::vector<int16_t> block(kBlockSamples);
+    std::vector<int16_t> output(kBlockSamples);
+    const std::size_t blocks = static_cast<std::size_t>(seconds) * kSampleRateHz / kBlockSamples;
+
+    int64_t sum = 0;
+    const auto start = std::chrono::steady_clock::now();
+    for (std::size_t b = 0; b < blocks; ++b) {
+        for (std::size_t i = 0; i < kBlockSamples; ++i) {
+            block[i] = static_cast<int16_t>(std::lround(8000.0 * std::sin(0.0576 * static_cast<double>(b * kBlockSamples + i))));
+        }
+        engine.pushPcm16(block.data(), block.size());
+
+        for (std::size_t d = 0; d < handles.size(); ++d) {
+            if (correct && b % 100 == 0) {
+                // A fresh measurement once a second keeps the slew stage busy as well.
+                engine.slewDriftCorrectionMs(handles[d], 0.25F, kSampleRateHz);
+            }
+            engine.pullForDevice(handles[d], output.data(), output.size());
+            sum += output[d % kBlockSamples];
+        }
+    }
+    const auto elapsed = std::chrono::steady_clock::now() - start;
+
+    *checksum = sum;
+    return std::chrono::duration<double>(elapsed).count();
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    const int devices = argc > 1 ? std::max(std::atoi(argv[1]), 1) : 8;
+    const int sessionSeconds = argc > 2 ? std::max(std::atoi(argv[2]), 1) : 120;
+    const double budgetPercent = argc > 3 ? std::atof(argv[3]) : 1.0;
+
+    int64_t checksum = 0;
+    const double copySeconds = runSession(devices, sessionSeconds, false, &checksum);
+    const double correctedSeconds = runSession(devices, sessionSeconds, true, &checksum);
+
+    const double deviceSeconds = static_cast<double>(devices) * sessionSeconds;
+    const double percentPerDevice = 100.0 * correctedSeconds / deviceSeconds;
+    std::cout << "BENCH config devices=" << devices << " sessionSeconds=" << sessionSeconds
+              << " blockSamples=" << kBlockSamples << " budgetPercentPerDevice=" << budgetPercent << '\n';
+    std::cout << "BENCH pull=copy seconds=" << copySeconds
+              << " percentCorePerDevice=" << 100.0 * copySeconds / deviceSeconds << '\n';
+    std::cout << "BENCH pull=resampled seconds=" << correctedSeconds << " percentCorePerDevice=" << percentPerDevice
+              << " checksum=" << checksum << '\n';
+
+    if (percentPerDevice > budgetPercent) {
+        std::cerr << "ERROR drift corrector used " << percentPerDevice << "% of a core per device (budget "
+                  << budgetPercent << "%)\n";
+        return 1;
+    }
+    return 0;
+}
@@ -0,0 +1,122 @@
+// Host microbenchmark: block-copy MasterRingBuffer vs the original per-sample implementation.
+//
+// Build with optimizations for meaningful numbers:
+//   cmake -S native -B native/build-release -DCMAKE_BUILD_TYPE=Release
+//   cmake --build native/build-release --target bench_ring_buffer
+//   ./native/build-release/bench_ring_buffer [speakers] [seconds]
+
+#include "multiconnect/master_ring_buffer.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cstdint>
+#include <cstdlib>
+#include <iostream>
+#include <vector>
+
+namespace {
+
+// Verbatim copy of the pre-block-copy implementation, kept as the comparison baseline.
+class PerSampleRingBuffer {
+  public:
+    explicit PerSampleRingBuffer(std::size_t capacitySamples) : data_(std::max<std::size_t>(capacitySamples, 1), 0) {}
+
+    std::size_t write(const int16_t* input, std::size_t sampleCount) {
+        for (std::size_t i = 0; i < sampleCount; ++i) {
+            data_[writeHead_] = input[i];
+            writeHead_ = (writeHead_ + 1) % data_.size();
+            size_ = std::min(size_ + 1, data_.size());
+        }
+        return sampleCount;
+    }
+
+    std::size_t readWithOffset(std::size_t logicalReadHead,
+                               int32_t offsetSamples,
+                               int16_t* output,
+                               std::size_t sampleCount) const {
+        const std::size_t readable = std::min(sampleCount, size_);
+        for (std::size_t i = 0; i < readable; ++i) {
+            const int64_t shifted = static_cast<int64_t>(logicalReadHead + i) + offsetSamples;
+            const int64_t normalized = ((shifted % static_cast<int64_t>(data_.size())) +
+                                        static_cast<int64_t>(data_.size())) %
+                                       static_cast<int64_t>(data_.size());
+            output[i] = data_[static_cast<std::size_t>(normalized)];
+        }
+        return readable;
+    }
+
+  private:
+    std::vector<int16_t> data_;
+    std::size_t writeHead_ = 0;
+    std::size_t size_ = 0;
+};
+
+constexpr int32_t kSampleRateHz = 48000;
+constexpr std::size_t kBlockSamples = 480;  // 10 ms at 48 kHz.
+
+template <typename Ring>
+double runSession(Ring& ring, int speakers, int seconds, int64_t* checksum) {
+    std::vector<int16_t> block(kBlockSamples);
+    std::vector<int16_t> output(kBlockSamples);
+    const std::size_t blocks = static_cast<std::size_t>(seconds) * kSampleRateHz / kBlockSamples;
+
+    int64_t sum = 0;
+    const auto start = std::chrono::steady_clock::now();
+    for (std::size_t b = 0; b < blocks; ++b) {
+        for (std::size_t i = 0; i < kBlockSamples; ++i) {
+            block[i] = static_cast<int16_t>((b * kBlockSamples + i) & 0x7FFF);
+        }
+        ring.write(block.data(), block.size());
+
+        const std::size_t readHead = b * kBlockSamples;
+        for (int s = 0; s < speakers; ++s) {
+            ring.readWithOffset(readHead, -(s * 97), output.data(), output.size());
+            sum += output[s % kBlockSamples];
+        }
+    }
+    const auto elapsed = std::chrono::steady_clock::now() - start;
+
+    *checksum = sum;
+    return std::chrono::duration<double>(elapsed).count();
+}
+
+void report(const char* name, double seconds, int speakers, int sessionSeconds) {
+    const double samples = static_cast<double>(sessionSeconds) * kSampleRateHz * (speakers + 1);
+    std::cout << "BENCH ring=" << name << " seconds=" << seconds
+              << " msamplesPerSec=" << (samples / seconds) / 1e6
+              << " realtimeFactor=" << sessionSeconds / seconds << '\n';
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    const int speakers = argc > 1 ? std::max(std::atoi(argv[1]), 1) : 4;
+    const int sessionSeconds = argc > 2 ? std::max(std::atoi(argv[2]), 1) : 600;
+    const std::size_t capacity = kSampleRateHz;  // 1 s of audio, not a power of two.
+
+    int64_t baselineChecksum = 0;
+    PerSampleRingBuffer baseline(capacity);
+    const double baselineSeconds = runSession(baseline, speakers, sessionSeconds, &baselineChecksum);
+
+    int64_t blockChecksum = 0;
+    multiconnect::MasterRingBuffer blockCopy(capacity);
+    const double blockSeconds = runSession(blockCopy, speakers, sessionSeconds, &blockChecksum);
+
+    int64_t maskedChecksum = 0;
+    multiconnect::MasterRingBuffer masked(capacity, multiconnect::RingCapacityPolicy::kRoundUpToPowerOfTwo);
+    const double maskedSeconds = runSession(masked, speakers, sessionSeconds, &maskedChecksum);
+
+    std::cout << "BENCH config speakers=" << speakers << " sessionSeconds=" << sessionSeconds
+              << " blockSamples=" << kBlockSamples << '\n';
+    report("per-sample", baselineSeconds, speakers, sessionSeconds);
+    report("block-copy", blockSeconds, speakers, sessionSeconds);
+    report("block-copy-pow2", maskedSeconds, speakers, sessionSeconds);
+    std::cout << "BENCH speedup block-copy=" << baselineSeconds / blockSeconds
+              << "x block-copy-pow2=" << baselineSeconds / maskedSeconds << "x\n";
+
+    if (baselineChecksum != blockChecksum || baselineChecksum != maskedChecksum) {
+        std::cerr << "ERROR block-copy output diverged from per-sample baseline\n";
+        return 1;
+    }
+    return 0;
+}
@@ -0,0 +1,121 @@
+// Host microbenchmark: resonator-based generateSine vs the original per-sample std::sin +
+// push_back beep generator, plus the throughput of the sweep, MLS and multi-tone probes.
+//
+//   cmake -S native -B native/build-release -DCMAKE_BUILD_TYPE=Release
+//   cmake --build native/build-release --target bench_signal_generator
+//   ./native/build-release/bench_signal_generator [devices] [seconds]
+
+#include "multiconnect/signal_generator.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <iostream>
+#include <vector>
+
+namespace {
+
+constexpr int32_t kSampleRateHz = 48000;
+constexpr float kFrequencyHz = 1000.0F;
+constexpr float kAmplitude = 0.6F;
+
+// Verbatim copy of the original generateBeepPcm16 loop, kept as the comparison baseline.
+std::vector<int16_t> legacyBeepPcm16(int32_t sampleRate, std::size_t sampleCount, float frequencyHz, float amplitude) {
+    constexpr float kPi = 3.14159265358979323846F;
+    std::vector<int16_t> buffer;
+    buffer.reserve(sampleCount);
+    for (std::size_t i = 0; i < sampleCount; ++i) {
+        const float t = static_cast<float>(i) / static_cast<float>(sampleRate);
+        const float sample = std::sin(2.0F * kPi * frequencyHz * t);
+        const float scaled = sample * amplitude * static_cast<float>(INT16_MAX);
+        buffer.push_back(static_cast<int16_t>(scaled));
+    }
+    return buffer;
+}
+
+template <typename Fn>
+double timeSeconds(int devices, Fn&& render) {
+    const auto start = std::chrono::steady_clock::now();
+    for (int d = 0; d < devices; ++d) {
+        render(d);
+    }
+    return std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    const int devices = argc > 1 ? std::max(std::atoi(argv[1]), 1) : 8;
+    const int seconds = argc > 2 ? std::max(std::atoi(argv[2]), 1) : 30;
+    const std::size_t count = static_cast<std::size_t>(seconds) * kSampleRateHz;
+
+    int64_t checksum = 0;
+    std::vector<int16_t> legacy;
+    const double legacySeconds = timeSeconds(devices, [&](int d) {
+        legacy = legacyBeepPcm16(kSampleRateHz, count, kFrequencyHz, kAmplitude);
+        checksum += legacy[static_cast<std::size_t>(d) % count];
+    });
+
+    std::vector<int16_t> pcm(count);
+    multiconnect::SineConfig sine;
+    sine.sampleRateHz = kSampleRateHz;
+    sine.frequencyHz = kFrequencyHz;
+    sine.amplitude = kAmplitude;
+    const double sineSeconds = timeSeconds(devices, [&](int d) {
+        multiconnect::generateSine(sine, pcm.data(), pcm.size());
+        checksum += pcm[static_cast<std::size_t>(d) % count];
+    });
+
+    // The legacy loop evaluates sin of a float time, so its phase error grows with t; compare the
+    // first 100 ms, where only rounding vs truncation separates the two.
+    int worstLsb = 0;
+    for (std::size_t i = 0; i < std::min<std::size_t>(count, kSampleRateHz / 10); ++i) {
+        worstLsb = std::max(worstLsb, std::abs(static_cast<int>(pcm[i]) - static_cast<int>(legacy[i])));
+    }
+
+    multiconnect::LogSweepConfig sweep;
+    sweep.sampleRateHz = kSampleRateHz;
+    const double sweepSeconds = timeSeconds(devices, [&](int d) {
+        multiconnect::generateLogSweep(sweep, pcm.data(), pcm.size());
+        checksum += pcm[static_cast<std::size_t>(d) % count];
+    });
+
+    multiconnect::MlsConfig mls;
+    mls.order = 18;
+    const double mlsSeconds = timeSeconds(devices, [&](int d) {
+        multiconnect::generateMls(mls, pcm.data(), pcm.size());
+        checksum += pcm[static_cast<std::size_t>(d) % count];
+    });
+
+    const std::vector<float> tones = {125.0F, 250.0F, 500.0F, 1000.0F, 2000.0F, 4000.0F, 8000.0F, 16000.0F};
+    multiconnect::MultiToneConfig multiTone;
+    multiTone.sampleRateHz = kSampleRateHz;
+    multiTone.frequenciesHz = tones.data();
+    multiTone.toneCount = tones.size();
+    const double multiToneSeconds = timeSeconds(devices, [&](int d) {
+        multiconnect::generateMultiTone(multiTone, pcm.data(), pcm.size());
+        checksum += pcm[static_cast<std::size_t>(d) % count];
+    });
+
+    const double samples = static_cast<double>(count) * devices;
+    std::cout << "BENCH config devices=" << devices << " signalSeconds=" << seconds << " sampleRateHz=" << kSampleRateHz
+              << '\n';
+    std::cout << "BENCH signal=legacy-beep seconds=" << legacySeconds << " msamplesPerSec=" << samples / legacySeconds / 1e6
+              << '\n';
+    std::cout << "BENCH signal=sine seconds=" << sineSeconds << " msamplesPerSec=" << samples / sineSeconds / 1e6 << '\n';
+    std::cout << "BENCH signal=log-sweep seconds=" << sweepSeconds << " msamplesPerSec=" << samples / sweepSeconds / 1e6
+              << '\n';
+    std::cout << "BENCH signal=mls seconds=" << mlsSeconds << " msamplesPerSec=" << samples / mlsSeconds / 1e6 << '\n';
+    std::cout << "BENCH signal=multi-tone-" << tones.size() << " seconds=" << multiToneSeconds
+              << " msamplesPerSec=" << samples / multiToneSeconds / 1e6 << '\n';
+    std::cout << "BENCH speedup sine-vs-legacy=" << legacySeconds / sineSeconds << "x maxDiffLsb=" << worstLsb
+              << " checksum=" << checksum << '\n';
+
+    if (worstLsb > 2) {
+        std::cerr << "ERROR sine output diverged from the legacy beep generator\n";
+        return 1;
+    }
+    return 0;
+}
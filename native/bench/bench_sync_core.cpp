@@ -0,0 +1,295 @@
+// Host microbenchmark suite for the audio path: ring write and read, SyncEngine pulls for 1-16
+// devices, drift-corrected (resampled) pulls and beep generation. Prints one BENCH line per case
+// and, with --json, writes the results for scripts/compare_native_benchmarks.py, which keeps a
+// history and fails on regressions (see scripts/run_native_checks.sh).
+//
+// Each repetition repeats its case until it has run for at least --min-time-ms, and a case reports
+// the median of its repetitions, so short cases are not dominated by timer resolution or a single
+// preemption.
+//
+//   cmake -S native -B native/build-release -DCMAKE_BUILD_TYPE=Release
+//   cmake --build native/build-release --target bench_sync_core
+//   ./native/build-release/bench_sync_core [--json PATH] [--repetitions N] [--min-time-ms MS]
+
+#include "multiconnect/beep_generator.h"
+#include "multiconnect/master_ring_buffer.h"
+#include "multiconnect/sync_engine.h"
+
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <ctime>
+#include <fstream>
+#include <functional>
+#include <iomanip>
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <string_view>
+#include <vector>
+
+namespace {
+
+constexpr int32_t kSampleRateHz = 48000;
+constexpr std::size_t kBlockSamples = 480;  // 10 ms at 48 kHz.
+// One second of 10 ms blocks per session call.
+constexpr std::size_t kSessionBlocks = kSampleRateHz / kBlockSamples;
+constexpr int kDeviceCounts[] = {1, 2, 4, 8, 16};
+constexpr int kCorrectedDevices = 4;
+
+struct CliOptions {
+    std::string jsonPath;
+    int repetitions = 5;
+    double minTimeMs = 50.0;
+    bool valid = true;
+};
+
+struct CaseResult {
+    std::string name;
+    // Nanoseconds per unit: a frame written or read, a frame delivered to one device, or a
+    // generated sample.
+    std::string unit;
+    double medianNs = 0.0;
+    double minNs = 0.0;
+    double maxNs = 0.0;
+    int64_t unitsPerRepetition = 0;
+};
+
+bool parseDouble(std::string_view text, double* outValue) {
+    char* end = nullptr;
+    const std::string owned(text);
+    const double value = std::strtod(owned.c_str(), &end);
+    if (end == owned.c_str() || *end != '\0' || !std::isfinite(value)) {
+        return false;
+    }
+    *outValue = value;
+    return true;
+}
+
+CliOptions parseArgs(int argc, char** argv) {
+    CliOptions options;
+    for (int i = 1; i < argc; ++i) {
+        const std::string arg = argv[i];
+        const bool hasValue = i + 1 < argc;
+        double parsed = 0.0;
+
+        if (arg == "--json" && hasValue) {
+            options.jsonPath = argv[++i];
+        } else if (arg == "--repetitions" && hasValue && parseDouble(argv[++i], &parsed) && parsed >= 1.0) {
+            options.repetitions = static_cast<int>(parsed);
+        } else if (arg == "--min-time-ms" && hasValue && parseDouble(argv[++i], &parsed) && parsed > 0.0) {
+            options.minTimeMs = parsed;
+        } else {
+            std::cerr << "ERROR unrecognized or invalid argument: " << arg << '\n';
+            options.valid = false;
+        }
+    }
+    return options;
+}
+
+void fillBlock(std::vector<int16_t>& block, std::size_t firstSample) {
+    for (std::size_t i = 0; i < block.size(); ++i) {
+        block[i] = static_cast<int16_t>(std::lround(8000.0 * std::sin(0.0576 * static_cast<double>(firstSample + i))));
+    }
+}
+
+// `session` does `unitsPerSession` units of work and returns a checksum of what it produced.
+CaseResult measure(const std::string& name,
+                   const std::string& unit,
+                   int64_t unitsPerSession,
+                   const std::function<int64_t()>& session,
+                   const CliOptions& options,
+                   int64_t* checksum) {
+    using Clock = std::chrono::steady_clock;
+
+    // Warm-up, which also sizes a repetition.
+    auto start = Clock::now();
+    *checksum += session();
+    const double sessionMs = std::max(std::chrono::duration<double, std::milli>(Clock::now() - start).count(), 1e-3);
+    const auto sessionsPerRepetition = static_cast<int64_t>(std::max(std::ceil(options.minTimeMs / sessionMs), 1.0));
+
+    std::vector<double> nsPerUnit;
+    for (int r = 0; r < options.repetitions; ++r) {
+        start = Clock::now();
+        for (int64_t s = 0; s < sessionsPerRepetition; ++s) {
+            *checksum += session();
+        }
+        const double elapsedNs = std::chrono::duration<double, std::nano>(Clock::now() - start).count();
+        nsPerUnit.push_back(elapsedNs / static_cast<double>(unitsPerSession * sessionsPerRepetition));
+    }
+    std::sort(nsPerUnit.begin(), nsPerUnit.end());
+
+    CaseResult result;
+    result.name = name;
+    result.unit = unit;
+    const std::size_t middle = nsPerUnit.size() / 2;
+    result.medianNs = nsPerUnit.size() % 2 == 1 ? nsPerUnit[middle] : 0.5 * (nsPerUnit[middle - 1] + nsPerUnit[middle]);
+    result.minNs = nsPerUnit.front();
+    result.maxNs = nsPerUnit.back();
+    result.unitsPerRepetition = unitsPerSession * sessionsPerRepetition;
+    return result;
+}
+
+CaseResult benchRingWrite(const CliOptions& options, int64_t* checksum) {
+    multiconnect::MasterRingBuffer ring(kSampleRateHz);
+    std::vector<int16_t> block(kBlockSamples);
+    fillBlock(block, 0);
+    const auto session = [&] {
+        for (std::size_t b = 0; b < kSessionBlocks; ++b) {
+            ring.write(block.data(), block.size());
+        }
+        return static_cast<int64_t>(ring.totalWritten());
+    };
+    const auto frames = static_cast<int64_t>(kSessionBlocks * kBlockSamples);
+    return measure("ring_write", "ns/frame", frames, session, options, checksum);
+}
+
+CaseResult benchRingRead(const CliOptions& options, int64_t* checksum) {
+    multiconnect::MasterRingBuffer ring(kSampleRateHz);
+    std::vector<int16_t> second(kSampleRateHz);
+    fillBlock(second, 0);
+    ring.write(second.data(), second.size());
+    std::vector<int16_t> output(kBlockSamples);
+    const auto session = [&] {
+        int64_t sum = 0;
+        // Reads cross the wrap point once per second, as a live reader's do.
+        for (std::size_t b = 0; b < kSessionBlocks; ++b) {
+            ring.readWithOffset(b * kBlockSamples, -97, output.data(), output.size());
+            sum += output[b % kBlockSamples];
+        }
+        return sum;
+    };
+    const auto frames = static_cast<int64_t>(kSessionBlocks * kBlockSamples);
+    return measure("ring_read", "ns/frame", frames, session, options, checksum);
+}
+
+// Push one block, then pull it for every device: the engine's steady state. With `correct` every
+// device is resampled (non-zero ppm and an outstanding slew), as under drift correction.
+CaseResult benchPull(const std::string& name, int devices, bool correct, const CliOptions& options, int64_t* checksum) {
+    multiconnect::SyncEngineConfig config;
+    config.masterCapacitySamples = kSampleRateHz;
+    multiconnect::SyncEngine engine(config);
+    std::vector<multiconnect::DeviceHandle> handles;
+    for (int d = 0; d < devices; ++d) {
+        const auto handle = engine.registerDevice("speaker-" + std::to_string(d), -(d * 97));
+        if (correct) {
+            // Spread of clock errors seen on the hardware matrix (roughly 35-95 ppm).
+            engine.setDeviceRateCorrectionPpm(handle, 35.0F + 7.5F * static_cast<float>(d));
+        }
+        handles.push_back(handle);
+    }
+
+    // Generated up front so the timing holds only the engine's work.
+    std::vector<int16_t> source(kSessionBlocks * kBlockSamples);
+    fillBlock(source, 0);
+    std::vector<int16_t> output(kBlockSamples);
+    const auto session = [&] {
+        int64_t sum = 0;
+        for (std::size_t b = 0; b < kSessionBlocks; ++b) {
+            engine.pushPcm16(source.data() + b * kBlockSamples, kBlockSamples);
+            for (std::size_t d = 0; d < handles.size(); ++d) {
+                if (correct && b == 0) {
+                    // A fresh measurement once a second keeps the slew stage busy as well.
+                    engine.slewDriftCorrectionMs(handles[d], 0.25F, kSampleRateHz);
+                }
+                engine.pullForDevice(handles[d], output.data(), output.size());
+                sum += output[d % kBlockSamples];
+            }
+        }
+        return sum;
+    };
+    const auto units = static_cast<int64_t>(kSessionBlocks * kBlockSamples) * devices;
+    return measure(name, "ns/device-frame", units, session, options, checksum);
+}
+
+CaseResult benchBeep(const CliOptions& options, int64_t* checksum) {
+    multiconnect::BeepConfig config;
+    config.sampleRateHz = kSampleRateHz;
+    config.durationMs = 1000;
+    const auto session = [&] {
+        const std::vector<int16_t> beep = multiconnect::generateBeepPcm16(config);
+        return static_cast<int64_t>(beep[beep.size() / 3]);
+    };
+    return measure("beep_generation", "ns/sample", kSampleRateHz, session, options, checksum);
+}
+
+std::string jsonString(const std::string& text) {
+    // Case names and units are plain ASCII identifiers.
+    return '"' + text + '"';
+}
+
+std::string utcTimestamp() {
+    const std::time_t now = std::time(nullptr);
+    std::tm tm{};
+    gmtime_r(&now, &tm);
+    std::ostringstream oss;
+    oss << std::put_time(&tm, "%Y-%m-%dT%H:%M:%SZ");
+    return oss.str();
+}
+
+bool writeJson(const std::string& path, const std::vector<CaseResult>& results, const CliOptions& options) {
+    std::ofstream out(path);
+    if (!out) {
+        return false;
+    }
+#ifdef NDEBUG
+    const char* build = "release";
+#else
+    const char* build = "debug";
+#endif
+    out << std::setprecision(6) << "{\n"
+        << "  \"suite\": \"sync_core\",\n"
+        << "  \"schemaVersion\": 1,\n"
+        << "  \"timestampUtc\": " << jsonString(utcTimestamp()) << ",\n"
+        << "  \"build\": " << jsonString(build) << ",\n"
+        << "  \"sampleRateHz\": " << kSampleRateHz << ",\n"
+        << "  \"blockSamples\": " << kBlockSamples << ",\n"
+        << "  \"repetitions\": " << options.repetitions << ",\n"
+        << "  \"minTimeMs\": " << options.minTimeMs << ",\n"
+        << "  \"results\": [\n";
+    for (std::size_t i = 0; i < results.size(); ++i) {
+        const CaseResult& result = results[i];
+        out << "    {\"name\": " << jsonString(result.name) << ", \"unit\": " << jsonString(result.unit)
+            << ", \"medianNs\": " << result.medianNs << ", \"minNs\": " << result.minNs << ", \"maxNs\": " << result.maxNs
+            << ", \"unitsPerRepetition\": " << result.unitsPerRepetition << "}" << (i + 1 < results.size() ? "," : "")
+            << '\n';
+    }
+    out << "  ]\n}\n";
+    return static_cast<bool>(out);
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    const CliOptions options = parseArgs(argc, argv);
+    if (!options.valid) {
+        std::cerr << "usage: bench_sync_core [--json PATH] [--repetitions N] [--min-time-ms MS]\n";
+        return 2;
+    }
+
+    int64_t checksum = 0;
+    std::vector<CaseResult> results;
+    results.push_back(benchRingWrite(options, &checksum));
+    results.push_back(benchRingRead(options, &checksum));
+    for (const int devices : kDeviceCounts) {
+        results.push_back(benchPull("pull_for_device/devices=" + std::to_string(devices), devices, false, options, &checksum));
+    }
+    results.push_back(benchPull("drift_correction/devices=" + std::to_string(kCorrectedDevices), kCorrectedDevices, true,
+                                options, &checksum));
+    results.push_back(benchBeep(options, &checksum));
+
+    std::cout << "BENCH config repetitions=" << options.repetitions << " minTimeMs=" << options.minTimeMs
+              << " blockSamples=" << kBlockSamples << " checksum=" << checksum << '\n';
+    for (const CaseResult& result : results) {
+        std::cout << "BENCH case=" << result.name << " median=" << result.medianNs << ' ' << result.unit
+                  << " min=" << result.minNs << " max=" << result.maxNs << '\n';
+    }
+
+    if (!options.jsonPath.empty() && !writeJson(options.jsonPath, results, options)) {
+        std::cerr << "ERROR could not write " << options.jsonPath << '\n';
+        return 1;
+    }
+    return 0;
+}
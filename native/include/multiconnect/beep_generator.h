@@ -12,7 +12,8 @@ struct BeepConfig {
     float amplitude = 0.6F;
 };
 
-// Returns signed 16-bit mono PCM samples.
+// Returns signed 16-bit mono PCM samples. Allocates; to render into an existing buffer (or for
+// sweeps, MLS and multi-tone probes) use signal_generator.h.
 std::vector<int16_t> generateBeepPcm16(const BeepConfig& config);
 
 }  // namespace multiconnect
@@ -0,0 +1,55 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <string_view>
+#include <vector>
+
+namespace multiconnect {
+
+// The "Device calibration state" of docs/architecture.md, plus what the hardware matrix tells us
+// about the speaker so a session can start pre-aligned instead of measuring first.
+struct DeviceCalibration {
+    // User-dialled offset on top of the latency alignment; positive plays the device earlier.
+    int32_t manualOffsetMs = 0;
+    float gainDb = 0.0F;
+    float lastMeasuredDriftMs = 0.0F;
+    // Fitted playback clock error: positive runs fast (the drift simulator's skewPpm).
+    float driftPpm = 0.0F;
+    // Output latency of the speaker (Bluetooth link plus DSP).
+    float latencyMs = 0.0F;
+};
+
+// Calibrations keyed by device id or speaker model, stored as a compact little-endian binary file
+// (see scripts/build_calibration_store.py): a 16-byte header, fixed 40-byte records sorted by key
+// hash, then the key bytes. Loading is one read plus a linear decode, and lookups are a binary
+// search, so a store with hundreds of speakers loads in microseconds.
+class CalibrationStore {
+  public:
+    // Adds or replaces the calibration for `key`.
+    void set(std::string_view key, const DeviceCalibration& calibration);
+    [[nodiscard]] const DeviceCalibration* find(std::string_view key) const;
+    [[nodiscard]] std::size_t size() const;
+    [[nodiscard]] std::vector<std::string> keys() const;
+
+    [[nodiscard]] std::vector<uint8_t> serialize() const;
+    // Replaces the contents; returns false (leaving the store empty) for malformed input.
+    bool deserialize(const uint8_t* data, std::size_t size);
+    bool loadFile(const std::string& path);
+    bool saveFile(const std::string& path) const;
+
+  private:
+    struct Entry {
+        uint64_t hash = 0;
+        std::string key;
+        DeviceCalibration calibration;
+    };
+
+    std::vector<Entry> entries_;
+};
+
+// 64-bit FNV-1a of the key bytes; the record order in the binary format.
+[[nodiscard]] uint64_t calibrationKeyHash(std::string_view key);
+
+}  // namespace multiconnect
@@ -0,0 +1,110 @@
+#pragma once
+
+#include "multiconnect/sync_engine.h"
+
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+namespace multiconnect {
+
+struct DriftControllerConfig {
+    int32_t sampleRateHz = 48000;
+    // Standard deviation of a reported position (callback jitter), in ms.
+    double measurementNoiseMs = 1.0;
+    // How fast a speaker's clock rate may wander: the skew's random walk in ppm per sqrt(second).
+    double skewWanderPpm = 0.01;
+    // The rate correction is recomputed at most this often.
+    double controlIntervalSeconds = 1.0;
+    // Residual phase error is pulled in with roughly this time constant.
+    double phaseHorizonSeconds = 20.0;
+    // Bound on the rate correction the controller commands.
+    double maxCorrectionPpm = 500.0;
+    // Rate changes smaller than this are not sent to the engine (each one counts as a correction).
+    double minRateStepPpm = 0.5;
+    // Phase errors beyond this (a dropout, a stalled link) are removed with one offset step.
+    double stepThresholdMs = 20.0;
+};
+
+// What an output worker saw when its device last consumed audio: the stream frame the device had
+// reached (read head plus offset after a pull, less anything still queued in the device's own
+// buffer) at a host clock time on the capture clock's timeline.
+struct ConsumptionReport {
+    int64_t hostTimeNs = 0;
+    double streamPosition = 0.0;
+};
+
+struct DriftEstimate {
+    // Filtered phase error (positive: the device is ahead, as in applyDriftCorrectionMs) and the
+    // speaker clock's skew against the host clock, with their standard deviations.
+    double phaseMs = 0.0;
+    double skewPpm = 0.0;
+    double phaseStdMs = 0.0;
+    double skewStdPpm = 0.0;
+    // Rate correction currently commanded to the engine.
+    double rateCorrectionPpm = 0.0;
+    uint64_t reports = 0;
+    uint64_t rateUpdates = 0;
+    uint64_t stepCorrections = 0;
+};
+
+// Per-device clock-domain tracker (the DriftController of docs/architecture.md). A two-state
+// Kalman filter (phase, skew) follows each speaker's consumption reports; the controller then keeps
+// the engine's rate correction at -skew plus a bounded phase-pulling term, and steps the offset
+// only when the phase jumps past stepThresholdMs. Corrections happen as reports arrive, so the
+// caller never measures or schedules drift corrections itself.
+//
+// Device state is preallocated per engine slot: report() does no allocation and may be called from
+// each device's output thread (one thread per device). track()/untrack() follow the engine's
+// registration rules.
+class DriftController {
+  public:
+    explicit DriftController(SyncEngine& engine, const DriftControllerConfig& config = {});
+
+    // Starts tracking with the first report as the phase reference (the device is assumed aligned
+    // when it starts), or with an explicit reference: `referenceStreamPosition` is the frame the
+    // device should be playing at `referenceHostTimeNs`. Any existing rate correction (for example
+    // from a calibration) is kept as the starting point.
+    bool track(DeviceHandle handle);
+    bool track(DeviceHandle handle, int64_t referenceHostTimeNs, double referenceStreamPosition);
+    bool untrack(DeviceHandle handle);
+    [[nodiscard]] bool isTracking(DeviceHandle handle) const;
+
+    // Folds one report into the device's estimate and corrects the engine when due. Returns true
+    // if a correction was sent. The second overload reads the position from the engine itself.
+    bool report(DeviceHandle handle, const ConsumptionReport& report);
+    bool report(DeviceHandle handle, int64_t hostTimeNs);
+
+    [[nodiscard]] DriftEstimate estimate(DeviceHandle handle) const;
+    [[nodiscard]] const DriftControllerConfig& config() const;
+
+  private:
+    struct Tracker {
+        bool active = false;
+        bool referenced = false;
+        int64_t referenceTimeNs = 0;
+        double referencePosition = 0.0;
+        int64_t lastTimeNs = 0;
+        int64_t lastControlNs = 0;
+        // State (phase ms, skew ppm) and its covariance.
+        double phaseMs = 0.0;
+        double skewPpm = 0.0;
+        double pPhase = 0.0;
+        double pCross = 0.0;
+        double pSkew = 0.0;
+        double rateCorrectionPpm = 0.0;
+        uint64_t reports = 0;
+        uint64_t rateUpdates = 0;
+        uint64_t stepCorrections = 0;
+    };
+
+    [[nodiscard]] Tracker* trackerFor(DeviceHandle handle);
+    [[nodiscard]] const Tracker* trackerFor(DeviceHandle handle) const;
+    bool control(DeviceHandle handle, Tracker& tracker, int64_t hostTimeNs);
+
+    SyncEngine& engine_;
+    DriftControllerConfig config_;
+    std::vector<Tracker> trackers_;
+};
+
+}  // namespace multiconnect
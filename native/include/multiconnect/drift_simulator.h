@@ -0,0 +1,81 @@
+#pragma once
+
+#include "multiconnect/drift_controller.h"
+#include "multiconnect/sync_engine.h"
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace multiconnect {
+
+// A simulated speaker whose playback clock is not the capture clock.
+struct VirtualSpeakerProfile {
+    std::string deviceId;
+    // Playback clock error: positive runs fast, consuming the stream ahead of the master timeline.
+    double skewPpm = 0.0;
+    // Standard deviation of the speaker's callback timing.
+    double jitterMs = 0.0;
+    // Link dropouts; the speaker consumes nothing for dropoutMs and resumes where it stopped.
+    double dropoutsPerHour = 0.0;
+    double dropoutMs = 200.0;
+    // Buffering behind the write position at registration (the initial offset).
+    double latencyMs = 0.0;
+};
+
+enum class DriftCorrectionMode {
+    kNone,
+    // SyncEngine::applyDriftCorrectionMs every correctionIntervalSeconds (whole-millisecond jumps).
+    kStep,
+    // SyncEngine::slewDriftCorrectionMs every correctionIntervalSeconds (resampled, click-free).
+    kSlew,
+    // A DriftController fed a consumption report after every pull; it corrects on its own schedule.
+    kController,
+};
+
+struct DriftSimulationConfig {
+    int32_t sampleRateHz = 48000;
+    double sessionSeconds = 7200.0;
+    // Capture block pushed per tick (10 ms at 48 kHz); speakers are pulled once per tick.
+    std::size_t blockFrames = 480;
+    double ringSeconds = 4.0;
+    double timelineIntervalSeconds = 1.0;
+    DriftCorrectionMode correction = DriftCorrectionMode::kNone;
+    double correctionIntervalSeconds = 10.0;
+    // kController only; sampleRateHz is taken from the session.
+    DriftControllerConfig controller;
+    uint64_t seed = 1;
+};
+
+struct DriftTimelinePoint {
+    double timeSeconds = 0.0;
+    double driftMs = 0.0;
+};
+
+struct DeviceDriftReport {
+    VirtualSpeakerProfile profile;
+    // Drift is the stream position the speaker is playing minus the one it should be playing;
+    // positive means ahead (the sign SyncEngine's correction calls expect).
+    std::vector<DriftTimelinePoint> timeline;
+    double finalDriftMs = 0.0;
+    double maxAbsDriftMs = 0.0;
+    uint64_t dropouts = 0;
+    DeviceMetrics metrics;
+};
+
+struct DriftSimulationResult {
+    double simulatedSeconds = 0.0;
+    std::vector<DeviceDriftReport> devices;
+    EngineMetrics engine;
+};
+
+// Streams a whole session through a concurrent-mode SyncEngine from the calling thread, as fast as
+// the engine renders; no wall-clock waiting. Deterministic for a given seed.
+DriftSimulationResult simulateDriftSession(const DriftSimulationConfig& config,
+                                           const std::vector<VirtualSpeakerProfile>& speakers);
+
+// Clock skew implied by a drift measured after `elapsedSeconds` (hardware matrix drift columns).
+[[nodiscard]] double skewPpmFromDrift(double driftMs, double elapsedSeconds);
+
+}  // namespace multiconnect
@@ -0,0 +1,32 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+
+namespace multiconnect {
+
+// Windowed-sinc polyphase interpolator used for continuous, click-free rate correction.
+// Each output sample is a 16-tap dot product over the surrounding input samples, with the
+// coefficients interpolated between the two nearest of kResamplerPhases precomputed phases.
+constexpr int kResamplerTaps = 16;
+constexpr int kResamplerPhases = 256;
+// Input samples the kernel needs before and after the integer read position.
+constexpr int kResamplerHistory = kResamplerTaps / 2 - 1;
+constexpr int kResamplerLookahead = kResamplerTaps / 2;
+
+// Renders `outputCount` samples into output[0], output[stride], ... where output k is taken at
+// input position `startPosition + k * ratio` (startPosition in [0, 1)). `input` points at the sample
+// for position 0 and must be readable from input[-kResamplerHistory] through
+// input[floor(startPosition + (outputCount - 1) * ratio) + kResamplerLookahead].
+// Returns the input position following the last output (startPosition + outputCount * ratio).
+double resamplePcm16(const int16_t* input,
+                     double startPosition,
+                     double ratio,
+                     int16_t* output,
+                     std::size_t outputCount,
+                     std::size_t stride);
+
+// Number of input samples (history + lookahead included) needed for `outputCount` outputs.
+std::size_t resamplerInputSpan(double startPosition, double ratio, std::size_t outputCount);
+
+}  // namespace multiconnect
@@ -0,0 +1,96 @@
+#pragma once
+
+#include "multiconnect/calibration_store.h"
+#include "multiconnect/sync_engine.h"
+
+#include <cstddef>
+#include <cstdint>
+#include <string>
+#include <vector>
+
+namespace multiconnect {
+
+struct LatencyPolicyConfig {
+    int32_t sampleRateHz = 48000;
+    // Headroom kept above each device's mean lag, in standard deviations of its measured lag...
+    double jitterSigmas = 4.0;
+    // ...and never less than this (a capture block plus scheduling noise).
+    double minHeadroomMs = 20.0;
+    // Bounds on the ring whatever the devices need; maxBufferMs is the memory bound.
+    double minBufferMs = 50.0;
+    double maxBufferMs = 2000.0;
+    // A larger ring is adopted at once; a smaller one only once the ring is this fraction too big.
+    double shrinkHysteresis = 0.25;
+    // Lag mean and variance are exponentially weighted over about this many observations.
+    double smoothingObservations = 100.0;
+};
+
+// Where each device's audio spends its time between push and sound.
+struct DeviceLatencyReport {
+    DeviceHandle handle;
+    // Mean time a frame waits in the ring before this device plays it (its lag behind the write
+    // position; before the first pull, the lag its offset implies).
+    double bufferLatencyMs = 0.0;
+    // Standard deviation of that lag.
+    double jitterMs = 0.0;
+    // Speaker output latency (Bluetooth link plus DSP), as set on the policy.
+    double outputLatencyMs = 0.0;
+    // bufferLatencyMs + outputLatencyMs: from the capture handing a frame to the engine until the
+    // speaker plays it.
+    double endToEndMs = 0.0;
+    uint64_t observations = 0;
+};
+
+// Sizes the engine's ring from what its devices need instead of a guessed capacity: the largest
+// mean lag behind the write position (set by the offsets that align slow and fast speakers) plus
+// jitter headroom, plus the concurrent-mode rewind headroom, bounded by maxBufferMs. apply()
+// resizes the ring toward that without dropping audio, and reports() gives the latency each device
+// actually incurs.
+//
+// One thread drives a policy (observe, apply, reports); in concurrent mode that is the pushing
+// thread, since apply() resizes the ring. Device state is preallocated per engine slot.
+class LatencyPolicy {
+  public:
+    explicit LatencyPolicy(SyncEngine& engine, const LatencyPolicyConfig& config = {});
+
+    bool setOutputLatencyMs(DeviceHandle handle, double latencyMs);
+    // Output latency of every registered device the store holds; returns the number set.
+    std::size_t setOutputLatencies(const CalibrationStore& store);
+
+    // Samples each registered device's lag as of its last pull. Call it regularly, for example
+    // every few pushes or alongside metric polling.
+    void observe();
+
+    [[nodiscard]] std::size_t recommendedCapacitySamples() const;
+    // Resizes the ring to the recommendation when it is larger, or smaller by more than the
+    // hysteresis. Returns true if the ring was resized.
+    bool apply();
+
+    [[nodiscard]] DeviceLatencyReport report(DeviceHandle handle) const;
+    // Fills up to `maxDevices` entries for registered devices; returns the number written.
+    std::size_t reports(DeviceLatencyReport* out, std::size_t maxDevices) const;
+    [[nodiscard]] const LatencyPolicyConfig& config() const;
+
+  private:
+    struct Tracker {
+        std::string deviceId;
+        double meanLagFrames = 0.0;
+        double lagVariance = 0.0;
+        double outputLatencyMs = 0.0;
+        uint64_t lastFramesRead = 0;
+        uint64_t observations = 0;
+    };
+
+    // The slot's tracker, restarted if a different device now holds the slot; nullptr if the
+    // handle is not registered.
+    Tracker* trackerFor(DeviceHandle handle);
+    [[nodiscard]] const Tracker* trackerFor(DeviceHandle handle) const;
+    [[nodiscard]] double expectedLagFrames(DeviceHandle handle, const Tracker& tracker) const;
+    [[nodiscard]] double framesToMs(double frames) const;
+
+    SyncEngine& engine_;
+    LatencyPolicyConfig config_;
+    std::vector<Tracker> trackers_;
+};
+
+}  // namespace multiconnect
@@ -1,28 +1,81 @@
 #pragma once
 
+#include <atomic>
 #include <cstddef>
 #include <cstdint>
 #include <vector>
 
 namespace multiconnect {
 
-class MasterRingBuffer {
+enum class RingCapacityPolicy {
+    // Use the requested capacity as-is; slot indices are reduced with a modulo.
+    kExact,
+    // Round the requested capacity up to the next power of two so slot indices reduce with a mask.
+    kRoundUpToPowerOfTwo,
+};
+
+// Up to two contiguous spans covering a logical range of the ring (the second one is empty unless
+// the range wraps past the end of storage). Counts are in frames of channels() interleaved samples.
+template <typename Sample>
+struct PcmRingSegments {
+    const Sample* first = nullptr;
+    std::size_t firstCount = 0;
+    const Sample* second = nullptr;
+    std::size_t secondCount = 0;
+};
+
+// Ring of interleaved PCM frames. Every index, count and capacity is in frames; for the default
+// single channel a frame is one sample.
+template <typename Sample>
+class PcmRingBuffer {
   public:
-    explicit MasterRingBuffer(std::size_t capacitySamples);
+    explicit PcmRingBuffer(std::size_t capacityFrames, RingCapacityPolicy policy = RingCapacityPolicy::kExact);
+    PcmRingBuffer(std::size_t capacityFrames, std::size_t channels, RingCapacityPolicy policy = RingCapacityPolicy::kExact);
 
-    std::size_t write(const int16_t* input, std::size_t sampleCount);
+    // Writes and reads copy at most two contiguous segments (one memcpy each), regardless of
+    // how many frames are transferred.
+    //
+    // A single writer thread may call write() while other threads call readAt() for frames below
+    // totalWritten(): the write counter is published with release semantics after the copy.
+    std::size_t write(const Sample* input, std::size_t frameCount);
     std::size_t readWithOffset(std::size_t logicalReadHead,
-                               int32_t offsetSamples,
-                               int16_t* output,
-                               std::size_t sampleCount) const;
+                               int32_t offsetFrames,
+                               Sample* output,
+                               std::size_t frameCount) const;
+
+    // Copies `frameCount` frames starting at an absolute stream index without clamping to size().
+    // Callers must keep the range inside the last capacity() written frames.
+    void readAt(int64_t logicalIndex, Sample* output, std::size_t frameCount) const;
+    // Zero-copy view of the same range; `frameCount` is clamped to capacity().
+    [[nodiscard]] PcmRingSegments<Sample> segmentsAt(int64_t logicalIndex, std::size_t frameCount) const;
+
+    // Reallocates to a new capacity keeping the newest min(size(), capacity) frames at their stream
+    // indices; totalWritten() is unchanged, and slots the old ring never held read as silence.
+    // Not safe against a concurrent write() or read.
+    void resize(std::size_t capacityFrames, RingCapacityPolicy policy = RingCapacityPolicy::kExact);
 
     [[nodiscard]] std::size_t size() const;
     [[nodiscard]] std::size_t capacity() const;
+    [[nodiscard]] std::size_t channels() const;
+    [[nodiscard]] bool isPowerOfTwo() const;
+    // Total frames written since construction; slot of stream index i is i modulo capacity().
+    [[nodiscard]] uint64_t totalWritten() const;
 
   private:
-    std::vector<int16_t> data_;
-    std::size_t writeHead_ = 0;
-    std::size_t size_ = 0;
+    [[nodiscard]] std::size_t slotFor(int64_t logicalIndex) const;
+
+    std::size_t capacity_;
+    std::size_t channels_;
+    std::vector<Sample> data_;
+    std::size_t mask_ = 0;
+    std::atomic<uint64_t> written_{0};
 };
 
+using MasterRingBuffer = PcmRingBuffer<int16_t>;
+using FloatRingBuffer = PcmRingBuffer<float>;
+using RingSegments = PcmRingSegments<int16_t>;
+
+extern template class PcmRingBuffer<int16_t>;
+extern template class PcmRingBuffer<float>;
+
 }  // namespace multiconnect
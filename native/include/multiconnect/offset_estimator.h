@@ -0,0 +1,37 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+
+namespace multiconnect {
+
+struct GccPhatConfig {
+    // Largest |lag| searched, in samples; 0 searches every lag the two signals can overlap at.
+    // Bounding it also bounds the FFT size to about max(referenceCount, captureCount) + maxLag.
+    std::size_t maxLagSamples = 0;
+};
+
+struct OffsetEstimate {
+    // How much later the reference content appears in the capture, in samples (parabolically
+    // interpolated between correlation bins, so fractional). Negative when the capture leads.
+    double lagSamples = 0.0;
+    // Height of the phase-transform correlation peak: 1 for an exact (shifted) copy, falling
+    // toward 0 as noise and reverberation grow.
+    double peak = 0.0;
+    bool valid = false;
+};
+
+// Generalized cross-correlation with phase transform (GCC-PHAT): both signals are zero-padded to a
+// power of two, transformed with one packed real FFT, whitened, and correlated in O(n log n).
+OffsetEstimate estimateOffsetGccPhat(const int16_t* reference,
+                                     std::size_t referenceCount,
+                                     const int16_t* capture,
+                                     std::size_t captureCount,
+                                     const GccPhatConfig& config = {});
+OffsetEstimate estimateOffsetGccPhat(const float* reference,
+                                     std::size_t referenceCount,
+                                     const float* capture,
+                                     std::size_t captureCount,
+                                     const GccPhatConfig& config = {});
+
+}  // namespace multiconnect
@@ -0,0 +1,28 @@
+#pragma once
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+
+namespace multiconnect {
+
+// Mirrors the PCM frame packet contract in docs/architecture.md.
+enum class PcmEncoding {
+    kPcm16,
+    kPcmFloat,
+};
+
+// Samples are frame-interleaved: frame f, channel c lives at element f * channels + c.
+struct PcmFormat {
+    int32_t channels = 1;
+    PcmEncoding encoding = PcmEncoding::kPcm16;
+    // Nominal frame rate; timestamped pushes refine the actual rate against the host clock.
+    int32_t sampleRateHz = 48000;
+};
+
+// Full-scale float [-1, 1] to int16, rounded to nearest and clipped.
+inline int16_t pcmFloatToPcm16(float sample) {
+    return static_cast<int16_t>(std::lrint(std::clamp(sample, -1.0F, 1.0F) * 32767.0F));
+}
+
+}  // namespace multiconnect
@@ -0,0 +1,76 @@
+#pragma once
+
+#include <array>
+#include <cstddef>
+#include <cstdint>
+#include <cstdio>
+#include <string>
+#include <string_view>
+#include <vector>
+
+namespace multiconnect {
+
+// Compact alternative to poc_cli's one-JSON-file-per-run artifacts: fixed-width little-endian
+// records appended to a single file, so a sweep of millions of measurements is one file that Python
+// memory-maps as a NumPy structured array (python/multiconnect/run_records.py). The file starts with
+// a 16-byte header ("MCRR", u16 version, u16 record size, 8 reserved bytes) followed by records of
+// kRunRecordBytes. A torn trailing record from an interrupted writer is ignored by readers.
+constexpr std::size_t kRunRecordHeaderBytes = 16;
+constexpr std::size_t kRunRecordBytes = 96;
+constexpr std::size_t kRunRecordLabelBytes = 16;
+
+enum class RunRecordKind : uint8_t {
+    kRun = 0,
+    kSweep = 1,
+};
+
+// One measured device. Run mode writes one record (device B against device A); sweep mode writes
+// one per non-reference device per case, with caseId grouping the devices of a case.
+struct RunRecord {
+    int64_t timestampNs = 0;
+    uint32_t caseId = 0;
+    uint32_t trial = 0;
+    int32_t sampleRateHz = 0;
+    int32_t durationMs = 0;
+    int32_t requestedOffsetMs = 0;
+    uint16_t deviceIndex = 0;
+    uint16_t deviceCount = 0;
+    double measuredOffsetMs = 0.0;
+    double errorMs = 0.0;
+    double thresholdMs = 0.0;
+    RunRecordKind kind = RunRecordKind::kRun;
+    bool pass = false;
+    // NUL-padded and truncated to 16 bytes; the JSON artifacts keep the full text.
+    std::array<char, kRunRecordLabelBytes> device{};
+    std::array<char, kRunRecordLabelBytes> notes{};
+};
+
+void setRunRecordLabel(std::array<char, kRunRecordLabelBytes>& label, std::string_view text);
+[[nodiscard]] std::string_view runRecordLabel(const std::array<char, kRunRecordLabelBytes>& label);
+
+void encodeRunRecord(const RunRecord& record, uint8_t* out);
+[[nodiscard]] RunRecord decodeRunRecord(const uint8_t* in);
+
+// Appends records to a record file, writing the header first if the file is new or empty. Each
+// append encodes into a stack buffer and issues one buffered write; nothing is allocated per record.
+class RunRecordWriter {
+  public:
+    RunRecordWriter() = default;
+    ~RunRecordWriter();
+    RunRecordWriter(const RunRecordWriter&) = delete;
+    RunRecordWriter& operator=(const RunRecordWriter&) = delete;
+
+    // Fails if the file cannot be opened or holds something other than version-1 records.
+    bool open(const std::string& path);
+    bool append(const RunRecord& record);
+    bool close();
+    [[nodiscard]] bool isOpen() const;
+
+  private:
+    std::FILE* file_ = nullptr;
+};
+
+// Reads every complete record; false if the file is missing or its header is not a record header.
+bool readRunRecords(const std::string& path, std::vector<RunRecord>* records);
+
+}  // namespace multiconnect
@@ -0,0 +1,63 @@
+#pragma once
+
+#include <cstddef>
+#include <cstdint>
+
+namespace multiconnect {
+
+// Probe and test-signal generators for correlation-based calibration. Every generator writes
+// `count` mono samples into a caller-provided buffer and never allocates, so probes can be rendered
+// per device at session start (or block by block from a real-time thread). Float output is
+// full-scale [-1, 1]; the int16 overloads round to nearest and clip, as pcmFloatToPcm16 does.
+
+struct SineConfig {
+    int32_t sampleRateHz = 48000;
+    float frequencyHz = 1000.0F;
+    float amplitude = 0.6F;
+    float phaseRad = 0.0F;
+};
+
+// Exponential (logarithmic) sweep from startHz to endHz across the whole buffer: equal time per
+// octave, so the probe's energy is spread evenly over a loudspeaker's log-frequency response.
+struct LogSweepConfig {
+    int32_t sampleRateHz = 48000;
+    float startHz = 20.0F;
+    float endHz = 20000.0F;
+    float amplitude = 0.6F;
+};
+
+// Maximum-length sequence from a Galois LFSR: period 2^order - 1 samples of +/-amplitude, with a
+// flat spectrum and a two-valued circular autocorrelation (period at lag 0, -1 elsewhere).
+struct MlsConfig {
+    // Register length in bits, 2..24.
+    int32_t order = 15;
+    float amplitude = 0.6F;
+    // Initial register state; only the low `order` bits are used, and 0 is replaced with 1.
+    uint32_t seed = 1;
+};
+
+// Sum of equal-level sines at the given frequencies with Schroeder phases, which keep the crest
+// factor low so the probe can play loud without clipping. The peak never exceeds `amplitude`.
+struct MultiToneConfig {
+    int32_t sampleRateHz = 48000;
+    const float* frequenciesHz = nullptr;
+    std::size_t toneCount = 0;
+    float amplitude = 0.6F;
+};
+
+constexpr int32_t kMlsMinOrder = 2;
+constexpr int32_t kMlsMaxOrder = 24;
+
+// Period of the sequence for `order` (clamped to [kMlsMinOrder, kMlsMaxOrder]).
+[[nodiscard]] std::size_t mlsPeriod(int32_t order);
+
+void generateSine(const SineConfig& config, float* output, std::size_t count);
+void generateSine(const SineConfig& config, int16_t* output, std::size_t count);
+void generateLogSweep(const LogSweepConfig& config, float* output, std::size_t count);
+void generateLogSweep(const LogSweepConfig& config, int16_t* output, std::size_t count);
+void generateMls(const MlsConfig& config, float* output, std::size_t count);
+void generateMls(const MlsConfig& config, int16_t* output, std::size_t count);
+void generateMultiTone(const MultiToneConfig& config, float* output, std::size_t count);
+void generateMultiTone(const MultiToneConfig& config, int16_t* output, std::size_t count);
+
+}  // namespace multiconnect
@@ -0,0 +1,68 @@
+#pragma once
+
+#include <atomic>
+#include <cstddef>
+#include <cstdint>
+#include <vector>
+
+namespace multiconnect {
+
+constexpr std::size_t kDefaultTimelineAnchors = 256;
+// A stamp within this of where the current mapping already puts it adds no anchor (~5 frames at 48 kHz).
+constexpr int64_t kDefaultAnchorToleranceNs = 100'000;
+
+// Maps stream frame indices to presentation times on the host's monotonic clock. Anchors (frame,
+// time) come from timestamped pushes; between two anchors the mapping is interpolated, so it follows
+// the capture clock's real rate, and past the newest (or before the oldest) it runs at the nominal
+// sample rate. Anchors form a fixed-size circular history, oldest dropped first.
+//
+// One writer thread adds anchors while any number of threads look up: lookups take a seqlock
+// snapshot (retrying if the writer was mid-update) and neither side locks or allocates.
+class StreamTimeline {
+  public:
+    explicit StreamTimeline(int32_t sampleRateHz,
+                            std::size_t capacity = kDefaultTimelineAnchors,
+                            int64_t toleranceNs = kDefaultAnchorToleranceNs);
+
+    // Writer thread only. Records that `streamIndex` is presented at `timeNs`. Returns false if the
+    // stamp was not stored: it agrees with the current mapping, or does not move forward in both
+    // stream index and time.
+    bool addAnchor(int64_t streamIndex, int64_t timeNs);
+    void clear();
+
+    // False until an anchor exists.
+    bool timeAt(int64_t streamIndex, int64_t* outTimeNs) const;
+    // Nearest frame presented at `timeNs`.
+    bool streamIndexAt(int64_t timeNs, int64_t* outStreamIndex) const;
+
+    [[nodiscard]] std::size_t anchorCount() const;
+    [[nodiscard]] int32_t sampleRateHz() const;
+
+  private:
+    struct Anchor {
+        std::atomic<int64_t> streamIndex{0};
+        std::atomic<int64_t> timeNs{0};
+    };
+    struct Span {
+        int64_t fromIndex = 0;
+        int64_t fromTimeNs = 0;
+        // Frames per nanosecond over the span.
+        double rate = 0.0;
+    };
+
+    template <typename Pick>
+    bool lookup(Pick&& pick, Span* outSpan) const;
+
+    int32_t sampleRateHz_;
+    int64_t toleranceNs_;
+    std::vector<Anchor> anchors_;
+    // Even when stable; the writer makes it odd while it updates anchors_ and count_.
+    std::atomic<uint64_t> sequence_{0};
+    // Anchors stored since construction (or clear()); slot of anchor n is n modulo capacity.
+    std::atomic<uint64_t> count_{0};
+    // Writer-private copy of the newest anchor.
+    int64_t lastIndex_ = 0;
+    int64_t lastTimeNs_ = 0;
+};
+
+}  // namespace multiconnect
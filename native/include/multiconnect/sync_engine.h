@@ -1,20 +1,131 @@
 #pragma once
 
+#include "multiconnect/calibration_store.h"
 #include "multiconnect/master_ring_buffer.h"
+#include "multiconnect/pcm_format.h"
+#include "multiconnect/stream_timeline.h"
 
+#include <atomic>
 #include <cstddef>
 #include <cstdint>
+#include <limits>
+#include <mutex>
 #include <string>
-#include <unordered_map>
 #include <vector>
 
 namespace multiconnect {
 
+enum class SyncEngineMode {
+    // Caller serializes every call (original behavior). The writer never waits for readers, so a
+    // reader lagging more than a ring behind is lapped; one ahead of the writer gets silence.
+    kSingleThreaded,
+    // One capture thread pushes while each device is pulled from its own output thread.
+    // Push and pull are lock-free and allocation-free; the writer never overruns a live reader,
+    // and readers only see samples that have been published. A reader that stops pulling for
+    // longer than the ring spans stops holding the writer back: it is lapped like a single-threaded
+    // reader and counts an overrun when it resumes from the oldest frame still in the ring.
+    kConcurrent,
+};
+
+constexpr std::size_t kDefaultMaxDevices = 32;
+
+struct SyncEngineConfig {
+    // Ring capacity in frames (one sample per channel).
+    std::size_t masterCapacitySamples = 0;
+    int32_t maxCorrectionSamplesPerCall = 0;
+    SyncEngineMode mode = SyncEngineMode::kSingleThreaded;
+    // Device slots are preallocated; registration fails once all slots are taken.
+    std::size_t maxDevices = kDefaultMaxDevices;
+    // Largest playback-rate deviation slewDriftCorrectionMs may use while absorbing drift.
+    float maxSlewPpm = 500.0F;
+    // Frames over which a gain change is ramped (10 ms at 48 kHz) to avoid zipper noise.
+    std::size_t gainRampFrames = 480;
+    // Format of the pushed stream; it is stored as-is and converted to int16 per device on pull.
+    PcmFormat format;
+};
+
+// Which channels of the stream a device receives. Device output is always interleaved int16.
+enum class DeviceChannelLayout {
+    // Every stream channel, in stream order.
+    kAllChannels,
+    // Mean of all stream channels (mono).
+    kDownmixMono,
+    // One stream channel (mono), selected by DeviceChannelMap::channel.
+    kSingleChannel,
+};
+
+struct DeviceChannelMap {
+    DeviceChannelLayout layout = DeviceChannelLayout::kAllChannels;
+    int32_t channel = 0;
+};
+
+// Small-integer index into the engine's dense device table. Valid until the device is
+// unregistered; the slot (and therefore the index) may then be reused by a later registration.
+struct DeviceHandle {
+    int32_t index = -1;
+
+    [[nodiscard]] bool valid() const { return index >= 0; }
+    explicit operator bool() const { return valid(); }
+};
+
+// One entry of a batched pull. `readSamples` and `underrun` are filled in by SyncEngine::pullAll.
+struct DevicePull {
+    DeviceHandle handle;
+    int16_t* output = nullptr;
+    std::size_t sampleCount = 0;
+    std::size_t readSamples = 0;
+    bool underrun = false;
+};
+
 struct DeviceStreamState {
     int32_t offsetSamples = 0;
     std::size_t readHead = 0;
+    float rateCorrectionPpm = 0.0F;
+    // Drift still to be absorbed by slewDriftCorrectionMs, in input samples.
+    float pendingCorrectionSamples = 0.0F;
+    float gainDb = 0.0F;
+    bool softClip = false;
+};
+
+// Lock-free counters sampled by SyncEngine::deviceMetrics. Counters only ever grow (until the
+// device is unregistered); derive rates by differencing two snapshots.
+struct DeviceMetrics {
+    DeviceHandle handle;
+    // Frames between the write position and the device's next read position as of its last pull.
+    int64_t lagFrames = 0;
+    uint64_t framesRead = 0;
+    // Pulls that could not be filled completely, and the frames that were missing.
+    uint64_t underrunCount = 0;
+    uint64_t underrunFrames = 0;
+    // Pulls that started on frames the writer had already overwritten (the reader was lapped).
+    uint64_t overrunCount = 0;
+    uint64_t overrunFrames = 0;
+    // Drift corrections: step, slew and rate changes.
+    uint64_t correctionCount = 0;
+};
+
+struct EngineMetrics {
+    // steady_clock time of the snapshot.
+    int64_t timestampNs = 0;
+    uint64_t framesWritten = 0;
+    // Concurrent mode: frames the writer refused because the slowest reader had not caught up.
+    uint64_t droppedFrames = 0;
+    uint64_t droppedPushCount = 0;
+    // Sums over the registered devices.
+    uint64_t underrunCount = 0;
+    uint64_t overrunCount = 0;
+    uint64_t correctionCount = 0;
+    // Unread share of the ring for the device furthest behind (stored share with no devices).
+    double bufferFillPercent = 0.0;
+    std::size_t deviceCount = 0;
 };
 
+// Corrections per minute between two snapshots, the runtime metric in docs/architecture.md.
+inline double correctionsPerMinute(const EngineMetrics& earlier, const EngineMetrics& later) {
+    const double minutes = static_cast<double>(later.timestampNs - earlier.timestampNs) / 60e9;
+    return minutes > 0.0 ? static_cast<double>(later.correctionCount - earlier.correctionCount) / minutes : 0.0;
+}
+
 struct DeviceOffset {
     std::string deviceId;
     int32_t offsetSamples = 0;
@@ -23,35 +134,313 @@ struct DeviceOffset {
 class SyncEngine {
   public:
     explicit SyncEngine(std::size_t masterCapacitySamples, int32_t maxCorrectionSamplesPerCall = 0);
+    explicit SyncEngine(const SyncEngineConfig& config);
+
+    // Stream positions, offsets and pull/push counts are in frames. For the default mono PCM16
+    // format a frame is one sample; otherwise `input` is frame-interleaved and pull buffers hold
+    // sampleCount * deviceOutputChannels() samples.
 
-    void pushPcm16(const int16_t* input, std::size_t sampleCount);
+    // Returns the number of frames accepted. Single-threaded mode always accepts everything
+    // (overwriting the oldest frames); concurrent mode accepts only what fits ahead of the
+    // slowest device reader. Each push only accepts the configured encoding and returns 0 otherwise.
+    std::size_t pushPcm16(const int16_t* input, std::size_t sampleCount);
+    std::size_t pushPcmFloat(const float* input, std::size_t frameCount);
+    // Same, stamping the block with when its first frame should be heard, on the host's monotonic
+    // clock (the frame contract's timestampNs). Stamps build the stream timeline that the
+    // time-based calls below use; unstamped pushes extend it at the nominal sample rate.
+    std::size_t pushPcm16(const int16_t* input, std::size_t sampleCount, int64_t presentationTimeNs);
+    std::size_t pushPcmFloat(const float* input, std::size_t frameCount, int64_t presentationTimeNs);
 
-    bool registerDevice(const std::string& deviceId, int32_t initialOffsetSamples = 0);
+    // Returns an invalid handle if the id is already registered, every slot is taken, or the
+    // channel map selects a channel the stream does not have.
+    // Devices may join and leave while the writer and other devices' readers keep running: a join
+    // publishes a fully initialized slot at once, and readers never wait on either. In concurrent
+    // mode a device registered mid-stream starts at the current write position, and a join that
+    // overlaps a push waits for that one push to finish so it cannot be lapped by it.
+    DeviceHandle registerDevice(const std::string& deviceId,
+                                int32_t initialOffsetSamples = 0,
+                                DeviceChannelMap channels = {});
+    // Late join: registers a device whose first pull, made at `pullTimeNs` and heard
+    // `outputLatencyNs` later, plays the frame presented at that moment rather than whatever the
+    // write position happens to be. In concurrent mode a time older than the ring still holds
+    // starts at the oldest frame kept. Invalid handle if no timestamped push has been made yet.
+    DeviceHandle registerDeviceAtTime(const std::string& deviceId,
+                                      int64_t pullTimeNs,
+                                      int64_t outputLatencyNs,
+                                      DeviceChannelMap channels = {});
+    // Unpublishes the device, then waits out any pull still in progress on it before returning;
+    // only then may its slot be reused. Its offset, lag behind the write position, rate correction,
+    // gain, soft clipping and channel map are kept for rejoinDevice (the most recent maxDevices()
+    // leaves are remembered). Call it from a control thread, never from the device's own pull.
     bool unregisterDevice(const std::string& deviceId);
+    bool unregisterDevice(DeviceHandle handle);
+    // Reconnect: registers a device that left earlier with the state it left with, its read
+    // position the same distance behind the write position as at its last pull (in concurrent mode
+    // no further back than the ring still holds). A device with no kept state registers fresh.
+    DeviceHandle rejoinDevice(const std::string& deviceId);
+    [[nodiscard]] DeviceHandle deviceHandle(const std::string& deviceId) const;
 
+    // Offset changes are safe to make from a control thread in concurrent mode. A backward jump
+    // larger than rewindHeadroomSamples() is spread over subsequent pulls.
     bool setDeviceOffsetSamples(const std::string& deviceId, int32_t offsetSamples);
+    bool setDeviceOffsetSamples(DeviceHandle handle, int32_t offsetSamples);
     bool applyDriftCorrectionMs(const std::string& deviceId, float driftMs, int32_t sampleRateHz);
+    bool applyDriftCorrectionMs(DeviceHandle handle, float driftMs, int32_t sampleRateHz);
+
+    // Moves a registered device onto the timeline the same way; call it from the device's output
+    // thread (or while it is not pulling) so its read head does not move underneath.
+    bool alignDeviceToTime(DeviceHandle handle, int64_t pullTimeNs, int64_t outputLatencyNs);
+
+    // Continuous clock-rate compensation: the device consumes (1 + ppm * 1e-6) input samples per
+    // output sample, interpolated with a windowed-sinc kernel instead of jumping whole samples.
+    bool setDeviceRateCorrectionPpm(const std::string& deviceId, float ppm);
+    bool setDeviceRateCorrectionPpm(DeviceHandle handle, float ppm);
+    // Absorbs `driftMs` (same sign and per-call clamp as applyDriftCorrectionMs, but keeping
+    // sub-millisecond precision) by bending the rate by at most SyncEngineConfig::maxSlewPpm
+    // until the correction is used up, so there is no audible jump.
+    bool slewDriftCorrectionMs(const std::string& deviceId, float driftMs, int32_t sampleRateHz);
+    bool slewDriftCorrectionMs(DeviceHandle handle, float driftMs, int32_t sampleRateHz);
+
+    // Output gain, clamped to [-120, +24] dB and ramped over SyncEngineConfig::gainRampFrames.
+    // Gain and soft clipping are applied in the same pass that converts samples out of the ring.
+    bool setDeviceGainDb(const std::string& deviceId, float gainDb);
+    bool setDeviceGainDb(DeviceHandle handle, float gainDb);
+    // Soft clipping leaves samples below 75% of full scale untouched and bends louder ones
+    // smoothly toward full scale instead of hard-clipping them.
+    bool setDeviceSoftClip(const std::string& deviceId, bool enabled);
+    bool setDeviceSoftClip(DeviceHandle handle, bool enabled);
+
+    // Starts a device pre-aligned from a stored calibration instead of measuring first: offset
+    // manualOffsetMs + latencyMs - referenceLatencyMs (the reference being the slowest speaker of
+    // the session), the stored gain, and a rate correction cancelling driftPpm.
+    bool applyCalibration(DeviceHandle handle,
+                          const DeviceCalibration& calibration,
+                          int32_t sampleRateHz,
+                          float referenceLatencyMs = 0.0F);
+    // Calibrates every registered device whose id `store` holds, aligned to the highest stored
+    // latency among them. Returns the number of devices calibrated.
+    std::size_t applyCalibrations(const CalibrationStore& store, int32_t sampleRateHz);
 
     // Pulls cloned samples for a specific device based on its read head and offset.
+    // In concurrent mode each device may be pulled from its own thread; `outReadSamples` reports
+    // how many samples were actually available (leading silence for negative positions included).
+    // The handle overloads do no hashing or allocation and are the ones to use from audio callbacks.
     bool pullForDevice(const std::string& deviceId, int16_t* output, std::size_t sampleCount);
     bool pullForDevice(const std::string& deviceId,
                        int16_t* output,
                        std::size_t sampleCount,
                        std::size_t* outReadSamples);
+    bool pullForDevice(DeviceHandle handle,
+                       int16_t* output,
+                       std::size_t sampleCount,
+                       std::size_t* outReadSamples = nullptr);
 
+    // Fills every device's buffer in one call against a single snapshot of the write position.
+    // Samples that were not available are zero-filled and flagged as an underrun. Returns the
+    // number of entries whose handle was valid. In concurrent mode the calling thread becomes the
+    // reader for every device in the batch.
+    std::size_t pullAll(DevicePull* pulls, std::size_t pullCount);
+    // Same, writing frame-interleaved output: each frame holds every device's output channels in
+    // handle order (unknown handles keep one silent column), so with mono devices
+    // output[frame * deviceCount + device].
+    // `outReadSamples` / `outUnderrun` are optional per-device arrays of length deviceCount.
+    std::size_t pullAllInterleaved(const DeviceHandle* handles,
+                                   std::size_t deviceCount,
+                                   int16_t* output,
+                                   std::size_t frames,
+                                   std::size_t* outReadSamples = nullptr,
+                                   bool* outUnderrun = nullptr);
+    // Same, for an output buffer of `outputSampleCapacity` samples: pulls nothing and returns 0 if
+    // `frames` frames of every device's output channels do not fit.
+    std::size_t pullAllInterleaved(const DeviceHandle* handles,
+                                   std::size_t deviceCount,
+                                   int16_t* output,
+                                   std::size_t outputSampleCapacity,
+                                   std::size_t frames,
+                                   std::size_t* outReadSamples,
+                                   bool* outUnderrun);
+
+    // Stream timeline lookups; false until a timestamped push has been made.
+    bool streamIndexAtTime(int64_t presentationTimeNs, int64_t* outStreamIndex) const;
+    bool presentationTimeNs(int64_t streamIndex, int64_t* outTimeNs) const;
+    // When the frame this device pulls next is due to be heard. Minus the time of the pull, it is
+    // the output latency the device is being fed for, without playing a calibration tone.
+    bool devicePresentationTimeNs(DeviceHandle handle, int64_t* outTimeNs) const;
+
+    // Changes the ring capacity without losing audio: every frame a registered device has yet to
+    // play (and, in concurrent mode, the rewind headroom behind it, a quarter of the new capacity)
+    // is kept at its stream index. Returns false, leaving the ring untouched, if the new capacity
+    // cannot hold them. In concurrent mode call it from the pushing thread; pulls that arrive while
+    // the storage moves return no frames (an underrun) instead of waiting.
+    bool resizeRing(std::size_t capacitySamples);
+    [[nodiscard]] std::size_t masterCapacitySamples() const;
     [[nodiscard]] std::size_t bufferedSamples() const;
     [[nodiscard]] bool hasDevice(const std::string& deviceId) const;
+    [[nodiscard]] bool hasDevice(DeviceHandle handle) const;
     [[nodiscard]] DeviceStreamState deviceState(const std::string& deviceId) const;
+    [[nodiscard]] DeviceStreamState deviceState(DeviceHandle handle) const;
 
     [[nodiscard]] std::size_t deviceCount() const;
     [[nodiscard]] std::vector<DeviceOffset> deviceOffsets() const;
     std::size_t applyDeviceOffsets(const std::vector<DeviceOffset>& offsets);
     std::size_t resetAllDeviceOffsets(int32_t offsetSamples);
 
+    // Snapshots are a handful of relaxed loads per device: safe to poll from a UI thread while
+    // audio threads push and pull and devices join or leave.
+    [[nodiscard]] EngineMetrics engineMetrics() const;
+    [[nodiscard]] DeviceMetrics deviceMetrics(DeviceHandle handle) const;
+    // Fills up to `maxDevices` entries for registered devices; returns the number written.
+    std::size_t deviceMetrics(DeviceMetrics* out, std::size_t maxDevices) const;
+    [[nodiscard]] std::string deviceId(DeviceHandle handle) const;
+
+    [[nodiscard]] SyncEngineMode mode() const;
+    [[nodiscard]] PcmFormat format() const;
+    // Interleaved int16 channels per frame in this device's pull output; 0 for unknown handles.
+    [[nodiscard]] std::size_t deviceOutputChannels(DeviceHandle handle) const;
+    // Samples behind each reader that the writer keeps intact so offsets can move backward.
+    [[nodiscard]] std::size_t rewindHeadroomSamples() const;
+    [[nodiscard]] std::size_t maxDevices() const;
+
   private:
+    struct DeviceSlot {
+        void reset(int32_t initialOffsetSamples, std::size_t initialReadHead);
+
+        // Published last on join and cleared first on leave; readers only touch the fields below
+        // (other than atomics) after seeing it set.
+        std::atomic<bool> active{false};
+        // Readers inside a pull of this slot; a leave waits for it to drain before the slot is reused.
+        mutable std::atomic<uint32_t> readers{0};
+        std::string deviceId;
+        // Target offset, written by control threads.
+        std::atomic<int32_t> offsetSamples{0};
+        // Samples consumed so far, written only by the device's reader.
+        std::atomic<std::size_t> readHead{0};
+        // Concurrent mode: next absolute stream index the reader will consume (readHead + applied
+        // offset), published after each pull so the writer knows which slots are free.
+        std::atomic<int64_t> cursor{0};
+        // Concurrent mode: steady_clock time of the reader's last pull. Once it is older than the
+        // ring's span (and at least 100 ms) the writer marks the slot stalled and stops holding
+        // back for its cursor; the reader's next pull catches it up to what survived.
+        std::atomic<int64_t> lastPullNs{0};
+        std::atomic<bool> stalled{false};
+        std::atomic<float> rateCorrectionPpm{0.0F};
+        // Outstanding slew correction in 1/65536 input samples; control threads add, the reader
+        // subtracts what it has applied.
+        std::atomic<int64_t> pendingCorrectionQ16{0};
+        std::atomic<float> gainDb{0.0F};
+        // Linear target gain derived from gainDb.
+        std::atomic<float> gain{1.0F};
+        std::atomic<bool> softClip{false};
+        // Metrics, written by the device's reader (correctionCount by control threads).
+        std::atomic<int64_t> lagFrames{0};
+        std::atomic<uint64_t> framesRead{0};
+        std::atomic<uint64_t> underrunCount{0};
+        std::atomic<uint64_t> underrunFrames{0};
+        std::atomic<uint64_t> overrunCount{0};
+        std::atomic<uint64_t> overrunFrames{0};
+        std::atomic<uint64_t> correctionCount{0};
+        // Reader-private: highest cursor ever published, bounds how far the reader may rewind.
+        int64_t highWaterCursor = 0;
+        // Reader-private: fractional read position in [0, 1) left by the resampler.
+        double phase = 0.0;
+        // Reader-private gain ramp: gain reached so far, the target being ramped to, and the
+        // frames left in the ramp.
+        float appliedGain = 1.0F;
+        float rampTarget = 1.0F;
+        std::size_t rampRemaining = 0;
+        // Fixed at registration; outputChannels drops back to 1 once the slot has been left.
+        DeviceChannelMap channelMap;
+        std::atomic<std::size_t> outputChannels{1};
+    };
+
+    // What a device left with, restored by rejoinDevice.
+    struct ParkedDevice {
+        std::string deviceId;
+        int32_t offsetSamples = 0;
+        int64_t lagFrames = 0;
+        float rateCorrectionPpm = 0.0F;
+        float gainDb = 0.0F;
+        bool softClip = false;
+        DeviceChannelMap channels;
+    };
+
+    [[nodiscard]] DeviceSlot* slotFor(DeviceHandle handle);
+    [[nodiscard]] const DeviceSlot* slotFor(DeviceHandle handle) const;
+    // Readers pin the handle's slot, live or not, so a leave cannot recycle it underneath them;
+    // nullptr if the handle is out of range. Check isLive() after pinning.
+    [[nodiscard]] DeviceSlot* pinSlot(DeviceHandle handle);
+    [[nodiscard]] const DeviceSlot* pinSlot(DeviceHandle handle) const;
+    static void unpinSlot(const DeviceSlot* slot);
+    [[nodiscard]] static bool isLive(const DeviceSlot* slot);
+    DeviceHandle publishDevice(const std::string& deviceId,
+                               int32_t initialOffsetSamples,
+                               std::size_t initialReadHead,
+                               DeviceChannelMap channels,
+                               const ParkedDevice* parked);
+    // Unpublishes the handle's device and parks its state; the caller holds registryMutex_.
+    bool retireDevice(DeviceHandle handle);
+    // Renders up to `frameCount` frames for one device (output frames `frameStride` elements
+    // apart) and advances its read head; returns the number of frames produced.
+    std::size_t readSlot(DeviceSlot& slot, int64_t written, int16_t* output, std::size_t frameCount, std::size_t frameStride);
+    int64_t catchUpStalledSlot(DeviceSlot& slot);
+    template <typename Sample>
+    std::size_t readSlotFrom(const PcmRingBuffer<Sample>& ring,
+                             DeviceSlot& slot,
+                             int64_t written,
+                             int16_t* output,
+                             std::size_t frameCount,
+                             std::size_t frameStride);
+    [[nodiscard]] bool usesResampler(const DeviceSlot& slot, int64_t position) const;
+    template <typename Sample>
+    std::size_t resampleSlot(const PcmRingBuffer<Sample>& ring,
+                             DeviceSlot& slot,
+                             int64_t position,
+                             int64_t written,
+                             int16_t* output,
+                             std::size_t frameCount,
+                             std::size_t frameStride,
+                             int64_t* outConsumedInput);
+    template <typename Sample>
+    std::size_t pushFrames(PcmRingBuffer<Sample>& ring, const Sample* input, std::size_t frameCount);
+    // Stream index a device pulling at `pullTimeNs` with `outputLatencyNs` of output latency should read next.
+    bool streamIndexForPull(int64_t pullTimeNs, int64_t outputLatencyNs, int64_t* outStreamIndex) const;
+    [[nodiscard]] std::size_t ringCapacity() const;
+    [[nodiscard]] uint64_t ringWritten() const;
+    [[nodiscard]] int64_t rewindHeadroom() const;
+
+    PcmFormat format_;
+    // Only the ring matching format_.encoding is sized; the other holds a single frame.
     MasterRingBuffer ring_;
-    std::unordered_map<std::string, DeviceStreamState> devices_;
+    FloatRingBuffer floatRing_;
+    // Written only by the pushing thread.
+    StreamTimeline timeline_;
+    // Dense, preallocated device table indexed by DeviceHandle; never reallocates. String-keyed
+    // calls scan the live slots instead of keeping a map that joins would have to rehash.
+    std::vector<DeviceSlot> slots_;
+    // One past the highest slot ever used, so hot loops skip the untouched tail.
+    std::atomic<std::size_t> slotsInUse_{0};
+    std::atomic<std::size_t> deviceCount_{0};
+    // Serializes joins and leaves (control threads only) and guards parked_.
+    std::mutex registryMutex_;
+    std::vector<ParkedDevice> parked_;
     int32_t maxCorrectionSamplesPerCall_;
+    float maxSlewPpm_;
+    std::size_t gainRampFrames_;
+    SyncEngineMode mode_;
+    // Written only by resizeRing, on the pushing thread.
+    std::atomic<std::size_t> ringCapacity_;
+    std::atomic<int64_t> rewindHeadroomSamples_;
+    // Set by resizeRing while the ring's storage moves; readers stay out.
+    std::atomic<bool> resizing_{false};
+    // Concurrent mode: odd while the pushing thread is inside a push or resize, so a join can wait
+    // out one that scanned the cursors before its own was visible.
+    std::atomic<uint64_t> pushSequence_{0};
+    // Cursor of the join being published (under registryMutex_), which the writer holds back for
+    // until the slot itself is active; the int64_t maximum otherwise.
+    std::atomic<int64_t> joiningCursor_{std::numeric_limits<int64_t>::max()};
+    // Written only by the pushing thread.
+    std::atomic<uint64_t> droppedFrames_{0};
+    std::atomic<uint64_t> droppedPushCount_{0};
 };
 
 }  // namespace multiconnect
@@ -9,19 +9,136 @@ extern "C" {
 
 typedef struct MC_SyncEngine MC_SyncEngine;
 
+enum {
+    MC_SYNC_ENGINE_MODE_SINGLE_THREADED = 0,
+    MC_SYNC_ENGINE_MODE_CONCURRENT = 1,
+};
+
+enum {
+    MC_PCM_ENCODING_PCM16 = 0,
+    MC_PCM_ENCODING_FLOAT = 1,
+};
+
+/* What a device receives from a multi-channel stream (output is always interleaved int16). */
+enum {
+    MC_DEVICE_CHANNELS_ALL = 0,
+    MC_DEVICE_CHANNELS_DOWNMIX_MONO = 1,
+    MC_DEVICE_CHANNELS_SINGLE = 2,
+};
+
+typedef struct {
+    size_t master_capacity_samples; /* frames */
+    int32_t max_correction_samples_per_call;
+    int32_t mode;       /* MC_SYNC_ENGINE_MODE_* */
+    size_t max_devices; /* 0 selects the engine default; at most MC_MAX_DEVICES */
+    float max_slew_ppm; /* 0 selects the engine default */
+    int32_t channels;   /* 0 selects mono */
+    int32_t encoding;   /* MC_PCM_ENCODING_* */
+    size_t gain_ramp_frames; /* 0 selects the engine default */
+    int32_t sample_rate_hz;  /* nominal stream rate; 0 selects 48000 */
+} MC_SyncEngineConfig;
+
+/* Most devices an engine created through this API can hold: every one of them fits a single
+ * mc_sync_engine_pull_all_interleaved call. */
+#define MC_MAX_DEVICES 32
+
+/* Device handles are small non-negative integers; lookups by handle never hash or allocate. */
+#define MC_INVALID_DEVICE_HANDLE (-1)
+
+/* One entry of a batched pull; read_samples and underrun are outputs. */
+typedef struct {
+    int32_t device_handle;
+    int16_t* output;
+    size_t sample_count;
+    size_t read_samples;
+    int underrun; /* 1 when fewer than sample_count samples were available (tail zero-filled) */
+} MC_DevicePull;
+
 typedef struct {
     char device_id[128];
     int32_t offset_samples;
 } MC_DeviceOffset;
 
+/* Runtime metrics snapshot (see multiconnect::EngineMetrics / DeviceMetrics). Counters only grow;
+ * derive rates such as corrections per minute by differencing two snapshots' timestamp_ns. */
+typedef struct {
+    int64_t timestamp_ns;
+    uint64_t frames_written;
+    uint64_t dropped_frames;
+    uint64_t dropped_push_count;
+    uint64_t underrun_count;
+    uint64_t overrun_count;
+    uint64_t correction_count;
+    double buffer_fill_percent;
+    size_t device_count;
+} MC_EngineMetrics;
+
+typedef struct {
+    int32_t device_handle;
+    char device_id[128];
+    int64_t lag_frames;
+    uint64_t frames_read;
+    uint64_t underrun_count;
+    uint64_t underrun_frames;
+    uint64_t overrun_count;
+    uint64_t overrun_frames;
+    uint64_t correction_count;
+} MC_DeviceMetrics;
+
 MC_SyncEngine* mc_sync_engine_create(size_t master_capacity_samples,
                                      int32_t max_correction_samples_per_call);
+/* NULL if config is NULL or asks for more than MC_MAX_DEVICES devices. */
+MC_SyncEngine* mc_sync_engine_create_with_config(const MC_SyncEngineConfig* config);
 void mc_sync_engine_destroy(MC_SyncEngine* engine);
 
 int mc_sync_engine_register_device(MC_SyncEngine* engine, const char* device_id, int32_t initial_offset_samples);
 int mc_sync_engine_unregister_device(MC_SyncEngine* engine, const char* device_id);
 
-void mc_sync_engine_push_pcm16(MC_SyncEngine* engine, const int16_t* input, size_t sample_count);
+/* Registers a device and returns its handle, or MC_INVALID_DEVICE_HANDLE. */
+int32_t mc_sync_engine_register_device_handle(MC_SyncEngine* engine,
+                                              const char* device_id,
+                                              int32_t initial_offset_samples);
+/* layout is MC_DEVICE_CHANNELS_*; channel is only used by MC_DEVICE_CHANNELS_SINGLE. */
+int32_t mc_sync_engine_register_device_channels(MC_SyncEngine* engine,
+                                                const char* device_id,
+                                                int32_t initial_offset_samples,
+                                                int32_t layout,
+                                                int32_t channel);
+/* Late join: the device's first pull, made at pull_time_ns and heard output_latency_ns later, plays
+ * the frame presented at that moment. Needs a timestamped push first (MC_INVALID_DEVICE_HANDLE otherwise). */
+int32_t mc_sync_engine_register_device_at_time(MC_SyncEngine* engine,
+                                               const char* device_id,
+                                               int64_t pull_time_ns,
+                                               int64_t output_latency_ns,
+                                               int32_t layout,
+                                               int32_t channel);
+/* Reconnect: registers a device that left earlier with the offset, gain, rate correction and lag it
+ * left with (a fresh registration if none was kept). Joins and leaves may run while other devices pull. */
+int32_t mc_sync_engine_rejoin_device(MC_SyncEngine* engine, const char* device_id);
+int32_t mc_sync_engine_device_handle(const MC_SyncEngine* engine, const char* device_id);
+/* Interleaved channels per frame in the handle's pull output; 0 for unknown handles. */
+size_t mc_sync_engine_device_output_channels(const MC_SyncEngine* engine, int32_t device_handle);
+
+/* Counts are frames of interleaved samples (one sample per frame for mono streams).
+ * Returns the number of frames accepted (concurrent mode never overruns the slowest reader);
+ * each push only accepts the engine's configured encoding. */
+size_t mc_sync_engine_push_pcm16(MC_SyncEngine* engine, const int16_t* input, size_t sample_count);
+size_t mc_sync_engine_push_pcm_float(MC_SyncEngine* engine, const float* input, size_t frame_count);
+/* Same, stamped with the host monotonic time at which the block's first frame should be heard. */
+size_t mc_sync_engine_push_pcm16_at(MC_SyncEngine* engine,
+                                    const int16_t* input,
+                                    size_t sample_count,
+                                    int64_t presentation_time_ns);
+size_t mc_sync_engine_push_pcm_float_at(MC_SyncEngine* engine,
+                                        const float* input,
+                                        size_t frame_count,
+                                        int64_t presentation_time_ns);
+
+/* Stream timeline lookups; 0 until a timestamped push has been made. */
+int mc_sync_engine_stream_index_at_time(const MC_SyncEngine* engine, int64_t presentation_time_ns, int64_t* out_stream_index);
+int mc_sync_engine_presentation_time_ns(const MC_SyncEngine* engine, int64_t stream_index, int64_t* out_time_ns);
+/* When the handle's next pulled frame is due to be heard. */
+int mc_sync_engine_device_presentation_time_ns(const MC_SyncEngine* engine, int32_t device_handle, int64_t* out_time_ns);
 
 int mc_sync_engine_pull_for_device(MC_SyncEngine* engine,
                                    const char* device_id,
@@ -29,6 +146,28 @@ int mc_sync_engine_pull_for_device(MC_SyncEngine* engine,
                                    size_t sample_count,
                                    size_t* out_read_samples);
 
+int mc_sync_engine_pull_for_handle(MC_SyncEngine* engine,
+                                   int32_t device_handle,
+                                   int16_t* output,
+                                   size_t sample_count,
+                                   size_t* out_read_samples);
+
+/* Fills every listed device buffer in one native call. Returns the number of valid handles. */
+size_t mc_sync_engine_pull_all(MC_SyncEngine* engine, MC_DevicePull* pulls, size_t pull_count);
+/* Frame-interleaved variant, for up to MC_MAX_DEVICES devices: each frame holds every device's output channels in
+ * handle order, so the frame stride is the sum of mc_sync_engine_device_output_channels() over the
+ * handles (1 for an unknown handle), and output[frame * device_count + device] only when every device
+ * is mono. Pulls nothing and returns 0 if frames * stride exceeds output_sample_capacity.
+ * out_read_samples / out_underrun are optional arrays of device_count entries. */
+size_t mc_sync_engine_pull_all_interleaved(MC_SyncEngine* engine,
+                                           const int32_t* device_handles,
+                                           size_t device_count,
+                                           int16_t* output,
+                                           size_t output_sample_capacity,
+                                           size_t frames,
+                                           size_t* out_read_samples,
+                                           int* out_underrun);
+
 int mc_sync_engine_set_device_offset_samples(MC_SyncEngine* engine,
                                              const char* device_id,
                                              int32_t offset_samples);
@@ -36,6 +175,30 @@ int mc_sync_engine_apply_drift_correction_ms(MC_SyncEngine* engine,
                                              const char* device_id,
                                              float drift_ms,
                                              int32_t sample_rate_hz);
+int mc_sync_engine_set_handle_offset_samples(MC_SyncEngine* engine, int32_t device_handle, int32_t offset_samples);
+/* Re-aligns a device onto the stream timeline; call from its output thread or between pulls. */
+int mc_sync_engine_align_handle_to_time(MC_SyncEngine* engine,
+                                        int32_t device_handle,
+                                        int64_t pull_time_ns,
+                                        int64_t output_latency_ns);
+int mc_sync_engine_apply_handle_drift_correction_ms(MC_SyncEngine* engine,
+                                                    int32_t device_handle,
+                                                    float drift_ms,
+                                                    int32_t sample_rate_hz);
+/* Continuous, click-free correction through the fractional resampler on the pull path. */
+int mc_sync_engine_set_handle_rate_correction_ppm(MC_SyncEngine* engine, int32_t device_handle, float ppm);
+int mc_sync_engine_slew_handle_drift_correction_ms(MC_SyncEngine* engine,
+                                                   int32_t device_handle,
+                                                   float drift_ms,
+                                                   int32_t sample_rate_hz);
+/* Gain is ramped and applied in the same pass that copies samples out of the ring. */
+int mc_sync_engine_set_handle_gain_db(MC_SyncEngine* engine, int32_t device_handle, float gain_db);
+int mc_sync_engine_set_handle_soft_clip(MC_SyncEngine* engine, int32_t device_handle, int enabled);
+
+/* Loads a calibration store file (scripts/build_calibration_store.py) and pre-aligns every
+ * registered device whose id it holds. Returns the number of devices calibrated; 0 if the file is
+ * missing or malformed. */
+size_t mc_sync_engine_apply_calibration_file(MC_SyncEngine* engine, const char* path, int32_t sample_rate_hz);
 
 size_t mc_sync_engine_device_count(const MC_SyncEngine* engine);
 size_t mc_sync_engine_get_device_offsets(const MC_SyncEngine* engine,
@@ -46,6 +209,29 @@ size_t mc_sync_engine_apply_device_offsets(MC_SyncEngine* engine,
                                            size_t offset_count);
 size_t mc_sync_engine_reset_all_device_offsets(MC_SyncEngine* engine, int32_t offset_samples);
 
+/* Changes the ring capacity (in frames) keeping every frame a device has yet to play; call from the
+ * pushing thread. Returns 0, leaving the ring as it was, if the new capacity cannot hold them. */
+int mc_sync_engine_resize_ring(MC_SyncEngine* engine, size_t capacity_samples);
+size_t mc_sync_engine_master_capacity_samples(const MC_SyncEngine* engine);
+
+/* Cheap enough to poll at UI rates while audio threads run. out_engine and out_devices may be
+ * null. Returns the number of registered devices (entries written are capped at max_devices). */
+size_t mc_sync_engine_get_metrics(const MC_SyncEngine* engine,
+                                  MC_EngineMetrics* out_engine,
+                                  MC_DeviceMetrics* out_devices,
+                                  size_t max_devices);
+
+/* GCC-PHAT delay of capture relative to reference (native/include/multiconnect/offset_estimator.h),
+ * for the Python bindings to check multiconnect.gcc_phat against. max_lag_samples 0 searches every
+ * overlapping lag. Returns 1 and fills the non-null outputs when a peak was found, 0 otherwise. */
+int mc_estimate_offset_gcc_phat(const int16_t* reference,
+                                size_t reference_count,
+                                const int16_t* capture,
+                                size_t capture_count,
+                                size_t max_lag_samples,
+                                double* out_lag_samples,
+                                double* out_peak);
+
 #ifdef __cplusplus
 }
 #endif
@@ -0,0 +1,212 @@
+#include "multiconnect/calibration_store.h"
+
+#include <algorithm>
+#include <cstring>
+#include <fstream>
+
+namespace multiconnect {
+
+namespace {
+
+constexpr char kMagic[4] = {'M', 'C', 'C', 'B'};
+constexpr uint16_t kVersion = 1;
+constexpr std::size_t kHeaderBytes = 16;
+constexpr std::size_t kRecordBytes = 40;
+
+void putU16(std::vector<uint8_t>& out, uint16_t value) {
+    out.push_back(static_cast<uint8_t>(value));
+    out.push_back(static_cast<uint8_t>(value >> 8));
+}
+
+void putU32(std::vector<uint8_t>& out, uint32_t value) {
+    for (int shift = 0; shift < 32; shift += 8) {
+        out.push_back(static_cast<uint8_t>(value >> shift));
+    }
+}
+
+void putU64(std::vector<uint8_t>& out, uint64_t value) {
+    for (int shift = 0; shift < 64; shift += 8) {
+        out.push_back(static_cast<uint8_t>(value >> shift));
+    }
+}
+
+void putF32(std::vector<uint8_t>& out, float value) {
+    uint32_t bits = 0;
+    std::memcpy(&bits, &value, sizeof(bits));
+    putU32(out, bits);
+}
+
+uint16_t getU16(const uint8_t* in) {
+    return static_cast<uint16_t>(in[0] | (in[1] << 8));
+}
+
+uint32_t getU32(const uint8_t* in) {
+    return static_cast<uint32_t>(in[0]) | (static_cast<uint32_t>(in[1]) << 8) | (static_cast<uint32_t>(in[2]) << 16) |
+           (static_cast<uint32_t>(in[3]) << 24);
+}
+
+uint64_t getU64(const uint8_t* in) {
+    return static_cast<uint64_t>(getU32(in)) | (static_cast<uint64_t>(getU32(in + 4)) << 32);
+}
+
+float getF32(const uint8_t* in) {
+    const uint32_t bits = getU32(in);
+    float value = 0.0F;
+    std::memcpy(&value, &bits, sizeof(value));
+    return value;
+}
+
+template <typename EntryT>
+bool entryLess(const EntryT& entry, uint64_t hash, std::string_view key) {
+    return entry.hash != hash ? entry.hash < hash : std::string_view(entry.key) < key;
+}
+
+}  // namespace
+
+uint64_t calibrationKeyHash(std::string_view key) {
+    uint64_t hash = 0xcbf29ce484222325ULL;
+    for (const char c : key) {
+        hash ^= static_cast<uint8_t>(c);
+        hash *= 0x100000001b3ULL;
+    }
+    return hash;
+}
+
+void CalibrationStore::set(std::string_view key, const DeviceCalibration& calibration) {
+    const uint64_t hash = calibrationKeyHash(key);
+    const auto it = std::lower_bound(entries_.begin(), entries_.end(), hash, [&](const Entry& entry, uint64_t h) {
+        return entryLess(entry, h, key);
+    });
+    if (it != entries_.end() && it->hash == hash && it->key == key) {
+        it->calibration = calibration;
+        return;
+    }
+    entries_.insert(it, Entry{hash, std::string(key), calibration});
+}
+
+const DeviceCalibration* CalibrationStore::find(std::string_view key) const {
+    const uint64_t hash = calibrationKeyHash(key);
+    const auto it = std::lower_bound(entries_.begin(), entries_.end(), hash, [&](const Entry& entry, uint64_t h) {
+        return entryLess(entry, h, key);
+    });
+    if (it == entries_.end() || it->hash != hash || it->key != key) {
+        return nullptr;
+    }
+    return &it->calibration;
+}
+
+std::size_t CalibrationStore::size() const {
+    return entries_.size();
+}
+
+std::vector<std::string> CalibrationStore::keys() const {
+    std::vector<std::string> result;
+    result.reserve(entries_.size());
+    for (const Entry& entry : entries_) {
+        result.push_back(entry.key);
+    }
+    return result;
+}
+
+std::vector<uint8_t> CalibrationStore::serialize() const {
+    std::size_t stringBytes = 0;
+    for (const Entry& entry : entries_) {
+        stringBytes += entry.key.size();
+    }
+
+    std::vector<uint8_t> out;
+    out.reserve(kHeaderBytes + entries_.size() * kRecordBytes + stringBytes);
+    for (const char c : kMagic) {
+        out.push_back(static_cast<uint8_t>(c));
+    }
+    putU16(out, kVersion);
+    putU16(out, static_cast<uint16_t>(kRecordBytes));
+    putU32(out, static_cast<uint32_t>(entries_.size()));
+    putU32(out, static_cast<uint32_t>(stringBytes));
+
+    uint32_t keyOffset = 0;
+    for (const Entry& entry : entries_) {
+        putU64(out, entry.hash);
+        putU32(out, keyOffset);
+        putU32(out, static_cast<uint32_t>(entry.key.size()));
+        putU32(out, static_cast<uint32_t>(entry.calibration.manualOffsetMs));
+        putF32(out, entry.calibration.gainDb);
+        putF32(out, entry.calibration.lastMeasuredDriftMs);
+        putF32(out, entry.calibration.driftPpm);
+        putF32(out, entry.calibration.latencyMs);
+        putU32(out, 0);
+        keyOffset += static_cast<uint32_t>(entry.key.size());
+    }
+    for (const Entry& entry : entries_) {
+        out.insert(out.end(), entry.key.begin(), entry.key.end());
+    }
+    return out;
+}
+
+bool CalibrationStore::deserialize(const uint8_t* data, std::size_t size) {
+    entries_.clear();
+    if (data == nullptr || size < kHeaderBytes || std::memcmp(data, kMagic, sizeof(kMagic)) != 0 ||
+        getU16(data + 4) != kVersion) {
+        return false;
+    }
+    const std::size_t recordBytes = getU16(data + 6);
+    const std::size_t count = getU32(data + 8);
+    const std::size_t stringBytes = getU32(data + 12);
+    if (recordBytes < kRecordBytes || count > (size - kHeaderBytes) / recordBytes ||
+        kHeaderBytes + count * recordBytes + stringBytes != size) {
+        return false;
+    }
+
+    const uint8_t* strings = data + kHeaderBytes + count * recordBytes;
+    std::vector<Entry> entries(count);
+    for (std::size_t i = 0; i < count; ++i) {
+        const uint8_t* record = data + kHeaderBytes + i * recordBytes;
+        const std::size_t keyOffset = getU32(record + 8);
+        const std::size_t keyLength = getU32(record + 12);
+        if (keyOffset > stringBytes || keyLength > stringBytes - keyOffset) {
+            return false;
+        }
+
+        Entry& entry = entries[i];
+        entry.key.assign(reinterpret_cast<const char*>(strings + keyOffset), keyLength);
+        entry.hash = getU64(record);
+        if (entry.hash != calibrationKeyHash(entry.key) || (i > 0 && !entryLess(entries[i - 1], entry.hash, entry.key))) {
+            return false;
+        }
+        entry.calibration.manualOffsetMs = static_cast<int32_t>(getU32(record + 16));
+        entry.calibration.gainDb = getF32(record + 20);
+        entry.calibration.lastMeasuredDriftMs = getF32(record + 24);
+        entry.calibration.driftPpm = getF32(record + 28);
+        entry.calibration.latencyMs = getF32(record + 32);
+    }
+    entries_ = std::move(entries);
+    return true;
+}
+
+bool CalibrationStore::loadFile(const std::string& path) {
+    std::ifstream in(path, std::ios::binary | std::ios::ate);
+    const std::streamoff size = in.is_open() ? static_cast<std::streamoff>(in.tellg()) : -1;
+    if (size < 0) {
+        entries_.clear();
+        return false;
+    }
+    std::vector<uint8_t> data(static_cast<std::size_t>(size));
+    in.seekg(0);
+    if (!in.read(reinterpret_cast<char*>(data.data()), size)) {
+        entries_.clear();
+        return false;
+    }
+    return deserialize(data.data(), data.size());
+}
+
+bool CalibrationStore::saveFile(const std::string& path) const {
+    const std::vector<uint8_t> data = serialize();
+    std::ofstream out(path, std::ios::binary | std::ios::trunc);
+    if (!out.is_open()) {
+        return false;
+    }
+    out.write(reinterpret_cast<const char*>(data.data()), static_cast<std::streamsize>(data.size()));
+    return static_cast<bool>(out);
+}
+
+}  // namespace multiconnect
@@ -0,0 +1,194 @@
+#include "multiconnect/drift_controller.h"
+
+#include <algorithm>
+#include <cmath>
+
+namespace multiconnect {
+
+namespace {
+
+// Milliseconds of phase a 1 ppm rate difference accumulates per second.
+constexpr double kMsPerPpmSecond = 1e-3;
+// Innovations this many standard deviations out (and past stepThresholdMs) are phase jumps, not noise.
+constexpr double kJumpGateSigmas = 5.0;
+
+}  // namespace
+
+DriftController::DriftController(SyncEngine& engine, const DriftControllerConfig& config)
+    : engine_(engine), config_(config), trackers_(engine.maxDevices()) {
+    config_.sampleRateHz = std::max(config_.sampleRateHz, 1);
+    config_.measurementNoiseMs = std::max(config_.measurementNoiseMs, 1e-3);
+    config_.skewWanderPpm = std::max(config_.skewWanderPpm, 0.0);
+    config_.phaseHorizonSeconds = std::max(config_.phaseHorizonSeconds, 1e-3);
+    config_.maxCorrectionPpm = std::max(config_.maxCorrectionPpm, 0.0);
+}
+
+bool DriftController::track(DeviceHandle handle) {
+    if (!engine_.hasDevice(handle) || trackerFor(handle) == nullptr) {
+        return false;
+    }
+    Tracker& tracker = trackers_[static_cast<std::size_t>(handle.index)];
+    tracker = Tracker{};
+    tracker.active = true;
+    tracker.rateCorrectionPpm = engine_.deviceState(handle).rateCorrectionPpm;
+    // Before any report the skew is only known to lie within the correctable range.
+    tracker.pSkew = std::max(config_.maxCorrectionPpm * config_.maxCorrectionPpm, 1.0);
+    return true;
+}
+
+bool DriftController::track(DeviceHandle handle, int64_t referenceHostTimeNs, double referenceStreamPosition) {
+    if (!track(handle)) {
+        return false;
+    }
+    Tracker& tracker = trackers_[static_cast<std::size_t>(handle.index)];
+    tracker.referenced = true;
+    tracker.referenceTimeNs = referenceHostTimeNs;
+    tracker.referencePosition = referenceStreamPosition;
+    return true;
+}
+
+bool DriftController::untrack(DeviceHandle handle) {
+    Tracker* tracker = trackerFor(handle);
+    if (tracker == nullptr || !tracker->active) {
+        return false;
+    }
+    *tracker = Tracker{};
+    return true;
+}
+
+bool DriftController::isTracking(DeviceHandle handle) const {
+    const Tracker* tracker = trackerFor(handle);
+    return tracker != nullptr && tracker->active;
+}
+
+bool DriftController::report(DeviceHandle handle, const ConsumptionReport& report) {
+    Tracker* found = trackerFor(handle);
+    if (found == nullptr || !found->active || !std::isfinite(report.streamPosition)) {
+        return false;
+    }
+    Tracker& tracker = *found;
+    const double noiseVariance = config_.measurementNoiseMs * config_.measurementNoiseMs;
+
+    if (!tracker.referenced) {
+        tracker.referenced = true;
+        tracker.referenceTimeNs = report.hostTimeNs;
+        tracker.referencePosition = report.streamPosition;
+    }
+    const double expected = tracker.referencePosition +
+                            static_cast<double>(report.hostTimeNs - tracker.referenceTimeNs) * 1e-9 * config_.sampleRateHz;
+    const double measuredMs = (report.streamPosition - expected) * 1000.0 / config_.sampleRateHz;
+
+    if (tracker.reports++ == 0) {
+        tracker.phaseMs = measuredMs;
+        tracker.pPhase = noiseVariance;
+        tracker.lastTimeNs = report.hostTimeNs;
+        tracker.lastControlNs = report.hostTimeNs;
+        return false;
+    }
+    if (report.hostTimeNs < tracker.lastTimeNs) {
+        return false;
+    }
+
+    // Predict: the phase moves with the speaker's skew plus the rate correction the engine applied.
+    const double dt = static_cast<double>(report.hostTimeNs - tracker.lastTimeNs) * 1e-9;
+    const double a = dt * kMsPerPpmSecond;
+    const double q = config_.skewWanderPpm * config_.skewWanderPpm * dt;
+    tracker.phaseMs += (tracker.skewPpm + tracker.rateCorrectionPpm) * a;
+    tracker.pPhase += 2.0 * a * tracker.pCross + a * a * tracker.pSkew + q * a * a / 3.0;
+    tracker.pCross += a * tracker.pSkew + q * a / 2.0;
+    tracker.pSkew += q;
+    tracker.lastTimeNs = report.hostTimeNs;
+
+    const double innovation = measuredMs - tracker.phaseMs;
+    const double innovationVariance = tracker.pPhase + noiseVariance;
+    if (std::abs(innovation) > config_.stepThresholdMs &&
+        innovation * innovation > kJumpGateSigmas * kJumpGateSigmas * innovationVariance) {
+        // A jump is not evidence about the clock rate: restart the phase and keep the skew.
+        tracker.phaseMs = measuredMs;
+        tracker.pPhase = noiseVariance;
+        tracker.pCross = 0.0;
+    } else {
+        const double phaseGain = tracker.pPhase / innovationVariance;
+        const double skewGain = tracker.pCross / innovationVariance;
+        tracker.phaseMs += phaseGain * innovation;
+        tracker.skewPpm += skewGain * innovation;
+        tracker.pSkew -= skewGain * tracker.pCross;
+        tracker.pPhase -= phaseGain * tracker.pPhase;
+        tracker.pCross -= phaseGain * tracker.pCross;
+    }
+
+    return control(handle, tracker, report.hostTimeNs);
+}
+
+bool DriftController::report(DeviceHandle handle, int64_t hostTimeNs) {
+    if (!isTracking(handle)) {
+        return false;
+    }
+    const DeviceStreamState stream = engine_.deviceState(handle);
+    return report(handle, {hostTimeNs, static_cast<double>(stream.readHead) + stream.offsetSamples});
+}
+
+bool DriftController::control(DeviceHandle handle, Tracker& tracker, int64_t hostTimeNs) {
+    if (std::abs(tracker.phaseMs) > config_.stepThresholdMs) {
+        const int32_t before = engine_.deviceState(handle).offsetSamples;
+        engine_.applyDriftCorrectionMs(handle, static_cast<float>(tracker.phaseMs), config_.sampleRateHz);
+        const int32_t after = engine_.deviceState(handle).offsetSamples;
+        // The engine rounds to whole milliseconds (and may clamp); track what it actually moved.
+        tracker.phaseMs -= static_cast<double>(before - after) * 1000.0 / config_.sampleRateHz;
+        ++tracker.stepCorrections;
+        return true;
+    }
+
+    if (static_cast<double>(hostTimeNs - tracker.lastControlNs) * 1e-9 < config_.controlIntervalSeconds) {
+        return false;
+    }
+    tracker.lastControlNs = hostTimeNs;
+
+    const double pullPpm = tracker.phaseMs / (config_.phaseHorizonSeconds * kMsPerPpmSecond);
+    const double target = std::clamp(-tracker.skewPpm - pullPpm, -config_.maxCorrectionPpm, config_.maxCorrectionPpm);
+    if (std::abs(target - tracker.rateCorrectionPpm) < config_.minRateStepPpm) {
+        return false;
+    }
+    const auto ppm = static_cast<float>(target);
+    if (!engine_.setDeviceRateCorrectionPpm(handle, ppm)) {
+        return false;
+    }
+    tracker.rateCorrectionPpm = ppm;
+    ++tracker.rateUpdates;
+    return true;
+}
+
+DriftEstimate DriftController::estimate(DeviceHandle handle) const {
+    const Tracker* tracker = trackerFor(handle);
+    if (tracker == nullptr || !tracker->active) {
+        return {};
+    }
+    DriftEstimate estimate;
+    estimate.phaseMs = tracker->phaseMs;
+    estimate.skewPpm = tracker->skewPpm;
+    estimate.phaseStdMs = std::sqrt(std::max(tracker->pPhase, 0.0));
+    estimate.skewStdPpm = std::sqrt(std::max(tracker->pSkew, 0.0));
+    estimate.rateCorrectionPpm = tracker->rateCorrectionPpm;
+    estimate.reports = tracker->reports;
+    estimate.rateUpdates = tracker->rateUpdates;
+    estimate.stepCorrections = tracker->stepCorrections;
+    return estimate;
+}
+
+const DriftControllerConfig& DriftController::config() const {
+    return config_;
+}
+
+DriftController::Tracker* DriftController::trackerFor(DeviceHandle handle) {
+    return handle.valid() && static_cast<std::size_t>(handle.index) < trackers_.size()
+               ? &trackers_[static_cast<std::size_t>(handle.index)]
+               : nullptr;
+}
+
+const DriftController::Tracker* DriftController::trackerFor(DeviceHandle handle) const {
+    return handle.valid() && static_cast<std::size_t>(handle.index) < trackers_.size()
+               ? &trackers_[static_cast<std::size_t>(handle.index)]
+               : nullptr;
+}
+
+}  // namespace multiconnect
@@ -0,0 +1,287 @@
+// Host drift simulator: streams a long session (2 hours by default) through SyncEngine with virtual
+// speakers whose clocks are skewed, jittery and drop out, and reports each speaker's drift timeline.
+//
+//   ./native/build/drift_sim --matrix docs/hardware-matrix-template.csv --timeline-csv drift.csv
+//   ./native/build/drift_sim --speaker sony:2.1 --speaker mivi:-5.5:1.5:0.5:210 --correction slew
+//
+// Without --speaker, every row of the hardware matrix becomes a speaker: skew from
+// drift_after_120m_ms, dropouts from dropouts_count (per 2-hour run), latency from observed_latency_ms.
+
+#include "multiconnect/drift_simulator.h"
+
+#include <algorithm>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <ctime>
+#include <fstream>
+#include <iostream>
+#include <sstream>
+#include <string>
+#include <string_view>
+#include <vector>
+
+namespace {
+
+constexpr double kMatrixSessionSeconds = 7200.0;
+
+struct CliOptions {
+    std::string matrixPath = "docs/hardware-matrix-template.csv";
+    std::vector<std::string> speakerSpecs;
+    std::string timelineCsv;
+    double defaultJitterMs = 1.0;
+    double dropoutMs = 200.0;
+    double thresholdMs = -1.0;
+    multiconnect::DriftSimulationConfig simulation;
+    bool valid = true;
+};
+
+bool parseDouble(std::string_view text, double* outValue) {
+    if (outValue == nullptr) {
+        return false;
+    }
+
+    char* end = nullptr;
+    const std::string owned(text);
+    const double value = std::strtod(owned.c_str(), &end);
+    if (end == owned.c_str() || *end != '\0' || !std::isfinite(value)) {
+        return false;
+    }
+
+    *outValue = value;
+    return true;
+}
+
+std::vector<std::string> splitCsvLine(const std::string& line) {
+    std::vector<std::string> fields(1);
+    bool quoted = false;
+    for (std::size_t i = 0; i < line.size(); ++i) {
+        const char c = line[i];
+        if (quoted) {
+            if (c == '"' && i + 1 < line.size() && line[i + 1] == '"') {
+                fields.back() += '"';
+                ++i;
+            } else if (c == '"') {
+                quoted = false;
+            } else {
+                fields.back() += c;
+            }
+        } else if (c == '"') {
+            quoted = true;
+        } else if (c == ',') {
+            fields.emplace_back();
+        } else if (c != '\r') {
+            fields.back() += c;
+        }
+    }
+    return fields;
+}
+
+bool loadMatrixSpeakers(const CliOptions& options, std::vector<multiconnect::VirtualSpeakerProfile>* speakers) {
+    std::ifstream in(options.matrixPath);
+    if (!in.is_open()) {
+        std::cerr << "ERROR unable to open hardware matrix path=" << options.matrixPath << '\n';
+        return false;
+    }
+
+    std::string line;
+    std::getline(in, line);
+    const std::vector<std::string> header = splitCsvLine(line);
+    const auto column = [&](std::string_view name) {
+        return static_cast<std::size_t>(std::find(header.begin(), header.end(), name) - header.begin());
+    };
+    const std::size_t runId = column("run_id");
+    const std::size_t latency = column("observed_latency_ms");
+    const std::size_t drift = column("drift_after_120m_ms");
+    const std::size_t dropouts = column("dropouts_count");
+    if (std::max({runId, latency, drift, dropouts}) >= header.size()) {
+        std::cerr << "ERROR hardware matrix is missing run_id/observed_latency_ms/drift_after_120m_ms/dropouts_count\n";
+        return false;
+    }
+
+    while (std::getline(in, line)) {
+        const std::vector<std::string> fields = splitCsvLine(line);
+        if (fields.size() < header.size()) {
+            continue;
+        }
+
+        multiconnect::VirtualSpeakerProfile profile;
+        double driftMs = 0.0;
+        double dropoutCount = 0.0;
+        if (!parseDouble(fields[latency], &profile.latencyMs) || !parseDouble(fields[drift], &driftMs) ||
+            !parseDouble(fields[dropouts], &dropoutCount)) {
+            std::cerr << "WARN skipping hardware matrix row run_id=" << fields[runId] << '\n';
+            continue;
+        }
+        profile.deviceId = fields[runId];
+        profile.skewPpm = multiconnect::skewPpmFromDrift(driftMs, kMatrixSessionSeconds);
+        profile.dropoutsPerHour = dropoutCount * 3600.0 / kMatrixSessionSeconds;
+        profile.jitterMs = options.defaultJitterMs;
+        profile.dropoutMs = options.dropoutMs;
+        speakers->push_back(profile);
+    }
+    return true;
+}
+
+// id:skewPpm[:jitterMs[:dropoutsPerHour[:latencyMs]]]
+bool parseSpeakerSpec(const std::string& spec,
+                      const CliOptions& options,
+                      multiconnect::VirtualSpeakerProfile* profile) {
+    std::vector<std::string> parts;
+    std::stringstream stream(spec);
+    for (std::string part; std::getline(stream, part, ':');) {
+        parts.push_back(part);
+    }
+    if (parts.size() < 2 || parts.size() > 5 || parts[0].empty()) {
+        return false;
+    }
+
+    profile->deviceId = parts[0];
+    profile->jitterMs = options.defaultJitterMs;
+    profile->dropoutMs = options.dropoutMs;
+    double* targets[] = {&profile->skewPpm, &profile->jitterMs, &profile->dropoutsPerHour, &profile->latencyMs};
+    for (std::size_t i = 1; i < parts.size(); ++i) {
+        if (!parseDouble(parts[i], targets[i - 1])) {
+            return false;
+        }
+    }
+    return true;
+}
+
+CliOptions parseArgs(int argc, char** argv) {
+    CliOptions options;
+    for (int i = 1; i < argc; ++i) {
+        const std::string arg = argv[i];
+        const bool hasValue = i + 1 < argc;
+        double parsed = 0.0;
+
+        if (arg == "--matrix" && hasValue) {
+            options.matrixPath = argv[++i];
+        } else if (arg == "--speaker" && hasValue) {
+            options.speakerSpecs.emplace_back(argv[++i]);
+        } else if (arg == "--timeline-csv" && hasValue) {
+            options.timelineCsv = argv[++i];
+        } else if (arg == "--duration-s" && hasValue && parseDouble(argv[++i], &parsed) && parsed > 0.0) {
+            options.simulation.sessionSeconds = parsed;
+        } else if (arg == "--sample-rate" && hasValue && parseDouble(argv[++i], &parsed) && parsed >= 1.0) {
+            options.simulation.sampleRateHz = static_cast<int32_t>(parsed);
+        } else if (arg == "--block-frames" && hasValue && parseDouble(argv[++i], &parsed) && parsed >= 1.0) {
+            options.simulation.blockFrames = static_cast<std::size_t>(parsed);
+        } else if (arg == "--ring-s" && hasValue && parseDouble(argv[++i], &parsed) && parsed > 0.0) {
+            options.simulation.ringSeconds = parsed;
+        } else if (arg == "--timeline-interval-s" && hasValue && parseDouble(argv[++i], &parsed) && parsed > 0.0) {
+            options.simulation.timelineIntervalSeconds = parsed;
+        } else if (arg == "--correction-interval-s" && hasValue && parseDouble(argv[++i], &parsed) && parsed > 0.0) {
+            options.simulation.correctionIntervalSeconds = parsed;
+        } else if (arg == "--jitter-ms" && hasValue && parseDouble(argv[++i], &parsed) && parsed >= 0.0) {
+            options.defaultJitterMs = parsed;
+        } else if (arg == "--dropout-ms" && hasValue && parseDouble(argv[++i], &parsed) && parsed > 0.0) {
+            options.dropoutMs = parsed;
+        } else if (arg == "--threshold-ms" && hasValue && parseDouble(argv[++i], &parsed) && parsed >= 0.0) {
+            options.thresholdMs = parsed;
+        } else if (arg == "--seed" && hasValue && parseDouble(argv[++i], &parsed) && parsed >= 0.0) {
+            options.simulation.seed = static_cast<uint64_t>(parsed);
+        } else if (arg == "--correction" && hasValue) {
+            const std::string mode = argv[++i];
+            if (mode == "none") {
+                options.simulation.correction = multiconnect::DriftCorrectionMode::kNone;
+            } else if (mode == "step") {
+                options.simulation.correction = multiconnect::DriftCorrectionMode::kStep;
+            } else if (mode == "slew") {
+                options.simulation.correction = multiconnect::DriftCorrectionMode::kSlew;
+            } else if (mode == "controller") {
+                options.simulation.correction = multiconnect::DriftCorrectionMode::kController;
+            } else {
+                std::cerr << "ERROR --correction must be none, step, slew or controller\n";
+                options.valid = false;
+            }
+        } else {
+            std::cerr << "ERROR unrecognized or invalid argument: " << arg << '\n';
+            options.valid = false;
+        }
+    }
+    return options;
+}
+
+const char* correctionName(multiconnect::DriftCorrectionMode mode) {
+    switch (mode) {
+        case multiconnect::DriftCorrectionMode::kStep:
+            return "step";
+        case multiconnect::DriftCorrectionMode::kSlew:
+            return "slew";
+        case multiconnect::DriftCorrectionMode::kController:
+            return "controller";
+        case multiconnect::DriftCorrectionMode::kNone:
+            break;
+    }
+    return "none";
+}
+
+bool writeTimelineCsv(const std::string& path, const multiconnect::DriftSimulationResult& result) {
+    std::ofstream out(path);
+    if (!out.is_open()) {
+        std::cerr << "ERROR unable to open timeline path=" << path << '\n';
+        return false;
+    }
+
+    out << "time_s,device_id,drift_ms\n";
+    for (const auto& device : result.devices) {
+        for (const auto& point : device.timeline) {
+            out << point.timeSeconds << ',' << device.profile.deviceId << ',' << point.driftMs << '\n';
+        }
+    }
+    return true;
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    const CliOptions options = parseArgs(argc, argv);
+    if (!options.valid) {
+        return 2;
+    }
+
+    std::vector<multiconnect::VirtualSpeakerProfile> speakers;
+    for (const std::string& spec : options.speakerSpecs) {
+        multiconnect::VirtualSpeakerProfile profile;
+        if (!parseSpeakerSpec(spec, options, &profile)) {
+            std::cerr << "ERROR --speaker expects id:skewPpm[:jitterMs[:dropoutsPerHour[:latencyMs]]], got " << spec << '\n';
+            return 2;
+        }
+        speakers.push_back(profile);
+    }
+    if (speakers.empty() && !loadMatrixSpeakers(options, &speakers)) {
+        return 2;
+    }
+    if (speakers.empty()) {
+        std::cerr << "ERROR no speakers to simulate\n";
+        return 2;
+    }
+
+    const std::clock_t cpuStart = std::clock();
+    const multiconnect::DriftSimulationResult result = multiconnect::simulateDriftSession(options.simulation, speakers);
+    const double cpuSeconds = static_cast<double>(std::clock() - cpuStart) / CLOCKS_PER_SEC;
+
+    bool pass = true;
+    for (const auto& device : result.devices) {
+        std::cout << "DRIFT_SIM device=" << device.profile.deviceId << " skewPpm=" << device.profile.skewPpm
+                  << " jitterMs=" << device.profile.jitterMs << " dropouts=" << device.dropouts
+                  << " finalDriftMs=" << device.finalDriftMs << " maxAbsDriftMs=" << device.maxAbsDriftMs
+                  << " underruns=" << device.metrics.underrunCount << " corrections=" << device.metrics.correctionCount
+                  << '\n';
+        pass = pass && (options.thresholdMs < 0.0 || device.maxAbsDriftMs <= options.thresholdMs);
+    }
+    std::cout << "DRIFT_SIM_SUMMARY devices=" << result.devices.size() << " simulatedSeconds=" << result.simulatedSeconds
+              << " cpuSeconds=" << cpuSeconds << " realtimeFactor=" << result.simulatedSeconds / std::max(cpuSeconds, 1e-9)
+              << " correction=" << correctionName(options.simulation.correction)
+              << " droppedFrames=" << result.engine.droppedFrames << '\n';
+
+    if (!options.timelineCsv.empty() && !writeTimelineCsv(options.timelineCsv, result)) {
+        return 2;
+    }
+
+    if (options.thresholdMs >= 0.0) {
+        std::cout << (pass ? "PASS" : "FAIL") << " thresholdMs=" << options.thresholdMs << '\n';
+    }
+    return pass ? 0 : 1;
+}
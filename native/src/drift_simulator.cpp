@@ -0,0 +1,151 @@
+#include "multiconnect/drift_simulator.h"
+
+#include <algorithm>
+#include <cmath>
+#include <random>
+
+namespace multiconnect {
+
+namespace {
+
+struct SpeakerState {
+    DeviceHandle handle;
+    std::mt19937_64 rng;
+    // Speaker clock rate, in frames per master second.
+    double framesPerSecond = 0.0;
+    int64_t latencyFrames = 0;
+    double dropoutProbabilityPerTick = 0.0;
+    std::size_t dropoutTicks = 0;
+    std::size_t dropoutTicksLeft = 0;
+    // Master seconds the speaker has spent playing (dropouts excluded) and output frames pulled.
+    double activeSeconds = 0.0;
+    int64_t pulledFrames = 0;
+};
+
+}  // namespace
+
+double skewPpmFromDrift(double driftMs, double elapsedSeconds) {
+    return elapsedSeconds > 0.0 ? driftMs / (elapsedSeconds * 1000.0) * 1e6 : 0.0;
+}
+
+DriftSimulationResult simulateDriftSession(const DriftSimulationConfig& config,
+                                           const std::vector<VirtualSpeakerProfile>& speakers) {
+    const int32_t sampleRateHz = std::max(config.sampleRateHz, 1);
+    const std::size_t blockFrames = std::max<std::size_t>(config.blockFrames, 1);
+    const double blockSeconds = static_cast<double>(blockFrames) / sampleRateHz;
+    const auto ticks = static_cast<std::size_t>(std::max(config.sessionSeconds, 0.0) / blockSeconds);
+    const auto everyTicks = [&](double seconds) {
+        return std::max<std::size_t>(static_cast<std::size_t>(std::lround(seconds / blockSeconds)), 1);
+    };
+    const std::size_t timelineTicks = everyTicks(config.timelineIntervalSeconds);
+    const std::size_t correctionTicks = everyTicks(config.correctionIntervalSeconds);
+
+    SyncEngineConfig engineConfig;
+    engineConfig.masterCapacitySamples =
+        std::max<std::size_t>(static_cast<std::size_t>(config.ringSeconds * sampleRateHz), blockFrames * 4);
+    engineConfig.mode = SyncEngineMode::kConcurrent;
+    engineConfig.maxDevices = std::max<std::size_t>(speakers.size(), 1);
+    SyncEngine engine(engineConfig);
+    DriftControllerConfig controllerConfig = config.controller;
+    controllerConfig.sampleRateHz = sampleRateHz;
+    DriftController controller(engine, controllerConfig);
+
+    DriftSimulationResult result;
+    std::vector<SpeakerState> states(speakers.size());
+    for (std::size_t i = 0; i < speakers.size(); ++i) {
+        const VirtualSpeakerProfile& profile = speakers[i];
+        SpeakerState& state = states[i];
+        state.latencyFrames = std::llround(profile.latencyMs * sampleRateHz / 1000.0);
+        state.handle = engine.registerDevice(profile.deviceId, static_cast<int32_t>(-state.latencyFrames));
+        if (config.correction == DriftCorrectionMode::kController) {
+            controller.track(state.handle, 0, static_cast<double>(-state.latencyFrames));
+        }
+        state.rng.seed(config.seed * 0x9E3779B97F4A7C15ULL + i);
+        state.framesPerSecond = sampleRateHz * (1.0 + profile.skewPpm * 1e-6);
+        state.dropoutProbabilityPerTick = std::clamp(profile.dropoutsPerHour * blockSeconds / 3600.0, 0.0, 1.0);
+        state.dropoutTicks = everyTicks(profile.dropoutMs / 1000.0);
+
+        DeviceDriftReport report;
+        report.profile = profile;
+        report.timeline.reserve(ticks / timelineTicks + 1);
+        result.devices.push_back(std::move(report));
+    }
+
+    const std::vector<int16_t> block(blockFrames, 0);
+    std::vector<int16_t> scratch(blockFrames * 4);
+    std::normal_distribution<double> unitNormal(0.0, 1.0);
+
+    const auto driftMsFor = [&](const SpeakerState& state, double masterSeconds) {
+        const DeviceStreamState stream = engine.deviceState(state.handle);
+        const double playing = static_cast<double>(stream.readHead) + stream.offsetSamples;
+        const double expected = masterSeconds * sampleRateHz - static_cast<double>(state.latencyFrames);
+        return (playing - expected) * 1000.0 / sampleRateHz;
+    };
+
+    for (std::size_t tick = 1; tick <= ticks; ++tick) {
+        engine.pushPcm16(block.data(), block.size());
+        const double masterSeconds = static_cast<double>(tick) * blockSeconds;
+
+        for (std::size_t i = 0; i < states.size(); ++i) {
+            SpeakerState& state = states[i];
+            DeviceDriftReport& report = result.devices[i];
+            if (!state.handle) {
+                continue;
+            }
+
+            if (state.dropoutTicksLeft > 0) {
+                --state.dropoutTicksLeft;
+            } else if (state.dropoutProbabilityPerTick > 0.0 &&
+                       std::uniform_real_distribution<double>(0.0, 1.0)(state.rng) < state.dropoutProbabilityPerTick) {
+                state.dropoutTicksLeft = state.dropoutTicks - 1;
+                ++report.dropouts;
+            } else {
+                // The speaker has played up to its (skewed, jittered) clock; pull whatever that adds.
+                state.activeSeconds += blockSeconds;
+                const double jitterSeconds = report.profile.jitterMs / 1000.0 * unitNormal(state.rng);
+                const auto target = static_cast<int64_t>(state.framesPerSecond * std::max(state.activeSeconds + jitterSeconds, 0.0));
+                while (state.pulledFrames < target) {
+                    const auto chunk = static_cast<std::size_t>(
+                        std::min<int64_t>(target - state.pulledFrames, static_cast<int64_t>(scratch.size())));
+                    engine.pullForDevice(state.handle, scratch.data(), chunk);
+                    state.pulledFrames += static_cast<int64_t>(chunk);
+                }
+            }
+
+            const double driftMs = driftMsFor(state, masterSeconds);
+            report.finalDriftMs = driftMs;
+            report.maxAbsDriftMs = std::max(report.maxAbsDriftMs, std::abs(driftMs));
+            if (tick % timelineTicks == 0) {
+                report.timeline.push_back({masterSeconds, driftMs});
+            }
+
+            if (config.correction == DriftCorrectionMode::kController) {
+                // A speaker that is not playing has nothing to report.
+                if (state.dropoutTicksLeft == 0) {
+                    controller.report(state.handle, static_cast<int64_t>(std::llround(masterSeconds * 1e9)));
+                }
+                continue;
+            }
+            if (config.correction == DriftCorrectionMode::kNone || tick % correctionTicks != 0 ||
+                state.dropoutTicksLeft > 0) {
+                continue;
+            }
+            if (config.correction == DriftCorrectionMode::kStep) {
+                engine.applyDriftCorrectionMs(state.handle, static_cast<float>(driftMs), sampleRateHz);
+            } else {
+                // Only correct what earlier slews have not already queued up.
+                const double pendingMs = engine.deviceState(state.handle).pendingCorrectionSamples * 1000.0 / sampleRateHz;
+                engine.slewDriftCorrectionMs(state.handle, static_cast<float>(driftMs + pendingMs), sampleRateHz);
+            }
+        }
+    }
+
+    result.simulatedSeconds = static_cast<double>(ticks) * blockSeconds;
+    for (std::size_t i = 0; i < states.size(); ++i) {
+        result.devices[i].metrics = engine.deviceMetrics(states[i].handle);
+    }
+    result.engine = engine.engineMetrics();
+    return result;
+}
+
+}  // namespace multiconnect
@@ -0,0 +1,99 @@
+#include "multiconnect/fractional_resampler.h"
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+
+namespace multiconnect {
+
+namespace {
+constexpr double kPi = 3.14159265358979323846;
+
+// kResamplerPhases + 1 rows so phase interpolation never wraps; row p holds the taps for a
+// fractional position of p / kResamplerPhases.
+using PhaseTable = std::array<std::array<float, kResamplerTaps>, kResamplerPhases + 1>;
+
+PhaseTable buildPhaseTable() {
+    PhaseTable table{};
+    constexpr double halfWidth = kResamplerTaps / 2.0;
+
+    for (int p = 0; p <= kResamplerPhases; ++p) {
+        const double fraction = static_cast<double>(p) / kResamplerPhases;
+        double sum = 0.0;
+        std::array<double, kResamplerTaps> taps{};
+
+        for (int t = 0; t < kResamplerTaps; ++t) {
+            // Tap t multiplies input[t - kResamplerHistory]; x is its distance from the output point.
+            const double x = static_cast<double>(t - kResamplerHistory) - fraction;
+            const double sinc = std::abs(x) < 1e-12 ? 1.0 : std::sin(kPi * x) / (kPi * x);
+            // Blackman window spanning [-halfWidth, halfWidth].
+            const double w = 0.5 + 0.5 * (x / halfWidth);
+            const double window =
+                (w <= 0.0 || w >= 1.0) ? 0.0 : 0.42 - 0.5 * std::cos(2.0 * kPi * w) + 0.08 * std::cos(4.0 * kPi * w);
+            taps[t] = sinc * window;
+            sum += taps[t];
+        }
+
+        // Unity DC gain for every phase so slow rate changes cannot modulate the level.
+        for (int t = 0; t < kResamplerTaps; ++t) {
+            table[p][t] = static_cast<float>(taps[t] / sum);
+        }
+    }
+
+    return table;
+}
+
+const PhaseTable& phaseTable() {
+    static const PhaseTable table = buildPhaseTable();
+    return table;
+}
+
+int16_t toPcm16(float value) {
+    const float rounded = std::nearbyint(value);
+    return static_cast<int16_t>(std::clamp(rounded, static_cast<float>(INT16_MIN), static_cast<float>(INT16_MAX)));
+}
+}  // namespace
+
+double resamplePcm16(const int16_t* input,
+                     double startPosition,
+                     double ratio,
+                     int16_t* output,
+                     std::size_t outputCount,
+                     std::size_t stride) {
+    const PhaseTable& table = phaseTable();
+    double position = startPosition;
+
+    for (std::size_t k = 0; k < outputCount; ++k) {
+        const double whole = std::floor(position);
+        const double phase = (position - whole) * kResamplerPhases;
+        const int phaseIndex = static_cast<int>(phase);
+        const float blend = static_cast<float>(phase - phaseIndex);
+        const auto& lower = table[phaseIndex];
+        const auto& upper = table[phaseIndex + 1];
+        const int16_t* taps = input + static_cast<std::ptrdiff_t>(whole) - kResamplerHistory;
+
+        float accLower = 0.0F;
+        float accUpper = 0.0F;
+        for (int t = 0; t < kResamplerTaps; ++t) {
+            const auto sample = static_cast<float>(taps[t]);
+            accLower += sample * lower[t];
+            accUpper += sample * upper[t];
+        }
+
+        output[k * stride] = toPcm16(accLower + (accUpper - accLower) * blend);
+        position = startPosition + static_cast<double>(k + 1) * ratio;
+    }
+
+    return position;
+}
+
+std::size_t resamplerInputSpan(double startPosition, double ratio, std::size_t outputCount) {
+    if (outputCount == 0) {
+        return 0;
+    }
+
+    const double last = startPosition + static_cast<double>(outputCount - 1) * ratio;
+    return static_cast<std::size_t>(std::floor(last)) + kResamplerHistory + kResamplerLookahead + 1;
+}
+
+}  // namespace multiconnect
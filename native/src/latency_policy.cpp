@@ -0,0 +1,181 @@
+#include "multiconnect/latency_policy.h"
+
+#include <algorithm>
+#include <cmath>
+#include <utility>
+
+namespace multiconnect {
+
+namespace {
+
+// In concurrent mode SyncEngine keeps a quarter of the ring behind the slowest reader as rewind
+// headroom, so readers can lag by at most the other three quarters.
+constexpr double kConcurrentUsableFraction = 0.75;
+
+}  // namespace
+
+LatencyPolicy::LatencyPolicy(SyncEngine& engine, const LatencyPolicyConfig& config)
+    : engine_(engine), config_(config), trackers_(engine.maxDevices()) {
+    config_.sampleRateHz = std::max(config_.sampleRateHz, 1);
+    config_.jitterSigmas = std::max(config_.jitterSigmas, 0.0);
+    config_.minHeadroomMs = std::max(config_.minHeadroomMs, 0.0);
+    config_.minBufferMs = std::max(config_.minBufferMs, 0.0);
+    config_.maxBufferMs = std::max(config_.maxBufferMs, config_.minBufferMs);
+    config_.shrinkHysteresis = std::max(config_.shrinkHysteresis, 0.0);
+    config_.smoothingObservations = std::max(config_.smoothingObservations, 1.0);
+}
+
+bool LatencyPolicy::setOutputLatencyMs(DeviceHandle handle, double latencyMs) {
+    Tracker* tracker = trackerFor(handle);
+    if (tracker == nullptr || !std::isfinite(latencyMs)) {
+        return false;
+    }
+    tracker->outputLatencyMs = std::max(latencyMs, 0.0);
+    return true;
+}
+
+std::size_t LatencyPolicy::setOutputLatencies(const CalibrationStore& store) {
+    std::size_t set = 0;
+    for (std::size_t i = 0; i < trackers_.size(); ++i) {
+        const DeviceHandle handle{static_cast<int32_t>(i)};
+        if (!engine_.hasDevice(handle)) {
+            continue;
+        }
+        const DeviceCalibration* calibration = store.find(engine_.deviceId(handle));
+        if (calibration != nullptr && setOutputLatencyMs(handle, calibration->latencyMs)) {
+            ++set;
+        }
+    }
+    return set;
+}
+
+void LatencyPolicy::observe() {
+    const double floorAlpha = 1.0 / config_.smoothingObservations;
+    for (std::size_t i = 0; i < trackers_.size(); ++i) {
+        const DeviceHandle handle{static_cast<int32_t>(i)};
+        Tracker* tracker = trackerFor(handle);
+        if (tracker == nullptr) {
+            continue;
+        }
+        const DeviceMetrics metrics = engine_.deviceMetrics(handle);
+        // Nothing pulled since the last look: the lag on record is not a new measurement.
+        if (metrics.framesRead == tracker->lastFramesRead) {
+            continue;
+        }
+        tracker->lastFramesRead = metrics.framesRead;
+        ++tracker->observations;
+
+        // Plain averages until the window fills, then exponentially weighted (West's update).
+        const double alpha = std::max(1.0 / static_cast<double>(tracker->observations), floorAlpha);
+        const double difference = static_cast<double>(metrics.lagFrames) - tracker->meanLagFrames;
+        const double increment = alpha * difference;
+        tracker->meanLagFrames += increment;
+        tracker->lagVariance = (1.0 - alpha) * (tracker->lagVariance + difference * increment);
+    }
+}
+
+std::size_t LatencyPolicy::recommendedCapacitySamples() const {
+    const double frameRate = config_.sampleRateHz / 1000.0;
+    const double minHeadroomFrames = config_.minHeadroomMs * frameRate;
+    const Tracker unobserved;
+
+    double neededFrames = 0.0;
+    for (std::size_t i = 0; i < trackers_.size(); ++i) {
+        const DeviceHandle handle{static_cast<int32_t>(i)};
+        if (!engine_.hasDevice(handle)) {
+            continue;
+        }
+        const Tracker* tracker = trackerFor(handle);
+        const Tracker& current = tracker != nullptr ? *tracker : unobserved;
+        const double headroom = std::max(config_.jitterSigmas * std::sqrt(current.lagVariance), minHeadroomFrames);
+        neededFrames = std::max(neededFrames, expectedLagFrames(handle, current) + headroom);
+    }
+
+    if (engine_.mode() == SyncEngineMode::kConcurrent) {
+        neededFrames /= kConcurrentUsableFraction;
+    }
+    neededFrames = std::clamp(neededFrames, config_.minBufferMs * frameRate, config_.maxBufferMs * frameRate);
+    return std::max<std::size_t>(static_cast<std::size_t>(std::ceil(neededFrames)), 1);
+}
+
+bool LatencyPolicy::apply() {
+    const std::size_t target = recommendedCapacitySamples();
+    const std::size_t current = engine_.masterCapacitySamples();
+    if (target == current ||
+        (target < current && static_cast<double>(current) <= static_cast<double>(target) * (1.0 + config_.shrinkHysteresis))) {
+        return false;
+    }
+    return engine_.resizeRing(target);
+}
+
+DeviceLatencyReport LatencyPolicy::report(DeviceHandle handle) const {
+    DeviceLatencyReport report;
+    if (!engine_.hasDevice(handle)) {
+        return report;
+    }
+    const Tracker unobserved;
+    const Tracker* tracker = trackerFor(handle);
+    const Tracker& current = tracker != nullptr ? *tracker : unobserved;
+
+    report.handle = handle;
+    report.bufferLatencyMs = framesToMs(expectedLagFrames(handle, current));
+    report.jitterMs = framesToMs(std::sqrt(current.lagVariance));
+    report.outputLatencyMs = current.outputLatencyMs;
+    report.endToEndMs = report.bufferLatencyMs + report.outputLatencyMs;
+    report.observations = current.observations;
+    return report;
+}
+
+std::size_t LatencyPolicy::reports(DeviceLatencyReport* out, std::size_t maxDevices) const {
+    if (out == nullptr) {
+        return 0;
+    }
+    std::size_t written = 0;
+    for (std::size_t i = 0; i < trackers_.size() && written < maxDevices; ++i) {
+        const DeviceHandle handle{static_cast<int32_t>(i)};
+        if (engine_.hasDevice(handle)) {
+            out[written++] = report(handle);
+        }
+    }
+    return written;
+}
+
+const LatencyPolicyConfig& LatencyPolicy::config() const {
+    return config_;
+}
+
+LatencyPolicy::Tracker* LatencyPolicy::trackerFor(DeviceHandle handle) {
+    if (!handle.valid() || static_cast<std::size_t>(handle.index) >= trackers_.size() || !engine_.hasDevice(handle)) {
+        return nullptr;
+    }
+    Tracker& tracker = trackers_[static_cast<std::size_t>(handle.index)];
+    std::string deviceId = engine_.deviceId(handle);
+    if (deviceId != tracker.deviceId) {
+        tracker = Tracker{};
+        tracker.deviceId = std::move(deviceId);
+    }
+    return &tracker;
+}
+
+const LatencyPolicy::Tracker* LatencyPolicy::trackerFor(DeviceHandle handle) const {
+    if (!handle.valid() || static_cast<std::size_t>(handle.index) >= trackers_.size()) {
+        return nullptr;
+    }
+    const Tracker& tracker = trackers_[static_cast<std::size_t>(handle.index)];
+    // A slot taken over by another device since the last observe() has nothing measured yet.
+    return engine_.deviceId(handle) == tracker.deviceId ? &tracker : nullptr;
+}
+
+double LatencyPolicy::expectedLagFrames(DeviceHandle handle, const Tracker& tracker) const {
+    if (tracker.observations > 0) {
+        return tracker.meanLagFrames;
+    }
+    // A device that has not played yet will trail the write position by its (negative) offset.
+    return std::max(-static_cast<double>(engine_.deviceState(handle).offsetSamples), 0.0);
+}
+
+double LatencyPolicy::framesToMs(double frames) const {
+    return frames * 1000.0 / config_.sampleRateHz;
+}
+
+}  // namespace multiconnect
@@ -2,48 +2,151 @@
 
 #include <algorithm>
 #include <cstring>
+#include <utility>
 
 namespace multiconnect {
 
-MasterRingBuffer::MasterRingBuffer(std::size_t capacitySamples)
-    : data_(std::max<std::size_t>(capacitySamples, 1), 0) {}
+namespace {
+std::size_t roundUpToPowerOfTwo(std::size_t value) {
+    std::size_t rounded = 1;
+    while (rounded < value) {
+        rounded <<= 1U;
+    }
+    return rounded;
+}
 
-std::size_t MasterRingBuffer::write(const int16_t* input, std::size_t sampleCount) {
-    if (input == nullptr || sampleCount == 0) {
-        return 0;
+std::size_t resolveCapacity(std::size_t capacityFrames, RingCapacityPolicy policy) {
+    const std::size_t requested = std::max<std::size_t>(capacityFrames, 1);
+    return policy == RingCapacityPolicy::kRoundUpToPowerOfTwo ? roundUpToPowerOfTwo(requested) : requested;
+}
+}  // namespace
+
+template <typename Sample>
+PcmRingBuffer<Sample>::PcmRingBuffer(std::size_t capacityFrames, RingCapacityPolicy policy)
+    : PcmRingBuffer(capacityFrames, 1, policy) {}
+
+template <typename Sample>
+PcmRingBuffer<Sample>::PcmRingBuffer(std::size_t capacityFrames, std::size_t channels, RingCapacityPolicy policy)
+    : capacity_(resolveCapacity(capacityFrames, policy)),
+      channels_(std::max<std::size_t>(channels, 1)),
+      data_(capacity_ * channels_, Sample{}) {
+    if ((capacity_ & (capacity_ - 1)) == 0) {
+        mask_ = capacity_ - 1;
     }
+}
 
-    for (std::size_t i = 0; i < sampleCount; ++i) {
-        data_[writeHead_] = input[i];
-        writeHead_ = (writeHead_ + 1) % data_.size();
-        size_ = std::min(size_ + 1, data_.size());
+template <typename Sample>
+std::size_t PcmRingBuffer<Sample>::write(const Sample* input, std::size_t frameCount) {
+    if (input == nullptr || frameCount == 0) {
+        return 0;
     }
 
-    return sampleCount;
+    // Single writer: nobody else modifies the counter, so a relaxed load is enough here.
+    const uint64_t written = written_.load(std::memory_order_relaxed);
+
+    // Only the newest `capacity` frames survive a write longer than the ring.
+    const std::size_t skipped = frameCount > capacity_ ? frameCount - capacity_ : 0;
+    const std::size_t toCopy = frameCount - skipped;
+    const std::size_t start = slotFor(static_cast<int64_t>(written + skipped));
+    const std::size_t firstSegment = std::min(toCopy, capacity_ - start);
+    const Sample* source = input + skipped * channels_;
+    std::memcpy(data_.data() + start * channels_, source, firstSegment * channels_ * sizeof(Sample));
+    std::memcpy(data_.data(), source + firstSegment * channels_, (toCopy - firstSegment) * channels_ * sizeof(Sample));
+
+    written_.store(written + frameCount, std::memory_order_release);
+    return frameCount;
 }
 
-std::size_t MasterRingBuffer::readWithOffset(std::size_t logicalReadHead,
-                                             int32_t offsetSamples,
-                                             int16_t* output,
-                                             std::size_t sampleCount) const {
-    if (output == nullptr || sampleCount == 0 || size_ == 0) {
+template <typename Sample>
+std::size_t PcmRingBuffer<Sample>::readWithOffset(std::size_t logicalReadHead,
+                                                  int32_t offsetFrames,
+                                                  Sample* output,
+                                                  std::size_t frameCount) const {
+    const std::size_t buffered = size();
+    if (output == nullptr || frameCount == 0 || buffered == 0) {
         return 0;
     }
 
-    const std::size_t readable = std::min(sampleCount, size_);
-    for (std::size_t i = 0; i < readable; ++i) {
-        const int64_t shifted = static_cast<int64_t>(logicalReadHead + i) + offsetSamples;
-        const int64_t normalized = ((shifted % static_cast<int64_t>(data_.size())) +
-                                    static_cast<int64_t>(data_.size())) %
-                                   static_cast<int64_t>(data_.size());
-        output[i] = data_[static_cast<std::size_t>(normalized)];
+    const std::size_t readable = std::min(frameCount, buffered);
+    readAt(static_cast<int64_t>(logicalReadHead) + offsetFrames, output, readable);
+    return readable;
+}
+
+template <typename Sample>
+void PcmRingBuffer<Sample>::readAt(int64_t logicalIndex, Sample* output, std::size_t frameCount) const {
+    if (output == nullptr || frameCount == 0) {
+        return;
     }
 
-    return readable;
+    const PcmRingSegments<Sample> segments = segmentsAt(logicalIndex, frameCount);
+    std::memcpy(output, segments.first, segments.firstCount * channels_ * sizeof(Sample));
+    std::memcpy(output + segments.firstCount * channels_, segments.second, segments.secondCount * channels_ * sizeof(Sample));
+}
+
+template <typename Sample>
+PcmRingSegments<Sample> PcmRingBuffer<Sample>::segmentsAt(int64_t logicalIndex, std::size_t frameCount) const {
+    const std::size_t count = std::min(frameCount, capacity_);
+    const std::size_t start = slotFor(logicalIndex);
+    const std::size_t firstCount = std::min(count, capacity_ - start);
+    return {data_.data() + start * channels_, firstCount, data_.data(), count - firstCount};
 }
 
-std::size_t MasterRingBuffer::size() const { return size_; }
+template <typename Sample>
+void PcmRingBuffer<Sample>::resize(std::size_t capacityFrames, RingCapacityPolicy policy) {
+    PcmRingBuffer resized(capacityFrames, channels_, policy);
+    const uint64_t written = written_.load(std::memory_order_relaxed);
+    const std::size_t kept = std::min(size(), resized.capacity_);
+
+    // Replaying the kept frames from their first stream index lands each one in its new slot.
+    resized.written_.store(written - kept, std::memory_order_relaxed);
+    const PcmRingSegments<Sample> segments = segmentsAt(static_cast<int64_t>(written - kept), kept);
+    resized.write(segments.first, segments.firstCount);
+    resized.write(segments.second, segments.secondCount);
+
+    capacity_ = resized.capacity_;
+    mask_ = resized.mask_;
+    data_ = std::move(resized.data_);
+}
+
+template <typename Sample>
+std::size_t PcmRingBuffer<Sample>::size() const {
+    const uint64_t written = totalWritten();
+    return written < capacity_ ? static_cast<std::size_t>(written) : capacity_;
+}
+
+template <typename Sample>
+std::size_t PcmRingBuffer<Sample>::capacity() const {
+    return capacity_;
+}
+
+template <typename Sample>
+std::size_t PcmRingBuffer<Sample>::channels() const {
+    return channels_;
+}
+
+template <typename Sample>
+bool PcmRingBuffer<Sample>::isPowerOfTwo() const {
+    return mask_ + 1 == capacity_;
+}
+
+template <typename Sample>
+uint64_t PcmRingBuffer<Sample>::totalWritten() const {
+    return written_.load(std::memory_order_acquire);
+}
+
+template <typename Sample>
+std::size_t PcmRingBuffer<Sample>::slotFor(int64_t logicalIndex) const {
+    if (isPowerOfTwo()) {
+        // Two's-complement wrap keeps negative indices correct under the mask.
+        return static_cast<std::size_t>(logicalIndex) & mask_;
+    }
+
+    const auto capacity = static_cast<int64_t>(capacity_);
+    const int64_t wrapped = logicalIndex % capacity;
+    return static_cast<std::size_t>(wrapped < 0 ? wrapped + capacity : wrapped);
+}
 
-std::size_t MasterRingBuffer::capacity() const { return data_.size(); }
+template class PcmRingBuffer<int16_t>;
+template class PcmRingBuffer<float>;
 
 }  // namespace multiconnect
@@ -0,0 +1,309 @@
+#include "multiconnect/offset_estimator.h"
+
+#include <algorithm>
+#include <cmath>
+#include <complex>
+#include <utility>
+#include <vector>
+
+namespace multiconnect {
+
+namespace {
+
+using Complex = std::complex<double>;
+
+constexpr double kPi = 3.14159265358979323846;
+// Cross-spectrum bins this far below the strongest one carry no usable phase and are dropped
+// instead of being whitened up to unit weight.
+constexpr double kPhatFloor = 1e-9;
+// FFT stages up to this many butterflies per block read twiddles from a table; larger stages use a
+// recurrence re-seeded exactly this often to bound rounding drift.
+constexpr std::size_t kMaxTwiddleTable = 1U << 16U;
+constexpr std::size_t kTwiddleReseed = 64;
+// Correlation bins on each side used to interpolate between them, and golden-section steps
+// (0.618^40 of a sample is far below anything audible).
+constexpr int64_t kRefineHalfWidth = 16;
+constexpr int kRefineIterations = 40;
+
+std::size_t roundUpToPowerOfTwo(std::size_t value) {
+    std::size_t rounded = 1;
+    while (rounded < value) {
+        rounded <<= 1U;
+    }
+    return rounded;
+}
+
+inline void butterfly(double* even, double* odd, double wRe, double wIm) {
+    const double oddRe = odd[0] * wRe - odd[1] * wIm;
+    const double oddIm = odd[0] * wIm + odd[1] * wRe;
+    odd[0] = even[0] - oddRe;
+    odd[1] = even[1] - oddIm;
+    even[0] += oddRe;
+    even[1] += oddIm;
+}
+
+// Iterative radix-2 FFT, unscaled in both directions. Butterflies use plain double arithmetic so
+// the compiler does not route every product through the NaN-checking complex multiply.
+void fftInPlace(std::vector<Complex>& data, bool inverse) {
+    const std::size_t n = data.size();
+    for (std::size_t i = 1, j = 0; i < n; ++i) {
+        std::size_t bit = n >> 1U;
+        for (; (j & bit) != 0; bit >>= 1U) {
+            j ^= bit;
+        }
+        j ^= bit;
+        if (i < j) {
+            std::swap(data[i], data[j]);
+        }
+    }
+
+    auto* values = reinterpret_cast<double*>(data.data());
+    std::size_t firstLength = 2;
+    if (n >= 4) {
+        // The first two stages only need twiddles of 1 and +/-i: run them fused, without multiplies.
+        const double sign = inverse ? 1.0 : -1.0;
+        for (std::size_t start = 0; start < n; start += 4) {
+            double* x = values + 2 * start;
+            const double a0Re = x[0] + x[2];
+            const double a0Im = x[1] + x[3];
+            const double a1Re = x[0] - x[2];
+            const double a1Im = x[1] - x[3];
+            const double b0Re = x[4] + x[6];
+            const double b0Im = x[5] + x[7];
+            const double b1Re = -sign * (x[5] - x[7]);
+            const double b1Im = sign * (x[4] - x[6]);
+            x[0] = a0Re + b0Re;
+            x[1] = a0Im + b0Im;
+            x[4] = a0Re - b0Re;
+            x[5] = a0Im - b0Im;
+            x[2] = a1Re + b1Re;
+            x[3] = a1Im + b1Im;
+            x[6] = a1Re - b1Re;
+            x[7] = a1Im - b1Im;
+        }
+        firstLength = 8;
+    }
+
+    std::vector<double> twiddles;
+    for (std::size_t length = firstLength; length <= n; length <<= 1U) {
+        const std::size_t half = length / 2;
+        const double angle = (inverse ? 2.0 : -2.0) * kPi / static_cast<double>(length);
+        // Small stages repeat their twiddles across many blocks, so tabulate them; the few blocks
+        // of a large stage generate theirs with a recurrence instead of a table the size of the data.
+        const bool tabulated = half <= kMaxTwiddleTable;
+        if (tabulated) {
+            twiddles.resize(2 * half);
+            for (std::size_t k = 0; k < half; ++k) {
+                twiddles[2 * k] = std::cos(angle * static_cast<double>(k));
+                twiddles[2 * k + 1] = std::sin(angle * static_cast<double>(k));
+            }
+        }
+        const double stepRe = std::cos(angle);
+        const double stepIm = std::sin(angle);
+
+        for (std::size_t start = 0; start < n; start += length) {
+            double* even = values + 2 * start;
+            double* odd = even + 2 * half;
+            if (tabulated) {
+                for (std::size_t k = 0; k < half; ++k) {
+                    butterfly(even + 2 * k, odd + 2 * k, twiddles[2 * k], twiddles[2 * k + 1]);
+                }
+                continue;
+            }
+            for (std::size_t block = 0; block < half; block += kTwiddleReseed) {
+                double wRe = std::cos(angle * static_cast<double>(block));
+                double wIm = std::sin(angle * static_cast<double>(block));
+                for (std::size_t k = block; k < std::min(half, block + kTwiddleReseed); ++k) {
+                    butterfly(even + 2 * k, odd + 2 * k, wRe, wIm);
+                    const double nextRe = wRe * stepRe - wIm * stepIm;
+                    wIm = wRe * stepIm + wIm * stepRe;
+                    wRe = nextRe;
+                }
+            }
+        }
+    }
+}
+
+template <typename Sample>
+OffsetEstimate estimate(const Sample* reference,
+                        std::size_t referenceCount,
+                        const Sample* capture,
+                        std::size_t captureCount,
+                        const GccPhatConfig& config) {
+    OffsetEstimate result;
+    if (reference == nullptr || capture == nullptr || referenceCount == 0 || captureCount == 0) {
+        return result;
+    }
+
+    // Lags in [-leadLimit, lateLimit]; anything wider has no overlap between the two signals.
+    std::size_t lateLimit = captureCount - 1;
+    std::size_t leadLimit = referenceCount - 1;
+    if (config.maxLagSamples > 0) {
+        lateLimit = std::min(lateLimit, config.maxLagSamples);
+        leadLimit = std::min(leadLimit, config.maxLagSamples);
+    }
+    // Large enough that the circular correlation never wraps inside the searched lags.
+    const std::size_t n = roundUpToPowerOfTwo(std::max(referenceCount + lateLimit, captureCount + leadLimit));
+
+    // Both real signals ride in one complex transform: reference as real part, capture as imaginary.
+    std::vector<Complex> spectrum(n);
+    bool referenceSilent = true;
+    bool captureSilent = true;
+    for (std::size_t i = 0; i < referenceCount; ++i) {
+        spectrum[i].real(static_cast<double>(reference[i]));
+        referenceSilent = referenceSilent && reference[i] == 0;
+    }
+    for (std::size_t i = 0; i < captureCount; ++i) {
+        spectrum[i].imag(static_cast<double>(capture[i]));
+        captureSilent = captureSilent && capture[i] == 0;
+    }
+    // The packed transform leaks rounding noise from one signal into the other's bins, so a silent
+    // side would otherwise whiten that noise into a spurious peak.
+    if (referenceSilent || captureSilent) {
+        return result;
+    }
+    fftInPlace(spectrum, false);
+
+    // Unpack X[k] = (Z[k] + conj Z[n-k]) / 2 and Y[k] = (Z[k] - conj Z[n-k]) / 2i, and replace each
+    // pair of bins with the cross spectrum Y[k] conj X[k] in place.
+    const auto magnitudeOf = [](const Complex& bin) {
+        return std::sqrt(bin.real() * bin.real() + bin.imag() * bin.imag());
+    };
+    double strongest = 0.0;
+    for (std::size_t k = 0; k <= n / 2; ++k) {
+        const std::size_t mirror = (n - k) & (n - 1);
+        const Complex zk = spectrum[k];
+        const Complex zm = spectrum[mirror];
+        const auto cross = [](const Complex& a, const Complex& b) {
+            const double xRe = 0.5 * (a.real() + b.real());
+            const double xIm = 0.5 * (a.imag() - b.imag());
+            const double yRe = 0.5 * (a.imag() + b.imag());
+            const double yIm = 0.5 * (b.real() - a.real());
+            return Complex(yRe * xRe + yIm * xIm, yIm * xRe - yRe * xIm);
+        };
+        spectrum[k] = cross(zk, zm);
+        spectrum[mirror] = cross(zm, zk);
+        strongest = std::max({strongest, magnitudeOf(spectrum[k]), magnitudeOf(spectrum[mirror])});
+    }
+    if (strongest == 0.0) {
+        return result;
+    }
+
+    // Phase transform: keep only the phase of every usable bin. A raised-cosine taper toward Nyquist
+    // turns the otherwise sinc-shaped peak into a smooth one whose tails die off within a few bins,
+    // so the sub-sample interpolation below needs only the bins next to the peak.
+    const double floor = strongest * kPhatFloor;
+    double weightSum = 0.0;
+    const auto whiten = [&](Complex& bin, double weight) {
+        const double magnitude = magnitudeOf(bin);
+        if (magnitude > floor) {
+            bin *= weight / magnitude;
+            weightSum += weight;
+        } else {
+            bin = Complex();
+        }
+    };
+    for (std::size_t k = 0; k <= n / 2; ++k) {
+        // Bins k and n - k share a frequency magnitude and therefore a weight.
+        const double weight = 0.5 + 0.5 * std::cos(2.0 * kPi * static_cast<double>(k) / static_cast<double>(n));
+        whiten(spectrum[k], weight);
+        const std::size_t mirror = n - k;
+        if (k != 0 && mirror != k) {
+            whiten(spectrum[mirror], weight);
+        }
+    }
+    fftInPlace(spectrum, true);
+
+    const auto correlationAt = [&](int64_t lag) {
+        return spectrum[static_cast<std::size_t>(lag) & (n - 1)].real() / weightSum;
+    };
+    const auto firstLag = -static_cast<int64_t>(leadLimit);
+    const auto lastLag = static_cast<int64_t>(lateLimit);
+    int64_t bestLag = firstLag;
+    double best = correlationAt(firstLag);
+    for (int64_t lag = firstLag + 1; lag <= lastLag; ++lag) {
+        const double value = correlationAt(lag);
+        if (value > best) {
+            best = value;
+            bestLag = lag;
+        }
+    }
+
+    // Vertex of the parabola through the peak and its neighbours...
+    double fraction = 0.0;
+    if (bestLag > firstLag && bestLag < lastLag) {
+        const double before = correlationAt(bestLag - 1);
+        const double after = correlationAt(bestLag + 1);
+        const double curvature = before - 2.0 * best + after;
+        if (curvature < 0.0) {
+            fraction = std::clamp(0.5 * (before - after) / curvature, -0.5, 0.5);
+        }
+    }
+
+    // ...then polished on a windowed-sinc interpolation of the (band-limited) correlation, since even
+    // the tapered peak is not quite a parabola and the bare vertex leans toward the whole sample.
+    const auto interpolatedAt = [&](double lag) {
+        const auto base = static_cast<int64_t>(std::floor(lag));
+        double sum = 0.0;
+        for (int64_t m = std::max(base - kRefineHalfWidth + 1, firstLag); m <= std::min(base + kRefineHalfWidth, lastLag);
+             ++m) {
+            const double x = lag - static_cast<double>(m);
+            const double sinc = x == 0.0 ? 1.0 : std::sin(kPi * x) / (kPi * x);
+            const double window = 0.5 + 0.5 * std::cos(kPi * x / kRefineHalfWidth);
+            sum += correlationAt(m) * sinc * window;
+        }
+        return sum;
+    };
+    if (fraction != 0.0) {
+        // Golden-section search for the maximum between the vertex's neighbouring half samples.
+        constexpr double kInvPhi = 0.6180339887498949;
+        double low = static_cast<double>(bestLag) + std::min(fraction, 0.0) - 0.5;
+        double high = static_cast<double>(bestLag) + std::max(fraction, 0.0) + 0.5;
+        double left = high - kInvPhi * (high - low);
+        double right = low + kInvPhi * (high - low);
+        double leftValue = interpolatedAt(left);
+        double rightValue = interpolatedAt(right);
+        for (int i = 0; i < kRefineIterations; ++i) {
+            if (leftValue < rightValue) {
+                low = left;
+                left = right;
+                leftValue = rightValue;
+                right = low + kInvPhi * (high - low);
+                rightValue = interpolatedAt(right);
+            } else {
+                high = right;
+                right = left;
+                rightValue = leftValue;
+                left = high - kInvPhi * (high - low);
+                leftValue = interpolatedAt(left);
+            }
+        }
+        fraction = 0.5 * (low + high) - static_cast<double>(bestLag);
+        best = std::max(best, interpolatedAt(0.5 * (low + high)));
+    }
+
+    result.lagSamples = static_cast<double>(bestLag) + fraction;
+    result.peak = best;
+    result.valid = best > 0.0;
+    return result;
+}
+
+}  // namespace
+
+OffsetEstimate estimateOffsetGccPhat(const int16_t* reference,
+                                     std::size_t referenceCount,
+                                     const int16_t* capture,
+                                     std::size_t captureCount,
+                                     const GccPhatConfig& config) {
+    return estimate(reference, referenceCount, capture, captureCount, config);
+}
+
+OffsetEstimate estimateOffsetGccPhat(const float* reference,
+                                     std::size_t referenceCount,
+                                     const float* capture,
+                                     std::size_t captureCount,
+                                     const GccPhatConfig& config) {
+    return estimate(reference, referenceCount, capture, captureCount, config);
+}
+
+}  // namespace multiconnect
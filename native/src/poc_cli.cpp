@@ -1,8 +1,11 @@
 #include "multiconnect/logging.h"
 #include "multiconnect/master_ring_buffer.h"
+#include "multiconnect/offset_estimator.h"
+#include "multiconnect/run_record.h"
 #include "multiconnect/sync_math.h"
 
 #include <algorithm>
+#include <atomic>
 #include <chrono>
 #include <cmath>
 #include <cstdint>
@@ -11,10 +14,12 @@
 #include <fstream>
 #include <iomanip>
 #include <iostream>
+#include <limits>
+#include <random>
 #include <sstream>
 #include <string>
 #include <string_view>
-#include <chrono>
+#include <thread>
 #include <vector>
 
 namespace {
@@ -30,13 +35,33 @@ std::vector<int16_t> makeImpulsePattern(int32_t sampleRateHz, int32_t durationMs
     return signal;
 }
 
-std::size_t findFirstImpulse(const std::vector<int16_t>& signal, int16_t threshold) {
-    for (std::size_t i = 0; i < signal.size(); ++i) {
-        if (signal[i] >= threshold) {
-            return i;
-        }
+// Plays the impulse pattern to every device at its requested offset and measures each device's
+// offset relative to device 0 from what it actually received.
+std::vector<double> measureDeviceOffsetsMs(int32_t sampleRateHz,
+                                           int32_t durationMs,
+                                           const std::vector<int32_t>& requestedOffsetsMs) {
+    auto pattern = makeImpulsePattern(sampleRateHz, durationMs);
+    multiconnect::MasterRingBuffer ring(pattern.size());
+    ring.write(pattern.data(), pattern.size());
+
+    std::vector<std::vector<int16_t>> devices(requestedOffsetsMs.size(), std::vector<int16_t>(pattern.size(), 0));
+    for (std::size_t i = 0; i < devices.size(); ++i) {
+        const int32_t offsetSamples = multiconnect::delayMsToSamples(requestedOffsetsMs[i], sampleRateHz);
+        ring.readWithOffset(0, offsetSamples, devices[i].data(), devices[i].size());
+    }
+
+    // The ring read wraps around the pattern, so only lags within half of it are meaningful.
+    multiconnect::GccPhatConfig estimator;
+    estimator.maxLagSamples = std::max<std::size_t>(pattern.size() / 2, 1);
+
+    std::vector<double> measuredMs(devices.size(), 0.0);
+    for (std::size_t i = 1; i < devices.size(); ++i) {
+        // How much later device 0 plays the same content than device i.
+        const auto estimate = multiconnect::estimateOffsetGccPhat(devices[i].data(), devices[i].size(),
+                                                                  devices[0].data(), devices[0].size(), estimator);
+        measuredMs[i] = estimate.lagSamples * 1000.0 / sampleRateHz;
     }
-    return signal.size();
+    return measuredMs;
 }
 
 struct CliOptions {
@@ -46,6 +71,24 @@ struct CliOptions {
     std::string deviceA = "deviceA";
     std::string deviceB = "deviceB";
     std::string notes;
+    // Also append fixed-width binary records (multiconnect/run_record.h) to this file.
+    std::string recordFile;
+    int32_t sampleRateHz = 44100;
+    int32_t durationMs = 1000;
+
+    // Sweep mode: every combination of device count, sample rate, duration and offset, `trials`
+    // times each. Device 0 is the reference, device 1 gets the grid offset and any further devices
+    // a random offset in [-randomOffsetMs, randomOffsetMs].
+    bool sweep = false;
+    std::vector<int32_t> sweepDeviceCounts{2, 3, 4};
+    std::vector<int32_t> sweepSampleRatesHz{44100, 48000};
+    std::vector<int32_t> sweepDurationsMs{1000};
+    std::vector<int32_t> sweepOffsetsMs{-60, -30, 0, 30, 60};
+    int32_t trials = 1;
+    int32_t randomOffsetMs = 80;
+    uint64_t seed = 1;
+    unsigned threads = 0;
+    bool valid = true;
 };
 
 bool parseDouble(std::string_view text, double* outValue) {
@@ -64,6 +107,39 @@ bool parseDouble(std::string_view text, double* outValue) {
     return true;
 }
 
+// Comma-separated integers and inclusive start:stop:step ranges, e.g. "-60:60:30,100".
+bool parseIntList(std::string_view text, std::vector<int32_t>* outValues) {
+    std::vector<int32_t> values;
+    std::stringstream items{std::string(text)};
+    for (std::string item; std::getline(items, item, ',');) {
+        std::vector<double> bounds;
+        std::stringstream parts(item);
+        for (std::string part; std::getline(parts, part, ':');) {
+            double parsed = 0.0;
+            if (!parseDouble(part, &parsed)) {
+                return false;
+            }
+            bounds.push_back(parsed);
+        }
+
+        if (bounds.size() == 1) {
+            values.push_back(static_cast<int32_t>(bounds[0]));
+        } else if (bounds.size() == 3 && bounds[2] > 0.0 && bounds[0] <= bounds[1]) {
+            for (double value = bounds[0]; value <= bounds[1]; value += bounds[2]) {
+                values.push_back(static_cast<int32_t>(value));
+            }
+        } else {
+            return false;
+        }
+    }
+
+    if (values.empty()) {
+        return false;
+    }
+    *outValues = std::move(values);
+    return true;
+}
+
 CliOptions parseArgs(int argc, char** argv) {
     CliOptions options;
     bool offsetAssigned = false;
@@ -99,6 +175,81 @@ CliOptions parseArgs(int argc, char** argv) {
             continue;
         }
 
+        if (arg == "--record-file" && i + 1 < argc) {
+            options.recordFile = argv[++i];
+            continue;
+        }
+
+        if (arg == "--sweep") {
+            options.sweep = true;
+            continue;
+        }
+
+        std::vector<int32_t>* list = nullptr;
+        // Same bounds as the single-run options: a sweep case needs a reference and a device under
+        // test, a positive sample rate and a non-empty signal.
+        int32_t listMinimum = std::numeric_limits<int32_t>::min();
+        if (arg == "--devices") {
+            list = &options.sweepDeviceCounts;
+            listMinimum = 2;
+        } else if (arg == "--sample-rates") {
+            list = &options.sweepSampleRatesHz;
+            listMinimum = 1;
+        } else if (arg == "--durations-ms") {
+            list = &options.sweepDurationsMs;
+            listMinimum = 1;
+        } else if (arg == "--offsets-ms") {
+            list = &options.sweepOffsetsMs;
+        }
+        if (list != nullptr && i + 1 < argc) {
+            if (!parseIntList(argv[++i], list) ||
+                std::any_of(list->begin(), list->end(), [listMinimum](int32_t value) { return value < listMinimum; })) {
+                std::cerr << "ERROR invalid list for " << arg << ": " << argv[i] << '\n';
+                options.valid = false;
+            }
+            continue;
+        }
+
+        int32_t* scalar = nullptr;
+        int32_t minimum = 0;
+        if (arg == "--sample-rate") {
+            scalar = &options.sampleRateHz;
+            minimum = 1;
+        } else if (arg == "--duration-ms") {
+            scalar = &options.durationMs;
+            minimum = 1;
+        } else if (arg == "--trials") {
+            scalar = &options.trials;
+            minimum = 1;
+        } else if (arg == "--random-offset-ms") {
+            scalar = &options.randomOffsetMs;
+        }
+        if (scalar != nullptr && i + 1 < argc) {
+            double parsed = 0.0;
+            if (parseDouble(argv[++i], &parsed) && parsed >= minimum) {
+                *scalar = static_cast<int32_t>(parsed);
+            } else {
+                std::cerr << "ERROR invalid value for " << arg << ": " << argv[i] << '\n';
+                options.valid = false;
+            }
+            continue;
+        }
+
+        if ((arg == "--seed" || arg == "--threads") && i + 1 < argc) {
+            double parsed = 0.0;
+            if (parseDouble(argv[++i], &parsed) && parsed >= 0.0) {
+                if (arg == "--seed") {
+                    options.seed = static_cast<uint64_t>(parsed);
+                } else {
+                    options.threads = static_cast<unsigned>(parsed);
+                }
+            } else {
+                std::cerr << "ERROR invalid value for " << arg << ": " << argv[i] << '\n';
+                options.valid = false;
+            }
+            continue;
+        }
+
         if (!offsetAssigned) {
             options.offsetMsDeviceB = std::atoi(arg.c_str());
             offsetAssigned = true;
@@ -118,6 +269,107 @@ std::string makeRunTimestamp() {
     return oss.str();
 }
 
+int64_t nowUnixNs() {
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::system_clock::now().time_since_epoch())
+        .count();
+}
+
+std::string jsonString(const std::string& text) {
+    std::ostringstream quoted;
+    quoted << '"';
+    for (const char c : text) {
+        switch (c) {
+            case '"':
+                quoted << "\\\"";
+                break;
+            case '\\':
+                quoted << "\\\\";
+                break;
+            case '\n':
+                quoted << "\\n";
+                break;
+            case '\r':
+                quoted << "\\r";
+                break;
+            case '\t':
+                quoted << "\\t";
+                break;
+            default:
+                if (static_cast<unsigned char>(c) < 0x20) {
+                    quoted << "\\u" << std::hex << std::setw(4) << std::setfill('0') << static_cast<int>(c) << std::dec;
+                } else {
+                    quoted << c;
+                }
+                break;
+        }
+    }
+    quoted << '"';
+    return quoted.str();
+}
+
+std::string csvField(const std::string& text) {
+    if (text.find_first_of(",\"\n") == std::string::npos) {
+        return text;
+    }
+    std::string quoted = "\"";
+    for (const char c : text) {
+        quoted += c;
+        if (c == '"') {
+            quoted += '"';
+        }
+    }
+    return quoted + "\"";
+}
+
+// Every artifact is also appended as one line to <artifact-dir>/artifacts-manifest.csv, so tools can
+// find the latest run (or every run since a timestamp) from the end of the manifest instead of
+// globbing and stat'ing the whole directory. Columns match scripts/artifact_manifest.py.
+struct ManifestEntry {
+    std::string timestamp;
+    std::string kind;
+    std::string fileName;
+    bool pass = false;
+    std::string requestedOffsetMs;
+    std::string measuredOffsetMs;
+    double errorMs = 0.0;
+    double thresholdMs = 0.0;
+};
+
+void appendArtifactManifest(const std::filesystem::path& artifactDir, const ManifestEntry& entry) {
+    const std::filesystem::path manifestPath = artifactDir / "artifacts-manifest.csv";
+    std::error_code error;
+    const bool needsHeader = !std::filesystem::exists(manifestPath, error) ||
+                             std::filesystem::file_size(manifestPath, error) == 0;
+    // A manifest started here would list only this run. Leave a directory that already holds older
+    // artifacts without one; the manifest tools then bootstrap it from every artifact, this one included.
+    if (needsHeader) {
+        for (const auto& file : std::filesystem::directory_iterator(artifactDir, error)) {
+            const std::string name = file.path().filename().string();
+            const bool artifact = (name.rfind("poc_run_", 0) == 0 && file.path().extension() == ".json") ||
+                                  (name.rfind("poc_sweep_", 0) == 0 && file.path().extension() == ".csv");
+            if (artifact && name != entry.fileName) {
+                return;
+            }
+        }
+    }
+
+    // Build the whole line first so concurrent appenders never interleave within a row.
+    std::ostringstream line;
+    if (needsHeader) {
+        line << "timestamp,kind,path,outcome,requested_offset_ms,measured_offset_ms,error_ms,threshold_ms\n";
+    }
+    line << entry.timestamp << ',' << entry.kind << ',' << csvField(entry.fileName) << ','
+         << (entry.pass ? "PASS" : "FAIL") << ',' << entry.requestedOffsetMs << ',' << entry.measuredOffsetMs << ','
+         << entry.errorMs << ',' << entry.thresholdMs << '\n';
+
+    std::ofstream out(manifestPath, std::ios::app | std::ios::binary);
+    if (!out.is_open()) {
+        std::cerr << "WARN unable to open artifact manifest path=" << manifestPath << '\n';
+        return;
+    }
+    out << line.str();
+}
+
 void writeArtifactReport(const CliOptions& options,
                          int32_t sampleRateHz,
                          int32_t durationMs,
@@ -140,43 +392,259 @@ void writeArtifactReport(const CliOptions& options,
     }
 
     out << "{\n"
-        << "  \"timestamp\": \"" << timestamp << "\",\n"
+        << "  \"timestamp\": " << jsonString(timestamp) << ",\n"
         << "  \"sampleRateHz\": " << sampleRateHz << ",\n"
         << "  \"durationMs\": " << durationMs << ",\n"
-        << "  \"deviceA\": \"" << options.deviceA << "\",\n"
-        << "  \"deviceB\": \"" << options.deviceB << "\",\n"
+        << "  \"deviceA\": " << jsonString(options.deviceA) << ",\n"
+        << "  \"deviceB\": " << jsonString(options.deviceB) << ",\n"
         << "  \"requestedOffsetMs\": " << options.offsetMsDeviceB << ",\n"
         << "  \"measuredOffsetMs\": " << measuredOffsetMs << ",\n"
         << "  \"errorFromRequestedMs\": " << errorFromRequestedMs << ",\n"
         << "  \"thresholdMs\": " << options.thresholdMs << ",\n"
         << "  \"outcome\": \"" << (pass ? "PASS" : "FAIL") << "\",\n"
-        << "  \"notes\": \"" << options.notes << "\"\n"
+        << "  \"notes\": " << jsonString(options.notes) << "\n"
         << "}\n";
+    out.close();
+
+    std::ostringstream measured;
+    measured << measuredOffsetMs;
+    appendArtifactManifest(options.artifactDir,
+                           {timestamp, "run", outputPath.filename().string(), pass,
+                            std::to_string(options.offsetMsDeviceB), measured.str(), errorFromRequestedMs,
+                            options.thresholdMs});
 }
-}  // namespace
 
-int main(int argc, char** argv) {
-    constexpr int32_t sampleRateHz = 44100;
-    constexpr int32_t durationMs = 1000;
-    const CliOptions options = parseArgs(argc, argv);
+// Opens --record-file for appending (creating its directory); false, with a warning, if it cannot.
+bool openRecordFile(const CliOptions& options, multiconnect::RunRecordWriter* writer) {
+    if (options.recordFile.empty()) {
+        return false;
+    }
+    const std::filesystem::path parent = std::filesystem::path(options.recordFile).parent_path();
+    std::error_code error;
+    if (!parent.empty()) {
+        std::filesystem::create_directories(parent, error);
+    }
+    if (!writer->open(options.recordFile)) {
+        std::cerr << "WARN unable to open record file (or not a run-record file) path=" << options.recordFile << '\n';
+        return false;
+    }
+    return true;
+}
 
-    auto pattern = makeImpulsePattern(sampleRateHz, durationMs);
-    multiconnect::MasterRingBuffer ring(pattern.size());
-    ring.write(pattern.data(), pattern.size());
+void writeRunRecord(const CliOptions& options,
+                    int32_t sampleRateHz,
+                    int32_t durationMs,
+                    double measuredOffsetMs,
+                    double errorFromRequestedMs,
+                    bool pass) {
+    multiconnect::RunRecordWriter writer;
+    if (!openRecordFile(options, &writer)) {
+        return;
+    }
+
+    multiconnect::RunRecord record;
+    record.timestampNs = nowUnixNs();
+    record.sampleRateHz = sampleRateHz;
+    record.durationMs = durationMs;
+    record.requestedOffsetMs = options.offsetMsDeviceB;
+    record.deviceIndex = 1;
+    record.deviceCount = 2;
+    record.measuredOffsetMs = measuredOffsetMs;
+    record.errorMs = errorFromRequestedMs;
+    record.thresholdMs = options.thresholdMs;
+    record.kind = multiconnect::RunRecordKind::kRun;
+    record.pass = pass;
+    multiconnect::setRunRecordLabel(record.device, options.deviceB);
+    multiconnect::setRunRecordLabel(record.notes, options.notes);
+    if (!writer.append(record) || !writer.close()) {
+        std::cerr << "WARN unable to write record file path=" << options.recordFile << '\n';
+    }
+}
 
-    std::vector<int16_t> deviceA(pattern.size(), 0);
-    std::vector<int16_t> deviceB(pattern.size(), 0);
+struct SweepCase {
+    int32_t trial = 0;
+    int32_t sampleRateHz = 0;
+    int32_t durationMs = 0;
+    std::vector<int32_t> requestedOffsetsMs;
+    std::vector<double> measuredOffsetsMs;
+};
 
-    ring.readWithOffset(0, 0, deviceA.data(), deviceA.size());
+// Offsets are drawn up front from one generator so results do not depend on the thread count.
+std::vector<SweepCase> makeSweepCases(const CliOptions& options) {
+    std::mt19937_64 rng(options.seed);
+    std::uniform_int_distribution<int32_t> randomOffsetMs(-options.randomOffsetMs, options.randomOffsetMs);
+
+    std::vector<SweepCase> cases;
+    for (const int32_t deviceCount : options.sweepDeviceCounts) {
+        for (const int32_t sampleRateHz : options.sweepSampleRatesHz) {
+            for (const int32_t durationMs : options.sweepDurationsMs) {
+                for (const int32_t offsetMs : options.sweepOffsetsMs) {
+                    for (int32_t trial = 0; trial < options.trials; ++trial) {
+                        SweepCase sweepCase{trial, sampleRateHz, durationMs, {0, offsetMs}, {}};
+                        while (sweepCase.requestedOffsetsMs.size() < static_cast<std::size_t>(deviceCount)) {
+                            sweepCase.requestedOffsetsMs.push_back(randomOffsetMs(rng));
+                        }
+                        cases.push_back(std::move(sweepCase));
+                    }
+                }
+            }
+        }
+    }
+    return cases;
+}
 
-    const int32_t targetOffsetSamples = multiconnect::delayMsToSamples(options.offsetMsDeviceB, sampleRateHz);
-    ring.readWithOffset(0, targetOffsetSamples, deviceB.data(), deviceB.size());
+unsigned runSweepCases(std::vector<SweepCase>& cases, unsigned requestedThreads) {
+    const unsigned available = std::max(std::thread::hardware_concurrency(), 1U);
+    const auto threads = static_cast<unsigned>(
+        std::min<std::size_t>(requestedThreads > 0 ? requestedThreads : available, std::max<std::size_t>(cases.size(), 1)));
+
+    // Workers claim the next unmeasured case, so slow (long, high-rate) cases do not hold up a
+    // statically assigned share of the grid.
+    std::atomic<std::size_t> next{0};
+    const auto worker = [&] {
+        for (std::size_t i = next.fetch_add(1); i < cases.size(); i = next.fetch_add(1)) {
+            SweepCase& sweepCase = cases[i];
+            sweepCase.measuredOffsetsMs =
+                measureDeviceOffsetsMs(sweepCase.sampleRateHz, sweepCase.durationMs, sweepCase.requestedOffsetsMs);
+        }
+    };
 
-    const auto impulseA = findFirstImpulse(deviceA, INT16_MAX / 2);
-    const auto impulseB = findFirstImpulse(deviceB, INT16_MAX / 2);
+    std::vector<std::thread> pool;
+    for (unsigned t = 1; t < threads; ++t) {
+        pool.emplace_back(worker);
+    }
+    worker();
+    for (std::thread& thread : pool) {
+        thread.join();
+    }
+    return threads;
+}
+
+// One row per device per case, in a single file: `case_id` groups the devices of one run.
+void writeSweepArtifact(const CliOptions& options, const std::vector<SweepCase>& cases) {
+    if (options.artifactDir.empty()) {
+        return;
+    }
+
+    namespace fs = std::filesystem;
+    fs::create_directories(options.artifactDir);
+
+    const std::string timestamp = makeRunTimestamp();
+    const fs::path outputPath = fs::path(options.artifactDir) / ("poc_sweep_" + timestamp + ".csv");
+    std::ofstream out(outputPath);
+    if (!out.is_open()) {
+        std::cerr << "WARN unable to open sweep artifact path=" << outputPath << '\n';
+        return;
+    }
+
+    out << "case_id,trial,device_count,sample_rate_hz,duration_ms,device_index,requested_offset_ms,"
+           "measured_offset_ms,error_ms,threshold_ms,outcome,notes\n";
+    const std::string notes = csvField(options.notes);
+    double maxErrorMs = 0.0;
+    bool pass = !cases.empty();
+    for (std::size_t caseId = 0; caseId < cases.size(); ++caseId) {
+        const SweepCase& sweepCase = cases[caseId];
+        for (std::size_t device = 1; device < sweepCase.requestedOffsetsMs.size(); ++device) {
+            const double errorMs =
+                std::abs(sweepCase.measuredOffsetsMs[device] - static_cast<double>(sweepCase.requestedOffsetsMs[device]));
+            out << caseId << ',' << sweepCase.trial << ',' << sweepCase.requestedOffsetsMs.size() << ','
+                << sweepCase.sampleRateHz << ',' << sweepCase.durationMs << ',' << device << ','
+                << sweepCase.requestedOffsetsMs[device] << ',' << sweepCase.measuredOffsetsMs[device] << ',' << errorMs
+                << ',' << options.thresholdMs << ',' << (errorMs <= options.thresholdMs ? "PASS" : "FAIL") << ','
+                << notes << '\n';
+            maxErrorMs = std::max(maxErrorMs, errorMs);
+            pass = pass && errorMs <= options.thresholdMs;
+        }
+    }
+    out.close();
+    appendArtifactManifest(options.artifactDir,
+                           {timestamp, "sweep", outputPath.filename().string(), pass, "", "", maxErrorMs,
+                            options.thresholdMs});
+    std::cout << "POC_SWEEP_ARTIFACT path=" << outputPath.string() << '\n';
+}
+
+void writeSweepRecords(const CliOptions& options, const std::vector<SweepCase>& cases) {
+    multiconnect::RunRecordWriter writer;
+    if (!openRecordFile(options, &writer)) {
+        return;
+    }
+
+    multiconnect::RunRecord record;
+    record.timestampNs = nowUnixNs();
+    record.thresholdMs = options.thresholdMs;
+    record.kind = multiconnect::RunRecordKind::kSweep;
+    multiconnect::setRunRecordLabel(record.notes, options.notes);
+
+    bool ok = true;
+    std::size_t written = 0;
+    for (std::size_t caseId = 0; caseId < cases.size(); ++caseId) {
+        const SweepCase& sweepCase = cases[caseId];
+        record.caseId = static_cast<uint32_t>(caseId);
+        record.trial = static_cast<uint32_t>(sweepCase.trial);
+        record.sampleRateHz = sweepCase.sampleRateHz;
+        record.durationMs = sweepCase.durationMs;
+        record.deviceCount = static_cast<uint16_t>(sweepCase.requestedOffsetsMs.size());
+        for (std::size_t device = 1; device < sweepCase.requestedOffsetsMs.size(); ++device) {
+            record.deviceIndex = static_cast<uint16_t>(device);
+            record.requestedOffsetMs = sweepCase.requestedOffsetsMs[device];
+            record.measuredOffsetMs = sweepCase.measuredOffsetsMs[device];
+            record.errorMs = std::abs(record.measuredOffsetMs - static_cast<double>(record.requestedOffsetMs));
+            record.pass = record.errorMs <= options.thresholdMs;
+            ok = ok && writer.append(record);
+            ++written;
+        }
+    }
+    if (!writer.close() || !ok) {
+        std::cerr << "WARN unable to write record file path=" << options.recordFile << '\n';
+        return;
+    }
+    std::cout << "POC_SWEEP_RECORDS path=" << options.recordFile << " records=" << written << '\n';
+}
+
+int runSweep(const CliOptions& options) {
+    std::vector<SweepCase> cases = makeSweepCases(options);
+    const auto start = std::chrono::steady_clock::now();
+    const unsigned threads = runSweepCases(cases, options.threads);
+    const double seconds = std::chrono::duration<double>(std::chrono::steady_clock::now() - start).count();
+
+    std::size_t measurements = 0;
+    std::size_t failures = 0;
+    double maxErrorMs = 0.0;
+    for (const SweepCase& sweepCase : cases) {
+        for (std::size_t device = 1; device < sweepCase.requestedOffsetsMs.size(); ++device) {
+            const double errorMs =
+                std::abs(sweepCase.measuredOffsetsMs[device] - static_cast<double>(sweepCase.requestedOffsetsMs[device]));
+            maxErrorMs = std::max(maxErrorMs, errorMs);
+            // Written so that a non-finite error (a failed measurement) counts as a failure.
+            failures += errorMs <= options.thresholdMs ? 0 : 1;
+            ++measurements;
+        }
+    }
+
+    std::cout << "POC_SWEEP cases=" << cases.size() << " measurements=" << measurements << " failures=" << failures
+              << " maxErrorMs=" << maxErrorMs << " thresholdMs=" << options.thresholdMs << " threads=" << threads
+              << " seconds=" << seconds << '\n';
+    writeSweepArtifact(options, cases);
+    writeSweepRecords(options, cases);
+
+    const bool pass = failures == 0 && measurements > 0;
+    std::cout << (pass ? "PASS" : "FAIL") << '\n';
+    return pass ? 0 : 1;
+}
+}  // namespace
+
+int main(int argc, char** argv) {
+    const CliOptions options = parseArgs(argc, argv);
+    if (!options.valid) {
+        return 2;
+    }
+    if (options.sweep) {
+        return runSweep(options);
+    }
 
-    const int64_t sampleDelta = static_cast<int64_t>(impulseA) - static_cast<int64_t>(impulseB);
-    const double measuredOffsetMs = static_cast<double>(sampleDelta) * 1000.0 / sampleRateHz;
+    const int32_t sampleRateHz = options.sampleRateHz;
+    const int32_t durationMs = options.durationMs;
+    const double measuredOffsetMs = measureDeviceOffsetsMs(sampleRateHz, durationMs, {0, options.offsetMsDeviceB})[1];
 
     const double errorFromRequestedMs = std::abs(measuredOffsetMs - static_cast<double>(options.offsetMsDeviceB));
 
@@ -188,6 +656,7 @@ int main(int argc, char** argv) {
     const bool pass = errorFromRequestedMs <= options.thresholdMs;
 
     writeArtifactReport(options, sampleRateHz, durationMs, measuredOffsetMs, errorFromRequestedMs, pass);
+    writeRunRecord(options, sampleRateHz, durationMs, measuredOffsetMs, errorFromRequestedMs, pass);
 
     std::cout << (pass ? "PASS" : "FAIL") << '\n';
     return pass ? 0 : 1;
@@ -0,0 +1,185 @@
+#include "multiconnect/run_record.h"
+
+#include <algorithm>
+#include <cstring>
+#include <filesystem>
+
+namespace multiconnect {
+
+namespace {
+
+constexpr char kMagic[4] = {'M', 'C', 'R', 'R'};
+constexpr uint16_t kVersion = 1;
+
+template <typename T>
+void storeLe(uint8_t* out, T value) {
+    for (std::size_t i = 0; i < sizeof(T); ++i) {
+        out[i] = static_cast<uint8_t>(static_cast<uint64_t>(value) >> (8 * i));
+    }
+}
+
+template <typename T>
+T loadLe(const uint8_t* in) {
+    uint64_t value = 0;
+    for (std::size_t i = 0; i < sizeof(T); ++i) {
+        value |= static_cast<uint64_t>(in[i]) << (8 * i);
+    }
+    return static_cast<T>(value);
+}
+
+void storeF64(uint8_t* out, double value) {
+    uint64_t bits = 0;
+    std::memcpy(&bits, &value, sizeof(bits));
+    storeLe(out, bits);
+}
+
+double loadF64(const uint8_t* in) {
+    const uint64_t bits = loadLe<uint64_t>(in);
+    double value = 0.0;
+    std::memcpy(&value, &bits, sizeof(value));
+    return value;
+}
+
+std::array<uint8_t, kRunRecordHeaderBytes> makeHeader() {
+    std::array<uint8_t, kRunRecordHeaderBytes> header{};
+    std::memcpy(header.data(), kMagic, sizeof(kMagic));
+    storeLe(header.data() + 4, kVersion);
+    storeLe(header.data() + 6, static_cast<uint16_t>(kRunRecordBytes));
+    return header;
+}
+
+bool isRecordHeader(const uint8_t* header) {
+    return std::memcmp(header, kMagic, sizeof(kMagic)) == 0 && loadLe<uint16_t>(header + 4) == kVersion &&
+           loadLe<uint16_t>(header + 6) == kRunRecordBytes;
+}
+
+}  // namespace
+
+void setRunRecordLabel(std::array<char, kRunRecordLabelBytes>& label, std::string_view text) {
+    label.fill('\0');
+    std::copy_n(text.begin(), std::min(text.size(), label.size()), label.begin());
+}
+
+std::string_view runRecordLabel(const std::array<char, kRunRecordLabelBytes>& label) {
+    const auto end = std::find(label.begin(), label.end(), '\0');
+    return {label.data(), static_cast<std::size_t>(end - label.begin())};
+}
+
+void encodeRunRecord(const RunRecord& record, uint8_t* out) {
+    storeLe(out, static_cast<uint64_t>(record.timestampNs));
+    storeLe(out + 8, record.caseId);
+    storeLe(out + 12, record.trial);
+    storeLe(out + 16, static_cast<uint32_t>(record.sampleRateHz));
+    storeLe(out + 20, static_cast<uint32_t>(record.durationMs));
+    storeLe(out + 24, static_cast<uint32_t>(record.requestedOffsetMs));
+    storeLe(out + 28, record.deviceIndex);
+    storeLe(out + 30, record.deviceCount);
+    storeF64(out + 32, record.measuredOffsetMs);
+    storeF64(out + 40, record.errorMs);
+    storeF64(out + 48, record.thresholdMs);
+    out[56] = static_cast<uint8_t>(record.kind);
+    out[57] = record.pass ? 1 : 0;
+    std::fill(out + 58, out + 64, uint8_t{0});
+    std::memcpy(out + 64, record.device.data(), kRunRecordLabelBytes);
+    std::memcpy(out + 80, record.notes.data(), kRunRecordLabelBytes);
+}
+
+RunRecord decodeRunRecord(const uint8_t* in) {
+    RunRecord record;
+    record.timestampNs = static_cast<int64_t>(loadLe<uint64_t>(in));
+    record.caseId = loadLe<uint32_t>(in + 8);
+    record.trial = loadLe<uint32_t>(in + 12);
+    record.sampleRateHz = static_cast<int32_t>(loadLe<uint32_t>(in + 16));
+    record.durationMs = static_cast<int32_t>(loadLe<uint32_t>(in + 20));
+    record.requestedOffsetMs = static_cast<int32_t>(loadLe<uint32_t>(in + 24));
+    record.deviceIndex = loadLe<uint16_t>(in + 28);
+    record.deviceCount = loadLe<uint16_t>(in + 30);
+    record.measuredOffsetMs = loadF64(in + 32);
+    record.errorMs = loadF64(in + 40);
+    record.thresholdMs = loadF64(in + 48);
+    record.kind = static_cast<RunRecordKind>(in[56]);
+    record.pass = in[57] != 0;
+    std::memcpy(record.device.data(), in + 64, kRunRecordLabelBytes);
+    std::memcpy(record.notes.data(), in + 80, kRunRecordLabelBytes);
+    return record;
+}
+
+RunRecordWriter::~RunRecordWriter() {
+    close();
+}
+
+bool RunRecordWriter::open(const std::string& path) {
+    close();
+    std::error_code error;
+    const auto size = std::filesystem::file_size(path, error);
+    const bool empty = error || size == 0;
+    if (!empty) {
+        std::array<uint8_t, kRunRecordHeaderBytes> header{};
+        std::FILE* existing = std::fopen(path.c_str(), "rb");
+        const bool valid = existing != nullptr && std::fread(header.data(), 1, header.size(), existing) == header.size() &&
+                           isRecordHeader(header.data());
+        if (existing != nullptr) {
+            std::fclose(existing);
+        }
+        if (!valid) {
+            return false;
+        }
+    }
+
+    file_ = std::fopen(path.c_str(), "ab");
+    if (file_ == nullptr) {
+        return false;
+    }
+    if (empty) {
+        const auto header = makeHeader();
+        if (std::fwrite(header.data(), 1, header.size(), file_) != header.size()) {
+            close();
+            return false;
+        }
+    }
+    return true;
+}
+
+bool RunRecordWriter::append(const RunRecord& record) {
+    if (file_ == nullptr) {
+        return false;
+    }
+    std::array<uint8_t, kRunRecordBytes> bytes;
+    encodeRunRecord(record, bytes.data());
+    return std::fwrite(bytes.data(), 1, bytes.size(), file_) == bytes.size();
+}
+
+bool RunRecordWriter::close() {
+    if (file_ == nullptr) {
+        return true;
+    }
+    const bool ok = std::fclose(file_) == 0;
+    file_ = nullptr;
+    return ok;
+}
+
+bool RunRecordWriter::isOpen() const {
+    return file_ != nullptr;
+}
+
+bool readRunRecords(const std::string& path, std::vector<RunRecord>* records) {
+    if (records == nullptr) {
+        return false;
+    }
+    records->clear();
+    std::FILE* file = std::fopen(path.c_str(), "rb");
+    if (file == nullptr) {
+        return false;
+    }
+
+    std::array<uint8_t, kRunRecordHeaderBytes> header{};
+    bool ok = std::fread(header.data(), 1, header.size(), file) == header.size() && isRecordHeader(header.data());
+    std::array<uint8_t, kRunRecordBytes> bytes;
+    while (ok && std::fread(bytes.data(), 1, bytes.size(), file) == bytes.size()) {
+        records->push_back(decodeRunRecord(bytes.data()));
+    }
+    std::fclose(file);
+    return ok;
+}
+
+}  // namespace multiconnect
@@ -0,0 +1,280 @@
+#include "multiconnect/signal_generator.h"
+
+#include <algorithm>
+#include <array>
+#include <cmath>
+
+namespace multiconnect {
+
+namespace {
+
+constexpr double kTwoPi = 6.28318530717958647692;
+// Samples rendered per pass; int16 output goes through a float scratch buffer of this size.
+constexpr std::size_t kChunkSamples = 256;
+constexpr std::size_t kLanes = 4;
+constexpr std::size_t kSineTableSize = 4096;
+
+// Maximal-length Galois LFSR feedback masks, indexed by register length.
+constexpr std::array<uint32_t, kMlsMaxOrder + 1> kMlsTaps = {
+    0,        0,        0x3,      0x6,      0xC,      0x14,     0x30,     0x60,     0xB8,
+    0x110,    0x240,    0x500,    0x829,    0x100D,   0x2015,   0x6000,   0xD008,   0x12000,
+    0x20400,  0x40023,  0x90000,  0x140000, 0x300000, 0x420000, 0xE10000,
+};
+
+// One cycle of sin with a guard entry, for linear interpolation at any phase in [0, 1).
+const std::array<float, kSineTableSize + 1>& sineTable() {
+    static const std::array<float, kSineTableSize + 1> table = [] {
+        std::array<float, kSineTableSize + 1> values{};
+        for (std::size_t i = 0; i <= kSineTableSize; ++i) {
+            values[i] = static_cast<float>(std::sin(kTwoPi * static_cast<double>(i) / kSineTableSize));
+        }
+        return values;
+    }();
+    return table;
+}
+
+float clampAmplitude(float amplitude) {
+    return std::clamp(amplitude, 0.0F, 1.0F);
+}
+
+// Adds amplitude * sin(phase + n * step) for n in [0, count) to output. Four interleaved
+// second-order resonators (y[n] = 2cos(4 step) y[n-4] - y[n-8]) replace the per-sample sin and
+// vectorize; reseeding them from std::sin every chunk keeps rounding error from accumulating.
+void accumulateSine(float* output, std::size_t count, double phase, double step, double amplitude) {
+    const double coefficient = 2.0 * std::cos(static_cast<double>(kLanes) * step);
+    std::array<double, kLanes> current{};
+    std::array<double, kLanes> previous{};
+    for (std::size_t lane = 0; lane < kLanes; ++lane) {
+        current[lane] = amplitude * std::sin(phase + static_cast<double>(lane) * step);
+        previous[lane] = amplitude * std::sin(phase + (static_cast<double>(lane) - kLanes) * step);
+    }
+
+    std::size_t i = 0;
+    for (; i + kLanes <= count; i += kLanes) {
+        for (std::size_t lane = 0; lane < kLanes; ++lane) {
+            output[i + lane] += static_cast<float>(current[lane]);
+            const double next = coefficient * current[lane] - previous[lane];
+            previous[lane] = current[lane];
+            current[lane] = next;
+        }
+    }
+    for (std::size_t lane = 0; i < count; ++i, ++lane) {
+        output[i] += static_cast<float>(current[lane]);
+    }
+}
+
+// pcmFloatToPcm16 with ties rounded away from zero instead of through lrint, so the conversion loop
+// vectorizes. The two differ only on exact half-LSB ties.
+inline int16_t toPcm16(float sample) {
+    float value = std::min(std::max(sample, -1.0F), 1.0F) * 32767.0F;
+    value += std::copysign(0.5F, value);
+    return static_cast<int16_t>(value);
+}
+
+// Feeds `render(float* chunk, std::size_t n)` consecutive chunks of the signal; chunks are zeroed
+// first so renderers can accumulate.
+template <typename Render>
+void renderFloat(float* output, std::size_t count, Render&& render) {
+    for (std::size_t done = 0; done < count;) {
+        const std::size_t n = std::min(kChunkSamples, count - done);
+        std::fill_n(output + done, n, 0.0F);
+        render(output + done, n);
+        done += n;
+    }
+}
+
+template <typename Render>
+void renderPcm16(int16_t* output, std::size_t count, Render&& render) {
+    std::array<float, kChunkSamples> scratch;
+    for (std::size_t done = 0; done < count;) {
+        const std::size_t n = std::min(kChunkSamples, count - done);
+        std::fill_n(scratch.data(), n, 0.0F);
+        render(scratch.data(), n);
+        for (std::size_t i = 0; i < n; ++i) {
+            output[done + i] = toPcm16(scratch[i]);
+        }
+        done += n;
+    }
+}
+
+// Renders a tone in chunks, carrying the phase between them.
+class SineRenderer {
+  public:
+    SineRenderer(int32_t sampleRateHz, double frequencyHz, double amplitude, double phaseRad)
+        : step_(kTwoPi * frequencyHz / std::max(sampleRateHz, 1)), amplitude_(amplitude), phase_(phaseRad) {}
+
+    void operator()(float* chunk, std::size_t n) {
+        accumulateSine(chunk, n, phase_, step_, amplitude_);
+        phase_ = std::fmod(phase_ + static_cast<double>(n) * step_, kTwoPi);
+    }
+
+  private:
+    double step_;
+    double amplitude_;
+    double phase_;
+};
+
+// Phase accumulators over sineTable() whose increment grows geometrically. Lane k renders samples
+// k, k + 4, ...: it advances by four increments per step and its increment grows by growth^4, so
+// the lanes are independent and the loop vectorizes.
+class LogSweepRenderer {
+  public:
+    LogSweepRenderer(const LogSweepConfig& config, std::size_t count) : amplitude_(clampAmplitude(config.amplitude)) {
+        const double sampleRate = std::max(config.sampleRateHz, 1);
+        const double startHz = std::max(static_cast<double>(config.startHz), 1e-3);
+        const double endHz = std::max(static_cast<double>(config.endHz), 1e-3);
+        const double growth = count > 1 ? std::pow(endHz / startHz, 1.0 / static_cast<double>(count - 1)) : 1.0;
+
+        double increment = startHz / sampleRate;
+        double phase = 0.0;
+        for (std::size_t lane = 0; lane < kLanes; ++lane) {
+            phase_[lane] = phase;
+            phase += increment;
+            phase -= static_cast<double>(static_cast<int64_t>(phase));
+            increment *= growth;
+        }
+        // Sum of the next four increments of lane 0, i.e. increment0 * (1 + g + g^2 + g^3).
+        const double first = startHz / sampleRate;
+        double span = 0.0;
+        double term = first;
+        for (std::size_t lane = 0; lane < kLanes; ++lane) {
+            span += term;
+            term *= growth;
+        }
+        laneGrowth_ = term / first;
+        for (std::size_t lane = 0; lane < kLanes; ++lane) {
+            advance_[lane] = span * std::pow(growth, static_cast<double>(lane));
+        }
+    }
+
+    void operator()(float* chunk, std::size_t n) {
+        const auto& table = sineTable();
+        std::size_t i = 0;
+        for (; i + kLanes <= n; i += kLanes) {
+            for (std::size_t lane = 0; lane < kLanes; ++lane) {
+                chunk[i + lane] = sample(table, phase_[lane]);
+                // Phases stay non-negative, so truncation is floor (and inlines, unlike std::floor).
+                const double next = phase_[lane] + advance_[lane];
+                phase_[lane] = next - static_cast<double>(static_cast<int64_t>(next));
+                advance_[lane] *= laneGrowth_;
+            }
+        }
+        // A partial group only ever ends the signal, so the lanes need not be rotated afterwards.
+        for (std::size_t lane = 0; i < n; ++i, ++lane) {
+            chunk[i] = sample(table, phase_[lane]);
+        }
+    }
+
+  private:
+    float sample(const std::array<float, kSineTableSize + 1>& table, double phase) const {
+        const double position = phase * kSineTableSize;
+        const auto index = static_cast<std::size_t>(position);
+        const auto fraction = static_cast<float>(position - static_cast<double>(index));
+        return amplitude_ * (table[index] + fraction * (table[index + 1] - table[index]));
+    }
+
+    float amplitude_;
+    // In cycles, kept in [0, 1).
+    std::array<double, kLanes> phase_{};
+    // Cycles lane k advances over its next four samples.
+    std::array<double, kLanes> advance_{};
+    double laneGrowth_ = 1.0;
+};
+
+class MlsRenderer {
+  public:
+    explicit MlsRenderer(const MlsConfig& config) : amplitude_(clampAmplitude(config.amplitude)) {
+        const int32_t order = std::clamp(config.order, kMlsMinOrder, kMlsMaxOrder);
+        taps_ = kMlsTaps[static_cast<std::size_t>(order)];
+        state_ = config.seed & ((1U << order) - 1U);
+        if (state_ == 0) {
+            state_ = 1;
+        }
+    }
+
+    void operator()(float* chunk, std::size_t n) {
+        for (std::size_t i = 0; i < n; ++i) {
+            const uint32_t bit = state_ & 1U;
+            chunk[i] = bit != 0 ? amplitude_ : -amplitude_;
+            state_ = (state_ >> 1) ^ (taps_ & (0U - bit));
+        }
+    }
+
+  private:
+    float amplitude_;
+    uint32_t taps_ = 0;
+    uint32_t state_ = 1;
+};
+
+class MultiToneRenderer {
+  public:
+    explicit MultiToneRenderer(const MultiToneConfig& config)
+        : config_(config),
+          toneAmplitude_(config.toneCount > 0 ? clampAmplitude(config.amplitude) / static_cast<double>(config.toneCount)
+                                              : 0.0) {}
+
+    void operator()(float* chunk, std::size_t n) {
+        if (config_.frequenciesHz == nullptr) {
+            return;
+        }
+        const double sampleRate = std::max(config_.sampleRateHz, 1);
+        const double tones = static_cast<double>(config_.toneCount);
+        for (std::size_t k = 0; k < config_.toneCount; ++k) {
+            const double step = kTwoPi * config_.frequenciesHz[k] / sampleRate;
+            // Schroeder phase for tone k + 1 of K: -pi k (k + 1) / K.
+            const double schroeder = -0.5 * kTwoPi * static_cast<double>(k) * static_cast<double>(k + 1) / tones;
+            const double phase = std::fmod(schroeder + static_cast<double>(position_) * step, kTwoPi);
+            accumulateSine(chunk, n, phase, step, toneAmplitude_);
+        }
+        position_ += n;
+    }
+
+  private:
+    MultiToneConfig config_;
+    double toneAmplitude_;
+    std::size_t position_ = 0;
+};
+
+SineRenderer makeSineRenderer(const SineConfig& config) {
+    return SineRenderer(config.sampleRateHz, config.frequencyHz, clampAmplitude(config.amplitude), config.phaseRad);
+}
+
+}  // namespace
+
+std::size_t mlsPeriod(int32_t order) {
+    return (std::size_t{1} << std::clamp(order, kMlsMinOrder, kMlsMaxOrder)) - 1;
+}
+
+void generateSine(const SineConfig& config, float* output, std::size_t count) {
+    renderFloat(output, count, makeSineRenderer(config));
+}
+
+void generateSine(const SineConfig& config, int16_t* output, std::size_t count) {
+    renderPcm16(output, count, makeSineRenderer(config));
+}
+
+void generateLogSweep(const LogSweepConfig& config, float* output, std::size_t count) {
+    renderFloat(output, count, LogSweepRenderer(config, count));
+}
+
+void generateLogSweep(const LogSweepConfig& config, int16_t* output, std::size_t count) {
+    renderPcm16(output, count, LogSweepRenderer(config, count));
+}
+
+void generateMls(const MlsConfig& config, float* output, std::size_t count) {
+    renderFloat(output, count, MlsRenderer(config));
+}
+
+void generateMls(const MlsConfig& config, int16_t* output, std::size_t count) {
+    renderPcm16(output, count, MlsRenderer(config));
+}
+
+void generateMultiTone(const MultiToneConfig& config, float* output, std::size_t count) {
+    renderFloat(output, count, MultiToneRenderer(config));
+}
+
+void generateMultiTone(const MultiToneConfig& config, int16_t* output, std::size_t count) {
+    renderPcm16(output, count, MultiToneRenderer(config));
+}
+
+}  // namespace multiconnect
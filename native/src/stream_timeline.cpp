@@ -0,0 +1,124 @@
+#include "multiconnect/stream_timeline.h"
+
+#include <algorithm>
+#include <cmath>
+
+namespace multiconnect {
+
+StreamTimeline::StreamTimeline(int32_t sampleRateHz, std::size_t capacity, int64_t toleranceNs)
+    : sampleRateHz_(std::max(sampleRateHz, 1)),
+      toleranceNs_(std::max<int64_t>(toleranceNs, 0)),
+      anchors_(std::max<std::size_t>(capacity, 2)) {}
+
+bool StreamTimeline::addAnchor(int64_t streamIndex, int64_t timeNs) {
+    const uint64_t count = count_.load(std::memory_order_relaxed);
+    if (count > 0) {
+        if (streamIndex <= lastIndex_ || timeNs <= lastTimeNs_) {
+            return false;
+        }
+        const double predictedNs =
+            static_cast<double>(lastTimeNs_) + static_cast<double>(streamIndex - lastIndex_) * 1e9 / sampleRateHz_;
+        if (std::abs(static_cast<double>(timeNs) - predictedNs) <= static_cast<double>(toleranceNs_)) {
+            return false;
+        }
+    }
+
+    // Seqlock without fences: a reader that acquires any of the stores below also sees the odd
+    // sequence stored before them, so its final sequence check fails and it retries.
+    const uint64_t sequence = sequence_.load(std::memory_order_relaxed);
+    sequence_.store(sequence + 1, std::memory_order_relaxed);
+    Anchor& anchor = anchors_[count % anchors_.size()];
+    anchor.streamIndex.store(streamIndex, std::memory_order_release);
+    anchor.timeNs.store(timeNs, std::memory_order_release);
+    count_.store(count + 1, std::memory_order_release);
+    sequence_.store(sequence + 2, std::memory_order_release);
+
+    lastIndex_ = streamIndex;
+    lastTimeNs_ = timeNs;
+    return true;
+}
+
+void StreamTimeline::clear() {
+    const uint64_t sequence = sequence_.load(std::memory_order_relaxed);
+    sequence_.store(sequence + 1, std::memory_order_relaxed);
+    count_.store(0, std::memory_order_release);
+    sequence_.store(sequence + 2, std::memory_order_release);
+}
+
+template <typename Pick>
+bool StreamTimeline::lookup(Pick&& pick, Span* outSpan) const {
+    for (;;) {
+        const uint64_t before = sequence_.load(std::memory_order_acquire);
+        if ((before & 1U) != 0) {
+            continue;
+        }
+
+        const uint64_t count = count_.load(std::memory_order_acquire);
+        const auto held = static_cast<std::size_t>(std::min<uint64_t>(count, anchors_.size()));
+        const uint64_t oldest = count - held;
+        const auto at = [&](std::size_t k) -> const Anchor& { return anchors_[(oldest + k) % anchors_.size()]; };
+
+        Span span;
+        if (held > 0) {
+            // Anchors ascend in both index and time: binary-search the last one at or before the
+            // key (the oldest if the key precedes them all).
+            std::size_t lo = 0;
+            std::size_t hi = held;
+            while (hi - lo > 1) {
+                const std::size_t mid = lo + (hi - lo) / 2;
+                if (pick(at(mid))) {
+                    lo = mid;
+                } else {
+                    hi = mid;
+                }
+            }
+            span.fromIndex = at(lo).streamIndex.load(std::memory_order_acquire);
+            span.fromTimeNs = at(lo).timeNs.load(std::memory_order_acquire);
+            span.rate = sampleRateHz_ * 1e-9;
+            if (lo + 1 < held && pick(at(lo))) {
+                const int64_t toIndex = at(lo + 1).streamIndex.load(std::memory_order_acquire);
+                const int64_t toTimeNs = at(lo + 1).timeNs.load(std::memory_order_acquire);
+                if (toTimeNs > span.fromTimeNs) {
+                    span.rate = static_cast<double>(toIndex - span.fromIndex) / static_cast<double>(toTimeNs - span.fromTimeNs);
+                }
+            }
+        }
+
+        if (sequence_.load(std::memory_order_relaxed) != before) {
+            continue;
+        }
+        *outSpan = span;
+        return held > 0;
+    }
+}
+
+bool StreamTimeline::timeAt(int64_t streamIndex, int64_t* outTimeNs) const {
+    Span span;
+    if (outTimeNs == nullptr ||
+        !lookup([streamIndex](const Anchor& anchor) { return anchor.streamIndex.load(std::memory_order_acquire) <= streamIndex; },
+                &span)) {
+        return false;
+    }
+    *outTimeNs = span.fromTimeNs + std::llround(static_cast<double>(streamIndex - span.fromIndex) / span.rate);
+    return true;
+}
+
+bool StreamTimeline::streamIndexAt(int64_t timeNs, int64_t* outStreamIndex) const {
+    Span span;
+    if (outStreamIndex == nullptr ||
+        !lookup([timeNs](const Anchor& anchor) { return anchor.timeNs.load(std::memory_order_acquire) <= timeNs; }, &span)) {
+        return false;
+    }
+    *outStreamIndex = span.fromIndex + std::llround(static_cast<double>(timeNs - span.fromTimeNs) * span.rate);
+    return true;
+}
+
+std::size_t StreamTimeline::anchorCount() const {
+    return static_cast<std::size_t>(std::min<uint64_t>(count_.load(std::memory_order_acquire), anchors_.size()));
+}
+
+int32_t StreamTimeline::sampleRateHz() const {
+    return sampleRateHz_;
+}
+
+}  // namespace multiconnect
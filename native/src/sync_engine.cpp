@@ -1,36 +1,570 @@
 #include "multiconnect/sync_engine.h"
 
+#include "multiconnect/fractional_resampler.h"
 #include "multiconnect/sync_math.h"
 
 #include <algorithm>
+#include <chrono>
 #include <cmath>
+#include <cstring>
+#include <limits>
+#include <thread>
+#include <type_traits>
 
 namespace multiconnect {
 
+namespace {
+// Fraction of the ring kept behind the slowest reader in concurrent mode.
+constexpr std::size_t kRewindHeadroomDivisor = 4;
+// joiningCursor_ while no join is in progress.
+constexpr int64_t kNoCursor = std::numeric_limits<int64_t>::max();
+// Shortest silence after which a concurrent reader counts as stalled, however short the ring: output
+// threads pull every few milliseconds, so only a reader that has really stopped goes this long.
+constexpr int64_t kMinStalledReaderNs = 100'000'000;
+
+// Pending drift corrections are tracked in 1/65536-sample fixed point so control threads and
+// the reader can hand them over with a single atomic.
+constexpr double kCorrectionQ16One = 65536.0;
+// Rate corrections are bounded so one resampler chunk always fits its stack input buffer.
+constexpr float kMaxRateCorrectionPpm = 10000.0F;
+constexpr std::size_t kResampleChunk = 256;
+constexpr std::size_t kResampleInputCapacity = 320;
+constexpr std::size_t kMinResamplerCapacity = kResampleInputCapacity;
+
+// Gain is bounded so a device can be muted but never boosted past a sane headroom.
+constexpr float kMinGainDb = -120.0F;
+constexpr float kMaxGainDb = 24.0F;
+constexpr float kPcm16FullScale = 32767.0F;
+// Soft clipping is transparent below the knee (fraction of full scale) and bends smoothly
+// toward full scale above it.
+constexpr float kSoftClipKnee = 0.75F;
+
+// Keeps the pushing thread's sequence odd for the duration of a push or resize.
+class PushScope {
+  public:
+    explicit PushScope(std::atomic<uint64_t>& sequence) : sequence_(sequence) { sequence_.fetch_add(1); }
+    ~PushScope() { sequence_.fetch_add(1); }
+    PushScope(const PushScope&) = delete;
+    PushScope& operator=(const PushScope&) = delete;
+
+  private:
+    std::atomic<uint64_t>& sequence_;
+};
+
+int16_t downmixToPcm16(const int16_t* frame, std::size_t channels) {
+    int32_t sum = 0;
+    for (std::size_t c = 0; c < channels; ++c) {
+        sum += frame[c];
+    }
+    return static_cast<int16_t>(sum / static_cast<int32_t>(channels));
+}
+
+int16_t downmixToPcm16(const float* frame, std::size_t channels) {
+    float sum = 0.0F;
+    for (std::size_t c = 0; c < channels; ++c) {
+        sum += frame[c];
+    }
+    return pcmFloatToPcm16(sum / static_cast<float>(channels));
+}
+
+// Plain format conversion; the int16 pass-through keeps its memcpy fast path.
+struct UnityGain {
+    static constexpr bool kUnity = true;
+
+    int16_t operator()(int16_t sample, std::size_t /*frame*/) const { return sample; }
+    int16_t operator()(float sample, std::size_t /*frame*/) const { return pcmFloatToPcm16(sample); }
+    template <typename Sample>
+    int16_t downmix(const Sample* frame, std::size_t channels, std::size_t /*frame*/) const {
+        return downmixToPcm16(frame, channels);
+    }
+};
+
+// Frame f of a render is scaled by start + step * min(f, rampFrames). Ramping and soft clipping
+// are template parameters and clamping uses min/max, so the per-sample path is branch-free and
+// auto-vectorizes; outside a ramp the gain is a plain constant.
+template <bool kRamp, bool kSoftClip>
+struct GainRamp {
+    static constexpr bool kUnity = false;
+
+    float start = 1.0F;
+    float step = 0.0F;
+    float rampFrames = 0.0F;
+
+    [[nodiscard]] float gainAt(std::size_t frame) const {
+        if constexpr (kRamp) {
+            // Render sizes fit in 32 bits; int32 -> float converts in vector registers.
+            return start + step * std::min(static_cast<float>(static_cast<int32_t>(frame)), rampFrames);
+        } else {
+            return start;
+        }
+    }
+
+    // Same ramp, continuing `frames` frames later.
+    [[nodiscard]] GainRamp advanced(std::size_t frames) const {
+        return {gainAt(frames), step, std::max(rampFrames - static_cast<float>(frames), 0.0F)};
+    }
+
+    // `value` is in int16 full-scale units. Written so GCC/Clang vectorize it at -O2/-O3: round
+    // before clamping, and no fabs/max(x, 0) (signed-zero rules keep those scalar).
+    [[nodiscard]] static int16_t finish(float value) {
+        if constexpr (kSoftClip) {
+            const float normalized = value / kPcm16FullScale;
+            const float core = std::min(std::max(normalized, -kSoftClipKnee), kSoftClipKnee);
+            const float excess = (normalized - core) / (1.0F - kSoftClipKnee);
+            const float shaped = core + (1.0F - kSoftClipKnee) * excess / (1.0F + std::copysign(excess, 1.0F));
+            value = shaped * kPcm16FullScale;
+        }
+        value += std::copysign(0.5F, value);
+        return static_cast<int16_t>(std::min(std::max(value, -32768.0F), 32767.0F));
+    }
+
+    int16_t operator()(int16_t sample, std::size_t frame) const {
+        return finish(static_cast<float>(sample) * gainAt(frame));
+    }
+    int16_t operator()(float sample, std::size_t frame) const {
+        return finish(sample * kPcm16FullScale * gainAt(frame));
+    }
+    template <typename Sample>
+    int16_t downmix(const Sample* frame, std::size_t channels, std::size_t f) const {
+        float sum = 0.0F;
+        for (std::size_t c = 0; c < channels; ++c) {
+            sum += static_cast<float>(frame[c]);
+        }
+        const float scale = std::is_same_v<Sample, float> ? kPcm16FullScale : 1.0F;
+        return finish(sum * scale / static_cast<float>(channels) * gainAt(f));
+    }
+};
+
+// Counters with a single writing thread skip the locked read-modify-write; pollers only load.
+void bumpCounter(std::atomic<uint64_t>& counter, uint64_t amount) {
+    counter.store(counter.load(std::memory_order_relaxed) + amount, std::memory_order_relaxed);
+}
+
+int64_t steadyNowNs() {
+    return std::chrono::duration_cast<std::chrono::nanoseconds>(std::chrono::steady_clock::now().time_since_epoch())
+        .count();
+}
+
+std::size_t outputChannelsFor(const DeviceChannelMap& map, std::size_t streamChannels) {
+    return map.layout == DeviceChannelLayout::kAllChannels ? streamChannels : 1;
+}
+
+// Converts ring frames straight into a device's int16 layout, applying gain in the same pass.
+// Consecutive output frames are `frameStride` elements apart; each occupies
+// outputChannelsFor(map) elements.
+template <typename Sample, typename Gain>
+void renderFrames(const Sample* source,
+                  std::size_t frameCount,
+                  std::size_t channels,
+                  const DeviceChannelMap& map,
+                  int16_t* destination,
+                  std::size_t frameStride,
+                  const Gain& gain) {
+    switch (map.layout) {
+    case DeviceChannelLayout::kAllChannels:
+        if constexpr (std::is_same_v<Sample, int16_t> && Gain::kUnity) {
+            if (frameStride == channels) {
+                std::memcpy(destination, source, frameCount * channels * sizeof(int16_t));
+                return;
+            }
+        }
+        if (channels == 1 && frameStride == 1) {
+            for (std::size_t f = 0; f < frameCount; ++f) {
+                destination[f] = gain(source[f], f);
+            }
+            return;
+        }
+        for (std::size_t f = 0; f < frameCount; ++f) {
+            for (std::size_t c = 0; c < channels; ++c) {
+                destination[f * frameStride + c] = gain(source[f * channels + c], f);
+            }
+        }
+        return;
+    case DeviceChannelLayout::kSingleChannel: {
+        const auto channel = static_cast<std::size_t>(map.channel);
+        for (std::size_t f = 0; f < frameCount; ++f) {
+            destination[f * frameStride] = gain(source[f * channels + channel], f);
+        }
+        return;
+    }
+    case DeviceChannelLayout::kDownmixMono:
+        for (std::size_t f = 0; f < frameCount; ++f) {
+            destination[f * frameStride] = gain.downmix(source + f * channels, channels, f);
+        }
+        return;
+    }
+}
+
+template <typename Sample, typename Gain = UnityGain>
+void renderSegments(const PcmRingSegments<Sample>& segments,
+                    std::size_t channels,
+                    const DeviceChannelMap& map,
+                    int16_t* destination,
+                    std::size_t frameStride,
+                    const Gain& gain = {}) {
+    if (destination == nullptr) {
+        return;
+    }
+
+    renderFrames(segments.first, segments.firstCount, channels, map, destination, frameStride, gain);
+    if constexpr (Gain::kUnity) {
+        renderFrames(segments.second,
+                     segments.secondCount,
+                     channels,
+                     map,
+                     destination + segments.firstCount * frameStride,
+                     frameStride,
+                     gain);
+    } else {
+        renderFrames(segments.second,
+                     segments.secondCount,
+                     channels,
+                     map,
+                     destination + segments.firstCount * frameStride,
+                     frameStride,
+                     gain.advanced(segments.firstCount));
+    }
+}
+
+// In-place gain over already rendered int16 frames (the resampler path).
+template <typename Gain>
+void applyGain(int16_t* frames, std::size_t frameCount, std::size_t channels, std::size_t frameStride, const Gain& gain) {
+    for (std::size_t f = 0; f < frameCount; ++f) {
+        for (std::size_t c = 0; c < channels; ++c) {
+            frames[f * frameStride + c] = gain(frames[f * frameStride + c], f);
+        }
+    }
+}
+
+// Runs `fn` with the cheapest gain functor for this pull.
+template <typename Fn>
+void withGain(float start, float step, float rampFrames, bool softClip, Fn&& fn) {
+    if (rampFrames > 0.0F) {
+        if (softClip) {
+            fn(GainRamp<true, true>{start, step, rampFrames});
+        } else {
+            fn(GainRamp<true, false>{start, step, rampFrames});
+        }
+    } else if (softClip) {
+        fn(GainRamp<false, true>{start, step, rampFrames});
+    } else if (start != 1.0F) {
+        fn(GainRamp<false, false>{start, step, rampFrames});
+    } else {
+        fn(UnityGain{});
+    }
+}
+
+void fillSilence(int16_t* destination, std::size_t frameCount, std::size_t channels, std::size_t frameStride) {
+    if (frameStride == channels) {
+        std::memset(destination, 0, frameCount * channels * sizeof(int16_t));
+        return;
+    }
+
+    for (std::size_t f = 0; f < frameCount; ++f) {
+        std::memset(destination + f * frameStride, 0, channels * sizeof(int16_t));
+    }
+}
+// What the original two-argument constructor means; every other field keeps its default.
+SyncEngineConfig legacyConfig(std::size_t masterCapacitySamples, int32_t maxCorrectionSamplesPerCall) {
+    SyncEngineConfig config;
+    config.masterCapacitySamples = masterCapacitySamples;
+    config.maxCorrectionSamplesPerCall = maxCorrectionSamplesPerCall;
+    config.mode = SyncEngineMode::kSingleThreaded;
+    return config;
+}
+}  // namespace
+
+void SyncEngine::DeviceSlot::reset(int32_t initialOffsetSamples, std::size_t initialReadHead) {
+    const int64_t initialCursor = static_cast<int64_t>(initialReadHead) + initialOffsetSamples;
+    offsetSamples.store(initialOffsetSamples, std::memory_order_relaxed);
+    readHead.store(initialReadHead, std::memory_order_relaxed);
+    cursor.store(initialCursor, std::memory_order_relaxed);
+    rateCorrectionPpm.store(0.0F, std::memory_order_relaxed);
+    pendingCorrectionQ16.store(0, std::memory_order_relaxed);
+    gainDb.store(0.0F, std::memory_order_relaxed);
+    gain.store(1.0F, std::memory_order_relaxed);
+    softClip.store(false, std::memory_order_relaxed);
+    lagFrames.store(0, std::memory_order_relaxed);
+    framesRead.store(0, std::memory_order_relaxed);
+    underrunCount.store(0, std::memory_order_relaxed);
+    underrunFrames.store(0, std::memory_order_relaxed);
+    overrunCount.store(0, std::memory_order_relaxed);
+    overrunFrames.store(0, std::memory_order_relaxed);
+    correctionCount.store(0, std::memory_order_relaxed);
+    stalled.store(false, std::memory_order_relaxed);
+    highWaterCursor = initialCursor;
+    phase = 0.0;
+    appliedGain = 1.0F;
+    rampTarget = 1.0F;
+    rampRemaining = 0;
+}
+
 SyncEngine::SyncEngine(std::size_t masterCapacitySamples, int32_t maxCorrectionSamplesPerCall)
-    : ring_(masterCapacitySamples), maxCorrectionSamplesPerCall_(std::max(maxCorrectionSamplesPerCall, 0)) {}
+    : SyncEngine(legacyConfig(masterCapacitySamples, maxCorrectionSamplesPerCall)) {}
+
+SyncEngine::SyncEngine(const SyncEngineConfig& config)
+    : format_{std::max(config.format.channels, 1), config.format.encoding, std::max(config.format.sampleRateHz, 1)},
+      ring_(format_.encoding == PcmEncoding::kPcm16 ? config.masterCapacitySamples : 1,
+            static_cast<std::size_t>(format_.channels)),
+      floatRing_(format_.encoding == PcmEncoding::kPcmFloat ? config.masterCapacitySamples : 1,
+                 static_cast<std::size_t>(format_.channels)),
+      timeline_(format_.sampleRateHz),
+      slots_(std::max<std::size_t>(config.maxDevices, 1)),
+      maxCorrectionSamplesPerCall_(std::max(config.maxCorrectionSamplesPerCall, 0)),
+      maxSlewPpm_(std::clamp(config.maxSlewPpm, 0.0F, kMaxRateCorrectionPpm)),
+      gainRampFrames_(config.gainRampFrames),
+      mode_(config.mode),
+      ringCapacity_(format_.encoding == PcmEncoding::kPcmFloat ? floatRing_.capacity() : ring_.capacity()),
+      rewindHeadroomSamples_(config.mode == SyncEngineMode::kConcurrent
+                                 ? static_cast<int64_t>(ringCapacity() / kRewindHeadroomDivisor)
+                                 : 0) {}
+
+std::size_t SyncEngine::pushPcm16(const int16_t* input, std::size_t sampleCount) {
+    return format_.encoding == PcmEncoding::kPcm16 ? pushFrames(ring_, input, sampleCount) : 0;
+}
+
+std::size_t SyncEngine::pushPcmFloat(const float* input, std::size_t frameCount) {
+    return format_.encoding == PcmEncoding::kPcmFloat ? pushFrames(floatRing_, input, frameCount) : 0;
+}
+
+std::size_t SyncEngine::pushPcm16(const int16_t* input, std::size_t sampleCount, int64_t presentationTimeNs) {
+    const auto first = static_cast<int64_t>(ringWritten());
+    const std::size_t accepted = pushPcm16(input, sampleCount);
+    if (accepted > 0) {
+        timeline_.addAnchor(first, presentationTimeNs);
+    }
+    return accepted;
+}
+
+std::size_t SyncEngine::pushPcmFloat(const float* input, std::size_t frameCount, int64_t presentationTimeNs) {
+    const auto first = static_cast<int64_t>(ringWritten());
+    const std::size_t accepted = pushPcmFloat(input, frameCount);
+    if (accepted > 0) {
+        timeline_.addAnchor(first, presentationTimeNs);
+    }
+    return accepted;
+}
+
+DeviceHandle SyncEngine::registerDevice(const std::string& deviceId,
+                                        int32_t initialOffsetSamples,
+                                        DeviceChannelMap channels) {
+    const std::lock_guard<std::mutex> lock(registryMutex_);
+    const std::size_t initialReadHead =
+        mode_ == SyncEngineMode::kConcurrent ? static_cast<std::size_t>(ringWritten()) : 0;
+    return publishDevice(deviceId, initialOffsetSamples, initialReadHead, channels, nullptr);
+}
+
+DeviceHandle SyncEngine::registerDeviceAtTime(const std::string& deviceId,
+                                              int64_t pullTimeNs,
+                                              int64_t outputLatencyNs,
+                                              DeviceChannelMap channels) {
+    int64_t streamIndex = 0;
+    if (!streamIndexForPull(pullTimeNs, outputLatencyNs, &streamIndex)) {
+        return {};
+    }
+    const int64_t initialReadHead = mode_ == SyncEngineMode::kConcurrent ? static_cast<int64_t>(ringWritten()) : 0;
+    const int64_t offset = std::clamp<int64_t>(streamIndex - initialReadHead,
+                                               std::numeric_limits<int32_t>::min(),
+                                               std::numeric_limits<int32_t>::max());
+    return registerDevice(deviceId, static_cast<int32_t>(offset), channels);
+}
+
+DeviceHandle SyncEngine::rejoinDevice(const std::string& deviceId) {
+    const std::lock_guard<std::mutex> lock(registryMutex_);
+    const auto parked = std::find_if(parked_.begin(), parked_.end(), [&](const ParkedDevice& entry) {
+        return entry.deviceId == deviceId;
+    });
+    if (parked == parked_.end()) {
+        const std::size_t initialReadHead =
+            mode_ == SyncEngineMode::kConcurrent ? static_cast<std::size_t>(ringWritten()) : 0;
+        return publishDevice(deviceId, 0, initialReadHead, {}, nullptr);
+    }
+
+    // Same distance behind the live edge as when it left; the offset is kept as it was and the
+    // read head placed to match.
+    const auto written = static_cast<int64_t>(ringWritten());
+    int64_t position = written - parked->lagFrames;
+    if (mode_ == SyncEngineMode::kConcurrent) {
+        position = std::max(position, written - static_cast<int64_t>(ringCapacity()) + rewindHeadroom());
+    }
+    const int64_t readHead = std::max<int64_t>(position - parked->offsetSamples, 0);
+    const DeviceHandle handle =
+        publishDevice(deviceId, parked->offsetSamples, static_cast<std::size_t>(readHead), parked->channels, &*parked);
+    if (handle) {
+        parked_.erase(parked);
+    }
+    return handle;
+}
+
+DeviceHandle SyncEngine::publishDevice(const std::string& deviceId,
+                                       int32_t initialOffsetSamples,
+                                       std::size_t initialReadHead,
+                                       DeviceChannelMap channels,
+                                       const ParkedDevice* parked) {
+    if (deviceHandle(deviceId)) {
+        return {};
+    }
+    if (channels.layout == DeviceChannelLayout::kSingleChannel &&
+        (channels.channel < 0 || channels.channel >= format_.channels)) {
+        return {};
+    }
+    // Every layout of a mono stream is the plain copy.
+    if (format_.channels == 1) {
+        channels = {};
+    }
+
+    // Only joins and leaves change `active`, and they hold registryMutex_.
+    const auto freeSlot = std::find_if(slots_.begin(), slots_.end(), [](const DeviceSlot& slot) {
+        return !slot.active.load(std::memory_order_relaxed);
+    });
+    if (freeSlot == slots_.end()) {
+        return {};
+    }
+
+    if (mode_ == SyncEngineMode::kConcurrent) {
+        // A push that scanned the cursors before the writer could see this one may still overwrite
+        // frames behind the write position: wait it out, then start no earlier than what survived.
+        const int64_t cursor = static_cast<int64_t>(initialReadHead) + initialOffsetSamples;
+        joiningCursor_.store(cursor);
+        const uint64_t sequence = pushSequence_.load();
+        if (sequence % 2 != 0) {
+            while (pushSequence_.load() == sequence) {
+                std::this_thread::yield();
+            }
+        }
+        const int64_t oldestKept =
+            static_cast<int64_t>(ringWritten()) - static_cast<int64_t>(ringCapacity()) + rewindHeadroom();
+        if (cursor < oldestKept) {
+            initialReadHead += static_cast<std::size_t>(oldestKept - cursor);
+        }
+    }
+
+    // Nobody reads these until `active` is published: the slot's last reader drained when it was left.
+    freeSlot->reset(initialOffsetSamples, initialReadHead);
+    freeSlot->lastPullNs.store(steadyNowNs(), std::memory_order_relaxed);
+    if (parked != nullptr) {
+        freeSlot->rateCorrectionPpm.store(parked->rateCorrectionPpm, std::memory_order_relaxed);
+        freeSlot->gainDb.store(parked->gainDb, std::memory_order_relaxed);
+        const float gain = parked->gainDb == 0.0F ? 1.0F : std::pow(10.0F, parked->gainDb / 20.0F);
+        freeSlot->gain.store(gain, std::memory_order_relaxed);
+        freeSlot->appliedGain = gain;
+        freeSlot->rampTarget = gain;
+        freeSlot->softClip.store(parked->softClip, std::memory_order_relaxed);
+    }
+    freeSlot->deviceId = deviceId;
+    freeSlot->channelMap = channels;
+    freeSlot->outputChannels.store(outputChannelsFor(channels, static_cast<std::size_t>(format_.channels)),
+                                   std::memory_order_relaxed);
+
+    const auto index = static_cast<int32_t>(freeSlot - slots_.begin());
+    if (static_cast<std::size_t>(index) >= slotsInUse_.load(std::memory_order_relaxed)) {
+        slotsInUse_.store(static_cast<std::size_t>(index) + 1, std::memory_order_release);
+    }
+    freeSlot->active.store(true);
+    joiningCursor_.store(kNoCursor);
+    deviceCount_.fetch_add(1, std::memory_order_relaxed);
+    return DeviceHandle{index};
+}
+
+bool SyncEngine::unregisterDevice(const std::string& deviceId) {
+    // The id is resolved under the same lock as the leave, so a concurrent leave and join cannot
+    // hand its slot to another device in between.
+    const std::lock_guard<std::mutex> lock(registryMutex_);
+    return retireDevice(deviceHandle(deviceId));
+}
 
-void SyncEngine::pushPcm16(const int16_t* input, std::size_t sampleCount) { ring_.write(input, sampleCount); }
+bool SyncEngine::unregisterDevice(DeviceHandle handle) {
+    const std::lock_guard<std::mutex> lock(registryMutex_);
+    return retireDevice(handle);
+}
+
+bool SyncEngine::retireDevice(DeviceHandle handle) {
+    DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr) {
+        return false;
+    }
+
+    slot->active.store(false);
+    deviceCount_.fetch_sub(1, std::memory_order_relaxed);
+    // Grace period: a reader that pinned the slot before it was unpublished may still be inside a
+    // pull; later readers see it inactive and keep out.
+    while (slot->readers.load() != 0) {
+        std::this_thread::yield();
+    }
 
-bool SyncEngine::registerDevice(const std::string& deviceId, int32_t initialOffsetSamples) {
-    return devices_.emplace(deviceId, DeviceStreamState{initialOffsetSamples, 0}).second;
+    ParkedDevice parked;
+    parked.deviceId = slot->deviceId;
+    parked.offsetSamples = slot->offsetSamples.load(std::memory_order_relaxed);
+    // A device that never pulled is still where it joined.
+    parked.lagFrames = slot->framesRead.load(std::memory_order_relaxed) > 0 ? slot->lagFrames.load(std::memory_order_relaxed)
+                                                                             : -static_cast<int64_t>(parked.offsetSamples);
+    parked.rateCorrectionPpm = slot->rateCorrectionPpm.load(std::memory_order_relaxed);
+    parked.gainDb = slot->gainDb.load(std::memory_order_relaxed);
+    parked.softClip = slot->softClip.load(std::memory_order_relaxed);
+    parked.channels = slot->channelMap;
+    parked_.erase(std::remove_if(parked_.begin(), parked_.end(), [&](const ParkedDevice& entry) {
+                      return entry.deviceId == parked.deviceId;
+                  }),
+                  parked_.end());
+    if (parked_.size() >= slots_.size()) {
+        parked_.erase(parked_.begin());
+    }
+    parked_.push_back(std::move(parked));
+
+    slot->outputChannels.store(1, std::memory_order_relaxed);
+    return true;
 }
 
-bool SyncEngine::unregisterDevice(const std::string& deviceId) { return devices_.erase(deviceId) > 0; }
+DeviceHandle SyncEngine::deviceHandle(const std::string& deviceId) const {
+    const std::size_t inUse = slotsInUse_.load(std::memory_order_acquire);
+    for (std::size_t i = 0; i < inUse; ++i) {
+        const DeviceHandle handle{static_cast<int32_t>(i)};
+        const DeviceSlot* slot = pinSlot(handle);
+        const bool match = isLive(slot) && slot->deviceId == deviceId;
+        unpinSlot(slot);
+        if (match) {
+            return handle;
+        }
+    }
+    return {};
+}
 
 bool SyncEngine::setDeviceOffsetSamples(const std::string& deviceId, int32_t offsetSamples) {
-    const auto it = devices_.find(deviceId);
-    if (it == devices_.end()) {
+    return setDeviceOffsetSamples(deviceHandle(deviceId), offsetSamples);
+}
+
+bool SyncEngine::setDeviceOffsetSamples(DeviceHandle handle, int32_t offsetSamples) {
+    DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr) {
         return false;
     }
 
-    it->second.offsetSamples = offsetSamples;
+    slot->offsetSamples.store(offsetSamples, std::memory_order_relaxed);
+    return true;
+}
+
+bool SyncEngine::alignDeviceToTime(DeviceHandle handle, int64_t pullTimeNs, int64_t outputLatencyNs) {
+    DeviceSlot* slot = slotFor(handle);
+    int64_t streamIndex = 0;
+    if (slot == nullptr || !streamIndexForPull(pullTimeNs, outputLatencyNs, &streamIndex)) {
+        return false;
+    }
+
+    const auto readHead = static_cast<int64_t>(slot->readHead.load(std::memory_order_relaxed));
+    const int64_t offset = std::clamp<int64_t>(streamIndex - readHead,
+                                               std::numeric_limits<int32_t>::min(),
+                                               std::numeric_limits<int32_t>::max());
+    slot->offsetSamples.store(static_cast<int32_t>(offset), std::memory_order_relaxed);
     return true;
 }
 
 bool SyncEngine::applyDriftCorrectionMs(const std::string& deviceId, float driftMs, int32_t sampleRateHz) {
-    const auto it = devices_.find(deviceId);
-    if (it == devices_.end()) {
+    return applyDriftCorrectionMs(deviceHandle(deviceId), driftMs, sampleRateHz);
+}
+
+bool SyncEngine::applyDriftCorrectionMs(DeviceHandle handle, float driftMs, int32_t sampleRateHz) {
+    DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr) {
         return false;
     }
 
@@ -40,59 +574,697 @@ bool SyncEngine::applyDriftCorrectionMs(const std::string& deviceId, float drift
     }
 
     // Positive drift means device is effectively late; advance reader by reducing offset.
-    it->second.offsetSamples -= correction;
+    slot->offsetSamples.fetch_sub(correction, std::memory_order_relaxed);
+    slot->correctionCount.fetch_add(1, std::memory_order_relaxed);
     return true;
 }
 
+bool SyncEngine::setDeviceRateCorrectionPpm(const std::string& deviceId, float ppm) {
+    return setDeviceRateCorrectionPpm(deviceHandle(deviceId), ppm);
+}
+
+bool SyncEngine::setDeviceRateCorrectionPpm(DeviceHandle handle, float ppm) {
+    DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr || !std::isfinite(ppm)) {
+        return false;
+    }
+
+    slot->rateCorrectionPpm.store(std::clamp(ppm, -kMaxRateCorrectionPpm, kMaxRateCorrectionPpm),
+                                  std::memory_order_relaxed);
+    slot->correctionCount.fetch_add(1, std::memory_order_relaxed);
+    return true;
+}
+
+bool SyncEngine::slewDriftCorrectionMs(const std::string& deviceId, float driftMs, int32_t sampleRateHz) {
+    return slewDriftCorrectionMs(deviceHandle(deviceId), driftMs, sampleRateHz);
+}
+
+bool SyncEngine::slewDriftCorrectionMs(DeviceHandle handle, float driftMs, int32_t sampleRateHz) {
+    DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr || !std::isfinite(driftMs)) {
+        return false;
+    }
+
+    double correction = static_cast<double>(driftMs) * std::max(sampleRateHz, 1) / 1000.0;
+    if (maxCorrectionSamplesPerCall_ > 0) {
+        correction = std::clamp(correction,
+                                -static_cast<double>(maxCorrectionSamplesPerCall_),
+                                static_cast<double>(maxCorrectionSamplesPerCall_));
+    }
+
+    // Same sign convention as applyDriftCorrectionMs: positive drift consumes fewer input samples.
+    slot->pendingCorrectionQ16.fetch_sub(std::llround(correction * kCorrectionQ16One), std::memory_order_relaxed);
+    slot->correctionCount.fetch_add(1, std::memory_order_relaxed);
+    return true;
+}
+
+bool SyncEngine::setDeviceGainDb(const std::string& deviceId, float gainDb) {
+    return setDeviceGainDb(deviceHandle(deviceId), gainDb);
+}
+
+bool SyncEngine::setDeviceGainDb(DeviceHandle handle, float gainDb) {
+    DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr || std::isnan(gainDb)) {
+        return false;
+    }
+
+    const float clamped = std::clamp(gainDb, kMinGainDb, kMaxGainDb);
+    slot->gainDb.store(clamped, std::memory_order_relaxed);
+    slot->gain.store(clamped == 0.0F ? 1.0F : std::pow(10.0F, clamped / 20.0F), std::memory_order_relaxed);
+    return true;
+}
+
+bool SyncEngine::setDeviceSoftClip(const std::string& deviceId, bool enabled) {
+    return setDeviceSoftClip(deviceHandle(deviceId), enabled);
+}
+
+bool SyncEngine::setDeviceSoftClip(DeviceHandle handle, bool enabled) {
+    DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr) {
+        return false;
+    }
+
+    slot->softClip.store(enabled, std::memory_order_relaxed);
+    return true;
+}
+
+bool SyncEngine::applyCalibration(DeviceHandle handle,
+                                  const DeviceCalibration& calibration,
+                                  int32_t sampleRateHz,
+                                  float referenceLatencyMs) {
+    if (slotFor(handle) == nullptr || sampleRateHz <= 0) {
+        return false;
+    }
+
+    const double offsetMs =
+        static_cast<double>(calibration.manualOffsetMs) + calibration.latencyMs - referenceLatencyMs;
+    setDeviceOffsetSamples(handle, static_cast<int32_t>(std::lround(offsetMs * sampleRateHz / 1000.0)));
+    setDeviceGainDb(handle, calibration.gainDb);
+    if (calibration.driftPpm != 0.0F) {
+        // A fast speaker (positive drift) must consume fewer stream samples per output sample.
+        setDeviceRateCorrectionPpm(handle, -calibration.driftPpm);
+    }
+    return true;
+}
+
+std::size_t SyncEngine::applyCalibrations(const CalibrationStore& store, int32_t sampleRateHz) {
+    std::vector<std::pair<DeviceHandle, const DeviceCalibration*>> found;
+    float referenceLatencyMs = 0.0F;
+    const std::size_t inUse = slotsInUse_.load(std::memory_order_acquire);
+    for (std::size_t i = 0; i < inUse; ++i) {
+        const DeviceSlot* slot = pinSlot(DeviceHandle{static_cast<int32_t>(i)});
+        const DeviceCalibration* calibration = isLive(slot) ? store.find(slot->deviceId) : nullptr;
+        unpinSlot(slot);
+        if (calibration != nullptr) {
+            referenceLatencyMs = found.empty() ? calibration->latencyMs : std::max(referenceLatencyMs, calibration->latencyMs);
+            found.emplace_back(DeviceHandle{static_cast<int32_t>(i)}, calibration);
+        }
+    }
+
+    std::size_t applied = 0;
+    for (const auto& [handle, calibration] : found) {
+        applied += applyCalibration(handle, *calibration, sampleRateHz, referenceLatencyMs) ? 1 : 0;
+    }
+    return applied;
+}
+
 bool SyncEngine::pullForDevice(const std::string& deviceId, int16_t* output, std::size_t sampleCount) {
-    return pullForDevice(deviceId, output, sampleCount, nullptr);
+    return pullForDevice(deviceHandle(deviceId), output, sampleCount, nullptr);
 }
 
 bool SyncEngine::pullForDevice(const std::string& deviceId,
                                int16_t* output,
                                std::size_t sampleCount,
                                std::size_t* outReadSamples) {
-    const auto it = devices_.find(deviceId);
-    if (it == devices_.end()) {
+    return pullForDevice(deviceHandle(deviceId), output, sampleCount, outReadSamples);
+}
+
+bool SyncEngine::pullForDevice(DeviceHandle handle,
+                               int16_t* output,
+                               std::size_t sampleCount,
+                               std::size_t* outReadSamples) {
+    DeviceSlot* slot = pinSlot(handle);
+    if (!isLive(slot)) {
+        unpinSlot(slot);
         if (outReadSamples != nullptr) {
             *outReadSamples = 0;
         }
         return false;
     }
 
-    auto& state = it->second;
-    const auto read = ring_.readWithOffset(state.readHead, state.offsetSamples, output, sampleCount);
-    state.readHead += read;
-
+    const std::size_t read = readSlot(*slot,
+                                      static_cast<int64_t>(ringWritten()),
+                                      output,
+                                      sampleCount,
+                                      slot->outputChannels.load(std::memory_order_relaxed));
+    unpinSlot(slot);
     if (outReadSamples != nullptr) {
         *outReadSamples = read;
     }
     return true;
 }
 
-std::size_t SyncEngine::bufferedSamples() const { return ring_.size(); }
+std::size_t SyncEngine::pullAll(DevicePull* pulls, std::size_t pullCount) {
+    if (pulls == nullptr) {
+        return 0;
+    }
+
+    // One acquire of the write counter serves every device in the batch.
+    const auto written = static_cast<int64_t>(ringWritten());
+    std::size_t served = 0;
+    for (std::size_t i = 0; i < pullCount; ++i) {
+        DevicePull& pull = pulls[i];
+        DeviceSlot* pinned = pinSlot(pull.handle);
+        DeviceSlot* slot = isLive(pinned) ? pinned : nullptr;
+        const std::size_t channels = slot == nullptr ? 1 : slot->outputChannels.load(std::memory_order_relaxed);
+        pull.readSamples = slot == nullptr ? 0 : readSlot(*slot, written, pull.output, pull.sampleCount, channels);
+        unpinSlot(pinned);
+        pull.underrun = pull.readSamples < pull.sampleCount;
+        if (pull.output != nullptr) {
+            fillSilence(pull.output + pull.readSamples * channels,
+                        pull.sampleCount - pull.readSamples,
+                        channels,
+                        channels);
+        }
+        served += slot == nullptr ? 0 : 1;
+    }
+
+    return served;
+}
+
+std::size_t SyncEngine::pullAllInterleaved(const DeviceHandle* handles,
+                                           std::size_t deviceCount,
+                                           int16_t* output,
+                                           std::size_t frames,
+                                           std::size_t* outReadSamples,
+                                           bool* outUnderrun) {
+    return pullAllInterleaved(handles,
+                              deviceCount,
+                              output,
+                              std::numeric_limits<std::size_t>::max(),
+                              frames,
+                              outReadSamples,
+                              outUnderrun);
+}
+
+std::size_t SyncEngine::pullAllInterleaved(const DeviceHandle* handles,
+                                           std::size_t deviceCount,
+                                           int16_t* output,
+                                           std::size_t outputSampleCapacity,
+                                           std::size_t frames,
+                                           std::size_t* outReadSamples,
+                                           bool* outUnderrun) {
+    if (handles == nullptr || output == nullptr || deviceCount == 0) {
+        return 0;
+    }
+
+    // Each device contributes its output channels to every frame; unknown handles keep one
+    // silent column so the layout stays predictable. Every slot stays pinned until its column is
+    // filled, so a device leaving mid-call keeps its width (a left slot drops back to one column
+    // only after its readers drain).
+    std::size_t frameStride = 0;
+    for (std::size_t d = 0; d < deviceCount; ++d) {
+        const DeviceSlot* slot = pinSlot(handles[d]);
+        frameStride += slot == nullptr ? 1 : slot->outputChannels.load(std::memory_order_relaxed);
+    }
+    if (frames > outputSampleCapacity / frameStride) {
+        // Nothing read: drop the stride pass's pins.
+        for (std::size_t d = 0; d < deviceCount; ++d) {
+            const DeviceSlot* slot = pinSlot(handles[d]);
+            unpinSlot(slot);
+            unpinSlot(slot);
+        }
+        return 0;
+    }
+
+    const auto written = static_cast<int64_t>(ringWritten());
+    std::size_t served = 0;
+    std::size_t column = 0;
+    for (std::size_t d = 0; d < deviceCount; ++d) {
+        DeviceSlot* pinned = pinSlot(handles[d]);
+        DeviceSlot* slot = isLive(pinned) ? pinned : nullptr;
+        std::size_t channels = pinned == nullptr ? 1 : pinned->outputChannels.load(std::memory_order_relaxed);
+        if (column + channels > frameStride) {
+            // A stale handle whose slot was registered again during the call: keep within the frame.
+            slot = nullptr;
+            channels = std::min<std::size_t>(1, frameStride - column);
+        }
+        const std::size_t read = slot == nullptr ? 0 : readSlot(*slot, written, output + column, frames, frameStride);
+        fillSilence(output + column + read * frameStride, frames - read, channels, frameStride);
+        // This pass's pin and the stride pass's.
+        unpinSlot(pinned);
+        unpinSlot(pinned);
+        column += channels;
+        if (outReadSamples != nullptr) {
+            outReadSamples[d] = read;
+        }
+        if (outUnderrun != nullptr) {
+            outUnderrun[d] = read < frames;
+        }
+        served += slot == nullptr ? 0 : 1;
+    }
+
+    return served;
+}
+
+std::size_t SyncEngine::readSlot(DeviceSlot& slot,
+                                 int64_t written,
+                                 int16_t* output,
+                                 std::size_t frameCount,
+                                 std::size_t frameStride) {
+    // The pushing thread is moving the ring's storage (resizeRing): this pull plays nothing.
+    if (resizing_.load()) {
+        if (output != nullptr && frameCount > 0) {
+            bumpCounter(slot.underrunCount, 1);
+            bumpCounter(slot.underrunFrames, frameCount);
+        }
+        return 0;
+    }
+    if (mode_ == SyncEngineMode::kConcurrent) {
+        if (slot.stalled.load()) {
+            written = catchUpStalledSlot(slot);
+        } else {
+            slot.lastPullNs.store(steadyNowNs(), std::memory_order_relaxed);
+        }
+    }
+    return format_.encoding == PcmEncoding::kPcmFloat ? readSlotFrom(floatRing_, slot, written, output, frameCount, frameStride)
+                                                      : readSlotFrom(ring_, slot, written, output, frameCount, frameStride);
+}
+
+int64_t SyncEngine::catchUpStalledSlot(DeviceSlot& slot) {
+    // Pushes from here on wait for this slot's cursor again (briefly: it is published at the end
+    // of this pull). One that skipped it may still be writing, so wait it out as a join does and
+    // move up to the oldest frame that survived, counting the ones lost as an overrun.
+    slot.lastPullNs.store(steadyNowNs(), std::memory_order_relaxed);
+    slot.stalled.store(false);
+    const uint64_t sequence = pushSequence_.load();
+    if (sequence % 2 != 0) {
+        while (pushSequence_.load() == sequence) {
+            std::this_thread::yield();
+        }
+    }
+
+    const auto written = static_cast<int64_t>(ringWritten());
+    const int64_t oldestKept = written - static_cast<int64_t>(ringCapacity()) + rewindHeadroom();
+    const int64_t position = static_cast<int64_t>(slot.readHead.load(std::memory_order_relaxed)) +
+                             slot.offsetSamples.load(std::memory_order_relaxed);
+    if (position < oldestKept) {
+        slot.readHead.fetch_add(static_cast<std::size_t>(oldestKept - position), std::memory_order_relaxed);
+        slot.highWaterCursor = std::max(slot.highWaterCursor, oldestKept);
+        slot.cursor.store(oldestKept, std::memory_order_release);
+        bumpCounter(slot.overrunCount, 1);
+        bumpCounter(slot.overrunFrames, static_cast<uint64_t>(oldestKept - position));
+    }
+    return written;
+}
+
+template <typename Sample>
+std::size_t SyncEngine::readSlotFrom(const PcmRingBuffer<Sample>& ring,
+                                     DeviceSlot& slot,
+                                     int64_t written,
+                                     int16_t* output,
+                                     std::size_t frameCount,
+                                     std::size_t frameStride) {
+    const bool concurrent = mode_ == SyncEngineMode::kConcurrent;
+    const std::size_t readHead = slot.readHead.load(std::memory_order_relaxed);
+    const int32_t targetOffset = slot.offsetSamples.load(std::memory_order_relaxed);
+    int64_t position = static_cast<int64_t>(readHead) + targetOffset;
+
+    // The writer only guarantees slots from (highest published cursor - headroom) onward, so a
+    // larger backward move is clamped here and finished on later pulls.
+    if (concurrent) {
+        position = std::max(position, slot.highWaterCursor - rewindHeadroom());
+    }
+
+    // Gain ramps linearly toward the latest target over gainRampFrames_ rendered frames.
+    const float targetGain = slot.gain.load(std::memory_order_relaxed);
+    if (targetGain != slot.rampTarget) {
+        slot.rampTarget = targetGain;
+        slot.rampRemaining = gainRampFrames_;
+    }
+    float gainStart = targetGain;
+    float gainStep = 0.0F;
+    if (slot.rampRemaining > 0) {
+        gainStart = slot.appliedGain;
+        gainStep = (targetGain - slot.appliedGain) / static_cast<float>(slot.rampRemaining);
+    }
+    const auto rampFrames = static_cast<float>(slot.rampRemaining);
+    const bool softClip = slot.softClip.load(std::memory_order_relaxed);
+
+    const std::size_t channels = ring.channels();
+    const auto render = [&](int64_t index, std::size_t count, int16_t* destination) {
+        withGain(gainStart, gainStep, rampFrames, softClip, [&](const auto& gain) {
+            renderSegments(ring.segmentsAt(index, count), channels, slot.channelMap, destination, frameStride, gain);
+        });
+    };
+
+    std::size_t produced = 0;
+    std::size_t rendered = 0;
+    int64_t consumedInput = 0;
+    if (output != nullptr && frameCount > 0) {
+        if (usesResampler(slot, position)) {
+            produced = resampleSlot(ring, slot, position, written, output, frameCount, frameStride, &consumedInput);
+            // Applied while the resampled block is still in cache.
+            withGain(gainStart, gainStep, rampFrames, softClip, [&](const auto& gain) {
+                if constexpr (!std::decay_t<decltype(gain)>::kUnity) {
+                    applyGain(output, produced, slot.outputChannels.load(std::memory_order_relaxed), frameStride, gain);
+                }
+            });
+            rendered = produced;
+        } else {
+            // Stream indices before the first pushed frame play as silence.
+            if (position < 0) {
+                produced = static_cast<std::size_t>(std::min<int64_t>(-position, static_cast<int64_t>(frameCount)));
+                fillSilence(output, produced, slot.outputChannels.load(std::memory_order_relaxed), frameStride);
+            }
+
+            // Never copy more than one ring's worth, even for a reader registered far behind.
+            const int64_t available = std::min<int64_t>(written - (position + static_cast<int64_t>(produced)),
+                                                        static_cast<int64_t>(ring.capacity()));
+            if (available > 0 && produced < frameCount) {
+                const auto toRead = static_cast<std::size_t>(
+                    std::min<int64_t>(available, static_cast<int64_t>(frameCount - produced)));
+                render(position + static_cast<int64_t>(produced), toRead, output + produced * frameStride);
+                produced += toRead;
+                rendered = toRead;
+            }
+            consumedInput = static_cast<int64_t>(produced);
+            // A reader ahead of the write position gets silence, not whatever the ring held there.
+            if (produced < frameCount) {
+                fillSilence(output + produced * frameStride,
+                            frameCount - produced,
+                            slot.outputChannels.load(std::memory_order_relaxed),
+                            frameStride);
+            }
+        }
+    }
+
+    const std::size_t rampAdvance = std::min(rendered, slot.rampRemaining);
+    slot.rampRemaining -= rampAdvance;
+    slot.appliedGain = slot.rampRemaining == 0 ? targetGain : gainStart + gainStep * static_cast<float>(rampAdvance);
+
+    if (output != nullptr && frameCount > 0) {
+        // Frames older than one ring behind the write position have been overwritten: the reader
+        // was lapped and whatever it copied from them is stale.
+        const int64_t oldestIntact = written - static_cast<int64_t>(ring.capacity());
+        if (position < oldestIntact && rendered > 0) {
+            bumpCounter(slot.overrunCount, 1);
+            bumpCounter(slot.overrunFrames,
+                        static_cast<uint64_t>(std::min<int64_t>(oldestIntact - position, static_cast<int64_t>(frameCount))));
+        }
+        if (produced < frameCount) {
+            bumpCounter(slot.underrunCount, 1);
+            bumpCounter(slot.underrunFrames, frameCount - produced);
+        }
+        bumpCounter(slot.framesRead, produced);
+    }
+    slot.lagFrames.store(written - (position + consumedInput), std::memory_order_relaxed);
+
+    slot.readHead.store(readHead + static_cast<std::size_t>(consumedInput), std::memory_order_relaxed);
+    if (!concurrent) {
+        return produced;
+    }
+
+    const int64_t nextCursor = position + consumedInput;
+    slot.highWaterCursor = std::max(slot.highWaterCursor, nextCursor);
+    // Release: the writer may reuse the slots we just copied out once it observes this cursor.
+    slot.cursor.store(nextCursor, std::memory_order_release);
+    return produced;
+}
+
+bool SyncEngine::usesResampler(const DeviceSlot& slot, int64_t position) const {
+    const bool active = slot.rateCorrectionPpm.load(std::memory_order_relaxed) != 0.0F ||
+                        slot.pendingCorrectionQ16.load(std::memory_order_relaxed) != 0 || slot.phase != 0.0;
+    if (!active || ringCapacity() < kMinResamplerCapacity) {
+        return false;
+    }
+
+    // Concurrent readers may only touch history the writer keeps intact behind their cursor.
+    return mode_ == SyncEngineMode::kSingleThreaded ||
+           (position >= kResamplerHistory && rewindHeadroom() >= kResamplerHistory);
+}
+
+template <typename Sample>
+std::size_t SyncEngine::resampleSlot(const PcmRingBuffer<Sample>& ring,
+                                     DeviceSlot& slot,
+                                     int64_t position,
+                                     int64_t written,
+                                     int16_t* output,
+                                     std::size_t frameCount,
+                                     std::size_t frameStride,
+                                     int64_t* outConsumedInput) {
+    const bool concurrent = mode_ == SyncEngineMode::kConcurrent;
+    const double baseRatio = 1.0 + slot.rateCorrectionPpm.load(std::memory_order_relaxed) * 1e-6;
+    const int64_t pendingQ16 = slot.pendingCorrectionQ16.load(std::memory_order_relaxed);
+    const std::size_t limit =
+        concurrent ? frameCount
+                   : std::min(frameCount, std::min<std::size_t>(static_cast<std::size_t>(written), ring.capacity()));
+    const std::size_t channels = ring.channels();
+    const bool splitChannels = slot.channelMap.layout == DeviceChannelLayout::kAllChannels && channels > 1;
+    const std::size_t outputChannels = slot.outputChannels.load(std::memory_order_relaxed);
+
+    int16_t input[kResampleInputCapacity];
+    double fraction = slot.phase;
+    int64_t consumedInput = 0;
+    int64_t appliedQ16 = 0;
+    std::size_t produced = 0;
+
+    while (produced < limit) {
+        std::size_t chunk = std::min(kResampleChunk, limit - produced);
+
+        // Spend at most maxSlewPpm_ of this chunk on the outstanding drift correction.
+        const double maxSlew = static_cast<double>(maxSlewPpm_) * 1e-6 * static_cast<double>(chunk);
+        const double remaining = static_cast<double>(pendingQ16 - appliedQ16) / kCorrectionQ16One;
+        const double ratio = baseRatio + std::clamp(remaining, -maxSlew, maxSlew) / static_cast<double>(chunk);
+        const int64_t chunkStart = position + consumedInput;
+
+        if (concurrent) {
+            const auto lastUsable = static_cast<double>(written - 1 - kResamplerLookahead - chunkStart);
+            if (lastUsable < fraction) {
+                break;
+            }
+            const auto usable = static_cast<std::size_t>(std::floor((lastUsable - fraction) / ratio)) + 1;
+            chunk = std::min(chunk, usable);
+        }
+
+        // Each output channel is gathered to mono int16 and interpolated on its own.
+        const std::size_t span = resamplerInputSpan(fraction, ratio, chunk);
+        const PcmRingSegments<Sample> segments = ring.segmentsAt(chunkStart - kResamplerHistory, span);
+        double end = fraction;
+        for (std::size_t c = 0; c < outputChannels; ++c) {
+            const DeviceChannelMap source =
+                splitChannels ? DeviceChannelMap{DeviceChannelLayout::kSingleChannel, static_cast<int32_t>(c)}
+                              : slot.channelMap;
+            renderSegments(segments, channels, source, input, 1);
+            end = resamplePcm16(input + kResamplerHistory,
+                                fraction,
+                                ratio,
+                                output + produced * frameStride + c,
+                                chunk,
+                                frameStride);
+        }
+
+        const double whole = std::floor(end);
+        consumedInput += static_cast<int64_t>(whole);
+        fraction = end - whole;
+        appliedQ16 += std::llround((ratio - baseRatio) * static_cast<double>(chunk) * kCorrectionQ16One);
+        produced += chunk;
+    }
+
+    slot.phase = fraction;
+    if (appliedQ16 != 0) {
+        slot.pendingCorrectionQ16.fetch_sub(appliedQ16, std::memory_order_relaxed);
+    }
+    *outConsumedInput = consumedInput;
+    return produced;
+}
+
+template <typename Sample>
+std::size_t SyncEngine::pushFrames(PcmRingBuffer<Sample>& ring, const Sample* input, std::size_t frameCount) {
+    if (input == nullptr || frameCount == 0) {
+        return 0;
+    }
+    if (mode_ == SyncEngineMode::kSingleThreaded) {
+        return ring.write(input, frameCount);
+    }
+
+    // A join publishes its cursor in joiningCursor_ before `active`, and reads it back here first,
+    // so a device joining during this scan is seen in one or the other; a join that missed this
+    // push altogether waits for it to finish before placing its cursor (see publishDevice).
+    const PushScope scope(pushSequence_);
+    const int64_t stalledBeforeNs =
+        steadyNowNs() - std::max(static_cast<int64_t>(ring.capacity()) * 1'000'000'000 / format_.sampleRateHz,
+                                 kMinStalledReaderNs);
+    int64_t slowestCursor = joiningCursor_.load();
+    const std::size_t inUse = slotsInUse_.load(std::memory_order_acquire);
+    for (std::size_t i = 0; i < inUse; ++i) {
+        DeviceSlot& slot = slots_[i];
+        if (!slot.active.load()) {
+            continue;
+        }
+        // A reader that has not pulled for longer than the ring spans no longer holds the writer
+        // back. Sequentially consistent with pinSlot and the reader's check of `stalled`: either
+        // the reader sees the mark and catches up, or this push sees it pinned and waits for it.
+        if (slot.lastPullNs.load(std::memory_order_relaxed) < stalledBeforeNs) {
+            if (!slot.stalled.load()) {
+                slot.stalled.store(true);
+            }
+            if (slot.readers.load() == 0) {
+                continue;
+            }
+        }
+        slowestCursor = std::min(slowestCursor, slot.cursor.load(std::memory_order_acquire));
+    }
+
+    std::size_t accepted = frameCount;
+    if (slowestCursor != kNoCursor) {
+        const auto written = static_cast<int64_t>(ring.totalWritten());
+        const int64_t limit = slowestCursor - rewindHeadroom() + static_cast<int64_t>(ring.capacity());
+        const int64_t space = std::max<int64_t>(limit - written, 0);
+        accepted = static_cast<std::size_t>(std::min<int64_t>(space, static_cast<int64_t>(frameCount)));
+    }
+    if (accepted < frameCount) {
+        bumpCounter(droppedPushCount_, 1);
+        bumpCounter(droppedFrames_, frameCount - accepted);
+    }
+
+    if (accepted == 0) {
+        return 0;
+    }
+    return ring.write(input, accepted);
+}
+
+bool SyncEngine::streamIndexForPull(int64_t pullTimeNs, int64_t outputLatencyNs, int64_t* outStreamIndex) const {
+    if (!timeline_.streamIndexAt(pullTimeNs + outputLatencyNs, outStreamIndex)) {
+        return false;
+    }
+    if (mode_ == SyncEngineMode::kConcurrent) {
+        // Older frames are overwritten, or would hold the writer back past the rewind headroom.
+        const int64_t oldestKept =
+            static_cast<int64_t>(ringWritten()) - static_cast<int64_t>(ringCapacity()) + rewindHeadroom();
+        *outStreamIndex = std::max(*outStreamIndex, oldestKept);
+    }
+    return true;
+}
+
+std::size_t SyncEngine::ringCapacity() const { return ringCapacity_.load(std::memory_order_relaxed); }
+
+uint64_t SyncEngine::ringWritten() const {
+    return format_.encoding == PcmEncoding::kPcmFloat ? floatRing_.totalWritten() : ring_.totalWritten();
+}
+
+bool SyncEngine::resizeRing(std::size_t capacitySamples) {
+    if (capacitySamples == 0) {
+        return false;
+    }
+
+    const bool concurrent = mode_ == SyncEngineMode::kConcurrent;
+    const PushScope scope(pushSequence_);
+    if (concurrent) {
+        // Pulls that start from here on see the flag and stay out of the ring; the ones already
+        // inside are waited out, as a leave waits out the readers of its slot.
+        resizing_.store(true);
+        for (const DeviceSlot& slot : slots_) {
+            while (slot.readers.load() != 0) {
+                std::this_thread::yield();
+            }
+        }
+    }
+
+    // Whatever a device may still play, or rewind onto within the new headroom, has to survive.
+    const auto written = static_cast<int64_t>(ringWritten());
+    const int64_t headroom = concurrent ? static_cast<int64_t>(capacitySamples / kRewindHeadroomDivisor) : 0;
+    int64_t oldestNeeded = concurrent ? std::min(written, joiningCursor_.load() - headroom) : written;
+    const std::size_t inUse = slotsInUse_.load(std::memory_order_acquire);
+    for (std::size_t i = 0; i < inUse; ++i) {
+        const DeviceSlot& slot = slots_[i];
+        // A stalled reader catches up to whatever the resized ring still holds on its next pull.
+        if (!slot.active.load(std::memory_order_acquire) || (concurrent && slot.stalled.load())) {
+            continue;
+        }
+        const int64_t position = concurrent ? slot.cursor.load(std::memory_order_acquire)
+                                            : static_cast<int64_t>(slot.readHead.load(std::memory_order_relaxed)) +
+                                                  slot.offsetSamples.load(std::memory_order_relaxed);
+        oldestNeeded = std::min(oldestNeeded, position - headroom);
+    }
+    oldestNeeded = std::max({oldestNeeded, written - static_cast<int64_t>(ringCapacity()), int64_t{0}});
+
+    const bool fits = written - oldestNeeded <= static_cast<int64_t>(capacitySamples);
+    if (fits) {
+        if (format_.encoding == PcmEncoding::kPcmFloat) {
+            floatRing_.resize(capacitySamples);
+        } else {
+            ring_.resize(capacitySamples);
+        }
+        ringCapacity_.store(capacitySamples, std::memory_order_relaxed);
+        rewindHeadroomSamples_.store(headroom, std::memory_order_relaxed);
+    }
+    resizing_.store(false, std::memory_order_release);
+    return fits;
+}
+
+std::size_t SyncEngine::masterCapacitySamples() const { return ringCapacity(); }
+
+std::size_t SyncEngine::bufferedSamples() const {
+    return static_cast<std::size_t>(std::min<uint64_t>(ringWritten(), ringCapacity()));
+}
+
+bool SyncEngine::streamIndexAtTime(int64_t presentationTimeNs, int64_t* outStreamIndex) const {
+    return timeline_.streamIndexAt(presentationTimeNs, outStreamIndex);
+}
 
-bool SyncEngine::hasDevice(const std::string& deviceId) const {
-    return devices_.find(deviceId) != devices_.end();
+bool SyncEngine::presentationTimeNs(int64_t streamIndex, int64_t* outTimeNs) const {
+    return timeline_.timeAt(streamIndex, outTimeNs);
 }
 
+bool SyncEngine::devicePresentationTimeNs(DeviceHandle handle, int64_t* outTimeNs) const {
+    const DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr) {
+        return false;
+    }
+    const int64_t position = static_cast<int64_t>(slot->readHead.load(std::memory_order_relaxed)) +
+                             slot->offsetSamples.load(std::memory_order_relaxed);
+    return timeline_.timeAt(position, outTimeNs);
+}
+
+bool SyncEngine::hasDevice(const std::string& deviceId) const { return deviceHandle(deviceId).valid(); }
+
+bool SyncEngine::hasDevice(DeviceHandle handle) const { return slotFor(handle) != nullptr; }
+
 DeviceStreamState SyncEngine::deviceState(const std::string& deviceId) const {
-    const auto it = devices_.find(deviceId);
-    if (it == devices_.end()) {
+    return deviceState(deviceHandle(deviceId));
+}
+
+DeviceStreamState SyncEngine::deviceState(DeviceHandle handle) const {
+    const DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr) {
         return {};
     }
 
-    return it->second;
+    DeviceStreamState state;
+    state.offsetSamples = slot->offsetSamples.load(std::memory_order_relaxed);
+    state.readHead = slot->readHead.load(std::memory_order_relaxed);
+    state.rateCorrectionPpm = slot->rateCorrectionPpm.load(std::memory_order_relaxed);
+    state.pendingCorrectionSamples = static_cast<float>(
+        static_cast<double>(slot->pendingCorrectionQ16.load(std::memory_order_relaxed)) / kCorrectionQ16One);
+    state.gainDb = slot->gainDb.load(std::memory_order_relaxed);
+    state.softClip = slot->softClip.load(std::memory_order_relaxed);
+    return state;
 }
 
-std::size_t SyncEngine::deviceCount() const { return devices_.size(); }
+std::size_t SyncEngine::deviceCount() const { return deviceCount_.load(std::memory_order_relaxed); }
 
 std::vector<DeviceOffset> SyncEngine::deviceOffsets() const {
     std::vector<DeviceOffset> offsets;
-    offsets.reserve(devices_.size());
+    offsets.reserve(deviceCount());
 
-    for (const auto& [deviceId, state] : devices_) {
-        offsets.push_back({deviceId, state.offsetSamples});
+    const std::size_t inUse = slotsInUse_.load(std::memory_order_acquire);
+    for (std::size_t i = 0; i < inUse; ++i) {
+        const DeviceSlot* slot = pinSlot(DeviceHandle{static_cast<int32_t>(i)});
+        if (isLive(slot)) {
+            offsets.push_back({slot->deviceId, slot->offsetSamples.load(std::memory_order_relaxed)});
+        }
+        unpinSlot(slot);
     }
 
     std::sort(offsets.begin(), offsets.end(), [](const DeviceOffset& lhs, const DeviceOffset& rhs) {
@@ -113,11 +1285,135 @@ std::size_t SyncEngine::applyDeviceOffsets(const std::vector<DeviceOffset>& offs
 }
 
 std::size_t SyncEngine::resetAllDeviceOffsets(int32_t offsetSamples) {
-    for (auto& [_, state] : devices_) {
-        state.offsetSamples = offsetSamples;
+    const std::size_t inUse = slotsInUse_.load(std::memory_order_acquire);
+    for (std::size_t i = 0; i < inUse; ++i) {
+        if (slots_[i].active.load(std::memory_order_acquire)) {
+            slots_[i].offsetSamples.store(offsetSamples, std::memory_order_relaxed);
+        }
+    }
+
+    return deviceCount();
+}
+
+EngineMetrics SyncEngine::engineMetrics() const {
+    EngineMetrics metrics;
+    metrics.timestampNs = steadyNowNs();
+    metrics.framesWritten = ringWritten();
+    metrics.droppedFrames = droppedFrames_.load(std::memory_order_relaxed);
+    metrics.droppedPushCount = droppedPushCount_.load(std::memory_order_relaxed);
+
+    int64_t maxLag = std::numeric_limits<int64_t>::min();
+    const std::size_t inUse = slotsInUse_.load(std::memory_order_acquire);
+    for (std::size_t i = 0; i < inUse; ++i) {
+        const DeviceSlot& slot = slots_[i];
+        if (!slot.active.load(std::memory_order_acquire)) {
+            continue;
+        }
+        ++metrics.deviceCount;
+        metrics.underrunCount += slot.underrunCount.load(std::memory_order_relaxed);
+        metrics.overrunCount += slot.overrunCount.load(std::memory_order_relaxed);
+        metrics.correctionCount += slot.correctionCount.load(std::memory_order_relaxed);
+        maxLag = std::max(maxLag, slot.lagFrames.load(std::memory_order_relaxed));
+    }
+
+    // Fill is what the furthest-behind device still has to play; without devices, what is stored.
+    const auto capacity = static_cast<int64_t>(ringCapacity());
+    const int64_t unread = metrics.deviceCount == 0 ? static_cast<int64_t>(bufferedSamples())
+                                                    : std::clamp<int64_t>(maxLag, 0, capacity);
+    metrics.bufferFillPercent = 100.0 * static_cast<double>(unread) / static_cast<double>(capacity);
+    return metrics;
+}
+
+DeviceMetrics SyncEngine::deviceMetrics(DeviceHandle handle) const {
+    const DeviceSlot* slot = slotFor(handle);
+    if (slot == nullptr) {
+        return {};
+    }
+
+    DeviceMetrics metrics;
+    metrics.handle = handle;
+    metrics.lagFrames = slot->lagFrames.load(std::memory_order_relaxed);
+    metrics.framesRead = slot->framesRead.load(std::memory_order_relaxed);
+    metrics.underrunCount = slot->underrunCount.load(std::memory_order_relaxed);
+    metrics.underrunFrames = slot->underrunFrames.load(std::memory_order_relaxed);
+    metrics.overrunCount = slot->overrunCount.load(std::memory_order_relaxed);
+    metrics.overrunFrames = slot->overrunFrames.load(std::memory_order_relaxed);
+    metrics.correctionCount = slot->correctionCount.load(std::memory_order_relaxed);
+    return metrics;
+}
+
+std::size_t SyncEngine::deviceMetrics(DeviceMetrics* out, std::size_t maxDevices) const {
+    if (out == nullptr) {
+        return 0;
+    }
+
+    std::size_t written = 0;
+    const std::size_t inUse = slotsInUse_.load(std::memory_order_acquire);
+    for (std::size_t i = 0; i < inUse && written < maxDevices; ++i) {
+        if (slots_[i].active.load(std::memory_order_acquire)) {
+            out[written++] = deviceMetrics(DeviceHandle{static_cast<int32_t>(i)});
+        }
+    }
+    return written;
+}
+
+std::string SyncEngine::deviceId(DeviceHandle handle) const {
+    const DeviceSlot* slot = pinSlot(handle);
+    std::string id = isLive(slot) ? slot->deviceId : std::string();
+    unpinSlot(slot);
+    return id;
+}
+
+SyncEngineMode SyncEngine::mode() const { return mode_; }
+
+PcmFormat SyncEngine::format() const { return format_; }
+
+std::size_t SyncEngine::deviceOutputChannels(DeviceHandle handle) const {
+    const DeviceSlot* slot = slotFor(handle);
+    return slot == nullptr ? 0 : slot->outputChannels.load(std::memory_order_relaxed);
+}
+
+std::size_t SyncEngine::rewindHeadroomSamples() const { return static_cast<std::size_t>(rewindHeadroom()); }
+
+int64_t SyncEngine::rewindHeadroom() const { return rewindHeadroomSamples_.load(std::memory_order_relaxed); }
+
+std::size_t SyncEngine::maxDevices() const { return slots_.size(); }
+
+SyncEngine::DeviceSlot* SyncEngine::slotFor(DeviceHandle handle) {
+    return const_cast<DeviceSlot*>(static_cast<const SyncEngine*>(this)->slotFor(handle));
+}
+
+const SyncEngine::DeviceSlot* SyncEngine::slotFor(DeviceHandle handle) const {
+    if (!handle.valid() || static_cast<std::size_t>(handle.index) >= slots_.size()) {
+        return nullptr;
     }
 
-    return devices_.size();
+    const DeviceSlot& slot = slots_[static_cast<std::size_t>(handle.index)];
+    return slot.active.load(std::memory_order_acquire) ? &slot : nullptr;
+}
+
+SyncEngine::DeviceSlot* SyncEngine::pinSlot(DeviceHandle handle) {
+    return const_cast<DeviceSlot*>(static_cast<const SyncEngine*>(this)->pinSlot(handle));
 }
 
+const SyncEngine::DeviceSlot* SyncEngine::pinSlot(DeviceHandle handle) const {
+    if (!handle.valid() || static_cast<std::size_t>(handle.index) >= slots_.size()) {
+        return nullptr;
+    }
+
+    // Sequentially consistent with the leave's store to `active` and its read of `readers`: either
+    // the leave waits for this pin, or isLive() sees the slot already unpublished.
+    const DeviceSlot& slot = slots_[static_cast<std::size_t>(handle.index)];
+    slot.readers.fetch_add(1);
+    return &slot;
+}
+
+void SyncEngine::unpinSlot(const DeviceSlot* slot) {
+    if (slot != nullptr) {
+        slot->readers.fetch_sub(1, std::memory_order_release);
+    }
+}
+
+bool SyncEngine::isLive(const DeviceSlot* slot) { return slot != nullptr && slot->active.load(); }
+
 }  // namespace multiconnect
@@ -1,15 +1,36 @@
 #include "multiconnect/sync_engine_c_api.h"
 
+#include "multiconnect/offset_estimator.h"
 #include "multiconnect/sync_engine.h"
 
+#include <algorithm>
 #include <cstring>
 #include <vector>
 
+namespace {
+// Batches are converted through a fixed stack array so the audio path never allocates.
+constexpr std::size_t kPullBatchSize = MC_MAX_DEVICES;
+
+bool toChannelMap(int32_t layout, int32_t channel, multiconnect::DeviceChannelMap* out) {
+    if (layout == MC_DEVICE_CHANNELS_DOWNMIX_MONO) {
+        out->layout = multiconnect::DeviceChannelLayout::kDownmixMono;
+    } else if (layout == MC_DEVICE_CHANNELS_SINGLE) {
+        out->layout = multiconnect::DeviceChannelLayout::kSingleChannel;
+        out->channel = channel;
+    } else if (layout != MC_DEVICE_CHANNELS_ALL) {
+        return false;
+    }
+    return true;
+}
+}  // namespace
+
 struct MC_SyncEngine {
     multiconnect::SyncEngine impl;
 
     explicit MC_SyncEngine(std::size_t masterCapacitySamples, int32_t maxCorrectionSamplesPerCall)
         : impl(masterCapacitySamples, maxCorrectionSamplesPerCall) {}
+
+    explicit MC_SyncEngine(const multiconnect::SyncEngineConfig& config) : impl(config) {}
 };
 
 extern "C" {
@@ -19,6 +40,37 @@ MC_SyncEngine* mc_sync_engine_create(size_t master_capacity_samples,
     return new MC_SyncEngine(master_capacity_samples, max_correction_samples_per_call);
 }
 
+MC_SyncEngine* mc_sync_engine_create_with_config(const MC_SyncEngineConfig* config) {
+    // More devices than one interleaved pull can take would leave some of them unplayable there.
+    if (config == nullptr || config->max_devices > MC_MAX_DEVICES) {
+        return nullptr;
+    }
+
+    multiconnect::SyncEngineConfig converted;
+    converted.masterCapacitySamples = config->master_capacity_samples;
+    converted.maxCorrectionSamplesPerCall = config->max_correction_samples_per_call;
+    converted.mode = config->mode == MC_SYNC_ENGINE_MODE_CONCURRENT ? multiconnect::SyncEngineMode::kConcurrent
+                                                                     : multiconnect::SyncEngineMode::kSingleThreaded;
+    if (config->max_devices > 0) {
+        converted.maxDevices = config->max_devices;
+    }
+    if (config->max_slew_ppm > 0.0F) {
+        converted.maxSlewPpm = config->max_slew_ppm;
+    }
+    if (config->channels > 0) {
+        converted.format.channels = config->channels;
+    }
+    if (config->gain_ramp_frames > 0) {
+        converted.gainRampFrames = config->gain_ramp_frames;
+    }
+    if (config->sample_rate_hz > 0) {
+        converted.format.sampleRateHz = config->sample_rate_hz;
+    }
+    converted.format.encoding = config->encoding == MC_PCM_ENCODING_FLOAT ? multiconnect::PcmEncoding::kPcmFloat
+                                                                          : multiconnect::PcmEncoding::kPcm16;
+    return new MC_SyncEngine(converted);
+}
+
 void mc_sync_engine_destroy(MC_SyncEngine* engine) {
     delete engine;
 }
@@ -31,6 +83,61 @@ int mc_sync_engine_register_device(MC_SyncEngine* engine, const char* device_id,
     return engine->impl.registerDevice(device_id, initial_offset_samples) ? 1 : 0;
 }
 
+int32_t mc_sync_engine_register_device_handle(MC_SyncEngine* engine,
+                                              const char* device_id,
+                                              int32_t initial_offset_samples) {
+    if (engine == nullptr || device_id == nullptr) {
+        return MC_INVALID_DEVICE_HANDLE;
+    }
+
+    return engine->impl.registerDevice(device_id, initial_offset_samples).index;
+}
+
+int32_t mc_sync_engine_register_device_channels(MC_SyncEngine* engine,
+                                                const char* device_id,
+                                                int32_t initial_offset_samples,
+                                                int32_t layout,
+                                                int32_t channel) {
+    if (engine == nullptr || device_id == nullptr) {
+        return MC_INVALID_DEVICE_HANDLE;
+    }
+
+    multiconnect::DeviceChannelMap channels;
+    if (!toChannelMap(layout, channel, &channels)) {
+        return MC_INVALID_DEVICE_HANDLE;
+    }
+    return engine->impl.registerDevice(device_id, initial_offset_samples, channels).index;
+}
+
+int32_t mc_sync_engine_register_device_at_time(MC_SyncEngine* engine,
+                                               const char* device_id,
+                                               int64_t pull_time_ns,
+                                               int64_t output_latency_ns,
+                                               int32_t layout,
+                                               int32_t channel) {
+    multiconnect::DeviceChannelMap channels;
+    if (engine == nullptr || device_id == nullptr || !toChannelMap(layout, channel, &channels)) {
+        return MC_INVALID_DEVICE_HANDLE;
+    }
+    return engine->impl.registerDeviceAtTime(device_id, pull_time_ns, output_latency_ns, channels).index;
+}
+
+size_t mc_sync_engine_device_output_channels(const MC_SyncEngine* engine, int32_t device_handle) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.deviceOutputChannels(multiconnect::DeviceHandle{device_handle});
+}
+
+int32_t mc_sync_engine_device_handle(const MC_SyncEngine* engine, const char* device_id) {
+    if (engine == nullptr || device_id == nullptr) {
+        return MC_INVALID_DEVICE_HANDLE;
+    }
+
+    return engine->impl.deviceHandle(device_id).index;
+}
+
 int mc_sync_engine_unregister_device(MC_SyncEngine* engine, const char* device_id) {
     if (engine == nullptr || device_id == nullptr) {
         return 0;
@@ -39,12 +146,74 @@ int mc_sync_engine_unregister_device(MC_SyncEngine* engine, const char* device_i
     return engine->impl.unregisterDevice(device_id) ? 1 : 0;
 }
 
-void mc_sync_engine_push_pcm16(MC_SyncEngine* engine, const int16_t* input, size_t sample_count) {
+int32_t mc_sync_engine_rejoin_device(MC_SyncEngine* engine, const char* device_id) {
+    if (engine == nullptr || device_id == nullptr) {
+        return MC_INVALID_DEVICE_HANDLE;
+    }
+
+    return engine->impl.rejoinDevice(device_id).index;
+}
+
+size_t mc_sync_engine_push_pcm16(MC_SyncEngine* engine, const int16_t* input, size_t sample_count) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.pushPcm16(input, sample_count);
+}
+
+size_t mc_sync_engine_push_pcm_float(MC_SyncEngine* engine, const float* input, size_t frame_count) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.pushPcmFloat(input, frame_count);
+}
+
+size_t mc_sync_engine_push_pcm16_at(MC_SyncEngine* engine,
+                                    const int16_t* input,
+                                    size_t sample_count,
+                                    int64_t presentation_time_ns) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.pushPcm16(input, sample_count, presentation_time_ns);
+}
+
+size_t mc_sync_engine_push_pcm_float_at(MC_SyncEngine* engine,
+                                        const float* input,
+                                        size_t frame_count,
+                                        int64_t presentation_time_ns) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.pushPcmFloat(input, frame_count, presentation_time_ns);
+}
+
+int mc_sync_engine_stream_index_at_time(const MC_SyncEngine* engine, int64_t presentation_time_ns, int64_t* out_stream_index) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.streamIndexAtTime(presentation_time_ns, out_stream_index) ? 1 : 0;
+}
+
+int mc_sync_engine_presentation_time_ns(const MC_SyncEngine* engine, int64_t stream_index, int64_t* out_time_ns) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.presentationTimeNs(stream_index, out_time_ns) ? 1 : 0;
+}
+
+int mc_sync_engine_device_presentation_time_ns(const MC_SyncEngine* engine, int32_t device_handle, int64_t* out_time_ns) {
     if (engine == nullptr) {
-        return;
+        return 0;
     }
 
-    engine->impl.pushPcm16(input, sample_count);
+    return engine->impl.devicePresentationTimeNs(multiconnect::DeviceHandle{device_handle}, out_time_ns) ? 1 : 0;
 }
 
 int mc_sync_engine_pull_for_device(MC_SyncEngine* engine,
@@ -59,6 +228,78 @@ int mc_sync_engine_pull_for_device(MC_SyncEngine* engine,
     return engine->impl.pullForDevice(device_id, output, sample_count, out_read_samples) ? 1 : 0;
 }
 
+int mc_sync_engine_pull_for_handle(MC_SyncEngine* engine,
+                                   int32_t device_handle,
+                                   int16_t* output,
+                                   size_t sample_count,
+                                   size_t* out_read_samples) {
+    if (engine == nullptr) {
+        if (out_read_samples != nullptr) {
+            *out_read_samples = 0;
+        }
+        return 0;
+    }
+
+    return engine->impl.pullForDevice(multiconnect::DeviceHandle{device_handle}, output, sample_count, out_read_samples)
+               ? 1
+               : 0;
+}
+
+size_t mc_sync_engine_pull_all(MC_SyncEngine* engine, MC_DevicePull* pulls, size_t pull_count) {
+    if (engine == nullptr || pulls == nullptr) {
+        return 0;
+    }
+
+    std::size_t served = 0;
+    multiconnect::DevicePull batch[kPullBatchSize];
+    for (std::size_t base = 0; base < pull_count; base += kPullBatchSize) {
+        const std::size_t count = std::min(kPullBatchSize, pull_count - base);
+        for (std::size_t i = 0; i < count; ++i) {
+            batch[i] = {};
+            batch[i].handle = multiconnect::DeviceHandle{pulls[base + i].device_handle};
+            batch[i].output = pulls[base + i].output;
+            batch[i].sampleCount = pulls[base + i].sample_count;
+        }
+
+        served += engine->impl.pullAll(batch, count);
+        for (std::size_t i = 0; i < count; ++i) {
+            pulls[base + i].read_samples = batch[i].readSamples;
+            pulls[base + i].underrun = batch[i].underrun ? 1 : 0;
+        }
+    }
+
+    return served;
+}
+
+size_t mc_sync_engine_pull_all_interleaved(MC_SyncEngine* engine,
+                                           const int32_t* device_handles,
+                                           size_t device_count,
+                                           int16_t* output,
+                                           size_t output_sample_capacity,
+                                           size_t frames,
+                                           size_t* out_read_samples,
+                                           int* out_underrun) {
+    if (engine == nullptr || device_handles == nullptr || device_count == 0 || device_count > kPullBatchSize) {
+        return 0;
+    }
+
+    multiconnect::DeviceHandle handles[kPullBatchSize];
+    bool underruns[kPullBatchSize] = {};
+    for (std::size_t i = 0; i < device_count; ++i) {
+        handles[i] = multiconnect::DeviceHandle{device_handles[i]};
+    }
+
+    const std::size_t served =
+        engine->impl.pullAllInterleaved(handles, device_count, output, output_sample_capacity, frames, out_read_samples, underruns);
+    if (out_underrun != nullptr) {
+        for (std::size_t i = 0; i < device_count; ++i) {
+            out_underrun[i] = underruns[i] ? 1 : 0;
+        }
+    }
+
+    return served;
+}
+
 int mc_sync_engine_set_device_offset_samples(MC_SyncEngine* engine,
                                              const char* device_id,
                                              int32_t offset_samples) {
@@ -80,6 +321,87 @@ int mc_sync_engine_apply_drift_correction_ms(MC_SyncEngine* engine,
     return engine->impl.applyDriftCorrectionMs(device_id, drift_ms, sample_rate_hz) ? 1 : 0;
 }
 
+int mc_sync_engine_set_handle_offset_samples(MC_SyncEngine* engine, int32_t device_handle, int32_t offset_samples) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.setDeviceOffsetSamples(multiconnect::DeviceHandle{device_handle}, offset_samples) ? 1 : 0;
+}
+
+int mc_sync_engine_align_handle_to_time(MC_SyncEngine* engine,
+                                        int32_t device_handle,
+                                        int64_t pull_time_ns,
+                                        int64_t output_latency_ns) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.alignDeviceToTime(multiconnect::DeviceHandle{device_handle}, pull_time_ns, output_latency_ns) ? 1 : 0;
+}
+
+int mc_sync_engine_apply_handle_drift_correction_ms(MC_SyncEngine* engine,
+                                                    int32_t device_handle,
+                                                    float drift_ms,
+                                                    int32_t sample_rate_hz) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.applyDriftCorrectionMs(multiconnect::DeviceHandle{device_handle}, drift_ms, sample_rate_hz)
+               ? 1
+               : 0;
+}
+
+int mc_sync_engine_set_handle_rate_correction_ppm(MC_SyncEngine* engine, int32_t device_handle, float ppm) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.setDeviceRateCorrectionPpm(multiconnect::DeviceHandle{device_handle}, ppm) ? 1 : 0;
+}
+
+int mc_sync_engine_slew_handle_drift_correction_ms(MC_SyncEngine* engine,
+                                                   int32_t device_handle,
+                                                   float drift_ms,
+                                                   int32_t sample_rate_hz) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.slewDriftCorrectionMs(multiconnect::DeviceHandle{device_handle}, drift_ms, sample_rate_hz)
+               ? 1
+               : 0;
+}
+
+int mc_sync_engine_set_handle_gain_db(MC_SyncEngine* engine, int32_t device_handle, float gain_db) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.setDeviceGainDb(multiconnect::DeviceHandle{device_handle}, gain_db) ? 1 : 0;
+}
+
+int mc_sync_engine_set_handle_soft_clip(MC_SyncEngine* engine, int32_t device_handle, int enabled) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.setDeviceSoftClip(multiconnect::DeviceHandle{device_handle}, enabled != 0) ? 1 : 0;
+}
+
+size_t mc_sync_engine_apply_calibration_file(MC_SyncEngine* engine, const char* path, int32_t sample_rate_hz) {
+    if (engine == nullptr || path == nullptr) {
+        return 0;
+    }
+
+    multiconnect::CalibrationStore store;
+    if (!store.loadFile(path)) {
+        return 0;
+    }
+    return engine->impl.applyCalibrations(store, sample_rate_hz);
+}
+
 size_t mc_sync_engine_device_count(const MC_SyncEngine* engine) {
     if (engine == nullptr) {
         return 0;
@@ -138,4 +460,93 @@ size_t mc_sync_engine_reset_all_device_offsets(MC_SyncEngine* engine, int32_t of
     return engine->impl.resetAllDeviceOffsets(offset_samples);
 }
 
+int mc_sync_engine_resize_ring(MC_SyncEngine* engine, size_t capacity_samples) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.resizeRing(capacity_samples) ? 1 : 0;
+}
+
+size_t mc_sync_engine_master_capacity_samples(const MC_SyncEngine* engine) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    return engine->impl.masterCapacitySamples();
+}
+
+size_t mc_sync_engine_get_metrics(const MC_SyncEngine* engine,
+                                  MC_EngineMetrics* out_engine,
+                                  MC_DeviceMetrics* out_devices,
+                                  size_t max_devices) {
+    if (engine == nullptr) {
+        return 0;
+    }
+
+    const multiconnect::EngineMetrics metrics = engine->impl.engineMetrics();
+    if (out_engine != nullptr) {
+        out_engine->timestamp_ns = metrics.timestampNs;
+        out_engine->frames_written = metrics.framesWritten;
+        out_engine->dropped_frames = metrics.droppedFrames;
+        out_engine->dropped_push_count = metrics.droppedPushCount;
+        out_engine->underrun_count = metrics.underrunCount;
+        out_engine->overrun_count = metrics.overrunCount;
+        out_engine->correction_count = metrics.correctionCount;
+        out_engine->buffer_fill_percent = metrics.bufferFillPercent;
+        out_engine->device_count = metrics.deviceCount;
+    }
+    if (out_devices == nullptr || max_devices == 0) {
+        return metrics.deviceCount;
+    }
+
+    // Polled from the UI thread, so a temporary allocation is fine here.
+    std::vector<multiconnect::DeviceMetrics> batch(std::min(max_devices, engine->impl.maxDevices()));
+    const std::size_t count = engine->impl.deviceMetrics(batch.data(), batch.size());
+    for (std::size_t i = 0; i < count; ++i) {
+        const multiconnect::DeviceMetrics& device = batch[i];
+        MC_DeviceMetrics& out = out_devices[i];
+        out.device_handle = device.handle.index;
+        const std::string deviceId = engine->impl.deviceId(device.handle);
+        std::strncpy(out.device_id, deviceId.c_str(), sizeof(out.device_id) - 1);
+        out.device_id[sizeof(out.device_id) - 1] = '\0';
+        out.lag_frames = device.lagFrames;
+        out.frames_read = device.framesRead;
+        out.underrun_count = device.underrunCount;
+        out.underrun_frames = device.underrunFrames;
+        out.overrun_count = device.overrunCount;
+        out.overrun_frames = device.overrunFrames;
+        out.correction_count = device.correctionCount;
+    }
+
+    return metrics.deviceCount;
+}
+
+int mc_estimate_offset_gcc_phat(const int16_t* reference,
+                                size_t reference_count,
+                                const int16_t* capture,
+                                size_t capture_count,
+                                size_t max_lag_samples,
+                                double* out_lag_samples,
+                                double* out_peak) {
+    if (reference == nullptr || capture == nullptr) {
+        return 0;
+    }
+
+    multiconnect::GccPhatConfig config;
+    config.maxLagSamples = max_lag_samples;
+    const multiconnect::OffsetEstimate estimate =
+        multiconnect::estimateOffsetGccPhat(reference, reference_count, capture, capture_count, config);
+    if (!estimate.valid) {
+        return 0;
+    }
+    if (out_lag_samples != nullptr) {
+        *out_lag_samples = estimate.lagSamples;
+    }
+    if (out_peak != nullptr) {
+        *out_peak = estimate.peak;
+    }
+    return 1;
+}
+
 }  // extern "C"
@@ -0,0 +1,136 @@
+#include "multiconnect/calibration_store.h"
+#include "multiconnect/sync_engine.h"
+
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <cstdio>
+#include <string>
+#include <vector>
+
+namespace {
+
+bool near(float a, float b) {
+    return std::fabs(a - b) < 1e-4F;
+}
+
+multiconnect::CalibrationStore makeStore() {
+    multiconnect::CalibrationStore store;
+    multiconnect::DeviceCalibration sony;
+    sony.latencyMs = 120.0F;
+    sony.driftPpm = 2.0F;
+    sony.lastMeasuredDriftMs = 15.0F;
+    store.set("sony-h20r", sony);
+
+    multiconnect::DeviceCalibration tribit;
+    tribit.latencyMs = 165.0F;
+    tribit.gainDb = -3.0F;
+    tribit.manualOffsetMs = 5;
+    store.set("tribit-stormbox", tribit);
+
+    multiconnect::DeviceCalibration model;
+    model.latencyMs = 210.0F;
+    store.set("Mivi Classic Box", model);
+    return store;
+}
+
+void testLookupAndReplace() {
+    multiconnect::CalibrationStore store = makeStore();
+    assert(store.size() == 3);
+    assert(store.find("unknown") == nullptr);
+
+    const multiconnect::DeviceCalibration* sony = store.find("sony-h20r");
+    assert(sony != nullptr);
+    assert(near(sony->latencyMs, 120.0F));
+    assert(near(sony->driftPpm, 2.0F));
+
+    multiconnect::DeviceCalibration updated = *sony;
+    updated.lastMeasuredDriftMs = -4.5F;
+    store.set("sony-h20r", updated);
+    assert(store.size() == 3);
+    assert(near(store.find("sony-h20r")->lastMeasuredDriftMs, -4.5F));
+}
+
+void testBinaryRoundTrip() {
+    const multiconnect::CalibrationStore store = makeStore();
+    const std::vector<uint8_t> bytes = store.serialize();
+    assert(bytes.size() == 16 + 3 * 40 + std::string("sony-h20rtribit-stormboxMivi Classic Box").size());
+
+    multiconnect::CalibrationStore loaded;
+    assert(loaded.deserialize(bytes.data(), bytes.size()));
+    assert(loaded.size() == 3);
+    const multiconnect::DeviceCalibration* tribit = loaded.find("tribit-stormbox");
+    assert(tribit != nullptr);
+    assert(tribit->manualOffsetMs == 5);
+    assert(near(tribit->gainDb, -3.0F));
+    assert(loaded.find("Mivi Classic Box") != nullptr);
+
+    const std::string path = "test_calibration_store.bin";
+    assert(store.saveFile(path));
+    multiconnect::CalibrationStore fromFile;
+    assert(fromFile.loadFile(path));
+    assert(fromFile.keys() == store.keys());
+    std::remove(path.c_str());
+    assert(!fromFile.loadFile(path));
+    assert(fromFile.size() == 0);
+}
+
+void testRejectsMalformedInput() {
+    const std::vector<uint8_t> bytes = makeStore().serialize();
+    multiconnect::CalibrationStore store;
+
+    assert(!store.deserialize(bytes.data(), bytes.size() - 1));
+    assert(store.size() == 0);
+
+    std::vector<uint8_t> badMagic = bytes;
+    badMagic[0] = 'X';
+    assert(!store.deserialize(badMagic.data(), badMagic.size()));
+
+    // A flipped key byte no longer matches the record's stored hash.
+    std::vector<uint8_t> badKey = bytes;
+    badKey.back() ^= 0x20;
+    assert(!store.deserialize(badKey.data(), badKey.size()));
+
+    assert(!store.deserialize(nullptr, 0));
+    assert(store.deserialize(bytes.data(), bytes.size()));
+}
+
+void testEngineStartsPreAligned() {
+    constexpr int32_t kSampleRate = 48000;
+    multiconnect::SyncEngine engine(kSampleRate);
+    const multiconnect::DeviceHandle sony = engine.registerDevice("sony-h20r");
+    const multiconnect::DeviceHandle tribit = engine.registerDevice("tribit-stormbox");
+    const multiconnect::DeviceHandle unknown = engine.registerDevice("jbl-go", 7);
+    assert(sony && tribit && unknown);
+
+    // "Mivi Classic Box" is not registered, so the slowest registered speaker (tribit) sets the pace.
+    assert(engine.applyCalibrations(makeStore(), kSampleRate) == 2);
+
+    const multiconnect::DeviceStreamState sonyState = engine.deviceState(sony);
+    assert(sonyState.offsetSamples == -45 * kSampleRate / 1000);
+    assert(near(sonyState.rateCorrectionPpm, -2.0F));
+    assert(near(sonyState.gainDb, 0.0F));
+
+    const multiconnect::DeviceStreamState tribitState = engine.deviceState(tribit);
+    assert(tribitState.offsetSamples == 5 * kSampleRate / 1000);
+    assert(near(tribitState.gainDb, -3.0F));
+    assert(near(tribitState.rateCorrectionPpm, 0.0F));
+
+    assert(engine.deviceState(unknown).offsetSamples == 7);
+
+    multiconnect::DeviceCalibration byModel;
+    byModel.latencyMs = 100.0F;
+    assert(engine.applyCalibration(unknown, byModel, kSampleRate, 165.0F));
+    assert(engine.deviceState(unknown).offsetSamples == -65 * kSampleRate / 1000);
+    assert(!engine.applyCalibration(multiconnect::DeviceHandle{}, byModel, kSampleRate));
+}
+
+}  // namespace
+
+int main() {
+    testLookupAndReplace();
+    testBinaryRoundTrip();
+    testRejectsMalformedInput();
+    testEngineStartsPreAligned();
+    return 0;
+}
@@ -0,0 +1,131 @@
+#include "multiconnect/drift_controller.h"
+#include "multiconnect/drift_simulator.h"
+
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <random>
+
+namespace {
+
+constexpr int32_t kSampleRateHz = 48000;
+constexpr int64_t kReportIntervalNs = 10'000'000;
+
+// A speaker whose clock runs skewPpm fast, consuming through the engine's rate correction; reports
+// carry its stream position plus Gaussian callback jitter.
+struct SyntheticSpeaker {
+    multiconnect::SyncEngine& engine;
+    multiconnect::DeviceHandle handle;
+    double skewPpm = 0.0;
+    double jitterMs = 0.0;
+    double consumed = 0.0;
+    int64_t timeNs = 0;
+    std::mt19937_64 rng{7};
+
+    multiconnect::ConsumptionReport advance(bool playing = true) {
+        timeNs += kReportIntervalNs;
+        if (playing) {
+            const double ppm = skewPpm + engine.deviceState(handle).rateCorrectionPpm;
+            consumed += kReportIntervalNs * 1e-9 * kSampleRateHz * (1.0 + ppm * 1e-6);
+        }
+        const double jitterFrames = jitterMs / 1000.0 * kSampleRateHz * std::normal_distribution<double>(0.0, 1.0)(rng);
+        return {timeNs, consumed + engine.deviceState(handle).offsetSamples + jitterFrames};
+    }
+};
+
+void testTracksSkewAndStepsAfterDropout() {
+    multiconnect::SyncEngine engine(4800);
+    const auto handle = engine.registerDevice("speaker");
+    multiconnect::DriftControllerConfig config;
+    config.measurementNoiseMs = 0.5;
+    multiconnect::DriftController controller(engine, config);
+    assert(controller.track(handle));
+    assert(controller.isTracking(handle));
+
+    SyntheticSpeaker speaker{engine, handle, 80.0, 0.5};
+    for (int i = 0; i < 60'000; ++i) {
+        controller.report(handle, speaker.advance());
+    }
+    auto estimate = controller.estimate(handle);
+    assert(estimate.reports == 60'000);
+    assert(std::abs(estimate.skewPpm - 80.0) < 2.0);
+    assert(estimate.skewStdPpm < 2.0);
+    assert(std::abs(estimate.rateCorrectionPpm + 80.0) < 3.0);
+    assert(std::abs(engine.deviceState(handle).rateCorrectionPpm - estimate.rateCorrectionPpm) < 1e-3);
+    assert(std::abs(estimate.phaseMs) < 1.0);
+    assert(estimate.rateUpdates > 0 && estimate.rateUpdates < 300);
+    assert(estimate.stepCorrections == 0);
+
+    // 100 ms without consumption leaves the speaker behind; one forward step catches it up.
+    for (int i = 0; i < 10; ++i) {
+        speaker.advance(false);
+    }
+    controller.report(handle, speaker.advance());
+    estimate = controller.estimate(handle);
+    assert(estimate.stepCorrections == 1);
+    assert(std::abs(engine.deviceState(handle).offsetSamples - 100 * kSampleRateHz / 1000) <= kSampleRateHz / 1000);
+    assert(std::abs(estimate.skewPpm - 80.0) < 2.0);
+    for (int i = 0; i < 3'000; ++i) {
+        controller.report(handle, speaker.advance());
+    }
+    assert(std::abs(controller.estimate(handle).phaseMs) < 1.0);
+    assert(controller.estimate(handle).stepCorrections == 1);
+
+    assert(controller.untrack(handle));
+    assert(!controller.isTracking(handle));
+    assert(!controller.report(handle, speaker.advance()));
+    assert(controller.estimate(handle).reports == 0);
+}
+
+void testStartsFromExistingRateAndRejectsUnknownDevices() {
+    multiconnect::SyncEngine engine(4800);
+    const auto handle = engine.registerDevice("calibrated");
+    assert(engine.setDeviceRateCorrectionPpm(handle, -40.0F));
+    multiconnect::DriftController controller(engine);
+    assert(!controller.track(multiconnect::DeviceHandle{}));
+    assert(!controller.track(multiconnect::DeviceHandle{5}));
+    assert(!controller.report(handle, multiconnect::ConsumptionReport{}));
+
+    // An explicit reference: the speaker should be at frame -4800 (100 ms of buffering) at t = 0.
+    assert(controller.track(handle, 0, -4800.0));
+    assert(controller.estimate(handle).rateCorrectionPpm == -40.0);
+    controller.report(handle, {kReportIntervalNs, -4800.0 + 480.0 + 96.0});
+    assert(std::abs(controller.estimate(handle).phaseMs - 2.0) < 1e-9);
+}
+
+void testHoldsDriftOverTwoHourSession() {
+    // Phase 4 exit metric: two hours with speakers well apart in clock rate and with callback
+    // jitter stay within 5 ms. 4 kHz keeps the continuously resampled run fast in debug builds;
+    // drift in milliseconds does not depend on the sample rate.
+    multiconnect::DriftSimulationConfig config;
+    config.sampleRateHz = 4000;
+    config.blockFrames = 40;
+    config.sessionSeconds = 7200.0;
+    config.timelineIntervalSeconds = 60.0;
+    config.correction = multiconnect::DriftCorrectionMode::kController;
+    config.controller.measurementNoiseMs = 0.5;
+
+    multiconnect::VirtualSpeakerProfile fast{"fast", 100.0, 0.5};
+    multiconnect::VirtualSpeakerProfile slow{"slow", -100.0, 0.5};
+    fast.latencyMs = 150.0;
+    slow.latencyMs = 120.0;
+    const auto result = multiconnect::simulateDriftSession(config, {fast, slow});
+    assert(result.simulatedSeconds == 7200.0);
+    for (const auto& device : result.devices) {
+        assert(device.maxAbsDriftMs < 5.0);
+        assert(std::abs(device.finalDriftMs) < 3.0);
+        assert(device.metrics.underrunCount == 0);
+        // Bounded micro-corrections: a few per minute, not one per report.
+        assert(device.metrics.correctionCount > 0 && device.metrics.correctionCount < 1200);
+    }
+    assert(result.engine.droppedFrames == 0);
+}
+
+}  // namespace
+
+int main() {
+    testTracksSkewAndStepsAfterDropout();
+    testStartsFromExistingRateAndRejectsUnknownDevices();
+    testHoldsDriftOverTwoHourSession();
+    return 0;
+}
@@ -0,0 +1,66 @@
+#include "multiconnect/drift_simulator.h"
+
+#include <cassert>
+#include <cmath>
+#include <vector>
+
+int main() {
+    // 15 ms after a 2-hour run (hardware matrix MC-001) is a little over 2 ppm.
+    assert(std::abs(multiconnect::skewPpmFromDrift(15.0, 7200.0) - 15.0 / 7.2) < 1e-9);
+    assert(multiconnect::skewPpmFromDrift(15.0, 0.0) == 0.0);
+
+    multiconnect::DriftSimulationConfig config;
+    config.sessionSeconds = 120.0;
+    config.timelineIntervalSeconds = 10.0;
+
+    // Without correction, drift grows linearly with skew: +/-100 ppm over 120 s is +/-12 ms.
+    {
+        multiconnect::VirtualSpeakerProfile fast{"fast", 100.0};
+        multiconnect::VirtualSpeakerProfile slow{"slow", -100.0};
+        fast.latencyMs = 150.0;
+        const auto result = multiconnect::simulateDriftSession(config, {fast, slow});
+        assert(result.simulatedSeconds == 120.0);
+        assert(result.devices.size() == 2);
+        assert(result.devices[0].timeline.size() == 12);
+        assert(result.devices[0].timeline.back().timeSeconds == 120.0);
+        assert(std::abs(result.devices[0].finalDriftMs - 12.0) < 0.1);
+        assert(std::abs(result.devices[1].finalDriftMs + 12.0) < 0.1);
+        assert(std::abs(result.devices[0].timeline[4].driftMs - 5.0) < 0.1);
+        assert(result.devices[1].maxAbsDriftMs >= 12.0 - 0.1);
+        assert(result.devices[0].metrics.correctionCount == 0);
+        assert(result.devices[0].metrics.underrunCount == 0);
+        assert(result.engine.droppedFrames == 0);
+    }
+
+    // A fast speaker with no buffering cannot play ahead of the capture: it underruns instead.
+    {
+        const auto result = multiconnect::simulateDriftSession(config, {{"unbuffered", 100.0}});
+        assert(result.devices[0].metrics.underrunCount > 0);
+        assert(std::abs(result.devices[0].finalDriftMs) < 0.1);
+    }
+
+    // A dropout leaves the speaker behind by the time it was gone; runs are reproducible per seed.
+    {
+        multiconnect::VirtualSpeakerProfile flaky{"flaky", 0.0, 0.0, 240.0, 250.0};
+        const auto first = multiconnect::simulateDriftSession(config, {flaky});
+        const auto second = multiconnect::simulateDriftSession(config, {flaky});
+        assert(first.devices[0].dropouts > 0);
+        assert(first.devices[0].dropouts == second.devices[0].dropouts);
+        assert(first.devices[0].finalDriftMs == second.devices[0].finalDriftMs);
+        assert(std::abs(first.devices[0].finalDriftMs + 250.0 * first.devices[0].dropouts) < 1.0);
+    }
+
+    // Periodic corrections keep a 100 ppm speaker with callback jitter within a few milliseconds.
+    for (const auto mode : {multiconnect::DriftCorrectionMode::kStep, multiconnect::DriftCorrectionMode::kSlew}) {
+        config.correction = mode;
+        multiconnect::VirtualSpeakerProfile speaker{"corrected", 100.0, 0.5};
+        speaker.latencyMs = 120.0;
+        const auto result = multiconnect::simulateDriftSession(config, {speaker});
+        assert(result.devices[0].metrics.correctionCount > 0);
+        assert(result.devices[0].maxAbsDriftMs < 5.0);
+        assert(std::abs(result.devices[0].finalDriftMs) < 3.0);
+        assert(result.devices[0].metrics.underrunCount == 0);
+    }
+
+    return 0;
+}
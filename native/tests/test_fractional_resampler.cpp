@@ -0,0 +1,152 @@
+#include "multiconnect/fractional_resampler.h"
+#include "multiconnect/sync_engine.h"
+
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <vector>
+
+namespace {
+
+constexpr double kPi = 3.14159265358979323846;
+
+int16_t sineAt(double position) {
+    return static_cast<int16_t>(std::lround(12000.0 * std::sin(2.0 * kPi * 440.0 * position / 48000.0)));
+}
+
+std::vector<int16_t> sineBlock(std::size_t start, std::size_t count) {
+    std::vector<int16_t> block(count);
+    for (std::size_t i = 0; i < count; ++i) {
+        block[i] = sineAt(static_cast<double>(start + i));
+    }
+    return block;
+}
+
+}  // namespace
+
+int main() {
+    // Kernel: ratio 1 at phase 0 is an exact copy; a half-sample phase interpolates a band-limited sine.
+    {
+        const std::vector<int16_t> input = sineBlock(0, 256);
+        std::vector<int16_t> output(200, 0);
+        const double end = multiconnect::resamplePcm16(input.data() + multiconnect::kResamplerHistory,
+                                                       0.0,
+                                                       1.0,
+                                                       output.data(),
+                                                       output.size(),
+                                                       1);
+        assert(end == 200.0);
+        for (std::size_t i = 0; i < output.size(); ++i) {
+            assert(output[i] == input[i + multiconnect::kResamplerHistory]);
+        }
+
+        multiconnect::resamplePcm16(input.data() + multiconnect::kResamplerHistory,
+                                    0.5,
+                                    1.0,
+                                    output.data(),
+                                    output.size(),
+                                    1);
+        for (std::size_t i = 0; i < output.size(); ++i) {
+            const double expected = 12000.0 * std::sin(2.0 * kPi * 440.0 *
+                                                       (static_cast<double>(i) + 0.5 + multiconnect::kResamplerHistory) /
+                                                       48000.0);
+            assert(std::abs(output[i] - expected) <= 4.0);
+        }
+
+        assert(multiconnect::resamplerInputSpan(0.0, 1.0, 0) == 0);
+        assert(multiconnect::resamplerInputSpan(0.0, 1.0, 10) == 9 + multiconnect::kResamplerTaps);
+    }
+
+    // Rate correction: +1000 ppm consumes 48048 input samples for 48000 output samples.
+    {
+        multiconnect::SyncEngineConfig config;
+        config.masterCapacitySamples = 1U << 17U;
+        config.mode = multiconnect::SyncEngineMode::kConcurrent;
+        multiconnect::SyncEngine engine(config);
+        const auto device = engine.registerDevice("mivi");
+        const std::vector<int16_t> source = sineBlock(0, 60000);
+        assert(engine.pushPcm16(source.data(), source.size()) == source.size());
+
+        // Start past the kernel history so the resampler can engage on the first pull.
+        std::vector<int16_t> warmup(16, 0);
+        assert(engine.pullForDevice(device, warmup.data(), warmup.size()));
+        assert(engine.setDeviceRateCorrectionPpm(device, 1000.0F));
+        assert(engine.deviceState(device).rateCorrectionPpm == 1000.0F);
+
+        std::vector<int16_t> block(480, 0);
+        double position = 16.0;
+        for (int b = 0; b < 100; ++b) {
+            std::size_t read = 0;
+            assert(engine.pullForDevice(device, block.data(), block.size(), &read));
+            assert(read == block.size());
+            for (std::size_t i = 0; i < block.size(); ++i) {
+                assert(std::abs(block[i] - sineAt(position)) <= 4);
+                position += 1.001;
+            }
+        }
+        const std::size_t readHead = engine.deviceState(device).readHead;
+        assert(readHead >= 16 + 48047 && readHead <= 16 + 48048);
+        assert(!engine.setDeviceRateCorrectionPpm(multiconnect::DeviceHandle{}, 10.0F));
+    }
+
+    // Slew: 0.5 ms of drift at 48 kHz is absorbed at no more than maxSlewPpm, then stops.
+    {
+        multiconnect::SyncEngineConfig config;
+        config.masterCapacitySamples = 4096;
+        config.maxSlewPpm = 500.0F;
+        multiconnect::SyncEngine engine(config);
+        const auto device = engine.registerDevice("tribit");
+
+        assert(engine.slewDriftCorrectionMs(device, 0.5F, 48000));
+        assert(engine.deviceState(device).pendingCorrectionSamples == -24.0F);
+        assert(engine.deviceState(device).offsetSamples == 0);
+
+        std::vector<int16_t> block(480, 0);
+        std::size_t pushed = 0;
+        float previousPending = -24.0F;
+        for (int b = 0; b < 200; ++b) {
+            const std::vector<int16_t> source = sineBlock(pushed, block.size());
+            engine.pushPcm16(source.data(), source.size());
+            pushed += source.size();
+            std::size_t read = 0;
+            assert(engine.pullForDevice(device, block.data(), block.size(), &read));
+            assert(read == block.size());
+
+            // Never faster than 500 ppm of a 480-sample block (0.24 samples).
+            const float pending = engine.deviceState(device).pendingCorrectionSamples;
+            assert(pending - previousPending <= 0.25F);
+            previousPending = pending;
+        }
+
+        const auto state = engine.deviceState(device);
+        assert(std::abs(state.pendingCorrectionSamples) < 0.01F);
+        assert(state.readHead == pushed - 24);
+    }
+
+    // Stereo float: each channel is resampled on its own into interleaved int16 output.
+    {
+        multiconnect::SyncEngineConfig config;
+        config.masterCapacitySamples = 4096;
+        config.format = {2, multiconnect::PcmEncoding::kPcmFloat};
+        multiconnect::SyncEngine engine(config);
+        const auto device = engine.registerDevice("stereo");
+        std::vector<float> frames(2 * 2048);
+        for (std::size_t i = 0; i < 2048; ++i) {
+            frames[2 * i] = static_cast<float>(sineAt(static_cast<double>(i))) / 32767.0F;
+            frames[2 * i + 1] = -frames[2 * i];
+        }
+        assert(engine.pushPcmFloat(frames.data(), 2048) == 2048);
+        assert(engine.setDeviceRateCorrectionPpm(device, 500.0F));
+
+        std::vector<int16_t> block(2 * 1000, 0);
+        assert(engine.pullForDevice(device, block.data(), 1000));
+        for (std::size_t i = 0; i < 1000; ++i) {
+            const int16_t expected = sineAt(static_cast<double>(i) * 1.0005);
+            assert(std::abs(block[2 * i] - expected) <= 5);
+            assert(std::abs(block[2 * i + 1] + expected) <= 5);
+        }
+    }
+
+    return 0;
+}
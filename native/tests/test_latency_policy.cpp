@@ -0,0 +1,202 @@
+#include "multiconnect/calibration_store.h"
+#include "multiconnect/latency_policy.h"
+#include "multiconnect/sync_engine.h"
+
+#include <algorithm>
+#include <atomic>
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace {
+
+multiconnect::SyncEngine makeEngine(std::size_t capacity, multiconnect::SyncEngineMode mode) {
+    multiconnect::SyncEngineConfig config;
+    config.masterCapacitySamples = capacity;
+    config.mode = mode;
+    return multiconnect::SyncEngine(config);
+}
+
+void push(multiconnect::SyncEngine& engine, int64_t& next, std::size_t frames) {
+    std::vector<int16_t> block(frames);
+    for (auto& sample : block) {
+        sample = static_cast<int16_t>(next++ & 0x7FFF);
+    }
+    assert(engine.pushPcm16(block.data(), block.size()) == frames);
+}
+
+bool near(double a, double b) {
+    return std::abs(a - b) < 1e-6;
+}
+
+void testSizingFromOffsets() {
+    auto engine = makeEngine(48000, multiconnect::SyncEngineMode::kConcurrent);
+    multiconnect::LatencyPolicy policy(engine);
+    // No devices: the configured floor of 50 ms.
+    assert(policy.recommendedCapacitySamples() == 2400);
+
+    // A slow speaker 90 ms behind the fast one, plus 20 ms of headroom, in the three quarters of the
+    // ring the rewind headroom leaves to readers.
+    const auto slow = engine.registerDevice("slow", -4320);
+    const auto fast = engine.registerDevice("fast", 0);
+    assert(policy.recommendedCapacitySamples() == (4320 + 960) * 4 / 3);
+    assert(policy.apply());
+    assert(engine.masterCapacitySamples() == 7040 && engine.rewindHeadroomSamples() == 1760);
+    assert(!policy.apply());
+
+    multiconnect::CalibrationStore store;
+    multiconnect::DeviceCalibration calibration;
+    calibration.latencyMs = 120.0F;
+    store.set("slow", calibration);
+    calibration.latencyMs = 210.0F;
+    store.set("fast", calibration);
+    store.set("absent", calibration);
+    assert(policy.setOutputLatencies(store) == 2);
+    const multiconnect::DeviceLatencyReport report = policy.report(slow);
+    assert(report.handle.index == slow.index && report.observations == 0);
+    assert(near(report.bufferLatencyMs, 90.0) && near(report.endToEndMs, 210.0));
+
+    std::vector<multiconnect::DeviceLatencyReport> all(4);
+    assert(policy.reports(all.data(), all.size()) == 2);
+    assert(all[1].handle.index == fast.index && near(all[1].endToEndMs, 210.0));
+    assert(!policy.report(multiconnect::DeviceHandle{}).handle);
+    assert(!policy.setOutputLatencyMs(multiconnect::DeviceHandle{}, 10.0));
+
+    // Without concurrent readers there is no rewind headroom to allow for; the ceiling bounds memory.
+    auto single = makeEngine(1024, multiconnect::SyncEngineMode::kSingleThreaded);
+    multiconnect::LatencyPolicy singlePolicy(single);
+    assert(single.registerDevice("slow", -4320));
+    assert(singlePolicy.recommendedCapacitySamples() == 4320 + 960);
+    assert(single.registerDevice("far", -400000));
+    assert(singlePolicy.recommendedCapacitySamples() == 96000);
+}
+
+void testShrinkAndGrowKeepTheStream() {
+    auto engine = makeEngine(48000, multiconnect::SyncEngineMode::kConcurrent);
+    multiconnect::LatencyPolicy policy(engine);
+    const auto speaker = engine.registerDevice("speaker");
+    int64_t next = 0;
+    int64_t played = 0;
+    std::vector<int16_t> out(960);
+    const auto pullAndCheck = [&](std::size_t frames) {
+        std::size_t read = 0;
+        assert(engine.pullForDevice(speaker, out.data(), frames, &read) && read == frames);
+        for (std::size_t i = 0; i < read; ++i) {
+            assert(out[i] == static_cast<int16_t>(played++ & 0x7FFF));
+        }
+    };
+
+    // 10 ms capture blocks; the speaker's callbacks alternate 5 ms and 15 ms, so it trails the
+    // capture by 20 or 25 ms.
+    push(engine, next, 960);
+    for (int i = 0; i < 200; ++i) {
+        push(engine, next, 480);
+        pullAndCheck(i % 2 == 0 ? 240 : 720);
+        policy.observe();
+    }
+    const multiconnect::DeviceLatencyReport report = policy.report(speaker);
+    assert(report.observations == 200);
+    assert(std::abs(report.bufferLatencyMs - 22.5) < 0.5 && std::abs(report.jitterMs - 2.5) < 0.5);
+
+    // 48000 frames was far more than needed: shrink, keeping every unplayed frame.
+    const std::size_t target = policy.recommendedCapacitySamples();
+    assert(target < 48000 / 4);
+    assert(policy.apply() && engine.masterCapacitySamples() == target);
+    assert(!policy.apply());
+    pullAndCheck(480);
+    for (int i = 0; i < 50; ++i) {
+        push(engine, next, 480);
+        pullAndCheck(480);
+    }
+
+    // Too small for what is still unplayed: refused, nothing lost.
+    push(engine, next, 960);
+    assert(!engine.resizeRing(1024));
+    assert(engine.masterCapacitySamples() == target);
+    pullAndCheck(480);
+    pullAndCheck(480);
+
+    // A speaker 200 ms behind joins: the ring grows before its first pull.
+    const auto late = engine.registerDevice("late", -9600);
+    assert(policy.recommendedCapacitySamples() == (9600 + 960) * 4 / 3);
+    assert(policy.apply() && engine.masterCapacitySamples() == 14080);
+    assert(near(policy.report(late).bufferLatencyMs, 200.0));
+    assert(engine.unregisterDevice(late));
+    // With the late speaker gone the ring is far larger than needed again.
+    assert(policy.apply() && engine.masterCapacitySamples() == target);
+}
+
+// The writer keeps resizing the ring while two readers pull; every frame they receive must be the
+// next one of the stream. Build with -DMC_ENABLE_TSAN=ON to run this under ThreadSanitizer.
+void testResizeWhileStreaming() {
+    constexpr std::size_t kTotalSamples = 1 << 18;
+    auto engine = makeEngine(4096, multiconnect::SyncEngineMode::kConcurrent);
+    assert(engine.registerDevice("reader-0"));
+    assert(engine.registerDevice("reader-1"));
+
+    std::atomic<bool> failed{false};
+    std::thread writer([&] {
+        std::vector<int16_t> block(173);
+        std::size_t pushed = 0;
+        std::size_t blocks = 0;
+        while (pushed < kTotalSamples) {
+            const std::size_t want = std::min(block.size(), kTotalSamples - pushed);
+            for (std::size_t i = 0; i < want; ++i) {
+                block[i] = static_cast<int16_t>((pushed + i) & 0x7FFF);
+            }
+            const std::size_t accepted = engine.pushPcm16(block.data(), want);
+            pushed += accepted;
+            if (accepted < want) {
+                std::this_thread::yield();
+            }
+            if (++blocks % 8 == 0) {
+                // Shrinks are refused whenever the readers have more unplayed than fits.
+                engine.resizeRing((blocks / 8) % 2 == 0 ? 8192 : 2048);
+            }
+        }
+    });
+
+    std::vector<std::thread> readers;
+    for (int r = 0; r < 2; ++r) {
+        readers.emplace_back([&, r] {
+            const multiconnect::DeviceHandle handle = engine.deviceHandle("reader-" + std::to_string(r));
+            std::vector<int16_t> out(101 + r * 64);
+            std::size_t consumed = 0;
+            while (consumed < kTotalSamples) {
+                std::size_t read = 0;
+                if (!engine.pullForDevice(handle, out.data(), out.size(), &read)) {
+                    failed = true;
+                    return;
+                }
+                for (std::size_t i = 0; i < read; ++i) {
+                    if (out[i] != static_cast<int16_t>((consumed + i) & 0x7FFF)) {
+                        failed = true;
+                        return;
+                    }
+                }
+                consumed += read;
+                if (read == 0) {
+                    std::this_thread::yield();
+                }
+            }
+        });
+    }
+
+    writer.join();
+    for (auto& thread : readers) {
+        thread.join();
+    }
+    assert(!failed);
+}
+
+}  // namespace
+
+int main() {
+    testSizingFromOffsets();
+    testShrinkAndGrowKeepTheStream();
+    testResizeWhileStreaming();
+    return 0;
+}
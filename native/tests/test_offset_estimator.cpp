@@ -0,0 +1,110 @@
+#include "multiconnect/fractional_resampler.h"
+#include "multiconnect/offset_estimator.h"
+
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <vector>
+
+namespace {
+
+// Deterministic white noise, roughly uniform over +/-amplitude.
+std::vector<int16_t> noise(std::size_t count, uint32_t seed, int amplitude) {
+    std::vector<int16_t> samples(count);
+    uint32_t state = seed;
+    for (auto& sample : samples) {
+        state = state * 1664525U + 1013904223U;
+        sample = static_cast<int16_t>(static_cast<int>(state >> 16U) % (2 * amplitude + 1) - amplitude);
+    }
+    return samples;
+}
+
+// `source` delayed by `delay` samples (content appears later), zero before it starts.
+std::vector<int16_t> delayed(const std::vector<int16_t>& source, std::size_t delay, std::size_t count) {
+    std::vector<int16_t> output(count, 0);
+    for (std::size_t i = delay; i < count && i - delay < source.size(); ++i) {
+        output[i] = source[i - delay];
+    }
+    return output;
+}
+
+}  // namespace
+
+int main() {
+    const std::vector<int16_t> reference = noise(8000, 7U, 8000);
+
+    // Integer delays in both directions come out exact, with a full-height peak for an exact copy.
+    {
+        const std::vector<int16_t> capture = delayed(reference, 123, 9000);
+        const auto estimate = multiconnect::estimateOffsetGccPhat(reference.data(), reference.size(),
+                                                                  capture.data(), capture.size());
+        assert(estimate.valid);
+        assert(std::abs(estimate.lagSamples - 123.0) < 1e-6);
+        assert(estimate.peak > 0.8);
+
+        const auto reversed = multiconnect::estimateOffsetGccPhat(capture.data(), capture.size(),
+                                                                  reference.data(), reference.size());
+        assert(std::abs(reversed.lagSamples + 123.0) < 1e-6);
+    }
+
+    // Sub-sample delay from the windowed-sinc interpolator: capture[k] = reference(k + 0.25).
+    {
+        std::vector<int16_t> capture(reference.size() - multiconnect::kResamplerTaps, 0);
+        multiconnect::resamplePcm16(reference.data() + multiconnect::kResamplerHistory, 0.25, 1.0,
+                                    capture.data(), capture.size(), 1);
+        const auto estimate = multiconnect::estimateOffsetGccPhat(
+            reference.data() + multiconnect::kResamplerHistory, capture.size(), capture.data(), capture.size());
+        assert(estimate.valid);
+        assert(std::abs(estimate.lagSamples + 0.25) < 0.02);
+    }
+
+    // Buried in uncorrelated noise of equal power, and mixed with a second, louder speaker.
+    {
+        const std::vector<int16_t> otherSpeaker = noise(9000, 99U, 12000);
+        const std::vector<int16_t> roomNoise = noise(9000, 1234U, 8000);
+        std::vector<int16_t> capture = delayed(reference, 480, 9000);
+        for (std::size_t i = 0; i < capture.size(); ++i) {
+            capture[i] = static_cast<int16_t>((capture[i] + roomNoise[i] + delayed(otherSpeaker, 0, 9000)[i]) / 3);
+        }
+        const auto estimate = multiconnect::estimateOffsetGccPhat(reference.data(), reference.size(),
+                                                                  capture.data(), capture.size());
+        assert(estimate.valid);
+        assert(std::abs(estimate.lagSamples - 480.0) < 0.5);
+        assert(estimate.peak < 0.8);
+    }
+
+    // maxLagSamples bounds the search: a true lag outside the window is not reported.
+    {
+        const std::vector<int16_t> capture = delayed(reference, 300, 9000);
+        multiconnect::GccPhatConfig config;
+        config.maxLagSamples = 200;
+        const auto estimate = multiconnect::estimateOffsetGccPhat(reference.data(), reference.size(),
+                                                                  capture.data(), capture.size(), config);
+        assert(std::abs(estimate.lagSamples) <= 200.0);
+        config.maxLagSamples = 400;
+        const auto widened = multiconnect::estimateOffsetGccPhat(reference.data(), reference.size(),
+                                                                 capture.data(), capture.size(), config);
+        assert(std::abs(widened.lagSamples - 300.0) < 1e-6);
+    }
+
+    // Float input and degenerate input.
+    {
+        std::vector<float> floatReference(reference.begin(), reference.end());
+        std::vector<float> floatCapture(9000, 0.0F);
+        for (std::size_t i = 0; i < floatReference.size(); ++i) {
+            floatCapture[i + 50] = floatReference[i] / 32768.0F;
+        }
+        const auto estimate = multiconnect::estimateOffsetGccPhat(floatReference.data(), floatReference.size(),
+                                                                  floatCapture.data(), floatCapture.size());
+        assert(std::abs(estimate.lagSamples - 50.0) < 1e-6);
+
+        const std::vector<int16_t> silence(1000, 0);
+        assert(!multiconnect::estimateOffsetGccPhat(silence.data(), silence.size(), silence.data(), silence.size()).valid);
+        // One silent side must not turn the other's rounding noise into a peak.
+        assert(!multiconnect::estimateOffsetGccPhat(silence.data(), silence.size(), reference.data(), reference.size()).valid);
+        assert(!multiconnect::estimateOffsetGccPhat(reference.data(), reference.size(), silence.data(), silence.size()).valid);
+        assert(!multiconnect::estimateOffsetGccPhat(reference.data(), 0, reference.data(), reference.size()).valid);
+    }
+
+    return 0;
+}
@@ -22,5 +22,86 @@ int main() {
     ring.readWithOffset(0, -1, minusOne.data(), minusOne.size());
     assert(minusOne[0] == 8);
 
+    // Writes that straddle the end of the ring wrap into the front segment.
+    multiconnect::MasterRingBuffer wrapping(5);
+    const std::vector<int16_t> firstBlock = {1, 2, 3};
+    const std::vector<int16_t> secondBlock = {4, 5, 6, 7};
+    wrapping.write(firstBlock.data(), firstBlock.size());
+    wrapping.write(secondBlock.data(), secondBlock.size());
+    assert(wrapping.size() == 5);
+
+    std::vector<int16_t> wrapped(5, 0);
+    assert(wrapping.readWithOffset(5, 0, wrapped.data(), wrapped.size()) == 5);
+    assert(wrapped[0] == 6);
+    assert(wrapped[1] == 7);
+    assert(wrapped[2] == 3);
+    assert(wrapped[4] == 5);
+
+    // A single write longer than the ring keeps only the newest samples in their logical slots.
+    multiconnect::MasterRingBuffer overflow(4);
+    const std::vector<int16_t> longBlock = {1, 2, 3, 4, 5, 6, 7};
+    assert(overflow.write(longBlock.data(), longBlock.size()) == longBlock.size());
+    std::vector<int16_t> latest(4, 0);
+    overflow.readWithOffset(3, 0, latest.data(), latest.size());
+    assert(latest[0] == 4);
+    assert(latest[3] == 7);
+    overflow.write(source.data(), 1);
+    std::vector<int16_t> afterOverflow(1, 0);
+    overflow.readWithOffset(7, 0, afterOverflow.data(), afterOverflow.size());
+    assert(afterOverflow[0] == 1);
+
+    // Power-of-two capacity rounds up and keeps negative offsets wrapping correctly.
+    multiconnect::MasterRingBuffer masked(6, multiconnect::RingCapacityPolicy::kRoundUpToPowerOfTwo);
+    assert(masked.capacity() == 8);
+    assert(masked.isPowerOfTwo());
+    assert(!multiconnect::MasterRingBuffer(6).isPowerOfTwo());
+    masked.write(source.data(), source.size());
+    std::vector<int16_t> maskedMinusThree(4, 0);
+    masked.readWithOffset(1, -3, maskedMinusThree.data(), maskedMinusThree.size());
+    assert(maskedMinusThree[0] == 7);
+    assert(maskedMinusThree[1] == 8);
+    assert(maskedMinusThree[2] == 1);
+
+    // Reads never return more samples than have been written.
+    multiconnect::MasterRingBuffer partial(16);
+    partial.write(source.data(), 3);
+    std::vector<int16_t> partialOut(8, 0);
+    assert(partial.readWithOffset(0, 0, partialOut.data(), partialOut.size()) == 3);
+
+    // Multi-channel rings index, count and wrap whole interleaved frames.
+    multiconnect::FloatRingBuffer stereo(3, 2);
+    assert(stereo.capacity() == 3 && stereo.channels() == 2);
+    const std::vector<float> stereoFrames = {0.1F, -0.1F, 0.2F, -0.2F, 0.3F, -0.3F, 0.4F, -0.4F};
+    assert(stereo.write(stereoFrames.data(), 4) == 4);
+    assert(stereo.size() == 3 && stereo.totalWritten() == 4);
+    std::vector<float> stereoOut(6, 0.0F);
+    stereo.readAt(1, stereoOut.data(), 3);
+    assert(stereoOut[0] == 0.2F && stereoOut[1] == -0.2F);
+    assert(stereoOut[4] == 0.4F && stereoOut[5] == -0.4F);
+    const auto segments = stereo.segmentsAt(2, 2);
+    assert(segments.firstCount == 1 && segments.secondCount == 1);
+    assert(segments.first[1] == -0.3F && segments.second[0] == 0.4F);
+
+    // Resizing keeps the newest frames at their stream indices, growing or shrinking.
+    multiconnect::MasterRingBuffer resized(5);
+    const std::vector<int16_t> stream = {0, 1, 2, 3, 4, 5, 6, 7};
+    resized.write(stream.data(), stream.size());
+    resized.resize(8, multiconnect::RingCapacityPolicy::kRoundUpToPowerOfTwo);
+    assert(resized.capacity() == 8 && resized.isPowerOfTwo());
+    assert(resized.totalWritten() == 8);
+    std::vector<int16_t> resizedOut(5, 0);
+    resized.readAt(3, resizedOut.data(), resizedOut.size());
+    assert(resizedOut[0] == 3 && resizedOut[4] == 7);
+    // Frames the smaller ring had already dropped come back as silence.
+    resized.readAt(0, resizedOut.data(), 3);
+    assert(resizedOut[0] == 0 && resizedOut[2] == 0);
+    resized.write(stream.data(), 2);
+    resized.readAt(8, resizedOut.data(), 2);
+    assert(resizedOut[0] == 0 && resizedOut[1] == 1);
+    resized.resize(3);
+    assert(resized.capacity() == 3 && resized.size() == 3 && resized.totalWritten() == 10);
+    resized.readAt(7, resizedOut.data(), 3);
+    assert(resizedOut[0] == 7 && resizedOut[1] == 0 && resizedOut[2] == 1);
+
     return 0;
 }
@@ -0,0 +1,124 @@
+#include "multiconnect/run_record.h"
+
+#include <array>
+#include <cassert>
+#include <cstdint>
+#include <cstdio>
+#include <filesystem>
+#include <fstream>
+#include <string>
+#include <vector>
+
+namespace {
+
+multiconnect::RunRecord makeRecord(uint32_t caseId) {
+    multiconnect::RunRecord record;
+    record.timestampNs = 1771350662000000000LL + caseId;
+    record.caseId = caseId;
+    record.trial = 2;
+    record.sampleRateHz = 48000;
+    record.durationMs = 1000;
+    record.requestedOffsetMs = -60 + static_cast<int32_t>(caseId);
+    record.deviceIndex = 1;
+    record.deviceCount = 3;
+    record.measuredOffsetMs = -59.9887;
+    record.errorMs = 0.0113;
+    record.thresholdMs = 1.0;
+    record.kind = multiconnect::RunRecordKind::kSweep;
+    record.pass = true;
+    multiconnect::setRunRecordLabel(record.device, "tribit-sim");
+    multiconnect::setRunRecordLabel(record.notes, "native-sweep");
+    return record;
+}
+
+void testEncodeDecodeRoundTrip() {
+    const multiconnect::RunRecord record = makeRecord(7);
+    std::array<uint8_t, multiconnect::kRunRecordBytes> bytes{};
+    multiconnect::encodeRunRecord(record, bytes.data());
+
+    // Fixed little-endian layout: the NumPy dtype in python/multiconnect/run_records.py relies on it.
+    assert(bytes[8] == 7 && bytes[9] == 0);
+    assert(bytes[16] == 0x80 && bytes[17] == 0xBB);
+    assert(bytes[56] == 1 && bytes[57] == 1);
+    assert(bytes[64] == 't' && bytes[80] == 'n');
+
+    const multiconnect::RunRecord decoded = multiconnect::decodeRunRecord(bytes.data());
+    assert(decoded.timestampNs == record.timestampNs);
+    assert(decoded.caseId == 7 && decoded.trial == 2);
+    assert(decoded.requestedOffsetMs == -53);
+    assert(decoded.deviceIndex == 1 && decoded.deviceCount == 3);
+    assert(decoded.measuredOffsetMs == record.measuredOffsetMs);
+    assert(decoded.kind == multiconnect::RunRecordKind::kSweep && decoded.pass);
+    assert(multiconnect::runRecordLabel(decoded.device) == "tribit-sim");
+    assert(multiconnect::runRecordLabel(decoded.notes) == "native-sweep");
+}
+
+void testLabelsTruncate() {
+    std::array<char, multiconnect::kRunRecordLabelBytes> label{};
+    multiconnect::setRunRecordLabel(label, "a-device-name-longer-than-sixteen");
+    assert(multiconnect::runRecordLabel(label) == "a-device-name-lo");
+    multiconnect::setRunRecordLabel(label, "");
+    assert(multiconnect::runRecordLabel(label).empty());
+}
+
+void testWriterAppendsAcrossOpens() {
+    const std::string path = "test_run_record.bin";
+    std::remove(path.c_str());
+
+    multiconnect::RunRecordWriter writer;
+    assert(writer.open(path));
+    assert(writer.append(makeRecord(0)));
+    assert(writer.append(makeRecord(1)));
+    assert(writer.close());
+    assert(!writer.append(makeRecord(2)));
+
+    // Reopening appends after the existing records without a second header.
+    assert(writer.open(path));
+    assert(writer.append(makeRecord(2)));
+    assert(writer.close());
+    assert(std::filesystem::file_size(path) ==
+           multiconnect::kRunRecordHeaderBytes + 3 * multiconnect::kRunRecordBytes);
+
+    std::vector<multiconnect::RunRecord> records;
+    assert(multiconnect::readRunRecords(path, &records));
+    assert(records.size() == 3);
+    for (uint32_t i = 0; i < 3; ++i) {
+        assert(records[i].caseId == i);
+    }
+
+    // A torn trailing record is skipped.
+    {
+        std::ofstream out(path, std::ios::binary | std::ios::app);
+        out << "partial";
+    }
+    assert(multiconnect::readRunRecords(path, &records));
+    assert(records.size() == 3);
+    std::remove(path.c_str());
+    assert(!multiconnect::readRunRecords(path, &records));
+}
+
+void testRejectsForeignFiles() {
+    const std::string path = "test_run_record_foreign.json";
+    {
+        std::ofstream out(path, std::ios::binary);
+        out << "{\"outcome\": \"PASS\"}\n";
+    }
+    multiconnect::RunRecordWriter writer;
+    assert(!writer.open(path));
+    assert(!writer.isOpen());
+
+    std::vector<multiconnect::RunRecord> records;
+    assert(!multiconnect::readRunRecords(path, &records));
+    assert(records.empty());
+    std::remove(path.c_str());
+}
+
+}  // namespace
+
+int main() {
+    testEncodeDecodeRoundTrip();
+    testLabelsTruncate();
+    testWriterAppendsAcrossOpens();
+    testRejectsForeignFiles();
+    return 0;
+}
@@ -0,0 +1,179 @@
+#include "multiconnect/signal_generator.h"
+
+#include "multiconnect/pcm_format.h"
+
+#include <algorithm>
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <cstdlib>
+#include <vector>
+
+namespace {
+
+constexpr double kPi = 3.14159265358979323846;
+
+double maxAbs(const std::vector<float>& samples) {
+    double peak = 0.0;
+    for (const float sample : samples) {
+        peak = std::max(peak, static_cast<double>(std::fabs(sample)));
+    }
+    return peak;
+}
+
+void testSineMatchesReference() {
+    multiconnect::SineConfig config;
+    config.sampleRateHz = 48000;
+    config.frequencyHz = 997.0F;
+    config.amplitude = 0.5F;
+    config.phaseRad = 0.25F;
+
+    // Ten seconds, with a length that is not a multiple of the chunk or lane count.
+    const std::size_t count = 480001;
+    std::vector<float> samples(count);
+    multiconnect::generateSine(config, samples.data(), samples.size());
+
+    double worst = 0.0;
+    for (std::size_t i = 0; i < count; ++i) {
+        const double expected = 0.5 * std::sin(0.25 + 2.0 * kPi * 997.0 * static_cast<double>(i) / 48000.0);
+        worst = std::max(worst, std::fabs(samples[i] - expected));
+    }
+    assert(worst < 1e-6);
+
+    std::vector<int16_t> pcm(count);
+    multiconnect::generateSine(config, pcm.data(), pcm.size());
+    for (std::size_t i = 0; i < count; ++i) {
+        assert(std::abs(pcm[i] - multiconnect::pcmFloatToPcm16(samples[i])) <= 1);
+    }
+
+    config.amplitude = 3.0F;
+    multiconnect::generateSine(config, samples.data(), 4800);
+    assert(maxAbs(std::vector<float>(samples.begin(), samples.begin() + 4800)) <= 1.0 + 1e-6);
+}
+
+void testLogSweepFollowsExponentialPhase() {
+    multiconnect::LogSweepConfig config;
+    config.sampleRateHz = 48000;
+    config.startHz = 20.0F;
+    config.endHz = 20000.0F;
+    config.amplitude = 0.8F;
+
+    const std::size_t count = 48000 * 2;
+    std::vector<float> samples(count);
+    multiconnect::generateLogSweep(config, samples.data(), samples.size());
+
+    // Phase in cycles after n samples: f0 / fs * (r^n - 1) / (r - 1).
+    const double growth = std::pow(1000.0, 1.0 / static_cast<double>(count - 1));
+    double worst = 0.0;
+    for (std::size_t i = 0; i < count; i += 7) {
+        const double cycles = 20.0 / 48000.0 * (std::pow(growth, static_cast<double>(i)) - 1.0) / (growth - 1.0);
+        worst = std::max(worst, std::fabs(samples[i] - 0.8 * std::sin(2.0 * kPi * cycles)));
+    }
+    assert(worst < 1e-3);
+    assert(std::fabs(samples[0]) < 1e-6);
+
+    // The last samples sit near endHz: count sign changes over the final 10 ms.
+    int crossings = 0;
+    for (std::size_t i = count - 480; i < count; ++i) {
+        crossings += (samples[i - 1] < 0.0F) != (samples[i] < 0.0F) ? 1 : 0;
+    }
+    assert(crossings > 2 * 180 && crossings < 2 * 210);
+
+    std::vector<int16_t> pcm(count);
+    multiconnect::generateLogSweep(config, pcm.data(), pcm.size());
+    assert(std::abs(pcm[count / 2] - multiconnect::pcmFloatToPcm16(samples[count / 2])) <= 1);
+}
+
+void testMlsIsMaximalLength() {
+    for (int32_t order = multiconnect::kMlsMinOrder; order <= 16; ++order) {
+        multiconnect::MlsConfig config;
+        config.order = order;
+        config.amplitude = 1.0F;
+        const std::size_t period = multiconnect::mlsPeriod(order);
+        assert(period == (std::size_t{1} << order) - 1);
+
+        std::vector<float> samples(period * 2);
+        multiconnect::generateMls(config, samples.data(), samples.size());
+        const auto ones = std::count(samples.begin(), samples.begin() + static_cast<std::ptrdiff_t>(period), 1.0F);
+        assert(static_cast<std::size_t>(ones) == (period + 1) / 2);
+        assert(std::equal(samples.begin(), samples.begin() + static_cast<std::ptrdiff_t>(period),
+                          samples.begin() + static_cast<std::ptrdiff_t>(period)));
+    }
+
+    // Circular autocorrelation is period at lag 0 and -1 at every other lag.
+    multiconnect::MlsConfig config;
+    config.order = 9;
+    config.amplitude = 1.0F;
+    config.seed = 0x155;
+    const std::size_t period = multiconnect::mlsPeriod(config.order);
+    std::vector<float> samples(period);
+    multiconnect::generateMls(config, samples.data(), samples.size());
+    for (std::size_t lag = 0; lag < period; ++lag) {
+        double sum = 0.0;
+        for (std::size_t i = 0; i < period; ++i) {
+            sum += samples[i] * samples[(i + lag) % period];
+        }
+        assert(std::fabs(sum - (lag == 0 ? static_cast<double>(period) : -1.0)) < 1e-9);
+    }
+
+    std::vector<int16_t> pcm(period);
+    config.amplitude = 0.5F;
+    multiconnect::generateMls(config, pcm.data(), pcm.size());
+    for (std::size_t i = 0; i < period; ++i) {
+        assert(pcm[i] == (samples[i] > 0.0F ? 16384 : -16384));
+    }
+}
+
+void testMultiToneStaysBelowAmplitude() {
+    const std::vector<float> frequencies = {250.0F, 500.0F, 1000.0F, 2000.0F, 4000.0F, 8000.0F};
+    multiconnect::MultiToneConfig config;
+    config.sampleRateHz = 48000;
+    config.frequenciesHz = frequencies.data();
+    config.toneCount = frequencies.size();
+    config.amplitude = 0.9F;
+
+    const std::size_t count = 48000;
+    std::vector<float> samples(count);
+    multiconnect::generateMultiTone(config, samples.data(), samples.size());
+    assert(maxAbs(samples) <= 0.9 + 1e-6);
+
+    // Each tone is present at amplitude / K: project onto it over the whole (integer-cycle) second.
+    for (const float frequency : frequencies) {
+        double re = 0.0;
+        double im = 0.0;
+        for (std::size_t i = 0; i < count; ++i) {
+            const double angle = 2.0 * kPi * frequency * static_cast<double>(i) / 48000.0;
+            re += samples[i] * std::cos(angle);
+            im += samples[i] * std::sin(angle);
+        }
+        const double magnitude = 2.0 * std::sqrt(re * re + im * im) / static_cast<double>(count);
+        assert(std::fabs(magnitude - 0.9 / 6.0) < 1e-4);
+    }
+
+    // A single tone is the plain sine.
+    config.toneCount = 1;
+    multiconnect::generateMultiTone(config, samples.data(), 1000);
+    multiconnect::SineConfig sine;
+    sine.frequencyHz = frequencies[0];
+    sine.amplitude = 0.9F;
+    std::vector<float> reference(1000);
+    multiconnect::generateSine(sine, reference.data(), reference.size());
+    for (std::size_t i = 0; i < reference.size(); ++i) {
+        assert(std::fabs(samples[i] - reference[i]) < 1e-6);
+    }
+
+    config.frequenciesHz = nullptr;
+    std::vector<int16_t> silent(64, 7);
+    multiconnect::generateMultiTone(config, silent.data(), silent.size());
+    assert(std::all_of(silent.begin(), silent.end(), [](int16_t sample) { return sample == 0; }));
+}
+
+}  // namespace
+
+int main() {
+    testSineMatchesReference();
+    testLogSweepFollowsExponentialPhase();
+    testMlsIsMaximalLength();
+    testMultiToneStaysBelowAmplitude();
+    return 0;
+}
@@ -0,0 +1,154 @@
+#include "multiconnect/stream_timeline.h"
+#include "multiconnect/sync_engine.h"
+
+#include <atomic>
+#include <cassert>
+#include <cmath>
+#include <cstdint>
+#include <thread>
+#include <vector>
+
+namespace {
+
+constexpr int64_t kMs = 1'000'000;
+
+void testTimelineMapping() {
+    multiconnect::StreamTimeline timeline(48000, 4);
+    int64_t value = 0;
+    assert(!timeline.timeAt(0, &value));
+    assert(!timeline.streamIndexAt(0, &value));
+
+    assert(timeline.addAnchor(0, 1'000 * kMs));
+    // On the nominal rate: nothing new to remember.
+    assert(!timeline.addAnchor(480, 1'010 * kMs));
+    assert(timeline.anchorCount() == 1);
+    assert(timeline.timeAt(4800, &value) && value == 1'100 * kMs);
+    assert(timeline.streamIndexAt(990 * kMs, &value) && value == -480);
+
+    // The capture clock runs 1% slow against the host: 4800 frames took 101 ms.
+    assert(timeline.addAnchor(4800, 1'101 * kMs));
+    assert(timeline.timeAt(2400, &value) && value == 1'050'500'000);
+    assert(timeline.streamIndexAt(1'050'500'000, &value) && value == 2400);
+    // Past the newest anchor the nominal rate applies again.
+    assert(timeline.timeAt(9600, &value) && value == 1'201 * kMs);
+
+    // Stamps must move forward in both index and time.
+    assert(!timeline.addAnchor(4800, 1'200 * kMs));
+    assert(!timeline.addAnchor(9600, 1'100 * kMs));
+
+    // The oldest anchors fall out of the fixed history; lookups before them extrapolate.
+    for (int64_t i = 2; i <= 5; ++i) {
+        assert(timeline.addAnchor(i * 4800, 1'000 * kMs + i * 102 * kMs));
+    }
+    assert(timeline.anchorCount() == 4);
+    assert(timeline.timeAt(9600, &value) && value == 1'204 * kMs);
+    assert(timeline.timeAt(4800, &value) && value == 1'104 * kMs);
+
+    timeline.clear();
+    assert(timeline.anchorCount() == 0 && !timeline.timeAt(0, &value));
+    assert(timeline.addAnchor(0, 5 * kMs));
+}
+
+void testLookupsWhileWriting() {
+    // Every anchor is (m, 1 ms + 2m ns), far off the nominal rate so each one is stored, and the
+    // 8-anchor history keeps being overwritten. A lookup must come from one consistent snapshot,
+    // never a mix of two anchors.
+    multiconnect::StreamTimeline timeline(48000, 8);
+    assert(timeline.addAnchor(0, kMs));
+    const auto plausible = [](int64_t time) {
+        // Exact while an anchor at or before frame 1000 is held...
+        if (time == kMs + 2'000) {
+            return true;
+        }
+        // ...otherwise nominal-rate extrapolation from a single held anchor (m, 1 ms + 2m): back from
+        // the oldest, or forward from the newest before the writer has added the next one.
+        const double nsPerFrame = 1e9 / 48000.0;
+        const double m = (static_cast<double>(time - kMs) - 1000.0 * nsPerFrame) / (2.0 - nsPerFrame);
+        return m > -1e-3 && std::abs(m / 100.0 - std::round(m / 100.0)) < 1e-3;
+    };
+
+    std::atomic<bool> done{false};
+    std::atomic<bool> failed{false};
+    std::thread reader([&] {
+        while (!done.load()) {
+            int64_t time = 0;
+            if (!timeline.timeAt(1'000, &time) || !plausible(time)) {
+                failed = true;
+            }
+        }
+    });
+    for (int64_t i = 1; i < 200'000; ++i) {
+        assert(timeline.addAnchor(i * 100, kMs + i * 200));
+    }
+    done = true;
+    reader.join();
+    assert(!failed);
+}
+
+void testLateJoinAlignsToPresentationTime() {
+    multiconnect::SyncEngineConfig config;
+    config.masterCapacitySamples = 48000;
+    config.mode = multiconnect::SyncEngineMode::kConcurrent;
+    multiconnect::SyncEngine engine(config);
+
+    int64_t value = 0;
+    assert(!engine.registerDeviceAtTime("early", 0, 0));
+    assert(!engine.streamIndexAtTime(0, &value));
+
+    // 10 ms blocks stamped 200 ms ahead of the capture: block n is heard at 200 + 10n ms.
+    std::vector<int16_t> block(480);
+    const auto pushBlock = [&](int64_t n) {
+        for (std::size_t i = 0; i < block.size(); ++i) {
+            block[i] = static_cast<int16_t>((n * 480 + static_cast<int64_t>(i)) % 30000);
+        }
+        assert(engine.pushPcm16(block.data(), block.size(), (200 + 10 * n) * kMs) == block.size());
+    };
+    const auto first = engine.registerDevice("first", -200 * 48);
+    for (int64_t n = 0; n < 30; ++n) {
+        pushBlock(n);
+    }
+
+    // At t = 250 ms a speaker with 20 ms of output latency joins: its first frame is heard at
+    // 270 ms, which is frame 70 ms * 48 = 3360 of the stream.
+    const auto late = engine.registerDeviceAtTime("late", 250 * kMs, 20 * kMs);
+    assert(late);
+    assert(engine.devicePresentationTimeNs(late, &value) && value == 270 * kMs);
+    std::vector<int16_t> out(480);
+    std::size_t read = 0;
+    assert(engine.pullForDevice(late, out.data(), out.size(), &read) && read == 480);
+    assert(out[0] == 3360 && out[479] == 3839);
+    assert(engine.devicePresentationTimeNs(late, &value) && value == 280 * kMs);
+
+    // Re-aligning after a latency change moves the read position onto the timeline again.
+    assert(engine.alignDeviceToTime(late, 260 * kMs, 35 * kMs));
+    assert(engine.devicePresentationTimeNs(late, &value) && value == 295 * kMs);
+    assert(engine.pullForDevice(late, out.data(), 1, &read) && out[0] == 95 * 48);
+
+    // Without stamps a device registered now would start at the write position instead.
+    assert(engine.presentationTimeNs(0, &value) && value == 200 * kMs);
+    assert(engine.streamIndexAtTime(300 * kMs, &value) && value == 4800);
+    assert(engine.deviceState(first).readHead == 0);
+    assert(!engine.alignDeviceToTime(multiconnect::DeviceHandle{}, 0, 0));
+    assert(!engine.devicePresentationTimeNs(multiconnect::DeviceHandle{}, &value));
+
+    // A time the ring no longer holds starts at the oldest frame kept.
+    for (int64_t n = 30; n < 130; ++n) {
+        assert(engine.pullForDevice(first, out.data(), out.size(), &read));
+        assert(engine.pullForDevice(late, out.data(), out.size(), &read));
+        pushBlock(n);
+    }
+    const auto stale = engine.registerDeviceAtTime("stale", 0, 0);
+    assert(stale);
+    const multiconnect::DeviceStreamState state = engine.deviceState(stale);
+    const auto oldestKept = static_cast<int64_t>(130 * 480 - 48000 + engine.rewindHeadroomSamples());
+    assert(static_cast<int64_t>(state.readHead) + state.offsetSamples == oldestKept);
+}
+
+}  // namespace
+
+int main() {
+    testTimelineMapping();
+    testLookupsWhileWriting();
+    testLateJoinAlignsToPresentationTime();
+    return 0;
+}
@@ -34,5 +34,181 @@ int main() {
     assert(engine.unregisterDevice("sony"));
     assert(!engine.hasDevice("sony"));
 
+    // Handles index a dense table: stable while registered, reused after unregister.
+    const multiconnect::DeviceHandle tribitHandle = engine.deviceHandle("tribit");
+    assert(tribitHandle.valid());
+    assert(tribitHandle.index == 1);
+    assert(!engine.deviceHandle("sony").valid());
+
+    const multiconnect::DeviceHandle mivi = engine.registerDevice("mivi", 0);
+    assert(mivi.index == 0);
+    std::vector<int16_t> byHandle(2, 0);
+    std::size_t read = 0;
+    assert(engine.pullForDevice(mivi, byHandle.data(), byHandle.size(), &read));
+    assert(read == 2);
+    assert(byHandle[0] == 1);
+    assert(engine.deviceState(mivi).readHead == 2);
+
+    assert(engine.setDeviceOffsetSamples(tribitHandle, 3));
+    assert(engine.deviceState("tribit").offsetSamples == 3);
+    assert(engine.applyDriftCorrectionMs(tribitHandle, 2.0F, 1000));
+    assert(engine.deviceState(tribitHandle).offsetSamples == 1);
+
+    assert(engine.unregisterDevice(mivi));
+    assert(!engine.hasDevice(mivi));
+    assert(!engine.pullForDevice(mivi, byHandle.data(), byHandle.size(), &read));
+    assert(read == 0);
+    assert(!engine.pullForDevice(multiconnect::DeviceHandle{}, byHandle.data(), byHandle.size()));
+
+    // Batched pulls fill every buffer in one call and flag devices that ran short.
+    multiconnect::SyncEngine batched(16);
+    const multiconnect::DeviceHandle left = batched.registerDevice("left", 0);
+    const multiconnect::DeviceHandle right = batched.registerDevice("right", 1);
+    batched.pushPcm16(source.data(), 3);
+
+    std::vector<int16_t> leftOut(3, -1);
+    std::vector<int16_t> rightOut(4, -1);
+    multiconnect::DevicePull pulls[3];
+    pulls[0].handle = left;
+    pulls[0].output = leftOut.data();
+    pulls[0].sampleCount = leftOut.size();
+    pulls[1].handle = right;
+    pulls[1].output = rightOut.data();
+    pulls[1].sampleCount = rightOut.size();
+    pulls[2].handle = multiconnect::DeviceHandle{};
+    assert(batched.pullAll(pulls, 3) == 2);
+    assert(pulls[0].readSamples == 3 && !pulls[0].underrun);
+    assert(leftOut[0] == 1 && leftOut[2] == 3);
+    // "right" is one frame ahead: only two frames exist for it; the rest is silence, not stale ring slots.
+    assert(pulls[1].readSamples == 2 && pulls[1].underrun);
+    assert(rightOut[0] == 2 && rightOut[1] == 3 && rightOut[2] == 0 && rightOut[3] == 0);
+    assert(batched.deviceMetrics(right).underrunCount == 1);
+    assert(batched.deviceState(left).readHead == 3);
+
+    multiconnect::SyncEngine interleavedEngine(16);
+    const multiconnect::DeviceHandle pair[2] = {interleavedEngine.registerDevice("a", 0),
+                                                interleavedEngine.registerDevice("b", 2)};
+    interleavedEngine.pushPcm16(source.data(), source.size());
+    std::vector<int16_t> frames(6, -1);
+    std::size_t perDeviceRead[2] = {};
+    bool perDeviceUnderrun[2] = {};
+    assert(interleavedEngine.pullAllInterleaved(pair, 2, frames.data(), 3, perDeviceRead, perDeviceUnderrun) == 2);
+    assert(frames[0] == 1 && frames[1] == 3);
+    assert(frames[2] == 2 && frames[3] == 4);
+    assert(frames[4] == 3 && frames[5] == 5);
+    assert(perDeviceRead[0] == 3 && perDeviceRead[1] == 3);
+    assert(!perDeviceUnderrun[0] && !perDeviceUnderrun[1]);
+
+    multiconnect::SyncEngineConfig tinyConfig;
+    tinyConfig.masterCapacitySamples = 8;
+    tinyConfig.maxDevices = 2;
+    multiconnect::SyncEngine tiny(tinyConfig);
+    assert(tiny.registerDevice("a"));
+    assert(tiny.registerDevice("b"));
+    assert(!tiny.registerDevice("c"));
+    assert(tiny.deviceCount() == 2);
+
+    // Stereo float capture is stored as-is and converted per device on pull.
+    multiconnect::SyncEngineConfig stereoConfig;
+    stereoConfig.masterCapacitySamples = 16;
+    stereoConfig.format = {2, multiconnect::PcmEncoding::kPcmFloat};
+    multiconnect::SyncEngine stereo(stereoConfig);
+    const auto both = stereo.registerDevice("both");
+    const auto firstChannel = stereo.registerDevice("left", 0, {multiconnect::DeviceChannelLayout::kSingleChannel, 0});
+    const auto mono = stereo.registerDevice("mono", 1, {multiconnect::DeviceChannelLayout::kDownmixMono, 0});
+    assert(!stereo.registerDevice("third", 0, {multiconnect::DeviceChannelLayout::kSingleChannel, 2}));
+    assert(stereo.deviceOutputChannels(both) == 2);
+    assert(stereo.deviceOutputChannels(firstChannel) == 1 && stereo.deviceOutputChannels(mono) == 1);
+
+    const std::vector<float> captured = {0.5F, -0.5F, 1.0F, 0.0F, 2.0F, -2.0F, 0.25F, 0.75F};
+    assert(stereo.pushPcm16(source.data(), 4) == 0);
+    assert(stereo.pushPcmFloat(captured.data(), 4) == 4);
+    assert(stereo.bufferedSamples() == 4);
+
+    std::vector<int16_t> bothOut(6, 0);
+    std::size_t bothRead = 0;
+    assert(stereo.pullForDevice(both, bothOut.data(), 3, &bothRead));
+    assert(bothRead == 3);
+    assert(bothOut[0] == 16384 && bothOut[1] == -16384);
+    assert(bothOut[2] == 32767 && bothOut[3] == 0);
+    assert(bothOut[4] == 32767 && bothOut[5] == -32767);
+
+    std::vector<int16_t> firstChannelOut(2, 0);
+    assert(stereo.pullForDevice(firstChannel, firstChannelOut.data(), firstChannelOut.size()));
+    assert(firstChannelOut[0] == 16384 && firstChannelOut[1] == 32767);
+
+    std::vector<int16_t> monoOut(2, 0);
+    assert(stereo.pullForDevice(mono, monoOut.data(), monoOut.size()));
+    assert(monoOut[0] == 16384 && monoOut[1] == 0);
+
+    // Interleaved batches give each device as many columns as it has output channels.
+    const multiconnect::DeviceHandle stereoHandles[] = {firstChannel, both};
+    std::vector<int16_t> mixed(3, -1);
+    assert(stereo.pullAllInterleaved(stereoHandles, 2, mixed.data(), 1) == 2);
+    assert(mixed[0] == 32767);
+    assert(mixed[1] == 8192 && mixed[2] == 24575);
+
+    // Gain changes ramp linearly over gainRampFrames; soft clipping only bends loud samples.
+    multiconnect::SyncEngineConfig gainConfig;
+    gainConfig.masterCapacitySamples = 16;
+    gainConfig.gainRampFrames = 4;
+    multiconnect::SyncEngine gained(gainConfig);
+    const auto quiet = gained.registerDevice("quiet");
+    const auto loud = gained.registerDevice("loud");
+    const std::vector<int16_t> level(12, 10000);
+    gained.pushPcm16(level.data(), level.size());
+
+    assert(gained.setDeviceGainDb(quiet, -6.0206F));
+    assert(gained.deviceState(quiet).gainDb == -6.0206F);
+    std::vector<int16_t> ramped(8, 0);
+    assert(gained.pullForDevice(quiet, ramped.data(), ramped.size()));
+    assert(ramped[0] == 10000 && ramped[1] == 8750 && ramped[2] == 7500 && ramped[3] == 6250);
+    assert(ramped[4] == 5000 && ramped[7] == 5000);
+
+    assert(gained.setDeviceGainDb(loud, 12.0F));
+    assert(gained.setDeviceSoftClip(loud, true));
+    assert(gained.deviceState(loud).softClip);
+    std::vector<int16_t> clipped(8, 0);
+    assert(gained.pullForDevice(loud, clipped.data(), clipped.size()));
+    assert(clipped[0] == 10000);
+    assert(clipped[6] > 24576 && clipped[6] < 32767);
+    assert(!gained.setDeviceGainDb(multiconnect::DeviceHandle{}, 0.0F));
+
+    // Metrics: a lapped reader counts an overrun, a starved one an underrun.
+    multiconnect::SyncEngine metered(8);
+    const auto lapped = metered.registerDevice("lapped");
+    const auto starved = metered.registerDevice("starved");
+    const std::vector<int16_t> twelve = {1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12};
+    metered.pushPcm16(twelve.data(), twelve.size());
+    std::vector<int16_t> meterOut(4, 0);
+    assert(metered.pullForDevice(lapped, meterOut.data(), meterOut.size()));
+    auto lappedMetrics = metered.deviceMetrics(lapped);
+    assert(lappedMetrics.overrunCount == 1 && lappedMetrics.overrunFrames == 4);
+    assert(lappedMetrics.lagFrames == 8 && lappedMetrics.framesRead == 4);
+    assert(metered.applyDriftCorrectionMs(lapped, 1.0F, 1000));
+    assert(metered.deviceMetrics(lapped).correctionCount == 1);
+
+    multiconnect::SyncEngine drained(16);
+    const auto drainedDevice = drained.registerDevice("drained");
+    drained.pushPcm16(twelve.data(), 2);
+    std::vector<int16_t> drainedOut(4, 0);
+    assert(drained.pullForDevice(drainedDevice, drainedOut.data(), drainedOut.size()));
+    const auto drainedMetrics = drained.deviceMetrics(drainedDevice);
+    assert(drainedMetrics.underrunCount == 1 && drainedMetrics.underrunFrames == 2);
+
+    const auto engineMetrics = metered.engineMetrics();
+    assert(engineMetrics.deviceCount == 2 && engineMetrics.framesWritten == 12);
+    assert(engineMetrics.overrunCount == 1 && engineMetrics.correctionCount == 1);
+    assert(engineMetrics.bufferFillPercent == 100.0);
+    assert(engineMetrics.timestampNs > 0);
+    multiconnect::DeviceMetrics all[4];
+    assert(metered.deviceMetrics(all, 4) == 2);
+    assert(all[1].handle.index == starved.index && all[1].framesRead == 0);
+    assert(metered.deviceId(starved) == "starved");
+    multiconnect::EngineMetrics later = engineMetrics;
+    later.timestampNs += 30'000'000'000LL;
+    later.correctionCount += 3;
+    assert(multiconnect::correctionsPerMinute(engineMetrics, later) == 6.0);
+
     return 0;
 }
@@ -3,6 +3,7 @@
 #include <cassert>
 #include <cstdint>
 #include <cstring>
+#include <string>
 #include <vector>
 
 int main() {
@@ -44,9 +45,181 @@ int main() {
     assert(afterReset[0].offset_samples == 4);
     assert(afterReset[1].offset_samples == 4);
 
+    const int32_t tribitHandle = mc_sync_engine_device_handle(engine, "tribit");
+    assert(tribitHandle != MC_INVALID_DEVICE_HANDLE);
+    assert(mc_sync_engine_device_handle(engine, "missing") == MC_INVALID_DEVICE_HANDLE);
+    assert(mc_sync_engine_set_handle_offset_samples(engine, tribitHandle, 0) == 1);
+    assert(mc_sync_engine_pull_for_handle(engine, tribitHandle, sonyOut.data(), 2, &read) == 1);
+    assert(read == 2);
+    assert(sonyOut[0] == 1);
+    assert(mc_sync_engine_apply_handle_drift_correction_ms(engine, tribitHandle, 0.0F, 1000) == 1);
+    assert(mc_sync_engine_pull_for_handle(engine, MC_INVALID_DEVICE_HANDLE, sonyOut.data(), 2, &read) == 0);
+    assert(read == 0);
+
+    std::vector<int16_t> tribitBatch(4, -1);
+    MC_DevicePull pulls[2] = {};
+    pulls[0].device_handle = tribitHandle;
+    pulls[0].output = tribitBatch.data();
+    pulls[0].sample_count = tribitBatch.size();
+    pulls[1].device_handle = 17;
+    assert(mc_sync_engine_pull_all(engine, pulls, 2) == 1);
+    assert(pulls[0].read_samples == 2);
+    assert(pulls[0].underrun == 1);
+    assert(tribitBatch[0] == 3 && tribitBatch[1] == 4 && tribitBatch[2] == 0 && tribitBatch[3] == 0);
+    assert(pulls[1].read_samples == 0);
+    assert(pulls[1].underrun == 0);
+
+    // Sony plays 4 frames ahead: give both devices something new to read.
+    mc_sync_engine_push_pcm16(engine, source.data(), source.size());
+    mc_sync_engine_push_pcm16(engine, source.data(), source.size());
+    const int32_t bothHandles[2] = {mc_sync_engine_device_handle(engine, "sony"), tribitHandle};
+    std::vector<int16_t> interleaved(4, -1);
+    int underruns[2] = {};
+    assert(mc_sync_engine_pull_all_interleaved(engine, bothHandles, 2, interleaved.data(), interleaved.size(), 2, nullptr,
+                                               underruns) == 2);
+    assert(underruns[0] == 0 && underruns[1] == 0);
+
     assert(mc_sync_engine_unregister_device(engine, "sony") == 1);
     assert(mc_sync_engine_device_count(engine) == 1);
+    const int32_t jblHandle = mc_sync_engine_register_device_handle(engine, "jbl", 0);
+    assert(jblHandle == 0);
+    assert(mc_sync_engine_register_device_handle(engine, "jbl", 0) == MC_INVALID_DEVICE_HANDLE);
 
     mc_sync_engine_destroy(engine);
+
+    MC_SyncEngineConfig config = {};
+    config.master_capacity_samples = 8;
+    config.mode = MC_SYNC_ENGINE_MODE_CONCURRENT;
+    MC_SyncEngine* concurrent = mc_sync_engine_create_with_config(&config);
+    assert(concurrent != nullptr);
+    assert(mc_sync_engine_register_device(concurrent, "sony", 0) == 1);
+    const std::vector<int16_t> burst = {1, 2, 3, 4, 5, 6, 7, 8};
+    assert(mc_sync_engine_push_pcm16(concurrent, burst.data(), burst.size()) == 6);
+    assert(mc_sync_engine_pull_for_device(concurrent, "sony", sonyOut.data(), sonyOut.size(), &read) == 1);
+    assert(read == 4);
+    assert(sonyOut[3] == 4);
+    // Frames 5 and 6 are still unplayed: a one-frame ring cannot hold them.
+    assert(mc_sync_engine_master_capacity_samples(concurrent) == 8);
+    assert(mc_sync_engine_resize_ring(concurrent, 1) == 0);
+    assert(mc_sync_engine_resize_ring(concurrent, 16) == 1);
+    assert(mc_sync_engine_master_capacity_samples(concurrent) == 16);
+    assert(mc_sync_engine_resize_ring(nullptr, 16) == 0);
+    const int32_t sonyHandle = mc_sync_engine_device_handle(concurrent, "sony");
+    assert(mc_sync_engine_set_handle_rate_correction_ppm(concurrent, sonyHandle, 40.0F) == 1);
+    assert(mc_sync_engine_slew_handle_drift_correction_ms(concurrent, sonyHandle, 0.1F, 48000) == 1);
+    assert(mc_sync_engine_set_handle_rate_correction_ppm(concurrent, MC_INVALID_DEVICE_HANDLE, 40.0F) == 0);
+    mc_sync_engine_destroy(concurrent);
+    assert(mc_sync_engine_create_with_config(nullptr) == nullptr);
+
+    // Every device an engine can hold fits one interleaved pull; a larger table is refused.
+    MC_SyncEngineConfig fullConfig = {};
+    fullConfig.master_capacity_samples = 8;
+    fullConfig.max_devices = MC_MAX_DEVICES + 1;
+    assert(mc_sync_engine_create_with_config(&fullConfig) == nullptr);
+    fullConfig.max_devices = MC_MAX_DEVICES;
+    MC_SyncEngine* full = mc_sync_engine_create_with_config(&fullConfig);
+    std::vector<int32_t> fullHandles;
+    for (int i = 0; i < MC_MAX_DEVICES; ++i) {
+        fullHandles.push_back(mc_sync_engine_register_device_handle(full, ("speaker-" + std::to_string(i)).c_str(), 0));
+    }
+    assert(mc_sync_engine_push_pcm16(full, burst.data(), 2) == 2);
+    std::vector<int16_t> fullOut(2 * MC_MAX_DEVICES, -1);
+    assert(mc_sync_engine_pull_all_interleaved(full, fullHandles.data(), fullHandles.size(), fullOut.data(), fullOut.size(), 2,
+                                               nullptr, nullptr) == MC_MAX_DEVICES);
+    assert(fullOut[MC_MAX_DEVICES - 1] == 1 && fullOut[2 * MC_MAX_DEVICES - 1] == 2);
+    mc_sync_engine_destroy(full);
+
+    MC_SyncEngineConfig stereoConfig = {};
+    stereoConfig.master_capacity_samples = 8;
+    stereoConfig.channels = 2;
+    stereoConfig.encoding = MC_PCM_ENCODING_FLOAT;
+    MC_SyncEngine* stereo = mc_sync_engine_create_with_config(&stereoConfig);
+    const int32_t right = mc_sync_engine_register_device_channels(stereo, "right", 0, MC_DEVICE_CHANNELS_SINGLE, 1);
+    assert(right != MC_INVALID_DEVICE_HANDLE);
+    assert(mc_sync_engine_register_device_channels(stereo, "bad", 0, 7, 0) == MC_INVALID_DEVICE_HANDLE);
+    assert(mc_sync_engine_device_output_channels(stereo, right) == 1);
+    const std::vector<float> frames = {0.0F, 0.5F, 0.0F, -0.5F};
+    assert(mc_sync_engine_push_pcm16(stereo, burst.data(), 2) == 0);
+    assert(mc_sync_engine_push_pcm_float(stereo, frames.data(), 2) == 2);
+    std::vector<int16_t> rightOut(2, 0);
+    assert(mc_sync_engine_pull_for_handle(stereo, right, rightOut.data(), rightOut.size(), &read) == 1);
+    assert(read == 2 && rightOut[0] == 16384 && rightOut[1] == -16384);
+    assert(mc_sync_engine_set_handle_gain_db(stereo, right, -6.0F) == 1);
+    assert(mc_sync_engine_set_handle_soft_clip(stereo, right, 1) == 1);
+    assert(mc_sync_engine_set_handle_gain_db(stereo, MC_INVALID_DEVICE_HANDLE, -6.0F) == 0);
+
+    MC_EngineMetrics engineMetrics = {};
+    MC_DeviceMetrics deviceMetrics[2] = {};
+    assert(mc_sync_engine_get_metrics(stereo, &engineMetrics, deviceMetrics, 2) == 1);
+    assert(engineMetrics.device_count == 1 && engineMetrics.frames_written == 2);
+    assert(std::strcmp(deviceMetrics[0].device_id, "right") == 0);
+    assert(deviceMetrics[0].device_handle == right && deviceMetrics[0].frames_read == 2);
+    assert(mc_sync_engine_get_metrics(stereo, nullptr, nullptr, 0) == 1);
+    mc_sync_engine_destroy(stereo);
+
+    // Interleaved pulls give each device its output channels: a mono and a stereo device make three
+    // columns per frame, and a buffer sized for one column per device is refused untouched.
+    MC_SyncEngine* mixed = mc_sync_engine_create_with_config(&stereoConfig);
+    const int32_t mixedHandles[2] = {
+        mc_sync_engine_register_device_channels(mixed, "left", 0, MC_DEVICE_CHANNELS_SINGLE, 0),
+        mc_sync_engine_register_device_channels(mixed, "both", 0, MC_DEVICE_CHANNELS_ALL, 0)};
+    assert(mc_sync_engine_device_output_channels(mixed, mixedHandles[1]) == 2);
+    assert(mc_sync_engine_push_pcm_float(mixed, frames.data(), 2) == 2);
+    std::vector<int16_t> columns(2 * 3, -1);
+    assert(mc_sync_engine_pull_all_interleaved(mixed, mixedHandles, 2, columns.data(), 2 * 2, 2, nullptr, nullptr) == 0);
+    assert(columns == std::vector<int16_t>(2 * 3, -1));
+    size_t mixedRead[2] = {};
+    assert(mc_sync_engine_pull_all_interleaved(mixed, mixedHandles, 2, columns.data(), columns.size(), 2, mixedRead,
+                                               nullptr) == 2);
+    assert(mixedRead[0] == 2 && mixedRead[1] == 2);
+    assert(columns == std::vector<int16_t>({0, 0, 16384, 0, 0, -16384}));
+    mc_sync_engine_destroy(mixed);
+
+    // Timestamped pushes and late join: blocks of 4 frames at 1 kHz, heard from t = 100 ms.
+    MC_SyncEngineConfig timedConfig = {};
+    timedConfig.master_capacity_samples = 64;
+    timedConfig.sample_rate_hz = 1000;
+    MC_SyncEngine* timed = mc_sync_engine_create_with_config(&timedConfig);
+    int64_t index = 0;
+    int64_t timeNs = 0;
+    assert(mc_sync_engine_stream_index_at_time(timed, 0, &index) == 0);
+    assert(mc_sync_engine_register_device_at_time(timed, "early", 0, 0, MC_DEVICE_CHANNELS_ALL, 0) ==
+           MC_INVALID_DEVICE_HANDLE);
+    const std::vector<int16_t> ramp = {10, 11, 12, 13, 14, 15, 16, 17};
+    assert(mc_sync_engine_push_pcm16_at(timed, ramp.data(), 4, 100'000'000) == 4);
+    assert(mc_sync_engine_push_pcm16_at(timed, ramp.data() + 4, 4, 104'000'000) == 4);
+    assert(mc_sync_engine_stream_index_at_time(timed, 106'000'000, &index) == 1 && index == 6);
+    assert(mc_sync_engine_presentation_time_ns(timed, 2, &timeNs) == 1 && timeNs == 102'000'000);
+    const int32_t joined = mc_sync_engine_register_device_at_time(timed, "joined", 101'000'000, 2'000'000,
+                                                                  MC_DEVICE_CHANNELS_ALL, 0);
+    assert(joined != MC_INVALID_DEVICE_HANDLE);
+    assert(mc_sync_engine_device_presentation_time_ns(timed, joined, &timeNs) == 1 && timeNs == 103'000'000);
+    int16_t sample = 0;
+    assert(mc_sync_engine_pull_for_handle(timed, joined, &sample, 1, &read) == 1 && sample == 13);
+    assert(mc_sync_engine_align_handle_to_time(timed, joined, 100'000'000, 0) == 1);
+    assert(mc_sync_engine_pull_for_handle(timed, joined, &sample, 1, &read) == 1 && sample == 10);
+    assert(mc_sync_engine_align_handle_to_time(timed, MC_INVALID_DEVICE_HANDLE, 0, 0) == 0);
+
+    // A dropped device reconnects as far behind the write position as it left, still 101 ms.
+    assert(mc_sync_engine_unregister_device(timed, "joined") == 1);
+    const int32_t rejoined = mc_sync_engine_rejoin_device(timed, "joined");
+    assert(rejoined != MC_INVALID_DEVICE_HANDLE);
+    assert(mc_sync_engine_device_presentation_time_ns(timed, rejoined, &timeNs) == 1 && timeNs == 101'000'000);
+    assert(mc_sync_engine_rejoin_device(timed, "joined") == MC_INVALID_DEVICE_HANDLE);
+    assert(mc_sync_engine_rejoin_device(nullptr, "joined") == MC_INVALID_DEVICE_HANDLE);
+    mc_sync_engine_destroy(timed);
+
+    // The estimator entry point sees a click delayed by 12 samples.
+    std::vector<int16_t> reference(256, 0);
+    std::vector<int16_t> capture(256, 0);
+    reference[40] = 20000;
+    capture[52] = 20000;
+    double lag = 0.0;
+    double peak = 0.0;
+    assert(mc_estimate_offset_gcc_phat(reference.data(), reference.size(), capture.data(), capture.size(), 64, &lag,
+                                       &peak) == 1);
+    assert(lag > 11.99 && lag < 12.01 && peak > 0.9);
+    assert(mc_estimate_offset_gcc_phat(nullptr, 0, capture.data(), capture.size(), 0, &lag, &peak) == 0);
+
     return 0;
 }
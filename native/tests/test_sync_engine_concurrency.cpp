@@ -0,0 +1,165 @@
+#include "multiconnect/sync_engine.h"
+
+#include <atomic>
+#include <cassert>
+#include <chrono>
+#include <cstdint>
+#include <string>
+#include <thread>
+#include <vector>
+
+// One capture thread pushes while eight output threads pull, each from its own device cursor.
+// Build with -DMC_ENABLE_TSAN=ON to run this under ThreadSanitizer.
+int main() {
+    constexpr std::size_t kTotalSamples = 1 << 20;
+    constexpr int kReaders = 8;
+    constexpr int32_t kDelayedOffset = -37;
+
+    multiconnect::SyncEngineConfig config;
+    config.masterCapacitySamples = 4096;
+    config.mode = multiconnect::SyncEngineMode::kConcurrent;
+    multiconnect::SyncEngine engine(config);
+
+    for (int r = 0; r < kReaders; ++r) {
+        assert(engine.registerDevice("speaker-" + std::to_string(r), r == 0 ? kDelayedOffset : 0));
+    }
+
+    std::atomic<bool> readersFailed{false};
+
+    std::thread writer([&engine] {
+        std::vector<int16_t> block(509);
+        std::size_t pushed = 0;
+        while (pushed < kTotalSamples) {
+            const std::size_t want = std::min(block.size(), kTotalSamples - pushed);
+            for (std::size_t i = 0; i < want; ++i) {
+                block[i] = static_cast<int16_t>((pushed + i) & 0x7FFF);
+            }
+            const std::size_t accepted = engine.pushPcm16(block.data(), want);
+            pushed += accepted;
+            if (accepted < want) {
+                std::this_thread::yield();
+            }
+        }
+    });
+
+    std::vector<std::thread> readers;
+    for (int r = 0; r < kReaders; ++r) {
+        readers.emplace_back([&engine, &readersFailed, r] {
+            const std::string deviceId = "speaker-" + std::to_string(r);
+            const int64_t leadingSilence = r == 0 ? -kDelayedOffset : 0;
+            const std::size_t expectedTotal = kTotalSamples + static_cast<std::size_t>(leadingSilence);
+            std::vector<int16_t> out(97 + r * 31);
+            std::size_t consumed = 0;
+
+            while (consumed < expectedTotal) {
+                std::size_t read = 0;
+                if (!engine.pullForDevice(deviceId, out.data(), out.size(), &read)) {
+                    readersFailed = true;
+                    return;
+                }
+
+                for (std::size_t i = 0; i < read; ++i) {
+                    const int64_t streamIndex = static_cast<int64_t>(consumed + i) - leadingSilence;
+                    const int16_t expected =
+                        streamIndex < 0 ? 0 : static_cast<int16_t>(static_cast<std::size_t>(streamIndex) & 0x7FFF);
+                    if (out[i] != expected) {
+                        readersFailed = true;
+                        return;
+                    }
+                }
+                consumed += read;
+                if (read == 0) {
+                    std::this_thread::yield();
+                }
+            }
+        });
+    }
+
+    // A UI-style poller snapshots metrics while audio threads run.
+    std::atomic<bool> polling{true};
+    std::thread poller([&engine, &polling] {
+        std::vector<multiconnect::DeviceMetrics> devices(kReaders);
+        while (polling) {
+            const auto metrics = engine.engineMetrics();
+            assert(metrics.deviceCount == kReaders);
+            assert(metrics.bufferFillPercent >= 0.0 && metrics.bufferFillPercent <= 100.0);
+            assert(engine.deviceMetrics(devices.data(), devices.size()) == kReaders);
+            std::this_thread::yield();
+        }
+    });
+
+    writer.join();
+    for (auto& reader : readers) {
+        reader.join();
+    }
+    polling = false;
+    poller.join();
+
+    assert(!readersFailed);
+    // The writer never overwrites unread frames in concurrent mode; it refuses them instead.
+    const auto finalMetrics = engine.engineMetrics();
+    assert(finalMetrics.overrunCount == 0);
+    assert(finalMetrics.framesWritten == kTotalSamples);
+    assert(engine.deviceState("speaker-1").readHead == kTotalSamples);
+
+    // Offsets set from a control thread: a backward jump beyond the headroom is spread over pulls,
+    // never reading slots the writer may already have reused.
+    multiconnect::SyncEngineConfig smallConfig;
+    smallConfig.masterCapacitySamples = 16;
+    smallConfig.mode = multiconnect::SyncEngineMode::kConcurrent;
+    multiconnect::SyncEngine small(smallConfig);
+    assert(small.rewindHeadroomSamples() == 4);
+    assert(small.registerDevice("late", 0));
+
+    std::vector<int16_t> ramp(16);
+    for (std::size_t i = 0; i < ramp.size(); ++i) {
+        ramp[i] = static_cast<int16_t>(i + 1);
+    }
+    assert(small.pushPcm16(ramp.data(), ramp.size()) == 12);
+    std::vector<int16_t> out(8, 0);
+    std::size_t read = 0;
+    assert(small.pullForDevice("late", out.data(), out.size(), &read));
+    assert(read == 8 && out[0] == 1 && out[7] == 8);
+
+    assert(small.setDeviceOffsetSamples("late", -6));
+    assert(small.pullForDevice("late", out.data(), 1, &read));
+    assert(read == 1 && out[0] == 5);
+
+    // A reader that stops pulling holds the writer back only until its last pull is older than the
+    // ring spans (at least 100 ms); it is then lapped and resumes from the oldest surviving frame.
+    multiconnect::SyncEngineConfig stallConfig;
+    stallConfig.masterCapacitySamples = 480;
+    stallConfig.mode = multiconnect::SyncEngineMode::kConcurrent;
+    multiconnect::SyncEngine stall(stallConfig);
+    const auto live = stall.registerDevice("live", 0);
+    const auto stalled = stall.registerDevice("stalled", 0);
+    assert(live && stalled);
+
+    std::vector<int16_t> stream(1200);
+    for (std::size_t i = 0; i < stream.size(); ++i) {
+        stream[i] = static_cast<int16_t>(i + 1);
+    }
+    std::vector<int16_t> block(360, 0);
+    assert(stall.pushPcm16(stream.data(), 360) == 360);
+    assert(stall.pullForDevice(live, block.data(), 360, &read) && read == 360);
+    // Still within the timeout: the idle reader keeps the ring full.
+    assert(stall.pushPcm16(stream.data() + 360, 360) == 0);
+
+    std::this_thread::sleep_for(std::chrono::milliseconds(150));
+    assert(stall.pullForDevice(live, block.data(), 1, &read) && read == 0);
+    assert(stall.pushPcm16(stream.data() + 360, 360) == 360);
+    assert(stall.pullForDevice(live, block.data(), 360, &read) && read == 360);
+    assert(block[0] == 361 && block[359] == 720);
+    assert(stall.deviceMetrics(live).overrunCount == 0);
+
+    // Written 720 of a 480-frame ring with 120 frames of headroom: frames 360 onward survive.
+    assert(stall.pullForDevice(stalled, block.data(), 8, &read) && read == 8);
+    assert(block[0] == 361 && block[7] == 368);
+    const auto resumed = stall.deviceMetrics(stalled);
+    assert(resumed.overrunCount == 1 && resumed.overrunFrames == 360);
+
+    // Pulling again, it holds the writer back as before.
+    assert(stall.pushPcm16(stream.data() + 720, 100) == 8);
+
+    return 0;
+}
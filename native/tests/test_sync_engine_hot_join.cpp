@@ -0,0 +1,263 @@
+#include "multiconnect/sync_engine.h"
+
+#include <atomic>
+#include <cassert>
+#include <cstdint>
+#include <string>
+#include <thread>
+#include <vector>
+
+namespace {
+
+multiconnect::SyncEngine makeConcurrentEngine(std::size_t capacity, std::size_t maxDevices = multiconnect::kDefaultMaxDevices) {
+    multiconnect::SyncEngineConfig config;
+    config.masterCapacitySamples = capacity;
+    config.mode = multiconnect::SyncEngineMode::kConcurrent;
+    config.maxDevices = maxDevices;
+    return multiconnect::SyncEngine(config);
+}
+
+void push(multiconnect::SyncEngine& engine, int64_t& next, std::size_t frames) {
+    std::vector<int16_t> block(frames);
+    for (auto& sample : block) {
+        sample = static_cast<int16_t>(next++ & 0x7FFF);
+    }
+    assert(engine.pushPcm16(block.data(), block.size()) == frames);
+}
+
+void testRejoinRestoresCalibrationAndLag() {
+    auto engine = makeConcurrentEngine(4096);
+    int64_t next = 0;
+    const auto anchor = engine.registerDevice("anchor");
+    const auto speaker = engine.registerDevice("speaker", -200);
+    assert(engine.setDeviceRateCorrectionPpm(speaker, 40.0F));
+    assert(engine.setDeviceGainDb(speaker, -6.0F));
+    assert(engine.setDeviceSoftClip(speaker, true));
+
+    std::vector<int16_t> out(256);
+    push(engine, next, 1024);
+    assert(engine.pullForDevice(anchor, out.data(), out.size()));
+    assert(engine.pullForDevice(speaker, out.data(), out.size()));
+    const int64_t lag = engine.deviceMetrics(speaker).lagFrames;
+    assert(lag > 0);
+
+    // The speaker drops out while the stream carries on.
+    assert(engine.unregisterDevice("speaker"));
+    assert(!engine.hasDevice("speaker") && engine.deviceCount() == 1);
+    assert(!engine.pullForDevice(speaker, out.data(), out.size()));
+    for (int i = 0; i < 4; ++i) {
+        push(engine, next, 256);
+        assert(engine.pullForDevice(anchor, out.data(), out.size()));
+    }
+
+    const auto back = engine.rejoinDevice("speaker");
+    assert(back && engine.deviceId(back) == "speaker" && engine.deviceCount() == 2);
+    const multiconnect::DeviceStreamState state = engine.deviceState(back);
+    assert(state.offsetSamples == -200);
+    assert(state.rateCorrectionPpm == 40.0F);
+    assert(state.gainDb == -6.0F && state.softClip);
+    assert(static_cast<int64_t>(state.readHead) + state.offsetSamples == next - lag);
+    // Calibration state is handed back once; a second leave parks it again.
+    assert(!engine.rejoinDevice("speaker"));
+    assert(engine.unregisterDevice(back));
+    assert(engine.rejoinDevice("speaker"));
+
+    // Nothing kept: a plain registration at the write position.
+    const auto stranger = engine.rejoinDevice("stranger");
+    assert(stranger);
+    assert(engine.deviceState(stranger).readHead == static_cast<std::size_t>(next));
+    assert(engine.deviceState(stranger).offsetSamples == 0);
+}
+
+void testParkedStateIsBounded() {
+    auto engine = makeConcurrentEngine(1024, 2);
+    for (int i = 0; i < 3; ++i) {
+        const std::string id = "device-" + std::to_string(i);
+        const auto handle = engine.registerDevice(id, -10 * (i + 1));
+        assert(handle && engine.unregisterDevice(handle));
+    }
+    // Only the two most recent leaves are remembered.
+    assert(engine.deviceState(engine.rejoinDevice("device-0")).offsetSamples == 0);
+    assert(engine.deviceState(engine.rejoinDevice("device-2")).offsetSamples == -30);
+}
+
+void testLeftStereoSlotKeepsItsColumnsUntilDrained() {
+    multiconnect::SyncEngineConfig config;
+    config.masterCapacitySamples = 1024;
+    config.mode = multiconnect::SyncEngineMode::kConcurrent;
+    config.format.channels = 2;
+    multiconnect::SyncEngine engine(config);
+    const auto stereo = engine.registerDevice("stereo");
+    const auto mono = engine.registerDevice("mono", 0, {multiconnect::DeviceChannelLayout::kDownmixMono});
+    assert(engine.deviceOutputChannels(stereo) == 2);
+    assert(engine.unregisterDevice(stereo));
+    // Once left, the slot's handle is an unknown handle with a single silent column.
+    assert(engine.deviceOutputChannels(stereo) == 0);
+    const std::vector<multiconnect::DeviceHandle> handles{stereo, mono};
+    std::vector<int16_t> out(2 * 16, 7);
+    assert(engine.pullAllInterleaved(handles.data(), handles.size(), out.data(), 16) == 1);
+    assert(engine.rejoinDevice("stereo").index == stereo.index && engine.deviceOutputChannels(stereo) == 2);
+}
+
+// Speakers keep dropping out and reconnecting while the capture thread pushes and two steady
+// speakers play a gapless stream. Build with -DMC_ENABLE_TSAN=ON to run this under ThreadSanitizer.
+void testJoinAndLeaveWhileStreaming() {
+    constexpr std::size_t kTotalSamples = 1 << 19;
+    auto engine = makeConcurrentEngine(4096);
+    assert(engine.registerDevice("steady-0"));
+    assert(engine.registerDevice("steady-1"));
+
+    std::atomic<bool> failed{false};
+    std::atomic<bool> streaming{true};
+    std::thread writer([&] {
+        std::vector<int16_t> block(331);
+        std::size_t pushed = 0;
+        while (pushed < kTotalSamples) {
+            const std::size_t want = std::min(block.size(), kTotalSamples - pushed);
+            for (std::size_t i = 0; i < want; ++i) {
+                block[i] = static_cast<int16_t>((pushed + i) & 0x7FFF);
+            }
+            const std::size_t accepted = engine.pushPcm16(block.data(), want);
+            pushed += accepted;
+            if (accepted < want) {
+                std::this_thread::yield();
+            }
+        }
+    });
+
+    std::vector<std::thread> steady;
+    for (int r = 0; r < 2; ++r) {
+        steady.emplace_back([&, r] {
+            // String-keyed pulls scan the device table while it changes underneath.
+            const std::string deviceId = "steady-" + std::to_string(r);
+            std::vector<int16_t> out(128 + r * 37);
+            std::size_t consumed = 0;
+            while (consumed < kTotalSamples) {
+                std::size_t read = 0;
+                if (!engine.pullForDevice(deviceId, out.data(), out.size(), &read)) {
+                    failed = true;
+                    return;
+                }
+                for (std::size_t i = 0; i < read; ++i) {
+                    if (out[i] != static_cast<int16_t>((consumed + i) & 0x7FFF)) {
+                        failed = true;
+                        return;
+                    }
+                }
+                consumed += read;
+                if (read == 0) {
+                    std::this_thread::yield();
+                }
+            }
+        });
+    }
+
+    // Each flaky speaker's output thread pulls whatever handle it currently has; its control
+    // thread drops and reconnects it.
+    constexpr int kFlaky = 3;
+    std::vector<std::atomic<int32_t>> flakyHandles(kFlaky);
+    std::vector<std::thread> flakyReaders;
+    for (int f = 0; f < kFlaky; ++f) {
+        flakyHandles[f] = engine.registerDevice("flaky-" + std::to_string(f)).index;
+        flakyReaders.emplace_back([&, f] {
+            std::vector<int16_t> out(2 * 96);
+            while (streaming.load()) {
+                const multiconnect::DeviceHandle handle{flakyHandles[f].load()};
+                if (f == 0) {
+                    const multiconnect::DeviceHandle both[] = {handle, handle};
+                    engine.pullAllInterleaved(both, 2, out.data(), 96);
+                } else {
+                    engine.pullForDevice(handle, out.data(), 96);
+                }
+                std::this_thread::yield();
+            }
+        });
+    }
+
+    std::thread control([&] {
+        std::size_t round = 0;
+        while (streaming.load()) {
+            const int f = static_cast<int>(round++ % kFlaky);
+            const std::string id = "flaky-" + std::to_string(f);
+            if (!engine.unregisterDevice(id)) {
+                failed = true;
+                return;
+            }
+            // UI-style polling in the middle of the churn.
+            if (engine.engineMetrics().deviceCount > 2 + kFlaky || engine.deviceOffsets().size() > 2 + kFlaky) {
+                failed = true;
+                return;
+            }
+            const auto handle = engine.rejoinDevice(id);
+            if (!handle) {
+                failed = true;
+                return;
+            }
+            flakyHandles[f] = handle.index;
+        }
+    });
+
+    writer.join();
+    for (auto& thread : steady) {
+        thread.join();
+    }
+    streaming = false;
+    control.join();
+    for (auto& thread : flakyReaders) {
+        thread.join();
+    }
+    assert(!failed);
+    assert(engine.deviceCount() == 2 + kFlaky);
+}
+
+// A speaker registered behind the write position while a push is under way must not be handed
+// frames that push goes on to overwrite.
+void testJoinBehindTheWriterDuringAPush() {
+    constexpr int kRounds = 2000;
+    auto engine = makeConcurrentEngine(4096);
+
+    std::atomic<bool> streaming{true};
+    std::thread writer([&] {
+        std::vector<int16_t> block(3000);
+        std::size_t pushed = 0;
+        while (streaming.load()) {
+            for (std::size_t i = 0; i < block.size(); ++i) {
+                block[i] = static_cast<int16_t>((pushed + i) & 0x7FFF);
+            }
+            pushed += engine.pushPcm16(block.data(), block.size());
+            std::this_thread::yield();
+        }
+    });
+
+    bool failed = false;
+    // Far enough in that the late speaker's start is real audio rather than silence before the stream.
+    while (engine.engineMetrics().framesWritten < 4096) {
+        std::this_thread::yield();
+    }
+    std::vector<int16_t> out(2048);
+    for (int round = 0; round < kRounds && !failed; ++round) {
+        const auto handle = engine.registerDevice("late", -3000);
+        std::size_t read = 0;
+        failed = !handle || !engine.pullForDevice(handle, out.data(), out.size(), &read) ||
+                 engine.deviceMetrics(handle).overrunCount != 0;
+        for (std::size_t i = 1; i < read && !failed; ++i) {
+            failed = out[i] != static_cast<int16_t>((out[0] + i) & 0x7FFF);
+        }
+        failed = !engine.unregisterDevice(handle) || failed;
+    }
+
+    streaming = false;
+    writer.join();
+    assert(!failed);
+}
+
+}  // namespace
+
+int main() {
+    testRejoinRestoresCalibrationAndLag();
+    testParkedStateIsBounded();
+    testLeftStereoSlotKeepsItsColumnsUntilDrained();
+    testJoinAndLeaveWhileStreaming();
+    testJoinBehindTheWriterDuringAPush();
+    return 0;
+}
@@ -0,0 +1,38 @@
+"""Python bindings for the MultiConnect native sync engine (libmulticonnect_core)."""
+
+from ._native import load_library
+from .calibration import DeviceCalibration, read_calibration_store, write_calibration_store
+from .hardware_matrix import (
+    CombinationForecast,
+    HardwareMatrix,
+    SpeakerModelStats,
+    fit_speaker_models,
+    forecast_combination,
+    load_hardware_matrix,
+    rank_combinations,
+)
+from .offset_estimator import OffsetEstimate, gcc_phat
+from .run_records import RUN_RECORD_DTYPE, load_run_records
+from .sync_engine import DeviceMetrics, EngineMetrics, SyncEngine, corrections_per_minute
+
+__all__ = [
+    "CombinationForecast",
+    "DeviceCalibration",
+    "DeviceMetrics",
+    "EngineMetrics",
+    "HardwareMatrix",
+    "OffsetEstimate",
+    "RUN_RECORD_DTYPE",
+    "SpeakerModelStats",
+    "SyncEngine",
+    "corrections_per_minute",
+    "fit_speaker_models",
+    "forecast_combination",
+    "gcc_phat",
+    "load_hardware_matrix",
+    "load_library",
+    "load_run_records",
+    "rank_combinations",
+    "read_calibration_store",
+    "write_calibration_store",
+]
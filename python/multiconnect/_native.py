@@ -0,0 +1,223 @@
+"""ctypes declarations for native/include/multiconnect/sync_engine_c_api.h."""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import os
+from pathlib import Path
+import sys
+
+LIBRARY_ENV = "MULTICONNECT_CORE_LIB"
+
+MODE_SINGLE_THREADED = 0
+MODE_CONCURRENT = 1
+
+PCM_ENCODING_PCM16 = 0
+PCM_ENCODING_FLOAT = 1
+
+DEVICE_CHANNELS_ALL = 0
+DEVICE_CHANNELS_DOWNMIX_MONO = 1
+DEVICE_CHANNELS_SINGLE = 2
+
+INVALID_DEVICE_HANDLE = -1
+# MC_MAX_DEVICES: the most devices an engine holds, all of which fit one interleaved pull.
+MAX_INTERLEAVED_DEVICES = 32
+DEVICE_ID_BYTES = 128
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+class MC_SyncEngineConfig(ctypes.Structure):
+    _fields_ = [
+        ("master_capacity_samples", ctypes.c_size_t),
+        ("max_correction_samples_per_call", ctypes.c_int32),
+        ("mode", ctypes.c_int32),
+        ("max_devices", ctypes.c_size_t),
+        ("max_slew_ppm", ctypes.c_float),
+        ("channels", ctypes.c_int32),
+        ("encoding", ctypes.c_int32),
+        ("gain_ramp_frames", ctypes.c_size_t),
+        ("sample_rate_hz", ctypes.c_int32),
+    ]
+
+
+class MC_DeviceOffset(ctypes.Structure):
+    _fields_ = [
+        ("device_id", ctypes.c_char * DEVICE_ID_BYTES),
+        ("offset_samples", ctypes.c_int32),
+    ]
+
+
+class MC_EngineMetrics(ctypes.Structure):
+    _fields_ = [
+        ("timestamp_ns", ctypes.c_int64),
+        ("frames_written", ctypes.c_uint64),
+        ("dropped_frames", ctypes.c_uint64),
+        ("dropped_push_count", ctypes.c_uint64),
+        ("underrun_count", ctypes.c_uint64),
+        ("overrun_count", ctypes.c_uint64),
+        ("correction_count", ctypes.c_uint64),
+        ("buffer_fill_percent", ctypes.c_double),
+        ("device_count", ctypes.c_size_t),
+    ]
+
+
+class MC_DeviceMetrics(ctypes.Structure):
+    _fields_ = [
+        ("device_handle", ctypes.c_int32),
+        ("device_id", ctypes.c_char * DEVICE_ID_BYTES),
+        ("lag_frames", ctypes.c_int64),
+        ("frames_read", ctypes.c_uint64),
+        ("underrun_count", ctypes.c_uint64),
+        ("underrun_frames", ctypes.c_uint64),
+        ("overrun_count", ctypes.c_uint64),
+        ("overrun_frames", ctypes.c_uint64),
+        ("correction_count", ctypes.c_uint64),
+    ]
+
+
+_engine_p = ctypes.c_void_p
+_int16_p = ctypes.POINTER(ctypes.c_int16)
+_float_p = ctypes.POINTER(ctypes.c_float)
+_size_p = ctypes.POINTER(ctypes.c_size_t)
+
+_PROTOTYPES = {
+    "mc_sync_engine_create_with_config": (_engine_p, [ctypes.POINTER(MC_SyncEngineConfig)]),
+    "mc_sync_engine_destroy": (None, [_engine_p]),
+    "mc_sync_engine_unregister_device": (ctypes.c_int, [_engine_p, ctypes.c_char_p]),
+    "mc_sync_engine_rejoin_device": (ctypes.c_int32, [_engine_p, ctypes.c_char_p]),
+    "mc_sync_engine_register_device_channels": (
+        ctypes.c_int32,
+        [_engine_p, ctypes.c_char_p, ctypes.c_int32, ctypes.c_int32, ctypes.c_int32],
+    ),
+    "mc_sync_engine_register_device_at_time": (
+        ctypes.c_int32,
+        [_engine_p, ctypes.c_char_p, ctypes.c_int64, ctypes.c_int64, ctypes.c_int32, ctypes.c_int32],
+    ),
+    "mc_sync_engine_device_handle": (ctypes.c_int32, [_engine_p, ctypes.c_char_p]),
+    "mc_sync_engine_device_output_channels": (ctypes.c_size_t, [_engine_p, ctypes.c_int32]),
+    "mc_sync_engine_push_pcm16": (ctypes.c_size_t, [_engine_p, _int16_p, ctypes.c_size_t]),
+    "mc_sync_engine_push_pcm_float": (ctypes.c_size_t, [_engine_p, _float_p, ctypes.c_size_t]),
+    "mc_sync_engine_push_pcm16_at": (ctypes.c_size_t, [_engine_p, _int16_p, ctypes.c_size_t, ctypes.c_int64]),
+    "mc_sync_engine_push_pcm_float_at": (ctypes.c_size_t, [_engine_p, _float_p, ctypes.c_size_t, ctypes.c_int64]),
+    "mc_sync_engine_stream_index_at_time": (ctypes.c_int, [_engine_p, ctypes.c_int64, ctypes.POINTER(ctypes.c_int64)]),
+    "mc_sync_engine_presentation_time_ns": (ctypes.c_int, [_engine_p, ctypes.c_int64, ctypes.POINTER(ctypes.c_int64)]),
+    "mc_sync_engine_device_presentation_time_ns": (
+        ctypes.c_int,
+        [_engine_p, ctypes.c_int32, ctypes.POINTER(ctypes.c_int64)],
+    ),
+    "mc_sync_engine_pull_for_handle": (
+        ctypes.c_int,
+        [_engine_p, ctypes.c_int32, _int16_p, ctypes.c_size_t, _size_p],
+    ),
+    "mc_sync_engine_pull_all_interleaved": (
+        ctypes.c_size_t,
+        [
+            _engine_p,
+            ctypes.POINTER(ctypes.c_int32),
+            ctypes.c_size_t,
+            _int16_p,
+            ctypes.c_size_t,
+            ctypes.c_size_t,
+            _size_p,
+            ctypes.POINTER(ctypes.c_int),
+        ],
+    ),
+    "mc_sync_engine_set_handle_offset_samples": (ctypes.c_int, [_engine_p, ctypes.c_int32, ctypes.c_int32]),
+    "mc_sync_engine_align_handle_to_time": (ctypes.c_int, [_engine_p, ctypes.c_int32, ctypes.c_int64, ctypes.c_int64]),
+    "mc_sync_engine_apply_handle_drift_correction_ms": (
+        ctypes.c_int,
+        [_engine_p, ctypes.c_int32, ctypes.c_float, ctypes.c_int32],
+    ),
+    "mc_sync_engine_set_handle_rate_correction_ppm": (ctypes.c_int, [_engine_p, ctypes.c_int32, ctypes.c_float]),
+    "mc_sync_engine_slew_handle_drift_correction_ms": (
+        ctypes.c_int,
+        [_engine_p, ctypes.c_int32, ctypes.c_float, ctypes.c_int32],
+    ),
+    "mc_sync_engine_set_handle_gain_db": (ctypes.c_int, [_engine_p, ctypes.c_int32, ctypes.c_float]),
+    "mc_sync_engine_set_handle_soft_clip": (ctypes.c_int, [_engine_p, ctypes.c_int32, ctypes.c_int]),
+    "mc_sync_engine_apply_calibration_file": (ctypes.c_size_t, [_engine_p, ctypes.c_char_p, ctypes.c_int32]),
+    "mc_sync_engine_device_count": (ctypes.c_size_t, [_engine_p]),
+    "mc_sync_engine_get_device_offsets": (
+        ctypes.c_size_t,
+        [_engine_p, ctypes.POINTER(MC_DeviceOffset), ctypes.c_size_t],
+    ),
+    "mc_sync_engine_reset_all_device_offsets": (ctypes.c_size_t, [_engine_p, ctypes.c_int32]),
+    "mc_sync_engine_resize_ring": (ctypes.c_int, [_engine_p, ctypes.c_size_t]),
+    "mc_sync_engine_master_capacity_samples": (ctypes.c_size_t, [_engine_p]),
+    "mc_sync_engine_get_metrics": (
+        ctypes.c_size_t,
+        [_engine_p, ctypes.POINTER(MC_EngineMetrics), ctypes.POINTER(MC_DeviceMetrics), ctypes.c_size_t],
+    ),
+    "mc_estimate_offset_gcc_phat": (
+        ctypes.c_int,
+        [
+            ctypes.POINTER(ctypes.c_int16),
+            ctypes.c_size_t,
+            ctypes.POINTER(ctypes.c_int16),
+            ctypes.c_size_t,
+            ctypes.c_size_t,
+            ctypes.POINTER(ctypes.c_double),
+            ctypes.POINTER(ctypes.c_double),
+        ],
+    ),
+}
+
+_loaded: ctypes.CDLL | None = None
+
+
+def _library_file_name() -> str:
+    if sys.platform == "darwin":
+        return "libmulticonnect_core.dylib"
+    if sys.platform == "win32":
+        return "multiconnect_core.dll"
+    return "libmulticonnect_core.so"
+
+
+def candidate_paths() -> list[Path]:
+    """Where load_library() looks when no explicit path is given, in order."""
+    paths: list[Path] = []
+    override = os.environ.get(LIBRARY_ENV)
+    if override:
+        paths.append(Path(override))
+    name = _library_file_name()
+    for build_dir in ("build", "build-release"):
+        paths.append(REPO_ROOT / "native" / build_dir / name)
+    return paths
+
+
+def load_library(path: str | os.PathLike[str] | None = None) -> ctypes.CDLL:
+    """Load libmulticonnect_core (built by native/CMakeLists.txt) and declare its prototypes.
+
+    Without `path`, tries $MULTICONNECT_CORE_LIB, then native/build and native/build-release, then the
+    system loader path. The first successfully loaded library is cached for later calls.
+    """
+    global _loaded
+    if path is None and _loaded is not None:
+        return _loaded
+
+    if path is not None:
+        library = ctypes.CDLL(str(path))
+    else:
+        found = next((candidate for candidate in candidate_paths() if candidate.is_file()), None)
+        if found is None:
+            system_name = ctypes.util.find_library("multiconnect_core")
+            if system_name is None:
+                searched = ", ".join(str(candidate) for candidate in candidate_paths())
+                raise OSError(
+                    f"libmulticonnect_core not found (searched {searched}); build it with "
+                    f"`cmake -S native -B native/build && cmake --build native/build` or set {LIBRARY_ENV}"
+                )
+            library = ctypes.CDLL(system_name)
+        else:
+            library = ctypes.CDLL(str(found))
+
+    for name, (restype, argtypes) in _PROTOTYPES.items():
+        function = getattr(library, name)
+        function.restype = restype
+        function.argtypes = argtypes
+
+    if path is None:
+        _loaded = library
+    return library
@@ -0,0 +1,92 @@
+"""Reader and writer for the native calibration store (native/include/multiconnect/calibration_store.h).
+
+The file is little-endian throughout. A 16-byte header ("MCCB", u16 version, u16 record size,
+u32 count, u32 key bytes) is followed by fixed 40-byte records sorted by the 64-bit FNV-1a hash of
+the key, then the concatenated key bytes. SyncEngine.apply_calibration_file loads it natively.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import struct
+from typing import Mapping
+
+_MAGIC = b"MCCB"
+_VERSION = 1
+_HEADER = struct.Struct("<4sHHII")
+_RECORD = struct.Struct("<QIIiffffI")
+
+
+@dataclass(frozen=True)
+class DeviceCalibration:
+    # User-dialled offset on top of the latency alignment; positive plays the device earlier.
+    manual_offset_ms: int = 0
+    gain_db: float = 0.0
+    last_measured_drift_ms: float = 0.0
+    # Fitted playback clock error: positive runs fast.
+    drift_ppm: float = 0.0
+    latency_ms: float = 0.0
+
+
+def calibration_key_hash(key: str) -> int:
+    value = 0xCBF29CE484222325
+    for byte in key.encode("utf-8"):
+        value = ((value ^ byte) * 0x100000001B3) & 0xFFFFFFFFFFFFFFFF
+    return value
+
+
+def encode_calibrations(calibrations: Mapping[str, DeviceCalibration]) -> bytes:
+    ordered = sorted(
+        ((calibration_key_hash(key), key.encode("utf-8"), value) for key, value in calibrations.items()),
+        key=lambda entry: (entry[0], entry[1]),
+    )
+    keys = b"".join(key for _, key, _ in ordered)
+    records = bytearray(_HEADER.pack(_MAGIC, _VERSION, _RECORD.size, len(ordered), len(keys)))
+    offset = 0
+    for key_hash, key, value in ordered:
+        records += _RECORD.pack(
+            key_hash,
+            offset,
+            len(key),
+            value.manual_offset_ms,
+            value.gain_db,
+            value.last_measured_drift_ms,
+            value.drift_ppm,
+            value.latency_ms,
+            0,
+        )
+        offset += len(key)
+    return bytes(records) + keys
+
+
+def decode_calibrations(data: bytes) -> dict[str, DeviceCalibration]:
+    if len(data) < _HEADER.size:
+        raise ValueError("calibration store is truncated")
+    magic, version, record_bytes, count, key_bytes = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("not a version 1 calibration store")
+    if record_bytes < _RECORD.size or _HEADER.size + count * record_bytes + key_bytes != len(data):
+        raise ValueError("calibration store size does not match its header")
+
+    keys_start = _HEADER.size + count * record_bytes
+    result: dict[str, DeviceCalibration] = {}
+    for i in range(count):
+        key_hash, offset, length, manual, gain, last_drift, ppm, latency, _ = _RECORD.unpack_from(
+            data, _HEADER.size + i * record_bytes
+        )
+        if offset + length > key_bytes:
+            raise ValueError(f"calibration record {i} points outside the key table")
+        key = data[keys_start + offset : keys_start + offset + length].decode("utf-8")
+        if key_hash != calibration_key_hash(key):
+            raise ValueError(f"calibration record {i} hash does not match key {key!r}")
+        result[key] = DeviceCalibration(manual, gain, last_drift, ppm, latency)
+    return result
+
+
+def write_calibration_store(path: str | Path, calibrations: Mapping[str, DeviceCalibration]) -> None:
+    Path(path).write_bytes(encode_calibrations(calibrations))
+
+
+def read_calibration_store(path: str | Path) -> dict[str, DeviceCalibration]:
+    return decode_calibrations(Path(path).read_bytes())
@@ -0,0 +1,229 @@
+"""Hardware-matrix analytics: per-speaker-model drift fits and speaker-combination forecasts.
+
+Loads docs/hardware-matrix-template.csv (or a fleet export with the same columns) in one pass into
+NumPy columns. Every run contributes two drift samples, at 30 and 120 minutes. Each speaker model
+then gets a drift rate from a least-squares line through the origin, fitted with grouped sums rather
+than a per-model loop, so tens of thousands of rows cost a few milliseconds. Drift is in milliseconds
+of the speaker's playback relative to the phone clock: positive means the speaker runs ahead.
+"""
+
+from __future__ import annotations
+
+import csv
+from dataclasses import dataclass
+from itertools import combinations
+import math
+from pathlib import Path
+from typing import Iterable, Sequence
+
+import numpy as np
+
+_DRIFT_SAMPLE_HOURS = (0.5, 2.0)
+_MATRIX_SESSION_HOURS = 2.0
+_REQUIRED_COLUMNS = (
+    "speaker_brand",
+    "speaker_model",
+    "signal_strength_dbm",
+    "observed_latency_ms",
+    "drift_after_30m_ms",
+    "drift_after_120m_ms",
+    "dropouts_count",
+)
+
+
+@dataclass(frozen=True)
+class HardwareMatrix:
+    """Matrix rows as NumPy columns; rows with a missing or non-numeric measurement are skipped."""
+
+    # "<brand> <model>" per row.
+    speaker: np.ndarray
+    signal_strength_dbm: np.ndarray
+    latency_ms: np.ndarray
+    drift_30m_ms: np.ndarray
+    drift_120m_ms: np.ndarray
+    dropouts: np.ndarray
+    skipped_rows: int = 0
+
+    def __len__(self) -> int:
+        return int(self.speaker.size)
+
+
+@dataclass(frozen=True)
+class SpeakerModelStats:
+    """Per-speaker-model fits, one array element per model (sorted by name)."""
+
+    models: np.ndarray
+    runs: np.ndarray
+    drift_ms_per_hour: np.ndarray
+    # Standard error of the drift rate: 0 when every sample sits on the fitted line.
+    drift_stderr_ms_per_hour: np.ndarray
+    latency_ms: np.ndarray
+    latency_std_ms: np.ndarray
+    dropouts_per_hour: np.ndarray
+    signal_strength_dbm: np.ndarray
+
+    @property
+    def drift_ppm(self) -> np.ndarray:
+        # 1 ms per hour is 1 / 3.6 ppm.
+        return self.drift_ms_per_hour / 3.6
+
+    def index(self, model: str) -> int:
+        position = int(np.searchsorted(self.models, model))
+        if position >= self.models.size or self.models[position] != model:
+            raise KeyError(f"speaker model not in hardware matrix: {model}")
+        return position
+
+
+@dataclass(frozen=True)
+class CombinationForecast:
+    models: tuple[str, ...]
+    # Delay to add to each speaker so all start aligned with the highest-latency one.
+    initial_offsets_ms: tuple[float, ...]
+    # Drift each speaker accumulates over the session and has to be corrected away, in ms.
+    correction_budget_ms: tuple[float, ...]
+    # Step corrections per hour each speaker needs to stay within the tolerance.
+    corrections_per_hour: tuple[float, ...]
+    # Rate bend a slewing corrector needs (compare with SyncEngineConfig::maxSlewPpm).
+    required_slew_ppm: float
+    # Worst pairwise desync over the session with no correction, plus twice the fit uncertainty.
+    # Lower is more stable; rank_combinations sorts by it.
+    expected_desync_ms: float
+    dropouts_per_hour: float
+
+
+def _parse_float(text: str) -> float:
+    try:
+        return float(text)
+    except ValueError:
+        return math.nan
+
+
+def load_hardware_matrix(path: str | Path) -> HardwareMatrix:
+    with Path(path).open(newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        missing = [name for name in _REQUIRED_COLUMNS if name not in header]
+        if missing:
+            raise ValueError(f"hardware matrix {path} is missing columns: {', '.join(missing)}")
+        brand, model, *numeric = (header.index(name) for name in _REQUIRED_COLUMNS)
+        width = max(brand, model, *numeric) + 1
+
+        speakers: list[str] = []
+        values: list[list[float]] = []
+        for row in reader:
+            if len(row) < width or not any(cell.strip() for cell in row):
+                continue
+            speakers.append(f"{row[brand].strip()} {row[model].strip()}")
+            values.append([_parse_float(row[column]) for column in numeric])
+
+    table = np.array(values, dtype=np.float64).reshape(-1, len(_REQUIRED_COLUMNS) - 2)
+    valid = np.isfinite(table).all(axis=1)
+    table = table[valid]
+    return HardwareMatrix(
+        speaker=np.array(speakers, dtype=object)[valid],
+        signal_strength_dbm=table[:, 0],
+        latency_ms=table[:, 1],
+        drift_30m_ms=table[:, 2],
+        drift_120m_ms=table[:, 3],
+        dropouts=table[:, 4],
+        skipped_rows=int((~valid).sum()),
+    )
+
+
+def fit_speaker_models(matrix: HardwareMatrix) -> SpeakerModelStats:
+    models, group = np.unique(matrix.speaker.astype(str), return_inverse=True)
+    count = models.size
+
+    def per_model(weights: np.ndarray) -> np.ndarray:
+        return np.bincount(group, weights=weights, minlength=count)
+
+    runs = per_model(np.ones(len(matrix)))
+    t30, t120 = _DRIFT_SAMPLE_HOURS
+    # Least squares through the origin: rate = sum(t * d) / sum(t^2) over both samples of every run.
+    sum_tt = runs * (t30 * t30 + t120 * t120)
+    sum_td = per_model(t30 * matrix.drift_30m_ms + t120 * matrix.drift_120m_ms)
+    rate = sum_td / sum_tt
+    sum_dd = per_model(matrix.drift_30m_ms**2 + matrix.drift_120m_ms**2)
+    residual = np.maximum(sum_dd - rate * sum_td, 0.0)
+    degrees = np.maximum(2.0 * runs - 1.0, 1.0)
+    stderr = np.sqrt(residual / degrees / sum_tt)
+
+    latency = per_model(matrix.latency_ms) / runs
+    latency_var = np.maximum(per_model(matrix.latency_ms**2) / runs - latency**2, 0.0)
+
+    return SpeakerModelStats(
+        models=models,
+        runs=runs.astype(np.int64),
+        drift_ms_per_hour=rate,
+        drift_stderr_ms_per_hour=stderr,
+        latency_ms=latency,
+        latency_std_ms=np.sqrt(latency_var),
+        dropouts_per_hour=per_model(matrix.dropouts) / (runs * _MATRIX_SESSION_HOURS),
+        signal_strength_dbm=per_model(matrix.signal_strength_dbm) / runs,
+    )
+
+
+def _forecast_arrays(
+    stats: SpeakerModelStats, combos: np.ndarray, session_hours: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """Expected desync (ms) and summed dropouts per hour for each row of model indices."""
+    rates = stats.drift_ms_per_hour[combos]
+    spread = (rates.max(axis=1) - rates.min(axis=1)) * session_hours
+    rate_uncertainty = np.sqrt((stats.drift_stderr_ms_per_hour[combos] ** 2).sum(axis=1)) * session_hours
+    latency_uncertainty = np.sqrt((stats.latency_std_ms[combos] ** 2).sum(axis=1))
+    desync = spread + 2.0 * (rate_uncertainty + latency_uncertainty)
+    return desync, stats.dropouts_per_hour[combos].sum(axis=1)
+
+
+def forecast_combination(
+    stats: SpeakerModelStats,
+    models: Sequence[str],
+    session_hours: float = 2.0,
+    tolerance_ms: float = 5.0,
+) -> CombinationForecast:
+    """Initial offsets, correction budget and expected stability for playing `models` together."""
+    indices = np.array([stats.index(model) for model in models], dtype=np.int64)
+    if indices.size == 0:
+        raise ValueError("a combination needs at least one speaker model")
+    latency = stats.latency_ms[indices]
+    rates = np.abs(stats.drift_ms_per_hour[indices])
+    desync, dropouts = _forecast_arrays(stats, indices[np.newaxis, :], session_hours)
+    return CombinationForecast(
+        models=tuple(models),
+        initial_offsets_ms=tuple((latency.max() - latency).tolist()),
+        correction_budget_ms=tuple((rates * session_hours).tolist()),
+        corrections_per_hour=tuple((rates / tolerance_ms if tolerance_ms > 0 else np.full_like(rates, np.inf)).tolist()),
+        required_slew_ppm=float(np.abs(stats.drift_ppm[indices]).max()),
+        expected_desync_ms=float(desync[0]),
+        dropouts_per_hour=float(dropouts[0]),
+    )
+
+
+def rank_combinations(
+    stats: SpeakerModelStats,
+    size: int = 2,
+    session_hours: float = 2.0,
+    tolerance_ms: float = 5.0,
+    top: int | None = 10,
+    models: Iterable[str] | None = None,
+) -> list[CombinationForecast]:
+    """Score every `size`-speaker combination at once and return the most stable first.
+
+    Ties on expected desync are broken by fewer dropouts per hour. `models` limits the candidates.
+    """
+    candidates = (
+        np.arange(stats.models.size)
+        if models is None
+        else np.array(sorted({stats.index(model) for model in models}), dtype=np.int64)
+    )
+    if size < 1 or size > candidates.size:
+        return []
+    combos = np.array(list(combinations(candidates.tolist(), size)), dtype=np.int64).reshape(-1, size)
+    desync, dropouts = _forecast_arrays(stats, combos, session_hours)
+    order = np.lexsort((dropouts, desync))
+    if top is not None:
+        order = order[:top]
+    return [
+        forecast_combination(stats, [str(stats.models[i]) for i in combos[row]], session_hours, tolerance_ms)
+        for row in order
+    ]
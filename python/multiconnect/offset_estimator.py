@@ -0,0 +1,108 @@
+"""GCC-PHAT offset estimation in NumPy, mirroring native/src/offset_estimator.cpp.
+
+Use it on recorded captures (WAV data, mixed speakers, room noise) from analysis scripts without going
+through the native library; both implementations agree to well under a hundredth of a sample.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+_PHAT_FLOOR = 1e-9
+_REFINE_HALF_WIDTH = 16
+_REFINE_ITERATIONS = 40
+_INV_PHI = 0.6180339887498949
+
+
+@dataclass(frozen=True)
+class OffsetEstimate:
+    # How much later the reference content appears in the capture, in (fractional) samples.
+    lag_samples: float
+    # Correlation peak height: 1 for an exact shifted copy, toward 0 with noise and reverberation.
+    peak: float
+    valid: bool
+
+
+def _next_power_of_two(value: int) -> int:
+    return 1 << max(value - 1, 0).bit_length()
+
+
+def gcc_phat(reference: Any, capture: Any, max_lag: int | None = None) -> OffsetEstimate:
+    """Estimate the delay of `capture` relative to `reference` with GCC-PHAT in O(n log n).
+
+    Both inputs are 1-D sample arrays (any numeric dtype). `max_lag` bounds the searched |lag| in
+    samples, which also bounds the FFT size for long captures; 0 searches only lag 0 and None
+    leaves the search unbounded.
+    """
+    if max_lag is not None and max_lag < 0:
+        raise ValueError(f"max_lag must be non-negative, got {max_lag}")
+    ref = np.asarray(reference, dtype=np.float64).ravel()
+    cap = np.asarray(capture, dtype=np.float64).ravel()
+    if ref.size == 0 or cap.size == 0:
+        return OffsetEstimate(0.0, 0.0, False)
+
+    late_limit = cap.size - 1
+    lead_limit = ref.size - 1
+    if max_lag is not None:
+        late_limit = min(late_limit, max_lag)
+        lead_limit = min(lead_limit, max_lag)
+    n = _next_power_of_two(max(ref.size + late_limit, cap.size + lead_limit))
+
+    cross = np.fft.rfft(cap, n) * np.conj(np.fft.rfft(ref, n))
+    magnitude = np.abs(cross)
+    strongest = magnitude.max()
+    if strongest == 0.0:
+        return OffsetEstimate(0.0, 0.0, False)
+
+    # Phase transform with a raised-cosine taper toward Nyquist (see the native implementation).
+    usable = magnitude > strongest * _PHAT_FLOOR
+    weight = np.where(usable, 0.5 + 0.5 * np.cos(2.0 * np.pi * np.arange(cross.size) / n), 0.0)
+    cross = np.where(usable, cross / np.where(usable, magnitude, 1.0), 0.0) * weight
+    # irfft scales by 1/n; the full (two-sided) weight sum normalizes an exact copy to a peak of 1.
+    full_weight = 2.0 * weight.sum() - weight[0] - (weight[-1] if n % 2 == 0 else 0.0)
+    correlation = np.fft.irfft(cross, n) * (n / full_weight)
+
+    lags = np.arange(-lead_limit, late_limit + 1)
+    values = correlation[lags % n]
+    index = int(np.argmax(values))
+    best_lag = int(lags[index])
+    best = float(values[index])
+
+    fraction = 0.0
+    if 0 < index < values.size - 1:
+        before, after = float(values[index - 1]), float(values[index + 1])
+        curvature = before - 2.0 * best + after
+        if curvature < 0.0:
+            fraction = float(np.clip(0.5 * (before - after) / curvature, -0.5, 0.5))
+
+    if fraction != 0.0:
+        window_lags = np.arange(
+            max(best_lag - _REFINE_HALF_WIDTH, -lead_limit), min(best_lag + _REFINE_HALF_WIDTH + 1, late_limit + 1)
+        )
+        window_values = correlation[window_lags % n]
+
+        def interpolated(lag: float) -> float:
+            x = lag - window_lags
+            taper = np.where(np.abs(x) < _REFINE_HALF_WIDTH, 0.5 + 0.5 * np.cos(np.pi * x / _REFINE_HALF_WIDTH), 0.0)
+            return float(np.sum(window_values * np.sinc(x) * taper))
+
+        low = best_lag + min(fraction, 0.0) - 0.5
+        high = best_lag + max(fraction, 0.0) + 0.5
+        left, right = high - _INV_PHI * (high - low), low + _INV_PHI * (high - low)
+        left_value, right_value = interpolated(left), interpolated(right)
+        for _ in range(_REFINE_ITERATIONS):
+            if left_value < right_value:
+                low, left, left_value = left, right, right_value
+                right = low + _INV_PHI * (high - low)
+                right_value = interpolated(right)
+            else:
+                high, right, right_value = right, left, left_value
+                left = high - _INV_PHI * (high - low)
+                left_value = interpolated(left)
+        fraction = 0.5 * (low + high) - best_lag
+        best = max(best, interpolated(0.5 * (low + high)))
+
+    return OffsetEstimate(best_lag + fraction, best, best > 0.0)
@@ -0,0 +1,87 @@
+"""Memory-mapped access to poc_cli's binary run-record files (native/include/multiconnect/run_record.h).
+
+`poc_cli --record-file <path>` appends one fixed-width 96-byte record per measured device after a
+16-byte header. `load_run_records` maps the file as a NumPy structured array without parsing it, so
+a sweep with millions of measurements opens instantly and filters with ordinary array expressions:
+
+    records = load_run_records("native/build/artifacts/poc_records.bin")
+    failures = records[records["outcome"] == 0]
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+
+HEADER_BYTES = 16
+RECORD_KIND_RUN = 0
+RECORD_KIND_SWEEP = 1
+
+_MAGIC = b"MCRR"
+_VERSION = 1
+
+RUN_RECORD_DTYPE = np.dtype(
+    [
+        ("timestamp_ns", "<i8"),
+        ("case_id", "<u4"),
+        ("trial", "<u4"),
+        ("sample_rate_hz", "<i4"),
+        ("duration_ms", "<i4"),
+        ("requested_offset_ms", "<i4"),
+        ("device_index", "<u2"),
+        ("device_count", "<u2"),
+        ("measured_offset_ms", "<f8"),
+        ("error_ms", "<f8"),
+        ("threshold_ms", "<f8"),
+        ("kind", "u1"),
+        # 1 for PASS, 0 for FAIL.
+        ("outcome", "u1"),
+        ("_reserved", "V6"),
+        # NUL-padded, truncated to 16 bytes.
+        ("device", "S16"),
+        ("notes", "S16"),
+    ]
+)
+
+
+def load_run_records(path: str | Path) -> np.ndarray:
+    """Map every complete record read-only; a torn trailing record is left out."""
+    path = Path(path)
+    with path.open("rb") as handle:
+        header = handle.read(HEADER_BYTES)
+    if (
+        len(header) != HEADER_BYTES
+        or header[:4] != _MAGIC
+        or int.from_bytes(header[4:6], "little") != _VERSION
+        or int.from_bytes(header[6:8], "little") != RUN_RECORD_DTYPE.itemsize
+    ):
+        raise ValueError(f"not a version {_VERSION} run-record file: {path}")
+
+    count = (path.stat().st_size - HEADER_BYTES) // RUN_RECORD_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=RUN_RECORD_DTYPE)
+    return np.memmap(path, dtype=RUN_RECORD_DTYPE, mode="r", offset=HEADER_BYTES, shape=(count,))
+
+
+def record_dicts(records: np.ndarray) -> Iterator[dict[str, Any]]:
+    """Records as JSON-ready dicts using the artifact JSON's field names."""
+    for record in records:
+        yield {
+            "timestampNs": int(record["timestamp_ns"]),
+            "kind": "sweep" if record["kind"] == RECORD_KIND_SWEEP else "run",
+            "caseId": int(record["case_id"]),
+            "trial": int(record["trial"]),
+            "sampleRateHz": int(record["sample_rate_hz"]),
+            "durationMs": int(record["duration_ms"]),
+            "deviceIndex": int(record["device_index"]),
+            "deviceCount": int(record["device_count"]),
+            "device": record["device"].decode("utf-8", "replace"),
+            "requestedOffsetMs": int(record["requested_offset_ms"]),
+            "measuredOffsetMs": float(record["measured_offset_ms"]),
+            "errorFromRequestedMs": float(record["error_ms"]),
+            "thresholdMs": float(record["threshold_ms"]),
+            "outcome": "PASS" if record["outcome"] else "FAIL",
+            "notes": record["notes"].decode("utf-8", "replace"),
+        }
@@ -0,0 +1,381 @@
+"""NumPy-facing wrapper around the MC_SyncEngine C API.
+
+Pushes and pulls hand the native engine a pointer into the caller's array, so a session of any length
+costs one C call per block and no per-sample Python work.
+"""
+
+from __future__ import annotations
+
+import ctypes
+from dataclasses import dataclass
+import os
+from typing import Any, Iterable, Union
+
+import numpy as np
+
+from . import _native
+
+Device = Union[int, str]
+
+_ENCODINGS = {"pcm16": _native.PCM_ENCODING_PCM16, "float": _native.PCM_ENCODING_FLOAT}
+_LAYOUTS = {
+    "all": _native.DEVICE_CHANNELS_ALL,
+    "downmix_mono": _native.DEVICE_CHANNELS_DOWNMIX_MONO,
+    "single": _native.DEVICE_CHANNELS_SINGLE,
+}
+
+
+@dataclass(frozen=True)
+class EngineMetrics:
+    timestamp_ns: int
+    frames_written: int
+    dropped_frames: int
+    dropped_push_count: int
+    underrun_count: int
+    overrun_count: int
+    correction_count: int
+    buffer_fill_percent: float
+    device_count: int
+
+
+@dataclass(frozen=True)
+class DeviceMetrics:
+    device_handle: int
+    device_id: str
+    lag_frames: int
+    frames_read: int
+    underrun_count: int
+    underrun_frames: int
+    overrun_count: int
+    overrun_frames: int
+    correction_count: int
+
+
+def corrections_per_minute(earlier: EngineMetrics, later: EngineMetrics) -> float:
+    """Drift corrections per minute between two snapshots (mirrors multiconnect::correctionsPerMinute)."""
+    minutes = (later.timestamp_ns - earlier.timestamp_ns) / 60e9
+    return (later.correction_count - earlier.correction_count) / minutes if minutes > 0 else 0.0
+
+
+def _pointer(array: np.ndarray, ctype: Any) -> Any:
+    return array.ctypes.data_as(ctypes.POINTER(ctype))
+
+
+def _output_array(out: np.ndarray | None, shape: tuple[int, ...], dtype: Any, name: str) -> np.ndarray:
+    if out is None:
+        return np.zeros(shape, dtype=dtype)
+    if not isinstance(out, np.ndarray) or out.dtype != dtype:
+        raise TypeError(f"{name} must be a numpy.ndarray of {np.dtype(dtype).name}")
+    if not out.flags.c_contiguous or not out.flags.writeable:
+        raise ValueError(f"{name} must be C-contiguous and writeable")
+    if out.size < int(np.prod(shape)):
+        raise ValueError(f"{name} holds {out.size} samples, need {int(np.prod(shape))}")
+    return out
+
+
+class SyncEngine:
+    """One native MC_SyncEngine.
+
+    Counts are frames of `channels` interleaved samples. Devices may be passed as the handle returned by
+    register_device() (cheapest) or by device id.
+    """
+
+    def __init__(
+        self,
+        capacity_frames: int,
+        *,
+        max_correction_samples_per_call: int = 0,
+        concurrent: bool = False,
+        max_devices: int = 0,
+        max_slew_ppm: float = 0.0,
+        channels: int = 1,
+        encoding: str = "pcm16",
+        gain_ramp_frames: int = 0,
+        sample_rate_hz: int = 0,
+        library: str | os.PathLike[str] | None = None,
+    ) -> None:
+        if encoding not in _ENCODINGS:
+            raise ValueError(f"encoding must be one of {sorted(_ENCODINGS)}, got {encoding!r}")
+        if not 0 <= max_devices <= _native.MAX_INTERLEAVED_DEVICES:
+            raise ValueError(f"max_devices must be 0 to {_native.MAX_INTERLEAVED_DEVICES}, got {max_devices}")
+        self._lib = _native.load_library(library)
+        config = _native.MC_SyncEngineConfig(
+            master_capacity_samples=capacity_frames,
+            max_correction_samples_per_call=max_correction_samples_per_call,
+            mode=_native.MODE_CONCURRENT if concurrent else _native.MODE_SINGLE_THREADED,
+            max_devices=max_devices,
+            max_slew_ppm=max_slew_ppm,
+            channels=channels,
+            encoding=_ENCODINGS[encoding],
+            gain_ramp_frames=gain_ramp_frames,
+            sample_rate_hz=sample_rate_hz,
+        )
+        self._engine = self._lib.mc_sync_engine_create_with_config(ctypes.byref(config))
+        if not self._engine:
+            raise MemoryError("mc_sync_engine_create_with_config failed")
+        self.channels = max(channels, 1)
+        self.encoding = encoding
+        self._push_dtype = np.int16 if encoding == "pcm16" else np.float32
+
+    def close(self) -> None:
+        if self._engine:
+            self._lib.mc_sync_engine_destroy(self._engine)
+            self._engine = None
+
+    def __enter__(self) -> SyncEngine:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def __del__(self) -> None:
+        if getattr(self, "_engine", None):
+            self.close()
+
+    @property
+    def _ptr(self) -> Any:
+        if not self._engine:
+            raise ValueError("SyncEngine is closed")
+        return self._engine
+
+    def register_device(self, device_id: str, offset_samples: int = 0, layout: str = "all", channel: int = 0) -> int:
+        """Registers a device and returns its handle; `layout` is all, downmix_mono or single."""
+        if layout not in _LAYOUTS:
+            raise ValueError(f"layout must be one of {sorted(_LAYOUTS)}, got {layout!r}")
+        handle = self._lib.mc_sync_engine_register_device_channels(
+            self._ptr, device_id.encode(), offset_samples, _LAYOUTS[layout], channel
+        )
+        if handle == _native.INVALID_DEVICE_HANDLE:
+            raise ValueError(f"could not register device {device_id!r} (duplicate id, bad channel or engine full)")
+        return handle
+
+    def register_device_at_time(
+        self,
+        device_id: str,
+        pull_time_ns: int,
+        output_latency_ns: int = 0,
+        layout: str = "all",
+        channel: int = 0,
+    ) -> int:
+        """Late join: a device first pulled at `pull_time_ns` plays the frame presented `output_latency_ns` later."""
+        if layout not in _LAYOUTS:
+            raise ValueError(f"layout must be one of {sorted(_LAYOUTS)}, got {layout!r}")
+        handle = self._lib.mc_sync_engine_register_device_at_time(
+            self._ptr, device_id.encode(), pull_time_ns, output_latency_ns, _LAYOUTS[layout], channel
+        )
+        if handle == _native.INVALID_DEVICE_HANDLE:
+            raise ValueError(
+                f"could not register device {device_id!r} "
+                "(no timestamped push yet, duplicate id, bad channel or engine full)"
+            )
+        return handle
+
+    def unregister_device(self, device_id: str) -> bool:
+        return bool(self._lib.mc_sync_engine_unregister_device(self._ptr, device_id.encode()))
+
+    def rejoin_device(self, device_id: str) -> int:
+        """Reconnects a device with the calibration and lag it left with; returns its handle."""
+        handle = self._lib.mc_sync_engine_rejoin_device(self._ptr, device_id.encode())
+        if handle == _native.INVALID_DEVICE_HANDLE:
+            raise ValueError(f"could not rejoin device {device_id!r} (already registered or engine full)")
+        return handle
+
+    def device_handle(self, device_id: str) -> int:
+        handle = self._lib.mc_sync_engine_device_handle(self._ptr, device_id.encode())
+        if handle == _native.INVALID_DEVICE_HANDLE:
+            raise KeyError(device_id)
+        return handle
+
+    def _resolve(self, device: Device) -> int:
+        return self.device_handle(device) if isinstance(device, str) else int(device)
+
+    def _check(self, ok: int, device: Device) -> None:
+        if not ok:
+            raise KeyError(device)
+
+    def output_channels(self, device: Device) -> int:
+        """Interleaved channels per frame in this device's pull output."""
+        channels = self._lib.mc_sync_engine_device_output_channels(self._ptr, self._resolve(device))
+        if channels == 0:
+            raise KeyError(device)
+        return channels
+
+    @property
+    def device_count(self) -> int:
+        return self._lib.mc_sync_engine_device_count(self._ptr)
+
+    @property
+    def capacity_frames(self) -> int:
+        return self._lib.mc_sync_engine_master_capacity_samples(self._ptr)
+
+    def push(self, samples: Any, presentation_time_ns: int | None = None) -> int:
+        """Pushes interleaved frames and returns the number of frames accepted.
+
+        `samples` is any buffer-protocol object (usually a NumPy array) of int16 for pcm16 engines or
+        float32 for float engines, shaped (frames,) / (frames * channels,) / (frames, channels).
+        Contiguous input is passed to the engine without copying. `presentation_time_ns` stamps the first
+        frame with when it should be heard (host monotonic clock), extending the stream timeline.
+        """
+        array = np.asarray(samples)
+        if array.dtype != self._push_dtype:
+            raise TypeError(f"{self.encoding} engine expects {np.dtype(self._push_dtype).name} samples, got {array.dtype}")
+        if array.size % self.channels:
+            raise ValueError(f"{array.size} samples is not a whole number of {self.channels}-channel frames")
+        array = np.ascontiguousarray(array)
+        frames = array.size // self.channels
+        if self._push_dtype is np.int16:
+            if presentation_time_ns is not None:
+                return self._lib.mc_sync_engine_push_pcm16_at(
+                    self._ptr, _pointer(array, ctypes.c_int16), frames, presentation_time_ns
+                )
+            return self._lib.mc_sync_engine_push_pcm16(self._ptr, _pointer(array, ctypes.c_int16), frames)
+        if presentation_time_ns is not None:
+            return self._lib.mc_sync_engine_push_pcm_float_at(
+                self._ptr, _pointer(array, ctypes.c_float), frames, presentation_time_ns
+            )
+        return self._lib.mc_sync_engine_push_pcm_float(self._ptr, _pointer(array, ctypes.c_float), frames)
+
+    def pull(self, device: Device, frames: int, out: np.ndarray | None = None) -> tuple[np.ndarray, int]:
+        """Pulls `frames` frames for one device into `out` (allocated when omitted).
+
+        Returns the output array, shaped (frames,) for mono output or (frames, channels) otherwise, and the
+        number of frames actually read; the tail past that count is zero-filled.
+        """
+        handle = self._resolve(device)
+        channels = self.output_channels(handle)
+        shape = (frames,) if channels == 1 else (frames, channels)
+        out = _output_array(out, shape, np.int16, "out")
+        read = ctypes.c_size_t(0)
+        ok = self._lib.mc_sync_engine_pull_for_handle(
+            self._ptr, handle, _pointer(out, ctypes.c_int16), frames, ctypes.byref(read)
+        )
+        self._check(ok, device)
+        return out, read.value
+
+    def pull_all(
+        self, devices: Iterable[Device], frames: int, out: np.ndarray | None = None
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Pulls every listed device in one native call into a frame-interleaved (frames, columns) array.
+
+        Each device contributes output_channels() adjacent columns. Returns the output, per-device frames
+        read and per-device underrun flags.
+        """
+        handles = np.array([self._resolve(device) for device in devices], dtype=np.int32)
+        if not 0 < handles.size <= _native.MAX_INTERLEAVED_DEVICES:
+            raise ValueError(f"pull_all takes 1 to {_native.MAX_INTERLEAVED_DEVICES} devices, got {handles.size}")
+        columns = sum(max(self._lib.mc_sync_engine_device_output_channels(self._ptr, int(h)), 1) for h in handles)
+        out = _output_array(out, (frames, columns), np.int16, "out")
+        read = np.zeros(handles.size, dtype=np.uintp)
+        underrun = np.zeros(handles.size, dtype=np.intc)
+        self._lib.mc_sync_engine_pull_all_interleaved(
+            self._ptr,
+            _pointer(handles, ctypes.c_int32),
+            handles.size,
+            _pointer(out, ctypes.c_int16),
+            out.size,
+            frames,
+            _pointer(read, ctypes.c_size_t),
+            _pointer(underrun, ctypes.c_int),
+        )
+        return out, read, underrun.astype(bool)
+
+    def set_offset_samples(self, device: Device, offset_samples: int) -> None:
+        ok = self._lib.mc_sync_engine_set_handle_offset_samples(self._ptr, self._resolve(device), offset_samples)
+        self._check(ok, device)
+
+    def align_to_time(self, device: Device, pull_time_ns: int, output_latency_ns: int = 0) -> None:
+        """Moves a device onto the stream timeline; call between its pulls."""
+        ok = self._lib.mc_sync_engine_align_handle_to_time(
+            self._ptr, self._resolve(device), pull_time_ns, output_latency_ns
+        )
+        self._check(ok, device)
+
+    def stream_index_at_time(self, presentation_time_ns: int) -> int | None:
+        """Stream frame presented at a host time; None before the first timestamped push."""
+        index = ctypes.c_int64()
+        if not self._lib.mc_sync_engine_stream_index_at_time(self._ptr, presentation_time_ns, ctypes.byref(index)):
+            return None
+        return index.value
+
+    def presentation_time_ns(self, stream_index: int) -> int | None:
+        """Host time at which a stream frame is presented; None before the first timestamped push."""
+        time_ns = ctypes.c_int64()
+        if not self._lib.mc_sync_engine_presentation_time_ns(self._ptr, stream_index, ctypes.byref(time_ns)):
+            return None
+        return time_ns.value
+
+    def device_presentation_time_ns(self, device: Device) -> int | None:
+        """When the device's next pulled frame is due to be heard; None before the first timestamped push."""
+        handle = self._resolve(device)
+        time_ns = ctypes.c_int64()
+        if not self._lib.mc_sync_engine_device_presentation_time_ns(self._ptr, handle, ctypes.byref(time_ns)):
+            if self._lib.mc_sync_engine_device_output_channels(self._ptr, handle) == 0:
+                raise KeyError(device)
+            return None
+        return time_ns.value
+
+    def apply_drift_correction_ms(self, device: Device, drift_ms: float, sample_rate_hz: int) -> None:
+        ok = self._lib.mc_sync_engine_apply_handle_drift_correction_ms(
+            self._ptr, self._resolve(device), drift_ms, sample_rate_hz
+        )
+        self._check(ok, device)
+
+    def set_rate_correction_ppm(self, device: Device, ppm: float) -> None:
+        ok = self._lib.mc_sync_engine_set_handle_rate_correction_ppm(self._ptr, self._resolve(device), ppm)
+        self._check(ok, device)
+
+    def slew_drift_correction_ms(self, device: Device, drift_ms: float, sample_rate_hz: int) -> None:
+        ok = self._lib.mc_sync_engine_slew_handle_drift_correction_ms(
+            self._ptr, self._resolve(device), drift_ms, sample_rate_hz
+        )
+        self._check(ok, device)
+
+    def set_gain_db(self, device: Device, gain_db: float) -> None:
+        ok = self._lib.mc_sync_engine_set_handle_gain_db(self._ptr, self._resolve(device), gain_db)
+        self._check(ok, device)
+
+    def set_soft_clip(self, device: Device, enabled: bool) -> None:
+        ok = self._lib.mc_sync_engine_set_handle_soft_clip(self._ptr, self._resolve(device), int(enabled))
+        self._check(ok, device)
+
+    def apply_calibration_file(self, path: str | os.PathLike[str], sample_rate_hz: int) -> int:
+        """Pre-align registered devices from a calibration store file; returns how many were calibrated."""
+        return self._lib.mc_sync_engine_apply_calibration_file(self._ptr, os.fsencode(path), sample_rate_hz)
+
+    def device_offsets(self) -> dict[str, int]:
+        count = self.device_count
+        entries = (_native.MC_DeviceOffset * max(count, 1))()
+        written = self._lib.mc_sync_engine_get_device_offsets(self._ptr, entries, count)
+        return {entries[i].device_id.decode(): entries[i].offset_samples for i in range(written)}
+
+    def reset_all_device_offsets(self, offset_samples: int = 0) -> int:
+        return self._lib.mc_sync_engine_reset_all_device_offsets(self._ptr, offset_samples)
+
+    def resize_ring(self, capacity_frames: int) -> bool:
+        """Resize the ring (frames) without losing unplayed audio; call from the pushing thread.
+
+        Returns False, leaving the ring as it was, if the new capacity cannot hold what the
+        devices still have to play.
+        """
+        if capacity_frames <= 0:
+            raise ValueError("capacity_frames must be positive")
+        return bool(self._lib.mc_sync_engine_resize_ring(self._ptr, capacity_frames))
+
+    def metrics(self) -> tuple[EngineMetrics, list[DeviceMetrics]]:
+        """Engine and per-device metrics snapshot; cheap enough to poll while audio threads run."""
+        engine = _native.MC_EngineMetrics()
+        capacity = max(self.device_count, 1)
+        devices = (_native.MC_DeviceMetrics * capacity)()
+        count = min(self._lib.mc_sync_engine_get_metrics(self._ptr, ctypes.byref(engine), devices, capacity), capacity)
+        return (
+            EngineMetrics(**{name: getattr(engine, name) for name, _ in _native.MC_EngineMetrics._fields_}),
+            [
+                DeviceMetrics(
+                    **{
+                        name: getattr(entry, name).decode() if name == "device_id" else getattr(entry, name)
+                        for name, _ in _native.MC_DeviceMetrics._fields_
+                    }
+                )
+                for entry in devices[:count]
+            ],
+        )
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Fit per-speaker-model drift from the hardware matrix and rank speaker combinations by stability."""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+from multiconnect.hardware_matrix import (  # noqa: E402
+    fit_speaker_models,
+    load_hardware_matrix,
+    rank_combinations,
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hardware-matrix", default="docs/hardware-matrix-template.csv")
+    parser.add_argument("--size", type=int, default=2, help="Speakers per combination.")
+    parser.add_argument("--session-hours", type=float, default=2.0)
+    parser.add_argument("--tolerance-ms", type=float, default=5.0, help="Desync allowed between corrections.")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--model", action="append", help="Restrict candidates to these '<brand> <model>' names.")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    matrix_path = Path(args.hardware_matrix)
+    if not matrix_path.exists():
+        print(f"ERROR: hardware matrix not found: {matrix_path}", file=sys.stderr)
+        return 1
+
+    try:
+        matrix = load_hardware_matrix(matrix_path)
+        stats = fit_speaker_models(matrix)
+        ranked = rank_combinations(
+            stats,
+            size=args.size,
+            session_hours=args.session_hours,
+            tolerance_ms=args.tolerance_ms,
+            top=args.top,
+            models=args.model,
+        )
+    except (KeyError, ValueError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    print(f"Hardware matrix: {matrix_path} rows={len(matrix)} skipped={matrix.skipped_rows} models={stats.models.size}")
+    print()
+    print("| speaker model | runs | drift ms/h | drift ppm | ± ms/h | latency ms | dropouts/h |")
+    print("|---|---:|---:|---:|---:|---:|---:|")
+    for i, model in enumerate(stats.models):
+        print(
+            f"| {model} | {stats.runs[i]} | {stats.drift_ms_per_hour[i]:.2f} | {stats.drift_ppm[i]:.2f} | "
+            f"{stats.drift_stderr_ms_per_hour[i]:.2f} | {stats.latency_ms[i]:.1f} | {stats.dropouts_per_hour[i]:.2f} |"
+        )
+
+    print()
+    print(f"Most stable {args.size}-speaker combinations over {args.session_hours:g} h:")
+    for rank, forecast in enumerate(ranked, start=1):
+        offsets = ", ".join(f"{model}=+{offset:.1f}ms" for model, offset in zip(forecast.models, forecast.initial_offsets_ms))
+        budget = ", ".join(f"{value:.1f}" for value in forecast.correction_budget_ms)
+        print(
+            f"{rank}. expectedDesyncMs={forecast.expected_desync_ms:.2f} dropoutsPerHour={forecast.dropouts_per_hour:.2f} "
+            f"slewPpm={forecast.required_slew_ppm:.2f} offsets[{offsets}] correctionBudgetMs[{budget}]"
+        )
+    if not ranked:
+        print("- none (not enough speaker models)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
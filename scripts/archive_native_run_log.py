@@ -1,47 +1,14 @@
 #!/usr/bin/env python3
-"""Archive latest native-check artifact metadata into a shared CSV run log."""
+"""Archive latest native-check artifact metadata into the shared run log (CSV plus SQLite index)."""
 
 from __future__ import annotations
 
 import argparse
-import csv
-import json
-from datetime import datetime, timezone
 from pathlib import Path
 import sys
 
-HEADER = [
-    "recorded_at_utc",
-    "standard_artifact",
-    "escape_artifact",
-    "outcome_standard",
-    "outcome_escape",
-    "requested_offset_ms",
-    "measured_offset_ms",
-    "threshold_ms",
-    "error_from_requested_ms",
-]
-
-
-def latest_json(path: Path) -> Path:
-    candidates = sorted(path.glob("*.json"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not candidates:
-        raise FileNotFoundError(f"No JSON artifacts found in {path}")
-    return candidates[0]
-
-
-def load_json(path: Path) -> dict:
-    with path.open(encoding="utf-8") as handle:
-        return json.load(handle)
-
-
-def ensure_header(path: Path) -> None:
-    if path.exists() and path.stat().st_size > 0:
-        return
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(HEADER)
+from evidence_pipeline import archive_latest_run
+from run_log_store import RunLogStore
 
 
 def main() -> int:
@@ -56,32 +23,12 @@ def main() -> int:
     run_log = Path(args.run_log)
 
     try:
-        standard_path = latest_json(artifact_dir)
-        escape_path = latest_json(escape_dir)
-    except FileNotFoundError as exc:
+        with RunLogStore(run_log) as store:
+            archive_latest_run(store, artifact_dir, escape_dir)
+    except (FileNotFoundError, ValueError) as exc:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 1
 
-    standard = load_json(standard_path)
-    escape = load_json(escape_path)
-
-    ensure_header(run_log)
-    with run_log.open("a", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(
-            [
-                datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
-                standard_path.as_posix(),
-                escape_path.as_posix(),
-                standard.get("outcome", ""),
-                escape.get("outcome", ""),
-                standard.get("requestedOffsetMs", ""),
-                standard.get("measuredOffsetMs", ""),
-                standard.get("thresholdMs", ""),
-                standard.get("errorFromRequestedMs", ""),
-            ]
-        )
-
     print(f"Archived run metadata to {run_log}")
     return 0
 
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""Append-only manifest of poc_cli artifacts (<artifact-dir>/artifacts-manifest.csv).
+
+poc_cli appends one line per artifact it writes, in time order. The latest artifact is the last
+matching line, and "everything since X" is the tail of the file. Both are read backwards from the end
+of the manifest, so lookups never list, stat or re-parse the artifact directory. A directory without
+a manifest (runs from an older poc_cli; poc_cli does not start one next to older artifacts) is scanned
+once to bootstrap it. Artifacts copied in by hand are merged with `backfill`.
+
+    python3 scripts/artifact_manifest.py latest native/build/artifacts
+    python3 scripts/artifact_manifest.py since native/build/artifacts 20260217T000000Z --kind run
+    python3 scripts/artifact_manifest.py backfill native/build/artifacts
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from dataclasses import asdict, dataclass
+import io
+import json
+import math
+import os
+from pathlib import Path
+import sys
+from typing import Iterator
+
+MANIFEST_NAME = "artifacts-manifest.csv"
+MANIFEST_HEADER = [
+    "timestamp",
+    "kind",
+    "path",
+    "outcome",
+    "requested_offset_ms",
+    "measured_offset_ms",
+    "error_ms",
+    "threshold_ms",
+]
+
+_READ_BLOCK = 8192
+
+
+@dataclass(frozen=True)
+class ManifestEntry:
+    # poc_cli run timestamp (%Y%m%dT%H%M%SZ), which sorts lexicographically.
+    timestamp: str
+    # "run" for poc_run_*.json, "sweep" for poc_sweep_*.csv.
+    kind: str
+    # File name relative to the artifact directory.
+    path: str
+    outcome: str
+    requested_offset_ms: str = ""
+    measured_offset_ms: str = ""
+    error_ms: str = ""
+    threshold_ms: str = ""
+
+
+def manifest_path(artifact_dir: Path) -> Path:
+    return Path(artifact_dir) / MANIFEST_NAME
+
+
+def append_entry(artifact_dir: Path, entry: ManifestEntry) -> None:
+    path = manifest_path(artifact_dir)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if not path.exists() or path.stat().st_size == 0:
+        writer.writerow(MANIFEST_HEADER)
+    writer.writerow([getattr(entry, name) for name in MANIFEST_HEADER])
+    # One write per entry, so concurrent appenders (poc_cli, scripts) never interleave inside a line.
+    with path.open("a", encoding="utf-8", newline="") as handle:
+        handle.write(buffer.getvalue())
+
+
+def _entry_from_line(line: bytes) -> ManifestEntry | None:
+    fields = next(csv.reader([line.decode("utf-8")]), [])
+    if len(fields) != len(MANIFEST_HEADER) or fields == MANIFEST_HEADER:
+        return None
+    return ManifestEntry(*fields)
+
+
+def iter_reverse(artifact_dir: Path) -> Iterator[ManifestEntry]:
+    """Yield manifest entries newest first, reading the file backwards in blocks."""
+    path = manifest_path(artifact_dir)
+    if not path.exists():
+        return
+    with path.open("rb") as handle:
+        position = handle.seek(0, os.SEEK_END)
+        remainder = b""
+        while position > 0:
+            step = min(_READ_BLOCK, position)
+            position -= step
+            handle.seek(position)
+            lines = (handle.read(step) + remainder).split(b"\n")
+            # The first piece may be the tail of a line that starts in an earlier block.
+            remainder = lines.pop(0)
+            for line in reversed(lines):
+                entry = _entry_from_line(line) if line.strip() else None
+                if entry is not None:
+                    yield entry
+        if remainder.strip():
+            entry = _entry_from_line(remainder)
+            if entry is not None:
+                yield entry
+
+
+def _is_artifact_name(name: str) -> bool:
+    return (name.startswith("poc_run_") and name.endswith(".json")) or (
+        name.startswith("poc_sweep_") and name.endswith(".csv")
+    )
+
+
+def _finite_or_none(value: str | None) -> float | None:
+    try:
+        number = float(value or "")
+    except ValueError:
+        return None
+    return number if math.isfinite(number) else None
+
+
+def _scan_entry(path: Path) -> ManifestEntry | None:
+    """Describe an artifact that predates the manifest (bootstrap only)."""
+    if path.name.startswith("poc_run_") and path.suffix == ".json":
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            return None
+        return ManifestEntry(
+            timestamp=str(data.get("timestamp", path.stem[len("poc_run_") :])),
+            kind="run",
+            path=path.name,
+            outcome=str(data.get("outcome", "")),
+            requested_offset_ms=str(data.get("requestedOffsetMs", "")),
+            measured_offset_ms=str(data.get("measuredOffsetMs", "")),
+            error_ms=str(data.get("errorFromRequestedMs", "")),
+            threshold_ms=str(data.get("thresholdMs", "")),
+        )
+    if path.name.startswith("poc_sweep_") and path.suffix == ".csv":
+        try:
+            with path.open(newline="", encoding="utf-8") as handle:
+                rows = list(csv.DictReader(handle))
+        except (OSError, UnicodeDecodeError, csv.Error):
+            return None
+        # Rows with an empty or unparsable error are left out of the maximum; their outcome still counts.
+        errors = [error for row in rows if (error := _finite_or_none(row.get("error_ms"))) is not None]
+        return ManifestEntry(
+            timestamp=path.stem[len("poc_sweep_") :],
+            kind="sweep",
+            path=path.name,
+            outcome="PASS" if rows and all(row.get("outcome") == "PASS" for row in rows) else "FAIL",
+            error_ms=str(max(errors)) if errors else "",
+            threshold_ms=rows[0].get("threshold_ms", "") if rows else "",
+        )
+    return None
+
+
+def _artifact_names(artifact_dir: Path) -> list[str]:
+    return [name for name in os.listdir(artifact_dir) if _is_artifact_name(name)]
+
+
+def _write_manifest(artifact_dir: Path, entries: list[ManifestEntry]) -> None:
+    entries = sorted(entries, key=lambda entry: (entry.timestamp, entry.path))
+    path = manifest_path(artifact_dir)
+    temporary = path.with_suffix(".tmp")
+    with temporary.open("w", encoding="utf-8", newline="") as handle:
+        writer = csv.writer(handle, lineterminator="\n")
+        writer.writerow(MANIFEST_HEADER)
+        writer.writerows([getattr(entry, name) for name in MANIFEST_HEADER] for entry in entries)
+    temporary.replace(path)
+
+
+def rebuild(artifact_dir: Path) -> int:
+    """Write a manifest for an artifact directory from its files, oldest first."""
+    artifact_dir = Path(artifact_dir)
+    entries = [entry for name in _artifact_names(artifact_dir) if (entry := _scan_entry(artifact_dir / name)) is not None]
+    _write_manifest(artifact_dir, entries)
+    return len(entries)
+
+
+def backfill(artifact_dir: Path) -> int:
+    """Merge artifacts the manifest does not list yet into it; returns how many were added."""
+    artifact_dir = Path(artifact_dir)
+    recorded = list(iter_reverse(artifact_dir))
+    listed = {entry.path for entry in recorded}
+    missing = [
+        entry
+        for name in _artifact_names(artifact_dir)
+        if name not in listed and (entry := _scan_entry(artifact_dir / name)) is not None
+    ]
+    if missing:
+        _write_manifest(artifact_dir, recorded + missing)
+    return len(missing)
+
+
+def ensure_manifest(artifact_dir: Path) -> None:
+    if Path(artifact_dir).is_dir() and not manifest_path(artifact_dir).exists():
+        rebuild(artifact_dir)
+
+
+def latest(artifact_dir: Path, kind: str | None = "run") -> ManifestEntry | None:
+    ensure_manifest(artifact_dir)
+    return next((entry for entry in iter_reverse(artifact_dir) if kind is None or entry.kind == kind), None)
+
+
+def latest_artifact(artifact_dir: Path, kind: str | None = "run") -> Path:
+    entry = latest(artifact_dir, kind)
+    if entry is None:
+        raise FileNotFoundError(f"No {kind or 'poc_cli'} artifacts recorded in {manifest_path(artifact_dir)}")
+    return Path(artifact_dir) / entry.path
+
+
+def since(artifact_dir: Path, timestamp: str, kind: str | None = None) -> list[ManifestEntry]:
+    """Entries at or after `timestamp`, oldest first; reads only the tail of the manifest."""
+    ensure_manifest(artifact_dir)
+    newer: list[ManifestEntry] = []
+    for entry in iter_reverse(artifact_dir):
+        if entry.timestamp < timestamp:
+            break
+        if kind is None or entry.kind == kind:
+            newer.append(entry)
+    newer.reverse()
+    return newer
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    latest_parser = subparsers.add_parser("latest", help="Print the newest manifest entry as JSON.")
+    latest_parser.add_argument("artifact_dir", type=Path)
+    latest_parser.add_argument("--kind", choices=["run", "sweep", "any"], default="run")
+    since_parser = subparsers.add_parser("since", help="Print entries at or after a timestamp as JSON lines.")
+    since_parser.add_argument("artifact_dir", type=Path)
+    since_parser.add_argument("timestamp", help="poc_cli timestamp, e.g. 20260217T000000Z")
+    since_parser.add_argument("--kind", choices=["run", "sweep", "any"], default="any")
+    rebuild_parser = subparsers.add_parser("rebuild", help="Regenerate the manifest from the directory contents.")
+    rebuild_parser.add_argument("artifact_dir", type=Path)
+    backfill_parser = subparsers.add_parser("backfill", help="Add artifacts the manifest does not list yet.")
+    backfill_parser.add_argument("artifact_dir", type=Path)
+    args = parser.parse_args()
+
+    if not args.artifact_dir.is_dir():
+        print(f"ERROR: artifact directory not found: {args.artifact_dir}", file=sys.stderr)
+        return 1
+
+    if args.command == "rebuild":
+        count = rebuild(args.artifact_dir)
+        print(f"Rebuilt {manifest_path(args.artifact_dir)} with {count} artifact(s)")
+        return 0
+    if args.command == "backfill":
+        count = backfill(args.artifact_dir) if manifest_path(args.artifact_dir).exists() else rebuild(args.artifact_dir)
+        print(f"Added {count} artifact(s) to {manifest_path(args.artifact_dir)}")
+        return 0
+
+    kind = None if args.kind == "any" else args.kind
+    if args.command == "latest":
+        entry = latest(args.artifact_dir, kind)
+        if entry is None:
+            print(f"ERROR: no artifacts recorded in {manifest_path(args.artifact_dir)}", file=sys.stderr)
+            return 1
+        print(json.dumps(asdict(entry)))
+        return 0
+
+    for entry in since(args.artifact_dir, args.timestamp, kind):
+        print(json.dumps(asdict(entry)))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Build the binary calibration store SyncEngine loads to start a session pre-aligned.
+
+Entries keyed "<brand> <model>" come from the hardware matrix drift fits. Entries keyed by device id
+come from the native run log: the latest PoC artifact for each device records its last measured
+offset error.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+from multiconnect.calibration import DeviceCalibration, write_calibration_store  # noqa: E402
+from multiconnect.hardware_matrix import fit_speaker_models, load_hardware_matrix  # noqa: E402
+from run_log_store import RunLogStore  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--hardware-matrix", default="docs/hardware-matrix-template.csv")
+    parser.add_argument("--run-log", default="docs/native-check-run-log.csv")
+    parser.add_argument("--output", default="native/build/calibration.bin")
+    return parser.parse_args()
+
+
+def model_calibrations(matrix_path: Path) -> dict[str, DeviceCalibration]:
+    matrix = load_hardware_matrix(matrix_path)
+    stats = fit_speaker_models(matrix)
+    # The matrix is appended in run order, so the last row per model is its latest measurement.
+    latest_drift = dict(zip(matrix.speaker.astype(str).tolist(), matrix.drift_120m_ms.tolist()))
+    return {
+        str(model): DeviceCalibration(
+            last_measured_drift_ms=latest_drift[str(model)],
+            drift_ppm=float(stats.drift_ppm[i]),
+            latency_ms=float(stats.latency_ms[i]),
+        )
+        for i, model in enumerate(stats.models)
+    }
+
+
+def device_calibrations(run_log: Path) -> dict[str, DeviceCalibration]:
+    calibrations: dict[str, DeviceCalibration] = {}
+    with RunLogStore(run_log) as store:
+        for row in store.rows():
+            artifact = Path(row["standard_artifact"])
+            if not artifact.is_file():
+                continue
+            try:
+                payload = json.loads(artifact.read_text(encoding="utf-8"))
+                error_ms = float(payload["measuredOffsetMs"]) - float(payload["requestedOffsetMs"])
+                device = str(payload["deviceB"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            calibrations[device] = DeviceCalibration(last_measured_drift_ms=error_ms)
+    return calibrations
+
+
+def main() -> int:
+    args = parse_args()
+    matrix_path = Path(args.hardware_matrix)
+    run_log = Path(args.run_log)
+
+    calibrations: dict[str, DeviceCalibration] = {}
+    try:
+        if matrix_path.exists():
+            calibrations.update(model_calibrations(matrix_path))
+        if run_log.exists():
+            calibrations.update(device_calibrations(run_log))
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    if not calibrations:
+        print("ERROR: no calibrations found in the hardware matrix or run log", file=sys.stderr)
+        return 1
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    write_calibration_store(output, calibrations)
+    print(f"Wrote {len(calibrations)} calibrations to {output} ({output.stat().st_size} bytes)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,9 +4,12 @@
 from __future__ import annotations
 
 import argparse
+import os
 import subprocess
 from pathlib import Path
 
+from evidence_pipeline import parse_args as parse_pipeline_args, run_pipeline
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -25,7 +28,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--skip-checks",
         action="store_true",
-        help="Only update acceptance config/report; skip run_native_checks.sh execution.",
+        help="Only update acceptance config/report; skip run_native_checks.sh and the report refresh.",
     )
     parser.add_argument("--repo", default=".")
     return parser.parse_args()
@@ -61,15 +64,30 @@ def main() -> int:
         cwd=repo,
     )
 
-    if not args.skip_checks:
-        run(["bash", "scripts/run_native_checks.sh"], cwd=repo)
-        print("\nUpdated blockers snapshot:")
-        with (repo / "docs/project-blockers.md").open(encoding="utf-8") as handle:
-            for _ in range(20):
-                line = handle.readline()
-                if not line:
-                    break
-                print(line.rstrip())
+    if args.skip_checks:
+        return 0
+
+    run(["bash", "scripts/run_native_checks.sh"], cwd=repo)
+
+    # Refresh the baseline, status and blockers reports in-process from the updated evidence. The run
+    # log records artifact paths relative to the repository, so resolve them from there, as the
+    # steps above do.
+    previous = Path.cwd()
+    os.chdir(repo)
+    try:
+        status = run_pipeline(parse_pipeline_args([]))
+    finally:
+        os.chdir(previous)
+    if status != 0:
+        return status
+
+    print("\nUpdated blockers snapshot:")
+    with (repo / "docs/project-blockers.md").open(encoding="utf-8") as handle:
+        for _ in range(20):
+            line = handle.readline()
+            if not line:
+                break
+            print(line.rstrip())
 
     return 0
 
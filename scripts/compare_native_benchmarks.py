@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""Compare a bench_sync_core result file against its history and append it.
+
+Every case is timed in nanoseconds per unit, so lower is better. A case regresses when its median is
+more than --threshold-percent above the baseline: the median of that case over the last --window
+recorded runs from the same host and build type that had no regressions. Runs that regressed are
+still appended, flagged, so they never become part of a later baseline. Exits 1 on any regression;
+after a deliberate trade-off, --accept records the run as clean so it starts the new baseline.
+
+    native/build-release/bench_sync_core --json /tmp/bench.json
+    python3 scripts/compare_native_benchmarks.py /tmp/bench.json --history native/build-release/bench_history.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timezone
+import json
+import math
+from pathlib import Path
+import platform
+import statistics
+import subprocess
+import sys
+from typing import Any
+
+SUITE = "sync_core"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("results", help="JSON written by bench_sync_core --json.")
+    parser.add_argument("--history", required=True, help="JSON Lines history; created if missing.")
+    parser.add_argument(
+        "--threshold-percent",
+        type=float,
+        default=30.0,
+        help="Allowed slowdown against the baseline (shared build hosts swing by about 20%%).",
+    )
+    parser.add_argument("--window", type=int, default=5, help="Recent clean runs the baseline is taken over.")
+    parser.add_argument("--no-append", action="store_true", help="Compare only; leave the history untouched.")
+    parser.add_argument("--accept", action="store_true", help="Record slowdowns as the new baseline instead of failing.")
+    return parser.parse_args()
+
+
+def load_results(path: Path) -> tuple[str, dict[str, tuple[float, str]]]:
+    """Return the build type and {case: (median ns, unit)}."""
+    payload = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(payload, dict) or payload.get("suite") != SUITE or not isinstance(payload.get("results"), list):
+        raise ValueError(f"{path} is not a {SUITE} result file")
+    cases: dict[str, tuple[float, str]] = {}
+    for entry in payload["results"]:
+        median = entry.get("medianNs") if isinstance(entry, dict) else None
+        if not isinstance(median, (int, float)) or not math.isfinite(median) or median <= 0:
+            raise ValueError(f"{path}: invalid result entry {entry!r}")
+        cases[str(entry["name"])] = (float(median), str(entry.get("unit", "ns")))
+    return str(payload.get("build", "unknown")), cases
+
+
+def load_history(path: Path) -> list[dict[str, Any]]:
+    if not path.exists():
+        return []
+    entries: list[dict[str, Any]] = []
+    for line_number, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            print(f"WARNING: {path}:{line_number} is not valid JSON; skipped", file=sys.stderr)
+            continue
+        if isinstance(entry, dict) and isinstance(entry.get("results"), dict):
+            entries.append(entry)
+    return entries
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            text=True,
+            stderr=subprocess.DEVNULL,
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def baselines(history: list[dict[str, Any]], host: str, build: str, window: int) -> dict[str, float]:
+    clean = [
+        entry
+        for entry in history
+        if entry.get("suite") == SUITE and entry.get("host") == host and entry.get("build") == build
+        and not entry.get("regressions")
+    ][-window:]
+    values: dict[str, list[float]] = {}
+    for entry in clean:
+        for name, value in entry["results"].items():
+            if isinstance(value, (int, float)) and math.isfinite(value) and value > 0:
+                values.setdefault(name, []).append(float(value))
+    return {name: statistics.median(samples) for name, samples in values.items()}
+
+
+def main() -> int:
+    args = parse_args()
+    results_path = Path(args.results)
+    history_path = Path(args.history)
+    try:
+        build, cases = load_results(results_path)
+    except (OSError, ValueError, KeyError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    host = platform.node() or "unknown"
+    baseline = baselines(load_history(history_path), host, build, max(args.window, 1))
+    regressions: list[str] = []
+    print(f"Benchmarks: suite={SUITE} host={host} build={build} threshold={args.threshold_percent:g}%")
+    for name, (median, unit) in cases.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"  {name}: {median:.4g} {unit} (no baseline)")
+            continue
+        change = 100.0 * (median / reference - 1.0)
+        print(f"  {name}: {median:.4g} {unit} (baseline {reference:.4g}, {change:+.1f}%)")
+        if change > args.threshold_percent:
+            regressions.append(name)
+            print(
+                f"{'WARNING' if args.accept else 'ERROR'}: {name} regressed {change:.1f}% ({reference:.4g} -> {median:.4g} {unit}, "
+                f"threshold {args.threshold_percent:g}%)",
+                file=sys.stderr,
+            )
+
+    if args.accept:
+        regressions = []
+    if not args.no_append:
+        entry = {
+            "recorded_at_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "suite": SUITE,
+            "host": host,
+            "build": build,
+            "commit": git_commit(),
+            "results": {name: median for name, (median, _) in cases.items()},
+            "regressions": regressions,
+        }
+        history_path.parent.mkdir(parents=True, exist_ok=True)
+        with history_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps(entry, sort_keys=True) + "\n")
+        print(f"Appended run to {history_path}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
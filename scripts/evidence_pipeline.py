@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+"""Refresh every evidence report in one pass from a shared in-memory model.
+
+Loads the run log (through its SQLite index), the hardware matrix and the latest standard artifact
+once, optionally archives a new run first, then derives the Day-1 baseline report, the Phase-1 status
+snapshot and the blockers report. An output is only rewritten when the content hash of its inputs
+changed (or the file was edited since the last run), so unchanged reports keep their timestamps.
+
+    python3 scripts/evidence_pipeline.py
+    python3 scripts/evidence_pipeline.py --artifact-dir native/build/artifacts \\
+        --escape-artifact-dir native/build/artifacts_escape
+
+archive_native_run_log.py, update_day1_baseline_report.py, generate_phase1_status_report.py and
+generate_project_blockers_report.py remain as single-step entry points over the same functions.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import io
+import json
+from pathlib import Path
+import re
+import sys
+from typing import Any
+
+from artifact_manifest import latest_artifact
+from run_log_store import RunLogStore
+
+BASELINE_METRICS = [
+    "sampleRateHz",
+    "durationMs",
+    "requestedOffsetMs",
+    "measuredOffsetMs",
+    "errorFromRequestedMs",
+    "thresholdMs",
+    "deviceA",
+    "deviceB",
+]
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def content_hash(*parts: object) -> str:
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part if isinstance(part, bytes) else json.dumps(part, sort_keys=True, default=str).encode("utf-8")
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+# --- run-log archiving -------------------------------------------------------------------------
+
+
+def load_json(path: Path) -> dict:
+    with path.open(encoding="utf-8") as handle:
+        return json.load(handle)
+
+
+def archive_latest_run(store: RunLogStore, artifact_dir: Path, escape_dir: Path) -> dict[str, str]:
+    """Append the newest standard and escape artifacts in the two directories as one run."""
+    standard_path = latest_artifact(artifact_dir)
+    escape_path = latest_artifact(escape_dir)
+    standard = load_json(standard_path)
+    escape = load_json(escape_path)
+    return store.append(
+        {
+            "recorded_at_utc": utc_now(),
+            "standard_artifact": standard_path.as_posix(),
+            "escape_artifact": escape_path.as_posix(),
+            "outcome_standard": standard.get("outcome", ""),
+            "outcome_escape": escape.get("outcome", ""),
+            "requested_offset_ms": standard.get("requestedOffsetMs", ""),
+            "measured_offset_ms": standard.get("measuredOffsetMs", ""),
+            "threshold_ms": standard.get("thresholdMs", ""),
+            "error_from_requested_ms": standard.get("errorFromRequestedMs", ""),
+        }
+    )
+
+
+# --- hardware matrix ---------------------------------------------------------------------------
+
+
+def count_matrix_rows_text(text: str) -> int:
+    rows = csv.reader(io.StringIO(text, newline=""))
+    next(rows, None)
+    return sum(1 for row in rows if row and any(cell.strip() for cell in row))
+
+
+def count_matrix_rows(path: Path) -> int:
+    return count_matrix_rows_text(path.read_text(encoding="utf-8"))
+
+
+# --- Day-1 baseline report ---------------------------------------------------------------------
+
+
+def resolve_artifact(artifact_rel: str) -> Path:
+    artifact_path = Path(artifact_rel)
+    return artifact_path if artifact_path.is_absolute() else Path.cwd() / artifact_path
+
+
+def replace_line(text: str, prefix: str, new_line: str) -> str:
+    pattern = re.compile(rf"^{re.escape(prefix)}.*$", re.MULTILINE)
+    if not pattern.search(text):
+        raise ValueError(f"missing line with prefix: {prefix}")
+    return pattern.sub(new_line, text)
+
+
+def replace_metric_row(text: str, metric: str, value: str) -> str:
+    pattern = re.compile(rf"^\|\s*{re.escape(metric)}\s*\|\s*[^|]*\|$", re.MULTILINE)
+    new_row = f"| {metric} | {value} |"
+    if not pattern.search(text):
+        raise ValueError(f"missing metric row: {metric}")
+    return pattern.sub(new_row, text)
+
+
+def render_baseline_report(text: str, artifact_rel: str, data: dict[str, Any]) -> str:
+    text = replace_line(text, "- Latest standard artifact:", f"- Latest standard artifact: `{artifact_rel}`")
+    text = replace_line(text, "- Result:", f"- Result: `{data.get('outcome', 'UNKNOWN')}`")
+    for key in BASELINE_METRICS:
+        text = replace_metric_row(text, key, str(data.get(key, "")))
+    return text
+
+
+def pending_acceptance_items(baseline_text: str) -> list[str]:
+    pending: list[str] = []
+    current_question = ""
+    question_re = re.compile(r"^\d+\.\s+\*\*(.+)\*\*")
+
+    for line in baseline_text.splitlines():
+        qmatch = question_re.match(line.strip())
+        if qmatch:
+            current_question = qmatch.group(1)
+            continue
+
+        if "**Status:** Pending" in line and current_question:
+            pending.append(current_question)
+
+    return pending
+
+
+# --- Phase-1 status snapshot -------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class Phase1Signals:
+    hardware_runs: int
+    pass_runs: int
+    total_runs: int
+    latest_artifact: str
+    min_hardware_runs: int
+    min_pass_runs: int
+    hardware_matrix: str
+    run_log: str
+
+    @property
+    def ready(self) -> bool:
+        return self.hardware_runs >= self.min_hardware_runs and self.pass_runs >= self.min_pass_runs
+
+    @property
+    def gate(self) -> str:
+        return "READY ✅" if self.ready else "NOT READY ⚠️"
+
+
+def render_phase1_status(signals: Phase1Signals, updated_at: str) -> str:
+    hardware_ok = signals.hardware_runs >= signals.min_hardware_runs
+    pass_ok = signals.pass_runs >= signals.min_pass_runs
+    return f"""# Phase-1 Status Snapshot
+
+_Last updated (UTC): {updated_at}_
+
+## Readiness Summary
+
+| signal | current | target | status |
+|---|---:|---:|---|
+| real-device hardware runs | {signals.hardware_runs} | {signals.min_hardware_runs} | {'✅' if hardware_ok else '⚠️'} |
+| PASS harness runs | {signals.pass_runs} | {signals.min_pass_runs} | {'✅' if pass_ok else '⚠️'} |
+| total logged harness runs | {signals.total_runs} | n/a | ℹ️ |
+
+**Overall Phase-1 gate:** {signals.gate}
+
+## Latest Evidence
+
+- Latest standard artifact: `{signals.latest_artifact}`
+- Hardware matrix file: `{signals.hardware_matrix}`
+- Native run-log file: `{signals.run_log}`
+"""
+
+
+def phase1_gate(phase1_text: str) -> str:
+    match = re.search(r"\*\*Overall Phase-1 gate:\*\*\s*(.+)", phase1_text)
+    return match.group(1).strip() if match else "UNKNOWN"
+
+
+# --- blockers report ---------------------------------------------------------------------------
+
+
+def render_blockers_report(gate_value: str, pending_items: list[str], updated_at: str) -> str:
+    blockers: list[str] = []
+    if "READY" not in gate_value:
+        blockers.append(f"Phase-1 gate is not ready ({gate_value}).")
+    for item in pending_items:
+        blockers.append(f"Acceptance item pending: {item}")
+
+    status = "NO ACTIVE BLOCKERS ✅" if not blockers else "OPEN BLOCKERS ⚠️"
+
+    report = [
+        "# Project Blockers Snapshot",
+        "",
+        f"_Last updated (UTC): {updated_at}_",
+        "",
+        f"**Status:** {status}",
+        "",
+        "## Signals Reviewed",
+        "",
+        f"- Phase-1 gate: `{gate_value}`",
+        f"- Pending acceptance items in baseline report: `{len(pending_items)}`",
+        "",
+        "## Open Blockers",
+        "",
+    ]
+
+    if blockers:
+        report.extend([f"- {item}" for item in blockers])
+    else:
+        report.append("- None.")
+
+    report.extend(
+        [
+            "",
+            "## Recommended Next Step",
+            "",
+            "- If blockers remain, resolve the listed acceptance items and rerun `./scripts/run_native_checks.sh`.",
+            "- If no blockers remain, keep running weekly evidence refresh and signoff checks.",
+            "",
+        ]
+    )
+    return "\n".join(report)
+
+
+# --- pipeline ----------------------------------------------------------------------------------
+
+
+@dataclass
+class OutputState:
+    """Per-output input/output hashes remembered between pipeline runs."""
+
+    path: Path
+    entries: dict[str, dict[str, str]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> OutputState:
+        if not path.exists():
+            return cls(path)
+        try:
+            entries = json.loads(path.read_text(encoding="utf-8"))
+        except ValueError:
+            entries = {}
+        return cls(path, entries if isinstance(entries, dict) else {})
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+
+    def write_if_changed(self, output: Path, inputs_hash: str, render: Any, force: bool = False) -> bool:
+        """Call `render()` and write its text only if the inputs or the file on disk changed."""
+        key = output.as_posix()
+        entry = self.entries.get(key, {})
+        current = output.read_bytes() if output.exists() else None
+        if (
+            not force
+            and current is not None
+            and entry.get("inputs") == inputs_hash
+            and entry.get("output") == content_hash(current)
+        ):
+            return False
+
+        data = render().encode("utf-8")
+        if data != current:
+            output.parent.mkdir(parents=True, exist_ok=True)
+            output.write_bytes(data)
+        self.entries[key] = {"inputs": inputs_hash, "output": content_hash(data)}
+        return data != current
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--artifact-dir", help="Archive the newest standard artifact from this directory first.")
+    parser.add_argument("--escape-artifact-dir", help="Escape-metadata artifact directory paired with --artifact-dir.")
+    parser.add_argument("--run-log", default="docs/native-check-run-log.csv")
+    parser.add_argument("--hardware-matrix", default="docs/hardware-matrix-template.csv")
+    parser.add_argument("--baseline-report", default="docs/day1-baseline-report.md")
+    parser.add_argument("--phase1-status", default="docs/phase1-status.md")
+    parser.add_argument("--blockers-report", default="docs/project-blockers.md")
+    parser.add_argument("--min-hardware-runs", type=int, default=3)
+    parser.add_argument("--min-pass-runs", type=int, default=5)
+    parser.add_argument("--state", default="docs/.evidence-pipeline-state.json")
+    parser.add_argument("--force", action="store_true", help="Rewrite every output even if its inputs are unchanged.")
+    return parser.parse_args(argv)
+
+
+def run_pipeline(args: argparse.Namespace) -> int:
+    if bool(args.artifact_dir) != bool(args.escape_artifact_dir):
+        print("ERROR: --artifact-dir and --escape-artifact-dir must be given together", file=sys.stderr)
+        return 1
+
+    run_log = Path(args.run_log)
+    matrix_path = Path(args.hardware_matrix)
+    baseline_path = Path(args.baseline_report)
+    status_path = Path(args.phase1_status)
+    blockers_path = Path(args.blockers_report)
+    for path, label in ((matrix_path, "hardware matrix"), (baseline_path, "baseline report")):
+        if not path.exists():
+            print(f"ERROR: {label} not found: {path}", file=sys.stderr)
+            return 1
+
+    try:
+        with RunLogStore(run_log) as store:
+            if args.artifact_dir:
+                archived = archive_latest_run(store, Path(args.artifact_dir), Path(args.escape_artifact_dir))
+                print(f"Archived run metadata to {run_log}: {archived['standard_artifact']}")
+            total_runs, pass_runs = store.counts()
+            latest_run = store.latest()
+    except (FileNotFoundError, ValueError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    matrix_bytes = matrix_path.read_bytes()
+    baseline_text = baseline_path.read_text(encoding="utf-8")
+    latest_artifact = latest_run["standard_artifact"].strip() if latest_run else ""
+
+    artifact_bytes = b""
+    if latest_artifact:
+        artifact_path = resolve_artifact(latest_artifact)
+        if artifact_path.exists():
+            artifact_bytes = artifact_path.read_bytes()
+        else:
+            # Typical on a fresh checkout: the run log records paths from the machine that made the
+            # runs. Only the baseline report needs the artifact; status and blockers still refresh.
+            print(f"WARNING: artifact does not exist, baseline report not refreshed: {artifact_path}", file=sys.stderr)
+
+    state = OutputState.load(Path(args.state))
+    updated_at = utc_now()
+    changed: list[Path] = []
+
+    if artifact_bytes:
+        data = json.loads(artifact_bytes)
+        try:
+            new_baseline = render_baseline_report(baseline_text, latest_artifact, data)
+        except ValueError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            return 1
+        baseline_inputs = content_hash(baseline_text.encode("utf-8"), latest_artifact, artifact_bytes)
+        if state.write_if_changed(baseline_path, baseline_inputs, lambda: new_baseline, args.force):
+            changed.append(baseline_path)
+        baseline_text = new_baseline
+
+    signals = Phase1Signals(
+        hardware_runs=count_matrix_rows_text(matrix_bytes.decode("utf-8")),
+        pass_runs=pass_runs,
+        total_runs=total_runs,
+        latest_artifact=latest_artifact or "N/A",
+        min_hardware_runs=args.min_hardware_runs,
+        min_pass_runs=args.min_pass_runs,
+        hardware_matrix=matrix_path.as_posix(),
+        run_log=run_log.as_posix(),
+    )
+    if state.write_if_changed(
+        status_path, content_hash(signals.__dict__), lambda: render_phase1_status(signals, updated_at), args.force
+    ):
+        changed.append(status_path)
+
+    pending_items = pending_acceptance_items(baseline_text)
+    if state.write_if_changed(
+        blockers_path,
+        content_hash(signals.gate, pending_items),
+        lambda: render_blockers_report(signals.gate, pending_items, updated_at),
+        args.force,
+    ):
+        changed.append(blockers_path)
+
+    state.save()
+    for path in (baseline_path, status_path, blockers_path):
+        print(f"{'Wrote' if path in changed else 'Unchanged'}: {path}")
+    return 0
+
+
+def main() -> int:
+    return run_pipeline(parse_args())
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Summarize or export a poc_cli binary run-record file (poc_cli --record-file) as JSON or CSV."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+import numpy as np  # noqa: E402
+
+from multiconnect.run_records import load_run_records, record_dicts  # noqa: E402
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("record_file", type=Path)
+    parser.add_argument("--format", choices=("json", "csv"), help="Export every record instead of summarizing.")
+    parser.add_argument("--output", help="Export destination (default: stdout).")
+    parser.add_argument("--failures-only", action="store_true", help="Only summarize or export FAIL records.")
+    return parser.parse_args()
+
+
+def export(records: np.ndarray, fmt: str, handle) -> None:
+    rows = record_dicts(records)
+    if fmt == "json":
+        json.dump(list(rows), handle, indent=2)
+        handle.write("\n")
+        return
+    first = next(rows, None)
+    if first is None:
+        return
+    writer = csv.DictWriter(handle, fieldnames=list(first))
+    writer.writeheader()
+    writer.writerow(first)
+    writer.writerows(rows)
+
+
+def main() -> int:
+    args = parse_args()
+    if not args.record_file.exists():
+        print(f"ERROR: record file not found: {args.record_file}", file=sys.stderr)
+        return 1
+    try:
+        records = load_run_records(args.record_file)
+    except ValueError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    if args.failures_only:
+        records = records[records["outcome"] == 0]
+
+    if args.format:
+        if args.output:
+            with Path(args.output).open("w", newline="", encoding="utf-8") as handle:
+                export(records, args.format, handle)
+        else:
+            export(records, args.format, sys.stdout)
+        return 0
+
+    passed = int(np.count_nonzero(records["outcome"]))
+    max_error = float(records["error_ms"].max()) if records.size else 0.0
+    print(
+        f"Run records: {args.record_file} records={records.size} pass={passed} fail={records.size - passed} "
+        f"maxErrorMs={max_error:.4f}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,10 +4,11 @@
 from __future__ import annotations
 
 import argparse
-import csv
-from datetime import datetime, timezone
 from pathlib import Path
 
+from evidence_pipeline import Phase1Signals, count_matrix_rows, render_phase1_status, utc_now
+from run_log_store import RunLogStore
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -19,25 +20,11 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def count_matrix_rows(path: Path) -> int:
-    with path.open(newline="", encoding="utf-8") as handle:
-        rows = list(csv.reader(handle))
-    return len([row for row in rows[1:] if row and any(cell.strip() for cell in row)])
-
-
 def read_run_log(path: Path) -> tuple[int, int, str]:
-    with path.open(newline="", encoding="utf-8") as handle:
-        rows = list(csv.DictReader(handle))
-    total = len(rows)
-    passed = len(
-        [
-            r
-            for r in rows
-            if r.get("outcome_standard") == "PASS" and r.get("outcome_escape") == "PASS"
-        ]
-    )
-    latest = rows[-1]["standard_artifact"] if rows else "N/A"
-    return total, passed, latest
+    with RunLogStore(path) as store:
+        total, passed = store.counts()
+        latest = store.latest()
+    return total, passed, latest["standard_artifact"] if latest else "N/A"
 
 
 def main() -> int:
@@ -49,30 +36,17 @@ def main() -> int:
     hardware_runs = count_matrix_rows(hardware_matrix)
     total_runs, pass_runs, latest_artifact = read_run_log(run_log)
 
-    ready = hardware_runs >= args.min_hardware_runs and pass_runs >= args.min_pass_runs
-
-    content = f"""# Phase-1 Status Snapshot
-
-_Last updated (UTC): {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}_
-
-## Readiness Summary
-
-| signal | current | target | status |
-|---|---:|---:|---|
-| real-device hardware runs | {hardware_runs} | {args.min_hardware_runs} | {'✅' if hardware_runs >= args.min_hardware_runs else '⚠️'} |
-| PASS harness runs | {pass_runs} | {args.min_pass_runs} | {'✅' if pass_runs >= args.min_pass_runs else '⚠️'} |
-| total logged harness runs | {total_runs} | n/a | ℹ️ |
-
-**Overall Phase-1 gate:** {'READY ✅' if ready else 'NOT READY ⚠️'}
-
-## Latest Evidence
-
-- Latest standard artifact: `{latest_artifact}`
-- Hardware matrix file: `{hardware_matrix.as_posix()}`
-- Native run-log file: `{run_log.as_posix()}`
-"""
-
-    output.write_text(content, encoding="utf-8")
+    signals = Phase1Signals(
+        hardware_runs=hardware_runs,
+        pass_runs=pass_runs,
+        total_runs=total_runs,
+        latest_artifact=latest_artifact,
+        min_hardware_runs=args.min_hardware_runs,
+        min_pass_runs=args.min_pass_runs,
+        hardware_matrix=hardware_matrix.as_posix(),
+        run_log=run_log.as_posix(),
+    )
+    output.write_text(render_phase1_status(signals, utc_now()), encoding="utf-8")
     print(f"Wrote Phase-1 status snapshot: {output}")
     return 0
 
@@ -4,10 +4,10 @@
 from __future__ import annotations
 
 import argparse
-import re
-from datetime import datetime, timezone
 from pathlib import Path
 
+from evidence_pipeline import pending_acceptance_items, phase1_gate, render_blockers_report, utc_now
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -17,29 +17,6 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def phase1_gate(phase1_text: str) -> str:
-    match = re.search(r"\*\*Overall Phase-1 gate:\*\*\s*(.+)", phase1_text)
-    return match.group(1).strip() if match else "UNKNOWN"
-
-
-def pending_acceptance_items(baseline_text: str) -> list[str]:
-    lines = baseline_text.splitlines()
-    pending: list[str] = []
-    current_question = ""
-    question_re = re.compile(r"^\d+\.\s+\*\*(.+)\*\*")
-
-    for line in lines:
-        qmatch = question_re.match(line.strip())
-        if qmatch:
-            current_question = qmatch.group(1)
-            continue
-
-        if "**Status:** Pending" in line and current_question:
-            pending.append(current_question)
-
-    return pending
-
-
 def main() -> int:
     args = parse_args()
     phase1_path = Path(args.phase1_status)
@@ -52,47 +29,7 @@ def main() -> int:
     gate_value = phase1_gate(phase1_text)
     pending_items = pending_acceptance_items(baseline_text)
 
-    blockers: list[str] = []
-    if "READY" not in gate_value:
-        blockers.append(f"Phase-1 gate is not ready ({gate_value}).")
-    for item in pending_items:
-        blockers.append(f"Acceptance item pending: {item}")
-
-    status = "NO ACTIVE BLOCKERS ✅" if not blockers else "OPEN BLOCKERS ⚠️"
-
-    report = [
-        "# Project Blockers Snapshot",
-        "",
-        f"_Last updated (UTC): {datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')}_",
-        "",
-        f"**Status:** {status}",
-        "",
-        "## Signals Reviewed",
-        "",
-        f"- Phase-1 gate: `{gate_value}`",
-        f"- Pending acceptance items in baseline report: `{len(pending_items)}`",
-        "",
-        "## Open Blockers",
-        "",
-    ]
-
-    if blockers:
-        report.extend([f"- {item}" for item in blockers])
-    else:
-        report.append("- None.")
-
-    report.extend(
-        [
-            "",
-            "## Recommended Next Step",
-            "",
-            "- If blockers remain, resolve the listed acceptance items and rerun `./scripts/run_native_checks.sh`.",
-            "- If no blockers remain, keep running weekly evidence refresh and signoff checks.",
-            "",
-        ]
-    )
-
-    output_path.write_text("\n".join(report), encoding="utf-8")
+    output_path.write_text(render_blockers_report(gate_value, pending_items, utc_now()), encoding="utf-8")
     print(f"Wrote blockers report: {output_path}")
     return 0
 
@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""Indexed, append-only store for the native-check run log.
+
+docs/native-check-run-log.csv stays the committed source of truth; a SQLite index next to it
+(`<run-log>.sqlite`, gitignored) mirrors its rows so reporting scripts get the latest row, a row by
+artifact path and the pass/total counters without rescanning the CSV. The index ingests only the
+bytes appended since its last sync and rebuilds itself if the CSV was rewritten underneath it.
+Read-only callers open the store with create_index=False: an index that already exists is used,
+otherwise the rows are indexed in memory and nothing is written next to the CSV.
+
+    python3 scripts/run_log_store.py summary
+    python3 scripts/run_log_store.py export --output /tmp/run-log.csv
+    python3 scripts/run_log_store.py import --input other-runner-run-log.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import sqlite3
+from pathlib import Path
+import sys
+from typing import Iterator, Mapping
+
+RUN_LOG_HEADER = [
+    "recorded_at_utc",
+    "standard_artifact",
+    "escape_artifact",
+    "outcome_standard",
+    "outcome_escape",
+    "requested_offset_ms",
+    "measured_offset_ms",
+    "threshold_ms",
+    "error_from_requested_ms",
+]
+
+# Bytes before the sync offset remembered to notice a CSV that was rewritten rather than appended to.
+_TAIL_BYTES = 256
+# Bumped whenever rows are indexed differently, so older index files are rebuilt from the CSV.
+_INDEX_VERSION = 2
+_ARTIFACT_COLUMNS = ("standard_artifact", "escape_artifact")
+_COLUMNS = ", ".join(RUN_LOG_HEADER)
+
+
+def default_index_path(run_log: Path) -> Path:
+    return run_log.with_suffix(".sqlite")
+
+
+def is_pass(row: Mapping[str, str]) -> bool:
+    return row.get("outcome_standard") == "PASS" and row.get("outcome_escape") == "PASS"
+
+
+class RunLogStore:
+    """Run-log CSV plus its SQLite index; use as a context manager."""
+
+    def __init__(self, run_log: Path, index_path: Path | None = None, *, create_index: bool = True) -> None:
+        self.run_log = Path(run_log)
+        self.index_path = Path(index_path) if index_path else default_index_path(self.run_log)
+        if create_index or self.index_path.exists():
+            self.index_path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.index_path)
+        else:
+            self._db = sqlite3.connect(":memory:")
+        self._db.row_factory = sqlite3.Row
+        with self._db:
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS runs (id INTEGER PRIMARY KEY, {_COLUMNS})"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS runs_standard_artifact ON runs (standard_artifact, id)"
+            )
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value)")
+            if self._meta("version") != _INDEX_VERSION:
+                self._reset()
+                self._set_meta(version=_INDEX_VERSION)
+        self.sync()
+
+    def __enter__(self) -> RunLogStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._db.close()
+
+    def _meta(self, key: str, default: object = None) -> object:
+        row = self._db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return default if row is None else row[0]
+
+    def _set_meta(self, **values: object) -> None:
+        self._db.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            values.items(),
+        )
+
+    def _reset(self) -> None:
+        self._db.execute("DELETE FROM runs")
+        self._set_meta(offset=0, tail=b"", total=0, passed=0)
+
+    def sync(self) -> int:
+        """Ingest rows appended to the CSV since the last sync; returns how many were added."""
+        with self._db:
+            if not self.run_log.exists():
+                self._reset()
+                return 0
+
+            offset = int(self._meta("offset", 0))
+            tail = bytes(self._meta("tail", b""))
+            with self.run_log.open("rb") as handle:
+                size = handle.seek(0, io.SEEK_END)
+                handle.seek(max(offset - len(tail), 0))
+                if size < offset or handle.read(len(tail)) != tail:
+                    self._reset()
+                    offset = 0
+                handle.seek(offset)
+                chunk = handle.read()
+
+            # Leave a partially written last line for the next sync.
+            complete = chunk[: chunk.rfind(b"\n") + 1]
+            if not complete:
+                return 0
+
+            rows = csv.reader(io.StringIO(complete.decode("utf-8"), newline=""))
+            if offset == 0:
+                header = next(rows, None)
+                if header != RUN_LOG_HEADER:
+                    raise ValueError(f"run-log header mismatch in {self.run_log}: {header}")
+
+            added = passed = 0
+            for fields in rows:
+                if not any(field.strip() for field in fields):
+                    continue
+                row = dict(zip(RUN_LOG_HEADER, fields + [""] * (len(RUN_LOG_HEADER) - len(fields))))
+                for name in _ARTIFACT_COLUMNS:
+                    row[name] = row[name].strip()
+                self._db.execute(
+                    f"INSERT INTO runs ({_COLUMNS}) VALUES ({', '.join('?' * len(RUN_LOG_HEADER))})",
+                    [row[name] for name in RUN_LOG_HEADER],
+                )
+                added += 1
+                passed += is_pass(row)
+
+            offset += len(complete)
+            self._set_meta(
+                offset=offset,
+                tail=(tail + complete)[-_TAIL_BYTES:],
+                total=int(self._meta("total", 0)) + added,
+                passed=int(self._meta("passed", 0)) + passed,
+            )
+            return added
+
+    def append(self, row: Mapping[str, object]) -> dict[str, str]:
+        """Append one run to the CSV (writing the header first if needed) and index it."""
+        self.run_log.parent.mkdir(parents=True, exist_ok=True)
+        needs_header = not self.run_log.exists() or self.run_log.stat().st_size == 0
+        with self.run_log.open("a", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            if needs_header:
+                writer.writerow(RUN_LOG_HEADER)
+            writer.writerow([row.get(name, "") for name in RUN_LOG_HEADER])
+        self.sync()
+        latest = self.latest()
+        assert latest is not None
+        return latest
+
+    def counts(self) -> tuple[int, int]:
+        """Return (total runs, runs where both the standard and escape outcome passed)."""
+        return int(self._meta("total", 0)), int(self._meta("passed", 0))
+
+    def latest(self) -> dict[str, str] | None:
+        row = self._db.execute(f"SELECT {_COLUMNS} FROM runs ORDER BY id DESC LIMIT 1").fetchone()
+        return dict(row) if row else None
+
+    def by_artifact(self, standard_artifact: str) -> dict[str, str] | None:
+        """Return the earliest run logged for a standard artifact path (surrounding blanks ignored)."""
+        row = self._db.execute(
+            f"SELECT {_COLUMNS} FROM runs WHERE standard_artifact = ? ORDER BY id LIMIT 1",
+            (standard_artifact.strip(),),
+        ).fetchone()
+        return dict(row) if row else None
+
+    def rows(self) -> Iterator[dict[str, str]]:
+        for row in self._db.execute(f"SELECT {_COLUMNS} FROM runs ORDER BY id"):
+            yield dict(row)
+
+    def export_csv(self, output: Path) -> int:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        count = 0
+        with output.open("w", newline="", encoding="utf-8") as handle:
+            writer = csv.DictWriter(handle, fieldnames=RUN_LOG_HEADER)
+            writer.writeheader()
+            for row in self.rows():
+                writer.writerow(row)
+                count += 1
+        return count
+
+    def import_csv(self, source: Path) -> int:
+        """Append every row of another run-log CSV (same header) to this one."""
+        self.run_log.parent.mkdir(parents=True, exist_ok=True)
+        needs_header = not self.run_log.exists() or self.run_log.stat().st_size == 0
+        count = 0
+        with source.open(newline="", encoding="utf-8") as handle:
+            reader = csv.DictReader(handle)
+            if reader.fieldnames != RUN_LOG_HEADER:
+                raise ValueError(f"run-log header mismatch in {source}: {reader.fieldnames}")
+            with self.run_log.open("a", newline="", encoding="utf-8") as out:
+                writer = csv.DictWriter(out, fieldnames=RUN_LOG_HEADER, extrasaction="ignore")
+                if needs_header:
+                    writer.writeheader()
+                for row in reader:
+                    if any((value or "").strip() for value in row.values()):
+                        writer.writerow(row)
+                        count += 1
+        self.sync()
+        return count
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--run-log", default="docs/native-check-run-log.csv")
+    parser.add_argument("--index", help="SQLite index path (default: <run-log>.sqlite)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("summary", help="Sync the index and print counters and the latest run.")
+    export_parser = subparsers.add_parser("export", help="Write every indexed run to a CSV file.")
+    export_parser.add_argument("--output", required=True)
+    import_parser = subparsers.add_parser("import", help="Append the rows of another run-log CSV.")
+    import_parser.add_argument("--input", required=True)
+    args = parser.parse_args()
+
+    run_log = Path(args.run_log)
+    source = Path(args.input) if args.command == "import" else None
+    if source is not None and not source.exists():
+        print(f"ERROR: import source not found: {source}", file=sys.stderr)
+        return 1
+
+    try:
+        with RunLogStore(run_log, Path(args.index) if args.index else None) as store:
+            if args.command == "export":
+                count = store.export_csv(Path(args.output))
+                print(f"Exported {count} run(s) to {args.output}")
+            elif source is not None:
+                count = store.import_csv(source)
+                print(f"Imported {count} run(s) from {source} into {run_log}")
+            else:
+                total, passed = store.counts()
+                latest = store.latest()
+                print(f"Run log: {run_log} total_runs={total} pass_runs={passed}")
+                print(f"Latest standard artifact: {latest['standard_artifact'] if latest else 'N/A'}")
+    except (ValueError, sqlite3.DatabaseError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,8 +5,20 @@ ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")/.." && pwd)"
 BUILD_DIR="$ROOT_DIR/native/build"
 ARTIFACT_DIR="$BUILD_DIR/artifacts"
 ESCAPE_ARTIFACT_DIR="$BUILD_DIR/artifacts_escape"
+TSAN_BUILD_DIR="$ROOT_DIR/native/build-tsan"
+BENCH_BUILD_DIR="$ROOT_DIR/native/build-release"
 
 cmake -S "$ROOT_DIR/native" -B "$BUILD_DIR"
 cmake --build "$BUILD_DIR"
 ctest --test-dir "$BUILD_DIR" --output-on-failure
+python3 "$ROOT_DIR/scripts/smoke_python_bindings.py"
+cmake -S "$ROOT_DIR/native" -B "$TSAN_BUILD_DIR" -DMC_ENABLE_TSAN=ON
+cmake --build "$TSAN_BUILD_DIR" --target test_sync_engine_concurrency
+"$TSAN_BUILD_DIR/test_sync_engine_concurrency"
 "$BUILD_DIR/poc_cli" 35 --threshold-ms 1.0 --artifact-dir "$BUILD_DIR/artifacts" --device-a "sony-sim" --device-b "tribit-sim" --notes "native-check"
+"$BUILD_DIR/poc_cli" --sweep --devices 2,3,4 --trials 2 --artifact-dir "$ARTIFACT_DIR" --record-file "$ARTIFACT_DIR/poc_records.bin" --notes "native-sweep"
+"$BUILD_DIR/drift_sim" --matrix "$ROOT_DIR/docs/hardware-matrix-template.csv" --correction step --threshold-ms 10 --timeline-csv "$ARTIFACT_DIR/drift_timeline.csv"
+cmake -S "$ROOT_DIR/native" -B "$BENCH_BUILD_DIR" -DCMAKE_BUILD_TYPE=Release
+cmake --build "$BENCH_BUILD_DIR" --target bench_sync_core
+"$BENCH_BUILD_DIR/bench_sync_core" --json "$ARTIFACT_DIR/bench_sync_core.json"
+python3 "$ROOT_DIR/scripts/compare_native_benchmarks.py" "$ARTIFACT_DIR/bench_sync_core.json" --history "$BENCH_BUILD_DIR/bench_history.jsonl"
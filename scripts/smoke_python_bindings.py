@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""Smoke-test the Python bindings against a freshly built libmulticonnect_core.
+
+Pushes a known int16 ramp through a SyncEngine, reads it back with pull() and pull_all(), checks the
+samples and metrics(), and checks multiconnect.gcc_phat against the native GCC-PHAT estimator.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+from pathlib import Path
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "python"))
+
+import numpy as np  # noqa: E402
+
+from multiconnect import SyncEngine, gcc_phat, load_library  # noqa: E402
+
+FRAMES = 480
+BLOCK = 256
+SHIFT_SAMPLES = 37
+MAX_LAG = 200
+LAG_TOLERANCE = 0.01
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--library", type=Path, help="libmulticonnect_core to load (default: native/build).")
+    return parser.parse_args()
+
+
+def check_engine(library: Path | None) -> list[str]:
+    errors: list[str] = []
+    engine = SyncEngine(1024, library=library)
+    first = engine.register_device("first")
+    second = engine.register_device("second")
+
+    ramp = np.arange(FRAMES, dtype=np.int16) * 16
+    accepted = engine.push(ramp)
+    if accepted != FRAMES:
+        errors.append(f"push accepted {accepted} of {FRAMES} frames")
+
+    out, read = engine.pull(first, BLOCK)
+    if read != BLOCK or not np.array_equal(out, ramp[:BLOCK]):
+        errors.append(f"pull read {read} frames, expected {BLOCK} matching the pushed ramp")
+
+    # "first" has FRAMES - BLOCK frames left and underruns; "second" still starts at frame 0.
+    out, read, underrun = engine.pull_all([first, second], BLOCK)
+    remaining = FRAMES - BLOCK
+    if list(read) != [remaining, BLOCK] or list(underrun) != [True, False]:
+        errors.append(f"pull_all read={list(read)} underrun={list(underrun)}, expected [{remaining}, {BLOCK}] [True, False]")
+    if not np.array_equal(out[:remaining, 0], ramp[BLOCK:]) or np.any(out[remaining:, 0]):
+        errors.append("pull_all column 0 is not the rest of the ramp followed by silence")
+    if not np.array_equal(out[:, 1], ramp[:BLOCK]):
+        errors.append("pull_all column 1 is not the start of the ramp")
+
+    engine_metrics, devices = engine.metrics()
+    if engine_metrics.frames_written != FRAMES or engine_metrics.device_count != 2:
+        errors.append(
+            f"metrics frames_written={engine_metrics.frames_written} device_count={engine_metrics.device_count}, "
+            f"expected {FRAMES} and 2"
+        )
+    frames_read = {device.device_id: device.frames_read for device in devices}
+    if frames_read != {"first": FRAMES, "second": BLOCK}:
+        errors.append(f"metrics frames_read={frames_read}, expected first={FRAMES} second={BLOCK}")
+    if engine_metrics.underrun_count < 1:
+        errors.append("metrics did not count the underrun on 'first'")
+    return errors
+
+
+def check_gcc_phat(library: ctypes.CDLL) -> list[str]:
+    rng = np.random.default_rng(7)
+    reference = (rng.standard_normal(4096) * 6000).astype(np.int16)
+    capture = np.concatenate([np.zeros(SHIFT_SAMPLES, dtype=np.int16), reference[:-SHIFT_SAMPLES]])
+
+    estimate = gcc_phat(reference, capture, max_lag=MAX_LAG)
+    native_lag = ctypes.c_double(0.0)
+    native_peak = ctypes.c_double(0.0)
+    valid = library.mc_estimate_offset_gcc_phat(
+        reference.ctypes.data_as(ctypes.POINTER(ctypes.c_int16)),
+        reference.size,
+        capture.ctypes.data_as(ctypes.POINTER(ctypes.c_int16)),
+        capture.size,
+        MAX_LAG,
+        ctypes.byref(native_lag),
+        ctypes.byref(native_peak),
+    )
+
+    errors: list[str] = []
+    if not valid or not estimate.valid:
+        return [f"gcc_phat valid={estimate.valid} native valid={bool(valid)} on a shifted copy"]
+    if abs(estimate.lag_samples - native_lag.value) > LAG_TOLERANCE:
+        errors.append(f"gcc_phat lag {estimate.lag_samples:.4f} disagrees with native {native_lag.value:.4f}")
+    if abs(native_lag.value - SHIFT_SAMPLES) > LAG_TOLERANCE:
+        errors.append(f"native lag {native_lag.value:.4f}, expected {SHIFT_SAMPLES}")
+    return errors
+
+
+def main() -> int:
+    args = parse_args()
+    try:
+        library = load_library(args.library)
+    except OSError as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    errors = check_engine(args.library) + check_gcc_phat(library)
+    for error in errors:
+        print(f"ERROR: {error}", file=sys.stderr)
+    if errors:
+        return 1
+    print("Python bindings smoke test: OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -4,12 +4,13 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import json
-import re
 from pathlib import Path
 import sys
 
+from evidence_pipeline import render_baseline_report, resolve_artifact
+from run_log_store import RunLogStore
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -19,31 +20,16 @@ def parse_args() -> argparse.Namespace:
 
 
 def latest_artifact_from_runlog(run_log: Path) -> str:
-    with run_log.open(newline="", encoding="utf-8") as handle:
-        rows = list(csv.DictReader(handle))
-    if not rows:
+    with RunLogStore(run_log) as store:
+        latest = store.latest()
+    if latest is None:
         raise ValueError("run log has no entries")
-    artifact = rows[-1].get("standard_artifact", "").strip()
+    artifact = latest.get("standard_artifact", "").strip()
     if not artifact:
         raise ValueError("latest run-log row missing standard_artifact")
     return artifact
 
 
-def replace_line(text: str, prefix: str, new_line: str) -> str:
-    pattern = re.compile(rf"^{re.escape(prefix)}.*$", re.MULTILINE)
-    if not pattern.search(text):
-        raise ValueError(f"missing line with prefix: {prefix}")
-    return pattern.sub(new_line, text)
-
-
-def replace_metric_row(text: str, metric: str, value: str) -> str:
-    pattern = re.compile(rf"^\|\s*{re.escape(metric)}\s*\|\s*[^|]*\|$", re.MULTILINE)
-    new_row = f"| {metric} | {value} |"
-    if not pattern.search(text):
-        raise ValueError(f"missing metric row: {metric}")
-    return pattern.sub(new_row, text)
-
-
 def main() -> int:
     args = parse_args()
     report = Path(args.report)
@@ -62,9 +48,7 @@ def main() -> int:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 1
 
-    artifact_path = Path(artifact_rel)
-    if not artifact_path.is_absolute():
-        artifact_path = Path.cwd() / artifact_path
+    artifact_path = resolve_artifact(artifact_rel)
     if not artifact_path.exists():
         print(f"ERROR: artifact does not exist: {artifact_path}", file=sys.stderr)
         return 1
@@ -72,24 +56,8 @@ def main() -> int:
     with artifact_path.open(encoding="utf-8") as handle:
         data = json.load(handle)
 
-    text = report.read_text(encoding="utf-8")
-
     try:
-        text = replace_line(text, "- Latest standard artifact:", f"- Latest standard artifact: `{artifact_rel}`")
-        text = replace_line(text, "- Result:", f"- Result: `{data.get('outcome', 'UNKNOWN')}`")
-
-        metrics = {
-            "sampleRateHz": str(data.get("sampleRateHz", "")),
-            "durationMs": str(data.get("durationMs", "")),
-            "requestedOffsetMs": str(data.get("requestedOffsetMs", "")),
-            "measuredOffsetMs": str(data.get("measuredOffsetMs", "")),
-            "errorFromRequestedMs": str(data.get("errorFromRequestedMs", "")),
-            "thresholdMs": str(data.get("thresholdMs", "")),
-            "deviceA": str(data.get("deviceA", "")),
-            "deviceB": str(data.get("deviceB", "")),
-        }
-        for key, value in metrics.items():
-            text = replace_metric_row(text, key, value)
+        text = render_baseline_report(report.read_text(encoding="utf-8"), artifact_rel, data)
     except ValueError as exc:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 1
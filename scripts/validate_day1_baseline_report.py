@@ -4,11 +4,13 @@
 from __future__ import annotations
 
 import argparse
-import csv
 import re
 from pathlib import Path
+import sqlite3
 import sys
 
+from run_log_store import RunLogStore
+
 LATEST_ARTIFACT_PREFIX = "- Latest standard artifact: `"
 METRIC_ROW_RE = re.compile(r"^\|\s*([a-zA-Z0-9_]+)\s*\|\s*([^|]+?)\s*\|$")
 
@@ -20,12 +22,11 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def read_run_log_rows(run_log: Path) -> list[dict[str, str]]:
-    with run_log.open(newline="", encoding="utf-8") as handle:
-        rows = list(csv.DictReader(handle))
-    if not rows:
-        raise ValueError(f"run log has no entries: {run_log}")
-    return rows
+def find_run_log_row(run_log: Path, artifact: str) -> dict[str, str] | None:
+    with RunLogStore(run_log, create_index=False) as store:
+        if store.counts()[0] == 0:
+            raise ValueError(f"run log has no entries: {run_log}")
+        return store.by_artifact(artifact)
 
 
 def read_report_artifact(report_text: str) -> str:
@@ -64,26 +65,15 @@ def main() -> int:
         print(f"ERROR: run log not found: {run_log_path}", file=sys.stderr)
         return 1
 
-    try:
-        run_rows = read_run_log_rows(run_log_path)
-    except ValueError as exc:
-        print(f"ERROR: {exc}", file=sys.stderr)
-        return 1
-
     report_text = report_path.read_text(encoding="utf-8")
 
     try:
         reported_artifact = read_report_artifact(report_text)
-    except ValueError as exc:
+        row_for_artifact = find_run_log_row(run_log_path, reported_artifact)
+    except (ValueError, sqlite3.DatabaseError) as exc:
         print(f"ERROR: {exc}", file=sys.stderr)
         return 1
 
-    row_for_artifact = None
-    for row in run_rows:
-        if row.get("standard_artifact", "").strip() == reported_artifact:
-            row_for_artifact = row
-            break
-
     if row_for_artifact is None:
         print(
             f"ERROR: reported artifact not present in run log: {reported_artifact}",
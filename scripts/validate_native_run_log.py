@@ -9,17 +9,9 @@ from datetime import datetime
 from pathlib import Path
 import sys
 
-EXPECTED_HEADER = [
-    "recorded_at_utc",
-    "standard_artifact",
-    "escape_artifact",
-    "outcome_standard",
-    "outcome_escape",
-    "requested_offset_ms",
-    "measured_offset_ms",
-    "threshold_ms",
-    "error_from_requested_ms",
-]
+from run_log_store import RUN_LOG_HEADER
+
+EXPECTED_HEADER = RUN_LOG_HEADER
 
 ALLOWED_OUTCOMES = {"PASS", "FAIL"}
 
@@ -81,23 +73,23 @@ def main() -> int:
             print(f"Actual:   {','.join(reader.fieldnames or [])}", file=sys.stderr)
             return 1
 
-        rows = list(reader)
+        row_count = 0
+        try:
+            for i, row in enumerate(reader, start=2):
+                validate_row(row, i)
+                row_count += 1
+        except ValueError as exc:
+            print(f"ERROR: {exc}", file=sys.stderr)
+            return 1
 
-    if len(rows) < args.min_rows:
+    if row_count < args.min_rows:
         print(
-            f"ERROR: expected at least {args.min_rows} rows, found {len(rows)}",
+            f"ERROR: expected at least {args.min_rows} rows, found {row_count}",
             file=sys.stderr,
         )
         return 1
 
-    try:
-        for i, row in enumerate(rows, start=2):
-            validate_row(row, i)
-    except ValueError as exc:
-        print(f"ERROR: {exc}", file=sys.stderr)
-        return 1
-
-    print(f"Native run log OK: {run_log} (rows={len(rows)})")
+    print(f"Native run log OK: {run_log} (rows={row_count})")
     return 0
 
 
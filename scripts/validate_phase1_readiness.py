@@ -6,8 +6,11 @@ from __future__ import annotations
 import argparse
 import csv
 from pathlib import Path
+import sqlite3
 import sys
 
+from run_log_store import RunLogStore
+
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
@@ -31,14 +34,8 @@ def count_data_rows(csv_path: Path) -> int:
 
 
 def count_pass_rows(run_log: Path) -> tuple[int, int]:
-    with run_log.open(newline="", encoding="utf-8") as handle:
-        rows = list(csv.DictReader(handle))
-    pass_rows = [
-        row
-        for row in rows
-        if row.get("outcome_standard") == "PASS" and row.get("outcome_escape") == "PASS"
-    ]
-    return len(rows), len(pass_rows)
+    with RunLogStore(run_log, create_index=False) as store:
+        return store.counts()
 
 
 def main() -> int:
@@ -54,7 +51,11 @@ def main() -> int:
         return 1
 
     hardware_runs = count_data_rows(matrix_path)
-    total_runs, pass_runs = count_pass_rows(run_log_path)
+    try:
+        total_runs, pass_runs = count_pass_rows(run_log_path)
+    except (ValueError, sqlite3.DatabaseError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
 
     ok_hardware = hardware_runs >= args.min_hardware_runs
     ok_pass = pass_runs >= args.min_pass_runs
@@ -1,9 +1,17 @@
 #!/usr/bin/env python3
-"""Validate a generated poc_cli artifact JSON file."""
+"""Validate a generated poc_cli artifact JSON file.
+
+Checks the newest artifact only; validate_run_log_artifacts.py checks every archived run.
+"""
+
+from __future__ import annotations
 
 import argparse
 import json
 from pathlib import Path
+import sys
+
+from artifact_manifest import latest_artifact
 
 
 def parse_args() -> argparse.Namespace:
@@ -18,19 +26,36 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> int:
     args = parse_args()
-    candidates = sorted(args.artifact_dir.glob("poc_run_*.json"), key=lambda p: p.stat().st_mtime)
-    if not candidates:
+    try:
+        latest = latest_artifact(args.artifact_dir)
+    except FileNotFoundError:
         raise SystemExit(f"No artifact files found in: {args.artifact_dir}")
 
-    latest = candidates[-1]
-    payload = json.loads(latest.read_text(encoding="utf-8"))
+    try:
+        payload = json.loads(latest.read_text(encoding="utf-8"))
+    except ValueError as exc:
+        print(f"ERROR: {latest} is not valid JSON: {exc}", file=sys.stderr)
+        return 1
 
-    assert payload.get("deviceA") == args.expected_device_a
-    assert payload.get("deviceB") == args.expected_device_b
-    assert payload.get("notes") == args.expected_notes
-    assert payload.get("outcome") == args.expected_outcome
-    assert isinstance(payload.get("requestedOffsetMs"), int)
-    assert isinstance(payload.get("measuredOffsetMs"), (int, float))
+    expected = {
+        "deviceA": args.expected_device_a,
+        "deviceB": args.expected_device_b,
+        "notes": args.expected_notes,
+        "outcome": args.expected_outcome,
+    }
+    errors = [
+        f"{key} expected={value!r} actual={payload.get(key)!r}"
+        for key, value in expected.items()
+        if payload.get(key) != value
+    ]
+    if not isinstance(payload.get("requestedOffsetMs"), int):
+        errors.append(f"requestedOffsetMs is not an integer: {payload.get('requestedOffsetMs')!r}")
+    if not isinstance(payload.get("measuredOffsetMs"), (int, float)):
+        errors.append(f"measuredOffsetMs is not a number: {payload.get('measuredOffsetMs')!r}")
+    for error in errors:
+        print(f"ERROR: {latest}: {error}", file=sys.stderr)
+    if errors:
+        return 1
 
     print(f"Validated artifact: {latest}")
     return 0
@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""Check every artifact referenced by the native run log against its run-log row.
+
+For each row, the standard artifact must agree with the row on outcome, offsets, threshold and error,
+and its outcome must follow from error <= threshold. The escape artifact must parse and match
+outcome_escape. Artifacts are parsed in a process pool. Parsed fields are cached by path, mtime and
+size, together with a content hash, in a gitignored JSON file, so a re-run only opens artifacts that
+are new or changed.
+
+    python3 scripts/validate_run_log_artifacts.py --report /tmp/artifact-report.json
+"""
+
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+import sqlite3
+import sys
+from typing import Any, Iterable
+
+from run_log_store import RunLogStore
+
+CACHE_VERSION = 1
+ARTIFACT_FIELDS = ("outcome", "requestedOffsetMs", "measuredOffsetMs", "thresholdMs", "errorFromRequestedMs")
+# (row column, artifact field) pairs compared numerically for the standard artifact.
+NUMERIC_CHECKS = (
+    ("requested_offset_ms", "requestedOffsetMs"),
+    ("measured_offset_ms", "measuredOffsetMs"),
+    ("threshold_ms", "thresholdMs"),
+    ("error_from_requested_ms", "errorFromRequestedMs"),
+)
+# Below this many artifacts to parse, starting worker processes costs more than it saves.
+_MIN_PARALLEL_ARTIFACTS = 16
+
+
+@dataclass
+class Mismatch:
+    line: int
+    recorded_at_utc: str
+    role: str
+    artifact: str
+    field: str
+    expected: Any
+    actual: Any
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--run-log", default="docs/native-check-run-log.csv")
+    parser.add_argument("--cache", default="docs/.artifact-validation-cache.json")
+    parser.add_argument("--report", help="Write the structured mismatch report to this JSON file.")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="Worker processes for parsing.")
+    parser.add_argument(
+        "--skip-missing",
+        action="store_true",
+        help="Report artifacts that no longer exist but do not fail on them (e.g. runs from another machine).",
+    )
+    return parser.parse_args()
+
+
+def inspect_artifact(path: str) -> dict[str, Any]:
+    """Hash and parse one artifact; runs in a worker process."""
+    data = Path(path).read_bytes()
+    record: dict[str, Any] = {"sha256": hashlib.sha256(data).hexdigest(), "fields": None, "error": None}
+    try:
+        payload = json.loads(data.decode("utf-8"))
+        if not isinstance(payload, dict):
+            raise ValueError("top-level value is not an object")
+        record["fields"] = {name: payload.get(name) for name in ARTIFACT_FIELDS}
+    except ValueError as exc:
+        record["error"] = f"invalid JSON: {exc}"
+    return record
+
+
+def load_cache(path: Path) -> dict[str, dict[str, Any]]:
+    try:
+        cache = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return {}
+    artifacts = cache.get("artifacts")
+    return artifacts if isinstance(artifacts, dict) else {}
+
+
+def save_cache(path: Path, artifacts: dict[str, dict[str, Any]]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {"version": CACHE_VERSION, "artifacts": artifacts}
+    path.write_text(json.dumps(payload, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+
+
+def resolve(artifact: str) -> str:
+    path = Path(artifact)
+    return str(path if path.is_absolute() else Path.cwd() / path)
+
+
+def inspect_all(
+    paths: Iterable[str], cache: dict[str, dict[str, Any]], jobs: int
+) -> tuple[dict[str, dict[str, Any] | None], int]:
+    """Return a record per path (None if missing) and how many artifacts had to be parsed."""
+    records: dict[str, dict[str, Any] | None] = {}
+    stale: list[tuple[str, int, int]] = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            records[path] = None
+            continue
+        cached = cache.get(path)
+        if cached and cached.get("mtime_ns") == stat.st_mtime_ns and cached.get("size") == stat.st_size:
+            records[path] = cached
+        else:
+            stale.append((path, stat.st_mtime_ns, stat.st_size))
+
+    names = [path for path, _, _ in stale]
+    if jobs > 1 and len(names) >= _MIN_PARALLEL_ARTIFACTS:
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            inspected = list(pool.map(inspect_artifact, names, chunksize=max(1, len(names) // (jobs * 4))))
+    else:
+        inspected = [inspect_artifact(path) for path in names]
+
+    for (path, mtime_ns, size), record in zip(stale, inspected):
+        record.update(mtime_ns=mtime_ns, size=size)
+        records[path] = cache[path] = record
+    return records, len(stale)
+
+
+def _number(value: Any) -> float | None:
+    if isinstance(value, bool):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return number if math.isfinite(number) else None
+
+
+def check_row(
+    line: int, row: dict[str, str], records: dict[str, dict[str, Any] | None], skip_missing: bool
+) -> tuple[list[Mismatch], int]:
+    """Return the row's mismatches and how many of its artifacts were missing."""
+    mismatches: list[Mismatch] = []
+    missing = 0
+
+    def add(role: str, artifact: str, field: str, expected: Any, actual: Any) -> None:
+        mismatches.append(Mismatch(line, row["recorded_at_utc"], role, artifact, field, expected, actual))
+
+    for role, column, outcome_column in (
+        ("standard", "standard_artifact", "outcome_standard"),
+        ("escape", "escape_artifact", "outcome_escape"),
+    ):
+        artifact = row[column]
+        record = records[resolve(artifact)]
+        if record is None:
+            missing += 1
+            if not skip_missing:
+                add(role, artifact, "file", "exists", "missing")
+            continue
+        if record["error"]:
+            add(role, artifact, "json", "valid", record["error"])
+            continue
+
+        fields = record["fields"]
+        if fields["outcome"] != row[outcome_column]:
+            add(role, artifact, "outcome", row[outcome_column], fields["outcome"])
+        if role != "standard":
+            continue
+
+        for row_column, field in NUMERIC_CHECKS:
+            expected = _number(row[row_column])
+            actual = _number(fields[field])
+            if expected is None or actual is None or not math.isclose(expected, actual, rel_tol=1e-6, abs_tol=1e-9):
+                add(role, artifact, field, row[row_column], fields[field])
+
+        error = _number(fields["errorFromRequestedMs"])
+        threshold = _number(fields["thresholdMs"])
+        if error is not None and threshold is not None:
+            derived = "PASS" if error <= threshold else "FAIL"
+            if fields["outcome"] != derived:
+                add(role, artifact, "outcome_vs_threshold", derived, fields["outcome"])
+    return mismatches, missing
+
+
+def main() -> int:
+    args = parse_args()
+    run_log = Path(args.run_log)
+    if not run_log.exists():
+        print(f"ERROR: run log not found: {run_log}", file=sys.stderr)
+        return 1
+
+    try:
+        with RunLogStore(run_log, create_index=False) as store:
+            rows = list(store.rows())
+    except (ValueError, sqlite3.DatabaseError) as exc:
+        print(f"ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    cache_path = Path(args.cache)
+    cache = load_cache(cache_path)
+    paths = dict.fromkeys(resolve(row[column]) for row in rows for column in ("standard_artifact", "escape_artifact"))
+    records, parsed = inspect_all(paths, cache, max(args.jobs, 1))
+    save_cache(cache_path, cache)
+
+    mismatches: list[Mismatch] = []
+    missing = 0
+    # Line 1 is the header, so row i of the log is line i + 2.
+    for index, row in enumerate(rows):
+        row_mismatches, row_missing = check_row(index + 2, row, records, args.skip_missing)
+        mismatches.extend(row_mismatches)
+        missing += row_missing
+
+    report = {
+        "generated_at_utc": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "run_log": run_log.as_posix(),
+        "rows": len(rows),
+        "artifacts": len(paths),
+        "parsed": parsed,
+        "cached": len(paths) - parsed - sum(record is None for record in records.values()),
+        "missing": missing,
+        "mismatches": [asdict(mismatch) for mismatch in mismatches],
+    }
+    if args.report:
+        report_path = Path(args.report)
+        report_path.parent.mkdir(parents=True, exist_ok=True)
+        report_path.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+
+    print(
+        f"Run-log artifacts: rows={report['rows']} artifacts={report['artifacts']} parsed={report['parsed']} "
+        f"cached={report['cached']} missing={report['missing']} mismatches={len(mismatches)}"
+    )
+    for mismatch in mismatches:
+        print(
+            f"ERROR: line {mismatch.line} {mismatch.role} {mismatch.artifact}: {mismatch.field} "
+            f"expected={mismatch.expected!r} actual={mismatch.actual!r}",
+            file=sys.stderr,
+        )
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())